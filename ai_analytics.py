@@ -0,0 +1,554 @@
+"""
+Claude-powered workload analytics for AI Database Migration Studio
+"""
+import json
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from anthropic import APIError, APIStatusError
+
+from ai_prompts import (WORKLOAD_TEXT_FORMAT, batch_message, migration_message, prediction_message, system_blocks,
+                        workload_message)
+from ai_schemas import (MIGRATION_STRATEGY_TOOL, PREDICTIONS_TOOL, WORKLOAD_ANALYSIS_TOOL, WORKLOAD_BATCH_TOOL,
+                        coerce, tool_choice, tool_input)
+from ai_transport import build_transport
+from config import Config
+
+class WorkloadAnalysisParser:
+    """Parses a workload analysis response line by line, so it can consume a stream"""
+    
+    def __init__(self):
+        self.reset()
+    
+    def reset(self):
+        self.text = ""
+        self._buffer = ""
+        self._current_section = ""
+        
+        # Default structure
+        self.result = {
+            "workload_type": "Mixed",
+            "complexity": "Medium",
+            "timeline": "N/A",
+            "bottlenecks": [],
+            "recommendations": [],
+            "risks": []
+        }
+    
+    def feed(self, chunk: str) -> bool:
+        """Consume a chunk of text; returns True when at least one complete line was parsed"""
+        self.text += chunk
+        self._buffer += chunk
+        *lines, self._buffer = self._buffer.split('\n')
+        for line in lines:
+            self._parse_line(line)
+        return bool(lines)
+    
+    def snapshot(self) -> dict:
+        """Partial result parsed so far"""
+        partial = {key: list(value) if isinstance(value, list) else value for key, value in self.result.items()}
+        partial["text"] = self.text
+        return partial
+    
+    def _parse_line(self, line: str):
+        line = line.strip()
+        if not line:
+            return
+        result = self.result
+            
+        # Identify sections
+        if "workload" in line.lower() and ("classification" in line.lower() or "type" in line.lower()):
+            if "oltp" in line.lower():
+                result["workload_type"] = "OLTP"
+            elif "olap" in line.lower():
+                result["workload_type"] = "OLAP"
+            elif "mixed" in line.lower():
+                result["workload_type"] = "Mixed"
+        
+        if "complexity" in line.lower():
+            if "high" in line.lower():
+                result["complexity"] = "High"
+            elif "low" in line.lower():
+                result["complexity"] = "Low"
+            else:
+                result["complexity"] = "Medium"
+        
+        # Extract recommendations, bottlenecks, risks
+        if any(marker in line for marker in ['•', '-', '*', '1.', '2.', '3.']):
+            clean_line = line.strip('•-* \t0123456789.').strip()
+            if clean_line:
+                if "recommend" in self._current_section.lower():
+                    result["recommendations"].append(clean_line)
+                elif "bottleneck" in self._current_section.lower() or "performance" in self._current_section.lower():
+                    result["bottlenecks"].append(clean_line)
+                elif "risk" in self._current_section.lower():
+                    result["risks"].append(clean_line)
+        
+        # Track current section
+        if ":" in line:
+            self._current_section = line
+    
+    def finish(self) -> dict:
+        """Parse any trailing partial line; sections the response did not cover stay empty"""
+        self._parse_line(self._buffer)
+        self._buffer = ""
+        result = self.result
+        response_text = self.text
+        result["summary"] = response_text[:500] + "..." if len(response_text) > 500 else response_text
+        return result
+
+
+def outline(value, indent: str = "") -> str:
+    """Markdown outline of a (partial) tool input, for rendering it while it streams"""
+    lines = []
+    for key, item in value.items():
+        label = key.replace("_", " ").capitalize()
+        if isinstance(item, dict):
+            lines.append(f"{indent}- **{label}**")
+            lines.append(outline(item, indent + "  "))
+        elif isinstance(item, list):
+            lines.append(f"{indent}- **{label}**")
+            for entry in item:
+                if isinstance(entry, dict):
+                    lines.append(outline(entry, indent + "  "))
+                else:
+                    lines.append(f"{indent}  - {entry}")
+        else:
+            lines.append(f"{indent}- **{label}:** {item}")
+    return "\n".join(line for line in lines if line)
+
+
+class UsageMetrics:
+    """Thread-safe per-call token, prompt-cache and latency accounting"""
+    
+    def __init__(self, history: int = 500):
+        self._lock = threading.Lock()
+        self.calls = deque(maxlen=history)
+        self.totals = {"calls": 0, "input_tokens": 0, "cache_read_input_tokens": 0,
+                       "cache_creation_input_tokens": 0, "output_tokens": 0, "latency_seconds": 0.0}
+    
+    def record(self, task: str, message, latency: float):
+        usage = getattr(message, "usage", None)
+        call = {
+            "task": task,
+            "latency_ms": round(latency * 1000, 1),
+            "input_tokens": getattr(usage, "input_tokens", 0) or 0,
+            "cache_read_input_tokens": getattr(usage, "cache_read_input_tokens", 0) or 0,
+            "cache_creation_input_tokens": getattr(usage, "cache_creation_input_tokens", 0) or 0,
+            "output_tokens": getattr(usage, "output_tokens", 0) or 0,
+        }
+        with self._lock:
+            self.calls.append(call)
+            self.totals["calls"] += 1
+            self.totals["latency_seconds"] += latency
+            for key in ("input_tokens", "cache_read_input_tokens", "cache_creation_input_tokens", "output_tokens"):
+                self.totals[key] += call[key]
+    
+    def snapshot(self) -> dict:
+        """Totals plus cache hit rate and estimated cost with and without caching"""
+        with self._lock:
+            totals = dict(self.totals)
+            calls = list(self.calls)
+        
+        uncached = totals["input_tokens"]
+        cached = totals["cache_read_input_tokens"]
+        written = totals["cache_creation_input_tokens"]
+        prompt_tokens = uncached + cached + written
+        
+        input_price = Config.AI_INPUT_PRICE_PER_MTOK / 1e6
+        output_cost = totals["output_tokens"] * Config.AI_OUTPUT_PRICE_PER_MTOK / 1e6
+        # Cache reads bill at 10% of the input price, cache writes at 125%
+        cost = (uncached + cached * 0.1 + written * 1.25) * input_price + output_cost
+        cost_without_cache = prompt_tokens * input_price + output_cost
+        
+        hits = [call["latency_ms"] for call in calls if call["cache_read_input_tokens"]]
+        misses = [call["latency_ms"] for call in calls if not call["cache_read_input_tokens"]]
+        
+        totals.update({
+            "prompt_tokens": prompt_tokens,
+            "cache_hit_rate": cached / prompt_tokens if prompt_tokens else 0.0,
+            "estimated_cost": round(cost, 4),
+            "estimated_cost_without_cache": round(cost_without_cache, 4),
+            "avg_latency_ms_cache_hit": round(sum(hits) / len(hits), 1) if hits else None,
+            "avg_latency_ms_cache_miss": round(sum(misses) / len(misses), 1) if misses else None,
+        })
+        return totals
+
+
+class AIAnalytics:
+    """AI-powered analytics engine using Claude API"""
+    
+    MODEL = "claude-3-5-sonnet-20240620"
+    
+    def __init__(self, api_key: str, transport=None, structured_output: bool = None):
+        # Transport decides live / record / replay / local mock endpoint (see ai_transport.py)
+        self.transport = transport or build_transport(api_key)
+        # Structured mode asks for forced tool calls (see ai_schemas.py) instead of free text
+        self.structured_output = Config.AI_STRUCTURED_OUTPUT if structured_output is None else structured_output
+        # Stable system prefixes are marked for prompt caching (see ai_prompts.py)
+        self.prompt_caching = Config.AI_PROMPT_CACHING
+        self.usage = UsageMetrics()
+    
+    def _request(self, task: str, content: str, max_tokens: int, tool: dict = None, suffix: str = "") -> dict:
+        """Messages API request: cacheable system prefix for ``task`` plus the variable user content"""
+        request = {}
+        if tool:
+            suffix = f"{suffix}\nRecord your answer with the {tool['name']} tool.".strip()
+            request = {"tools": [tool], "tool_choice": tool_choice(tool)}
+        return dict(
+            model=self.MODEL,
+            max_tokens=max_tokens,
+            system=system_blocks(task, suffix, cache=self.prompt_caching),
+            messages=[{"role": "user", "content": content}],
+            **request
+        )
+    
+    def _create_message(self, task: str, content: str, max_tokens: int, tool: dict = None, suffix: str = ""):
+        """Send a single-turn request through the configured transport, optionally forcing a tool call"""
+        start = time.perf_counter()
+        message = self.transport.create_message(**self._request(task, content, max_tokens, tool, suffix))
+        self.usage.record(task, message, time.perf_counter() - start)
+        return message
+    
+    def _structured_call(self, task: str, content: str, max_tokens: int, tool: dict) -> dict:
+        """Forced tool call whose input is validated against the tool's schema"""
+        message = self._create_message(task, content, max_tokens, tool=tool)
+        return coerce(tool_input(message, tool), tool["input_schema"])
+    
+    def _stream_message(self, task: str, content: str, max_tokens: int, on_text, on_reset=None, suffix: str = "",
+                        tool: dict = None, on_json=None):
+        """Stream a single-turn request, calling ``on_text(chunk)`` as text arrives; returns the final message
+
+        With ``tool`` the call is forced like _create_message's, and ``on_json(partial)``
+        receives the tool input parsed so far.
+        """
+        start = time.perf_counter()
+        message = self.transport.stream_message(
+            on_text, on_reset=on_reset, on_json=on_json, **self._request(task, content, max_tokens, tool, suffix)
+        )
+        self.usage.record(task, message, time.perf_counter() - start)
+        return message
+    
+    def _structured_stream(self, task: str, content: str, max_tokens: int, tool: dict, on_partial=None) -> dict:
+        """Streaming _structured_call; ``on_partial(partial_input)`` fires per tool-input delta"""
+        message = self._stream_message(task, content, max_tokens, lambda chunk: None, tool=tool,
+                                       on_json=on_partial)
+        return coerce(tool_input(message, tool), tool["input_schema"])
+    
+    def _error_result(self, label: str, error: Exception) -> dict:
+        if isinstance(error, APIStatusError) and error.status_code == 401:
+            return {"error": f"{label} failed: Authentication Error (401). Please check your Claude API key."}
+        return {"error": f"{label} failed: {str(error)}"}
+    
+    def analyze_workload_patterns(self, workload_data: dict) -> dict:
+        """Analyze workload patterns and provide intelligent recommendations"""
+        try:
+            if self.structured_output:
+                return self._workload_result(
+                    self._structured_call("workload", workload_message(workload_data), 2000, WORKLOAD_ANALYSIS_TOOL)
+                )
+            
+            message = self._create_message("workload", workload_message(workload_data), 2000, suffix=WORKLOAD_TEXT_FORMAT)
+
+            # Parse AI response
+            ai_analysis = self._parse_ai_response(message.content[0].text)
+            return ai_analysis
+
+        except Exception as e:
+            return self._error_result("AI analysis", e)
+    
+    def generate_migration_strategy(self, analysis_data: dict) -> dict:
+        """Generate detailed migration strategy with AI insights"""
+        try:
+            if self.structured_output:
+                return self._migration_result(
+                    self._structured_call("migration", migration_message(analysis_data), 2500, MIGRATION_STRATEGY_TOOL)
+                )
+            
+            message = self._create_message("migration", migration_message(analysis_data), 2500)
+            
+            return self._parse_migration_strategy(message.content[0].text)
+            
+        except Exception as e:
+            return self._error_result("Migration strategy generation", e)
+    
+    def predict_future_requirements(self, historical_data: dict, years: int = 3) -> dict:
+        """Predict future resource requirements using AI"""
+        try:
+            if self.structured_output:
+                return self._predictions_result(
+                    self._structured_call("prediction", prediction_message(historical_data, years), 2000, PREDICTIONS_TOOL), years
+                )
+            
+            message = self._create_message("prediction", prediction_message(historical_data, years), 2000)
+            
+            return self._parse_predictions(message.content[0].text)
+            
+        except Exception as e:
+            return self._error_result("Prediction generation", e)
+    
+    def analyze_workload_patterns_stream(self, workload_data: dict, on_update=None) -> dict:
+        """Streaming analyze_workload_patterns; ``on_update(partial)`` fires as each line is parsed"""
+        parser = WorkloadAnalysisParser()
+        
+        def on_text(chunk):
+            if parser.feed(chunk) and on_update:
+                on_update(parser.snapshot())
+        
+        try:
+            if self.structured_output:
+                return self._workload_result(self._structured_stream(
+                    "workload", workload_message(workload_data), 2000, WORKLOAD_ANALYSIS_TOOL,
+                    on_partial=lambda partial: on_update and on_update(dict(partial))
+                ))
+            
+            self._stream_message("workload", workload_message(workload_data), 2000, on_text,
+                                 on_reset=parser.reset, suffix=WORKLOAD_TEXT_FORMAT)
+            return parser.finish()
+        except Exception as e:
+            return self._error_result("AI analysis", e)
+    
+    def generate_migration_strategy_stream(self, analysis_data: dict, on_text=None) -> dict:
+        """Streaming generate_migration_strategy; ``on_text(text_so_far)`` fires per chunk"""
+        try:
+            if self.structured_output:
+                return self._migration_result(self._structured_stream(
+                    "migration", migration_message(analysis_data), 2500, MIGRATION_STRATEGY_TOOL,
+                    on_partial=lambda partial: on_text and on_text(outline(partial))
+                ))
+            
+            text = self._stream_accumulated("migration", migration_message(analysis_data), 2500, on_text)
+            return self._parse_migration_strategy(text)
+        except Exception as e:
+            return self._error_result("Migration strategy generation", e)
+    
+    def predict_future_requirements_stream(self, historical_data: dict, years: int = 3, on_text=None) -> dict:
+        """Streaming predict_future_requirements; ``on_text(text_so_far)`` fires per chunk"""
+        try:
+            if self.structured_output:
+                return self._predictions_result(self._structured_stream(
+                    "prediction", prediction_message(historical_data, years), 2000, PREDICTIONS_TOOL,
+                    on_partial=lambda partial: on_text and on_text(outline(partial))
+                ), years)
+            
+            text = self._stream_accumulated("prediction", prediction_message(historical_data, years), 2000, on_text)
+            return self._parse_predictions(text)
+        except Exception as e:
+            return self._error_result("Prediction generation", e)
+    
+    def _stream_accumulated(self, task: str, content: str, max_tokens: int, on_text=None) -> str:
+        chunks = []
+        
+        def collect(chunk):
+            chunks.append(chunk)
+            if on_text:
+                on_text("".join(chunks))
+        
+        self._stream_message(task, content, max_tokens, collect, on_reset=chunks.clear)
+        return "".join(chunks)
+    
+    # Column order of the compact one-line workload descriptions used in batched prompts
+    BATCH_FIELDS = ['engine', 'cores', 'ram', 'storage', 'cpu_util', 'ram_util', 'iops', 'growth', 'region']
+    
+    def plan_workload_batches(self, workloads: list) -> list:
+        """Split workloads into batches that fit the per-request input and output token budgets"""
+        per_db_output = Config.AI_BATCH_OUTPUT_TOKENS_PER_DB
+        max_size = max(1, min(Config.AI_BATCH_MAX_SIZE, (Config.AI_BATCH_MAX_OUTPUT_TOKENS - 200) // per_db_output))
+        
+        batches, current, current_tokens = [], [], 0
+        for index, workload in enumerate(workloads):
+            line_tokens = len(self._compact_workload(self._batch_key(workload, index), workload)) // 4 + 1
+            if current and (len(current) >= max_size or current_tokens + line_tokens > Config.AI_BATCH_MAX_INPUT_TOKENS):
+                batches.append(current)
+                current, current_tokens = [], 0
+            current.append(index)
+            current_tokens += line_tokens
+        if current:
+            batches.append(current)
+        return batches
+    
+    def analyze_workload_batch(self, workloads: list, max_workers: int = 1, progress_callback=None) -> list:
+        """Analyze many workloads with a few batched requests
+        
+        Returns one analysis per workload, in input order, shaped like analyze_workload_patterns.
+        ``progress_callback(completed_count)`` is called from the calling thread as batches finish.
+        """
+        results = [None] * len(workloads)
+        batches = self.plan_workload_batches(workloads)
+        completed = 0
+        
+        with ThreadPoolExecutor(max_workers=max(1, max_workers)) as pool:
+            futures = {pool.submit(self._analyze_batch, workloads, batch): batch for batch in batches}
+            for future in as_completed(futures):
+                for index, analysis in future.result().items():
+                    results[index] = analysis
+                completed += len(futures[future])
+                if progress_callback:
+                    progress_callback(completed)
+        return results
+    
+    def _batch_key(self, workload: dict, index: int) -> str:
+        # Index suffix keeps keys unique when db_name is missing or repeated
+        return f"{workload.get('db_name') or 'Database'} #{index + 1}"
+    
+    def _compact_workload(self, key: str, workload: dict) -> str:
+        return " | ".join([key] + [str(workload.get(field, '')) for field in self.BATCH_FIELDS])
+    
+    def _analyze_batch(self, workloads: list, batch: list) -> dict:
+        """Analyze one batch, bisecting on malformed output; returns {workload index: analysis}"""
+        if len(batch) == 1:
+            return {batch[0]: self.analyze_workload_patterns(workloads[batch[0]])}
+        
+        keys = {self._batch_key(workloads[index], index): index for index in batch}
+        lines = "\n".join(self._compact_workload(key, workloads[index]) for key, index in keys.items())
+        
+        # The JSON schema line is constant, so text mode keeps a fully cacheable prefix too
+        suffix = "" if self.structured_output else (
+            "Respond with only a JSON object keyed by db_name, each value matching this schema:\n"
+            + json.dumps(WORKLOAD_ANALYSIS_TOOL['input_schema']['properties'])
+        )
+        
+        max_tokens = min(Config.AI_BATCH_MAX_OUTPUT_TOKENS, Config.AI_BATCH_OUTPUT_TOKENS_PER_DB * len(batch) + 200)
+        try:
+            if self.structured_output:
+                message = self._create_message("batch", batch_message(lines), max_tokens, tool=WORKLOAD_BATCH_TOOL)
+                analyses = coerce(tool_input(message, WORKLOAD_BATCH_TOOL), WORKLOAD_BATCH_TOOL["input_schema"])["analyses"]
+                parsed = {entry["db_name"]: entry for entry in analyses}
+            else:
+                message = self._create_message("batch", batch_message(lines), max_tokens, suffix=suffix)
+                parsed = self._parse_batch_response(message.content[0].text)
+        except APIError as e:
+            error = {"error": f"AI analysis failed: {str(e)}"}
+            return {index: dict(error) for index in batch}
+        except Exception:
+            parsed = None
+        
+        if parsed is None or getattr(message, "stop_reason", None) == "max_tokens":
+            middle = len(batch) // 2
+            return {**self._analyze_batch(workloads, batch[:middle]), **self._analyze_batch(workloads, batch[middle:])}
+        
+        results = {}
+        missing = []
+        for key, index in keys.items():
+            if isinstance(parsed.get(key), dict):
+                results[index] = self._workload_result(coerce(parsed[key], WORKLOAD_ANALYSIS_TOOL["input_schema"]))
+            else:
+                missing.append(index)
+        for index in missing:
+            results[index] = self.analyze_workload_patterns(workloads[index])
+        return results
+    
+    def _parse_batch_response(self, response_text: str) -> dict:
+        """Extract the JSON object from a batched response, or None when it is unusable"""
+        start, end = response_text.find('{'), response_text.rfind('}')
+        if start < 0 or end <= start:
+            return None
+        try:
+            parsed = json.loads(response_text[start:end + 1])
+        except ValueError:
+            return None
+        return parsed if isinstance(parsed, dict) else None
+    
+    def _workload_result(self, data: dict) -> dict:
+        """Shape validated tool input like analyze_workload_patterns results, plus aggregation fields"""
+        weeks = data["timeline_weeks"]
+        return {
+            "workload_type": data["workload_type"],
+            "complexity": data["complexity"],
+            "timeline": f"{weeks} weeks",
+            "timeline_weeks": weeks,
+            "bottlenecks": data["bottlenecks"],
+            "bottleneck_categories": data["bottleneck_categories"],
+            "recommendations": data["recommendations"],
+            "risks": data["risks"],
+            "risk_categories": data["risk_categories"],
+            "summary": data["summary"]
+        }
+    
+    def _migration_result(self, data: dict) -> dict:
+        """Shape validated tool input like _parse_migration_strategy results"""
+        weeks = sum(phase["weeks"] for phase in data["phases"])
+        lines = [data["summary"], ""]
+        for phase in data["phases"]:
+            lines.append(f"{phase['name']} ({phase['weeks']} weeks)")
+            lines.extend(f"- {activity}" for activity in phase["activities"])
+        if data["rollback_plan"]:
+            lines += ["", f"Rollback: {data['rollback_plan']}"]
+        
+        return {
+            "phases": [phase["name"] for phase in data["phases"]],
+            "phase_details": data["phases"],
+            "timeline": f"{weeks} weeks",
+            "timeline_weeks": weeks,
+            "resources": data["resources"],
+            "risks": data["risks"],
+            "tools": data["tools"],
+            "checklist": data["checklist"],
+            "rollback_plan": data["rollback_plan"],
+            "full_strategy": "\n".join(lines)
+        }
+    
+    def _predictions_result(self, data: dict, years: int) -> dict:
+        """Shape validated tool input like _parse_predictions results, with numeric growth"""
+        def trend(name):
+            item = data[name]
+            text = f"{item['direction'].replace('_', ' ').capitalize()} ({item['growth_pct']:+.0f}% over {years} years)"
+            return f"{text} - {item['note']}" if item["note"] else text
+        
+        return {
+            "cpu_trend": trend("cpu"),
+            "memory_trend": trend("memory"),
+            "storage_trend": trend("storage"),
+            "iops_trend": trend("iops"),
+            "cost_trend": trend("cost"),
+            "growth_pct": {name: data[name]["growth_pct"] for name in ("cpu", "memory", "storage", "iops", "cost")},
+            "confidence": data["confidence"],
+            "key_factors": data["key_factors"],
+            "recommendations": data["recommendations"],
+            "full_prediction": "\n".join(f"{name.upper()}: {trend(name)}" for name in ("cpu", "memory", "storage", "iops", "cost"))
+        }
+    
+    def analyze_database(self, inputs: dict, prod_recommendation: dict, include_workload: bool = True,
+                         include_predictions: bool = True, include_migration: bool = True) -> dict:
+        """Run the enabled AI analyses for one database; safe to call from worker threads"""
+        ai_insights = {}
+        if include_workload:
+            ai_insights['workload'] = self.analyze_workload_patterns(inputs)
+        if include_predictions:
+            ai_insights['predictions'] = self.predict_future_requirements(inputs, inputs.get('years', 3))
+        if include_migration:
+            ai_insights['migration'] = self.generate_migration_strategy(prod_recommendation)
+        return ai_insights
+    
+    def _parse_ai_response(self, response_text: str) -> dict:
+        """Parse AI response into structured data"""
+        parser = WorkloadAnalysisParser()
+        parser.feed(response_text)
+        return parser.finish()
+    
+    def _parse_migration_strategy(self, response_text: str) -> dict:
+        """Free-text migration strategy: only the text itself, the structured fields stay empty"""
+        return {
+            "phases": [],
+            "timeline": "N/A",
+            "resources": [],
+            "risks": [],
+            "tools": [],
+            "checklist": [],
+            "full_strategy": response_text
+        }
+    
+    def _parse_predictions(self, response_text: str) -> dict:
+        """Free-text predictions: only the text itself, the structured fields stay empty"""
+        return {
+            "cpu_trend": "N/A",
+            "memory_trend": "N/A",
+            "storage_trend": "N/A",
+            "cost_trend": "N/A",
+            "confidence": "N/A",
+            "key_factors": [],
+            "recommendations": [],
+            "full_prediction": response_text
+        }
@@ -0,0 +1,284 @@
+"""
+Rate-limit-aware scheduling for Claude requests.
+
+All AIAnalytics calls made with the same API key share one RateLimitScheduler:
+token buckets keep requests/minute and tokens/minute under budget, an AIMD
+limiter adapts how many calls are in flight, and throttled or overloaded
+responses are retried with jittered exponential backoff that honors
+``retry-after``.
+"""
+import email.utils
+import random
+import threading
+import time
+
+import anthropic
+
+from config import Config
+
+
+class TokenBucket:
+    """Refills continuously at ``per_minute``; callers block until enough is available"""
+
+    def __init__(self, per_minute: float, burst: float = None):
+        self.rate = per_minute / 60.0
+        self.capacity = float(burst or per_minute)
+        self.tokens = self.capacity
+        self._updated = time.monotonic()
+        self._cond = threading.Condition()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self, amount: float = 1.0) -> float:
+        """Take ``amount`` tokens, returning the seconds spent waiting"""
+        amount = min(amount, self.capacity)
+        waited = 0.0
+        with self._cond:
+            while True:
+                self._refill()
+                if self.tokens >= amount:
+                    self.tokens -= amount
+                    return waited
+                delay = (amount - self.tokens) / self.rate
+                start = time.monotonic()
+                self._cond.wait(delay)
+                waited += time.monotonic() - start
+
+    def adjust(self, amount: float):
+        """Charge (positive) or refund (negative) tokens once actual usage is known"""
+        with self._cond:
+            self._refill()
+            self.tokens = min(self.capacity, self.tokens - amount)
+            self._cond.notify_all()
+
+
+class AdaptiveConcurrencyLimiter:
+    """Additive-increase / multiplicative-decrease cap on in-flight requests"""
+
+    def __init__(self, initial: int, maximum: int, minimum: int = 1):
+        self.minimum = max(1, minimum)
+        self.maximum = max(self.minimum, maximum)
+        self.limit = min(self.maximum, max(self.minimum, initial))
+        self.in_flight = 0
+        self._successes = 0
+        self._cond = threading.Condition()
+
+    def acquire(self):
+        with self._cond:
+            while self.in_flight >= self.limit:
+                self._cond.wait()
+            self.in_flight += 1
+
+    def release(self, outcome: str):
+        """``outcome`` is "success", "throttled" or "error" (which leaves the limit alone)"""
+        with self._cond:
+            self.in_flight -= 1
+            if outcome == "success":
+                self._successes += 1
+                if self._successes >= self.limit:
+                    self.limit = min(self.maximum, self.limit + 1)
+                    self._successes = 0
+            elif outcome == "throttled":
+                self.limit = max(self.minimum, self.limit // 2)
+                self._successes = 0
+            self._cond.notify_all()
+
+
+def estimate_request_tokens(request: dict, expected_output_tokens: int) -> int:
+    """Rough pre-flight token estimate (~4 characters per token) for budget accounting"""
+    chars = len(str(request.get("system", "")))
+    for message in request.get("messages", []):
+        chars += len(str(message.get("content", "")))
+    output = min(int(request.get("max_tokens") or expected_output_tokens), expected_output_tokens)
+    return chars // 4 + output
+
+
+def _retry_after_seconds(error) -> float:
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None) or {}
+
+    value = headers.get("retry-after-ms")
+    if value:
+        try:
+            return float(value) / 1000
+        except ValueError:
+            pass
+
+    value = headers.get("retry-after")
+    if value:
+        try:
+            return float(value)
+        except ValueError:
+            pass
+        # HTTP date; Python 3.10+ raises on unparseable values instead of returning None
+        try:
+            parsed = email.utils.parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        if parsed is not None:
+            return max(0.0, parsed.timestamp() - time.time())
+    return None
+
+
+class RateLimitScheduler:
+    """Runs Claude calls within rpm/tpm budgets, retrying throttled and transient failures"""
+
+    THROTTLE_STATUS = {429, 529}
+    RETRYABLE_STATUS = {408, 409, 429, 500, 502, 503, 504, 529}
+
+    def __init__(self, requests_per_minute=50, tokens_per_minute=80000, max_concurrency=8,
+                 initial_concurrency=None, max_retries=8, base_delay=1.0, max_delay=60.0,
+                 expected_output_tokens=1000, seed=None):
+        self.requests = TokenBucket(requests_per_minute)
+        self.tokens = TokenBucket(tokens_per_minute)
+        self.concurrency = AdaptiveConcurrencyLimiter(initial_concurrency or max(1, max_concurrency // 2), max_concurrency)
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.expected_output_tokens = expected_output_tokens
+
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._paused_until = 0.0
+        self.stats = {"calls": 0, "attempts": 0, "retries": 0, "throttled": 0, "failed": 0,
+                      "wait_seconds": 0.0, "tokens_used": 0}
+
+    def _count(self, key, amount=1):
+        with self._lock:
+            self.stats[key] += amount
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            stats = dict(self.stats)
+        stats["wait_seconds"] = round(stats["wait_seconds"], 2)
+        stats["concurrency_limit"] = self.concurrency.limit
+        return stats
+
+    def _backoff(self, attempt: int, retry_after: float = None) -> float:
+        delay = self._rng.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+        if retry_after is not None:
+            # Never retry before the server asked us to; spread callers out just after it
+            delay = min(self.max_delay, retry_after) + self._rng.uniform(0, self.base_delay)
+        return delay
+
+    def _wait_for_pause(self):
+        while True:
+            with self._lock:
+                remaining = self._paused_until - time.monotonic()
+            if remaining <= 0:
+                return
+            time.sleep(remaining)
+            self._count("wait_seconds", remaining)
+
+    def _pause(self, seconds: float):
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+    def _classify(self, error) -> str:
+        """Return "throttled", "retry" or "fatal" for an exception raised by the call"""
+        if isinstance(error, anthropic.APIStatusError):
+            if error.status_code in self.THROTTLE_STATUS:
+                return "throttled"
+            if error.status_code in self.RETRYABLE_STATUS:
+                return "retry"
+            return "fatal"
+        if isinstance(error, anthropic.APIConnectionError):
+            return "retry"
+        return "fatal"
+
+    def run(self, call, estimated_tokens: int = 0):
+        """Execute ``call()`` under the shared budgets; returns its result or raises the last error"""
+        self._count("calls")
+        for attempt in range(self.max_retries + 1):
+            self._wait_for_pause()
+            waited = self.requests.acquire(1)
+            waited += self.tokens.acquire(estimated_tokens)
+            self._count("wait_seconds", waited)
+
+            self.concurrency.acquire()
+            self._count("attempts")
+            try:
+                result = call()
+            except Exception as error:
+                kind = self._classify(error)
+                self.concurrency.release("throttled" if kind == "throttled" else "error")
+                if kind == "fatal" or attempt == self.max_retries:
+                    self._count("failed")
+                    raise
+
+                retry_after = _retry_after_seconds(error)
+                if kind == "throttled":
+                    self._count("throttled")
+                    if retry_after:
+                        self._pause(retry_after)
+                self._count("retries")
+                delay = self._backoff(attempt, retry_after)
+                self._count("wait_seconds", delay)
+                time.sleep(delay)
+                continue
+
+            self.concurrency.release("success")
+            usage = getattr(result, "usage", None)
+            if usage is not None:
+                actual = (usage.input_tokens or 0) + (usage.output_tokens or 0)
+                self.tokens.adjust(actual - estimated_tokens)
+                self._count("tokens_used", actual)
+            return result
+
+
+class ScheduledTransport:
+    """Routes another transport's calls through a RateLimitScheduler"""
+
+    def __init__(self, inner, scheduler: RateLimitScheduler):
+        self.inner = inner
+        self.scheduler = scheduler
+
+    def create_message(self, **request):
+        estimate = estimate_request_tokens(request, self.scheduler.expected_output_tokens)
+        return self.scheduler.run(lambda: self.inner.create_message(**request), estimate)
+
+    def stream_message(self, on_text, on_reset=None, on_json=None, **request):
+        """Streamed call under the scheduler; ``on_reset()`` fires before a retry that follows partial output"""
+        estimate = estimate_request_tokens(request, self.scheduler.expected_output_tokens)
+        emitted = [False]
+
+        def forward(chunk):
+            emitted[0] = True
+            on_text(chunk)
+
+        def forward_json(partial):
+            emitted[0] = True
+            on_json(partial)
+
+        def attempt():
+            if emitted[0] and on_reset:
+                on_reset()
+            emitted[0] = False
+            return self.inner.stream_message(forward, on_json=forward_json if on_json else None, **request)
+
+        return self.scheduler.run(attempt, estimate)
+
+
+_shared_schedulers = {}
+_shared_lock = threading.Lock()
+
+
+def get_shared_scheduler(api_key: str) -> RateLimitScheduler:
+    """One scheduler per API key, since rate limits apply to the key's organization"""
+    with _shared_lock:
+        scheduler = _shared_schedulers.get(api_key)
+        if scheduler is None:
+            scheduler = RateLimitScheduler(
+                requests_per_minute=Config.AI_REQUESTS_PER_MINUTE,
+                tokens_per_minute=Config.AI_TOKENS_PER_MINUTE,
+                max_concurrency=Config.AI_MAX_CONCURRENCY,
+                max_retries=Config.AI_MAX_RETRIES,
+                base_delay=Config.AI_RETRY_BASE_DELAY,
+                max_delay=Config.AI_RETRY_MAX_DELAY,
+            )
+            _shared_schedulers[api_key] = scheduler
+        return scheduler
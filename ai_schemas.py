@@ -0,0 +1,186 @@
+"""
+Tool-use schemas for structured Claude output.
+
+Each analysis is requested as a forced tool call, so the answer arrives as a
+JSON object matching the tool's ``input_schema``. ``coerce`` validates that
+object in one pass, dropping anything off-schema and filling defaults, so the
+results can be aggregated across a whole inventory without text heuristics.
+"""
+
+WORKLOAD_TYPES = ["OLTP", "OLAP", "Mixed"]
+COMPLEXITY_LEVELS = ["Low", "Medium", "High"]
+BOTTLENECK_CATEGORIES = ["cpu", "memory", "storage_capacity", "storage_iops", "network", "connections", "locking", "none"]
+RISK_CATEGORIES = ["compatibility", "data_volume", "downtime", "performance", "licensing", "security", "skills", "cost"]
+TREND_DIRECTIONS = ["decreasing", "stable", "gradual_increase", "rapid_increase"]
+CONFIDENCE_LEVELS = ["Low", "Medium", "High"]
+
+_SHORT_LIST = {"type": "array", "items": {"type": "string"}, "maxItems": 5}
+
+WORKLOAD_PROPERTIES = {
+    "workload_type": {"type": "string", "enum": WORKLOAD_TYPES, "default": "Mixed"},
+    "complexity": {"type": "string", "enum": COMPLEXITY_LEVELS, "default": "Medium"},
+    "timeline_weeks": {"type": "integer", "minimum": 1, "description": "Estimated end-to-end migration duration in weeks"},
+    "bottlenecks": _SHORT_LIST,
+    "bottleneck_categories": {"type": "array", "items": {"type": "string", "enum": BOTTLENECK_CATEGORIES}},
+    "recommendations": _SHORT_LIST,
+    "risks": _SHORT_LIST,
+    "risk_categories": {"type": "array", "items": {"type": "string", "enum": RISK_CATEGORIES}},
+    "summary": {"type": "string", "description": "Two or three sentence summary"},
+}
+WORKLOAD_REQUIRED = ["workload_type", "complexity", "timeline_weeks", "bottlenecks", "recommendations", "risks", "summary"]
+
+WORKLOAD_ANALYSIS_TOOL = {
+    "name": "record_workload_analysis",
+    "description": "Record the workload analysis for one database",
+    "input_schema": {"type": "object", "properties": WORKLOAD_PROPERTIES, "required": WORKLOAD_REQUIRED},
+}
+
+WORKLOAD_BATCH_TOOL = {
+    "name": "record_workload_analyses",
+    "description": "Record one workload analysis per database, identified by db_name exactly as given",
+    "input_schema": {
+        "type": "object",
+        "properties": {
+            "analyses": {
+                "type": "array",
+                "items": {
+                    "type": "object",
+                    "properties": {"db_name": {"type": "string"}, **WORKLOAD_PROPERTIES},
+                    "required": ["db_name"] + WORKLOAD_REQUIRED,
+                },
+            }
+        },
+        "required": ["analyses"],
+    },
+}
+
+MIGRATION_STRATEGY_TOOL = {
+    "name": "record_migration_strategy",
+    "description": "Record the migration strategy",
+    "input_schema": {
+        "type": "object",
+        "properties": {
+            "phases": {
+                "type": "array",
+                "items": {
+                    "type": "object",
+                    "properties": {
+                        "name": {"type": "string"},
+                        "weeks": {"type": "integer", "minimum": 1},
+                        "activities": _SHORT_LIST,
+                    },
+                    "required": ["name", "weeks"],
+                },
+            },
+            "resources": _SHORT_LIST,
+            "risks": _SHORT_LIST,
+            "tools": _SHORT_LIST,
+            "checklist": {"type": "array", "items": {"type": "string"}, "maxItems": 10},
+            "rollback_plan": {"type": "string"},
+            "summary": {"type": "string"},
+        },
+        "required": ["phases", "resources", "risks", "tools", "checklist", "summary"],
+    },
+}
+
+_TREND = {
+    "type": "object",
+    "properties": {
+        "direction": {"type": "string", "enum": TREND_DIRECTIONS, "default": "stable"},
+        "growth_pct": {"type": "number", "description": "Total change over the prediction period, in percent"},
+        "note": {"type": "string"},
+    },
+    "required": ["direction", "growth_pct"],
+}
+
+PREDICTIONS_TOOL = {
+    "name": "record_capacity_predictions",
+    "description": "Record capacity and cost predictions for the prediction period",
+    "input_schema": {
+        "type": "object",
+        "properties": {
+            "cpu": _TREND,
+            "memory": _TREND,
+            "storage": _TREND,
+            "iops": _TREND,
+            "cost": _TREND,
+            "confidence": {"type": "string", "enum": CONFIDENCE_LEVELS, "default": "Medium"},
+            "key_factors": _SHORT_LIST,
+            "recommendations": _SHORT_LIST,
+        },
+        "required": ["cpu", "memory", "storage", "iops", "cost", "confidence", "key_factors", "recommendations"],
+    },
+}
+
+
+def tool_choice(tool: dict) -> dict:
+    return {"type": "tool", "name": tool["name"]}
+
+
+def tool_input(message, tool: dict) -> dict:
+    """The input of the forced tool call in ``message``; ValueError when it is missing"""
+    for block in message.content:
+        if block.type == "tool_use" and block.name == tool["name"]:
+            if isinstance(block.input, dict):
+                return block.input
+    raise ValueError(f"Response did not call {tool['name']}")
+
+
+_DEFAULTS = {"string": "", "integer": 0, "number": 0.0, "array": [], "object": {}}
+
+
+def coerce(value, schema: dict):
+    """Validate ``value`` against a (subset of) JSON schema, repairing what can be repaired
+
+    Enum strings match case-insensitively, then by containment, then fall back
+    to the schema ``default`` (or the first member); numbers are converted and
+    clamped to ``minimum``; arrays drop invalid items and respect ``maxItems``;
+    objects keep only declared properties.
+    """
+    kind = schema.get("type")
+
+    if kind == "object":
+        value = value if isinstance(value, dict) else {}
+        properties = schema.get("properties", {})
+        return {
+            name: coerce(value[name], sub) if name in value else coerce(None, sub)
+            for name, sub in properties.items()
+        }
+
+    if kind == "array":
+        items = schema.get("items", {})
+        result = []
+        for item in value if isinstance(value, list) else []:
+            if items.get("type") == "string" and not isinstance(item, str):
+                continue
+            if "enum" in items and item not in items["enum"]:
+                continue
+            result.append(coerce(item, items))
+        return result[:schema["maxItems"]] if "maxItems" in schema else result
+
+    if kind == "string":
+        if "enum" in schema:
+            return _closest_enum(str(value or ""), schema["enum"], schema.get("default", schema["enum"][0]))
+        return "" if value is None else str(value)
+
+    if kind in ("integer", "number"):
+        try:
+            number = int(float(value)) if kind == "integer" else float(value)
+        except (TypeError, ValueError):
+            number = _DEFAULTS[kind]
+        if "minimum" in schema:
+            number = max(schema["minimum"], number)
+        return number
+
+    return value
+
+
+def _closest_enum(text: str, options: list, fallback: str) -> str:
+    lowered = text.lower()
+    for option in options:
+        if option.lower() == lowered:
+            return option
+    for option in options:
+        if lowered and option.lower() in lowered:
+            return option
+    return fallback
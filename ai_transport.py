@@ -0,0 +1,176 @@
+"""
+Pluggable transports for Claude requests made by AIAnalytics.
+
+- AnthropicTransport: the real API, or any compatible endpoint via ``base_url``
+  (e.g. the local stand-in in mock_claude.py)
+- RecordingTransport: wraps another transport and appends every exchange to a
+  JSONL cassette
+- ReplayTransport: serves responses from a cassette without any network access
+"""
+import hashlib
+import json
+import os
+import threading
+import time
+
+import anthropic
+from anthropic.types import Message
+
+from ai_scheduler import ScheduledTransport, get_shared_scheduler
+from config import Config
+
+
+class ReplayMissError(KeyError):
+    """Raised when a replayed request has no recorded response"""
+
+
+def request_key(request: dict) -> str:
+    """Stable hash of a request payload used to match recordings"""
+    canonical = json.dumps(request, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+class AnthropicTransport:
+    """Sends requests to the Anthropic API or a compatible endpoint"""
+
+    def __init__(self, api_key: str, base_url: str = None, max_retries: int = None, timeout: float = None):
+        kwargs = {"api_key": api_key}
+        if base_url:
+            kwargs["base_url"] = base_url
+        if max_retries is not None:
+            kwargs["max_retries"] = max_retries
+        if timeout is not None:
+            kwargs["timeout"] = timeout
+        self.client = anthropic.Anthropic(**kwargs)
+
+    def create_message(self, **request):
+        return self.client.messages.create(**request)
+
+    def stream_message(self, on_text, on_reset=None, on_json=None, **request):
+        """Stream a response, calling ``on_text(chunk)`` per text delta; returns the final Message
+
+        ``on_json(partial_input)`` receives the tool input parsed so far on each tool-use delta.
+        """
+        with self.client.messages.stream(**request) as stream:
+            for event in stream:
+                if event.type == "text":
+                    on_text(event.text)
+                elif event.type == "input_json" and on_json:
+                    on_json(event.snapshot)
+            return stream.get_final_message()
+
+
+class RecordingTransport:
+    """Forwards to an inner transport and records each exchange to a cassette"""
+
+    def __init__(self, inner, path: str):
+        self.inner = inner
+        self.path = path
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+
+    def create_message(self, **request):
+        start = time.perf_counter()
+        message = self.inner.create_message(**request)
+        self._record(request, message, start)
+        return message
+
+    def stream_message(self, on_text, on_reset=None, on_json=None, **request):
+        # Streamed exchanges are stored like regular ones, so either mode can replay them
+        start = time.perf_counter()
+        message = self.inner.stream_message(on_text, on_reset=on_reset, on_json=on_json, **request)
+        self._record(request, message, start)
+        return message
+
+    def _record(self, request, message, start):
+        entry = {
+            "key": request_key(request),
+            "request": request,
+            "response": message.model_dump(mode="json"),
+            "latency_ms": round((time.perf_counter() - start) * 1000, 1),
+        }
+        with self._lock, open(self.path, "a") as f:
+            f.write(json.dumps(entry, default=str) + "\n")
+
+
+class ReplayTransport:
+    """Serves recorded responses from a cassette
+
+    ``match="exact"`` only answers requests that were recorded verbatim;
+    ``match="sequential"`` cycles through the recordings regardless of the
+    request, which is what throughput benchmarks over synthetic workloads want.
+    ``latency_scale`` replays recorded latency (0 = instant, 1 = as recorded).
+    """
+
+    def __init__(self, path: str, match: str = "exact", latency_scale: float = 0.0):
+        self.path = path
+        self.match = match
+        self.latency_scale = latency_scale
+        self._entries = []
+        self._by_key = {}
+        self._cursor = 0
+        self._lock = threading.Lock()
+
+        with open(path) as f:
+            for line in f:
+                if line.strip():
+                    entry = json.loads(line)
+                    self._entries.append(entry)
+                    self._by_key.setdefault(entry["key"], entry)
+
+        if not self._entries:
+            raise ValueError(f"Cassette {path} contains no recordings")
+
+    def _lookup(self, request: dict) -> dict:
+        if self.match == "sequential":
+            with self._lock:
+                entry = self._entries[self._cursor % len(self._entries)]
+                self._cursor += 1
+            return entry
+
+        entry = self._by_key.get(request_key(request))
+        if entry is None:
+            raise ReplayMissError(f"No recorded response for request in {self.path}")
+        return entry
+
+    def create_message(self, **request):
+        entry = self._lookup(request)
+        if self.latency_scale:
+            time.sleep(entry.get("latency_ms", 0) / 1000 * self.latency_scale)
+        return Message.model_validate(entry["response"])
+
+    def stream_message(self, on_text, on_reset=None, on_json=None, chunk_chars=40, **request):
+        """Replay a recorded response as a stream of text chunks, then its tool inputs"""
+        entry = self._lookup(request)
+        message = Message.model_validate(entry["response"])
+        text = "".join(block.text for block in message.content if block.type == "text")
+
+        chunks = [text[i:i + chunk_chars] for i in range(0, len(text), chunk_chars)] or [""]
+        delay = entry.get("latency_ms", 0) / 1000 * self.latency_scale / len(chunks)
+        for chunk in chunks:
+            if delay:
+                time.sleep(delay)
+            on_text(chunk)
+        if on_json:
+            for block in message.content:
+                if block.type == "tool_use":
+                    on_json(block.input)
+        return message
+
+
+def build_transport(api_key: str):
+    """Build the transport selected by Config.AI_TRANSPORT_MODE"""
+    mode = Config.AI_TRANSPORT_MODE
+    if mode == "replay":
+        return ReplayTransport(Config.AI_CASSETTE_PATH, match=Config.AI_REPLAY_MATCH)
+
+    if Config.AI_SCHEDULER_ENABLED:
+        # The scheduler owns retries, so the SDK must not retry on its own
+        live = ScheduledTransport(AnthropicTransport(api_key, base_url=Config.AI_BASE_URL, max_retries=0),
+                                  get_shared_scheduler(api_key))
+    else:
+        live = AnthropicTransport(api_key, base_url=Config.AI_BASE_URL)
+
+    if mode == "record":
+        return RecordingTransport(live, Config.AI_CASSETTE_PATH)
+    return live
@@ -0,0 +1,169 @@
+"""
+Aurora Serverless v2 capacity (ACU) cost model.
+
+Serverless used to be priced as one flat ``db.serverless`` hour. Here the
+capacity follows a load profile instead:
+
+- the target at each step is the ACUs needed for the CPU demand
+  (VCPU_PER_ACU) or the working memory (GIB_PER_ACU), whichever is larger,
+  in ACU_INCREMENT steps between the minimum and maximum capacity
+- scaling up trails the target by SCALE_UP_LAG_MINUTES
+- scaling down is gradual: capacity halves every SCALE_DOWN_HALF_LIFE_MINUTES
+  until it reaches the target
+
+Hourly profiles cannot express a one-minute lag or a ten-minute half-life,
+so ``simulate_acu`` holds each step's target over sub-steps no longer than
+the lag. The scale-down recurrence c_t = max(target_t, c_{t-1} * r) is a
+running maximum in log space, so it handles whole (workloads x steps) arrays
+without a loop over time, in chunks of workloads. ``compare_serverless`` prices an
+EnhancedRDSCalculator inventory both ways in one pass;
+FixedRDSDatabaseSizingCalculator bills serverless recommendations from the
+same simulation.
+"""
+import numpy as np
+import pandas as pd
+
+from burst_credits import demand_from_profile, profile_shapes
+from vectorized_sizing import _columns_from_records, size_batch
+
+# Aurora Standard, us-east-1, per ACU-hour
+ACU_PRICE_PER_HOUR = 0.12
+GIB_PER_ACU = 2
+# About 2 vCPUs per 8 ACUs (16 GiB), like the memory-optimized instances
+VCPU_PER_ACU = 0.25
+MIN_ACU = 0.5
+MAX_ACU = 128
+ACU_INCREMENT = 0.5
+SCALE_UP_LAG_MINUTES = 1
+SCALE_DOWN_HALF_LIFE_MINUTES = 10
+HOURS_PER_MONTH = 24 * 30
+SERVERLESS_ENGINES = ("aurora-postgresql", "aurora-mysql")
+# Workloads x simulated steps per chunk
+CHUNK_CELLS = 2_000_000
+
+
+def acu_target(cpu_vcpus, ram_gb, min_acu: float = MIN_ACU, max_acu: float = MAX_ACU) -> np.ndarray:
+    """ACUs needed for the CPU and memory demand, in ACU_INCREMENT steps within [min_acu, max_acu]"""
+    needed = np.maximum(np.asarray(cpu_vcpus, dtype=float) / VCPU_PER_ACU, np.asarray(ram_gb, dtype=float) / GIB_PER_ACU)
+    return np.clip(np.ceil(needed / ACU_INCREMENT) * ACU_INCREMENT, min_acu, max_acu)
+
+
+def _capacity(series, steps: int, step_minutes: float, periodic: bool, lag: int, log_decay: float) -> np.ndarray:
+    """Capacity for the last ``steps`` of ACU target ``series`` (workloads, steps or 2 x steps)"""
+    # Capacity available at t follows the target from the lag earlier
+    lagged = np.roll(series, lag, axis=1)
+    if lag and not periodic:
+        lagged[:, :lag] = series[:, :1]
+
+    # c_t = max(u_t, c_{t-1} * r)  =>  log c_t = t log r + max_{s<=t}(log u_s - s log r)
+    t = np.arange(series.shape[1]) * log_decay
+    capacity = np.exp(t + np.maximum.accumulate(np.log(lagged) - t, axis=1))
+    return np.ceil(capacity[:, -steps:] / ACU_INCREMENT - 1e-9) * ACU_INCREMENT
+
+
+def simulate_acu(target, step_minutes: float = 60, periodic: bool = True,
+                 scale_up_lag_minutes: float = SCALE_UP_LAG_MINUTES,
+                 scale_down_half_life_minutes: float = SCALE_DOWN_HALF_LIFE_MINUTES) -> dict:
+    """Serverless capacity for ACU targets of shape (steps,) or (workloads, steps)
+
+    Steps longer than the scale-up lag (or, without lag, the half-life) are
+    split into sub-steps that hold the step's target, so hourly profiles still
+    pay for the lag and the gradual scale-down. ``periodic`` treats the series
+    as one repeating cycle (such as a 24-hour profile) and reports its steady
+    state. Returns ``capacity`` (workloads, simulated sub-steps) plus
+    per-workload ``acu_hours_month``, ``avg_acu``, ``peak_acu``, ``min_acu``
+    and ``shortfall_minutes`` (time spent below the target while scaling up).
+    """
+    target = np.atleast_2d(np.asarray(target, dtype=float))
+    resolution = scale_up_lag_minutes or scale_down_half_life_minutes
+    substeps = max(1, int(np.ceil(step_minutes / resolution - 1e-9)))
+    target = np.repeat(target, substeps, axis=1)
+    step_minutes = step_minutes / substeps
+    steps = target.shape[1]
+
+    lag = int(round(scale_up_lag_minutes / step_minutes))
+    log_decay = np.log(0.5) * step_minutes / scale_down_half_life_minutes
+    capacity = np.empty_like(target)
+    chunk = max(1, CHUNK_CELLS // (2 * steps))
+    for start in range(0, len(target), chunk):
+        rows = target[start:start + chunk]
+        series = np.tile(rows, 2) if periodic else rows
+        capacity[start:start + chunk] = _capacity(series, steps, step_minutes, periodic, lag, log_decay)
+
+    window_hours = steps * step_minutes / 60
+    return {
+        "capacity": capacity,
+        "acu_hours_month": capacity.sum(axis=1) * step_minutes / 60 * HOURS_PER_MONTH / window_hours,
+        "avg_acu": capacity.mean(axis=1),
+        "peak_acu": capacity.max(axis=1),
+        "min_acu": capacity.min(axis=1),
+        "shortfall_minutes": (capacity < target).sum(axis=1) * step_minutes,
+    }
+
+
+def serverless_capacity(cores: float, peak_cpu_percent: float, ram_gb: float, peak_ram_percent: float,
+                        cpu_multiplier: float = 1.0, ram_multiplier: float = 1.0, cpu_profile=None) -> dict:
+    """simulate_acu summary (plain floats) for one workload's daily CPU curve and flat memory demand"""
+    cpu = demand_from_profile(cores, peak_cpu_percent, cpu_multiplier, cpu_profile)
+    ram = ram_gb * (peak_ram_percent / 100) * ram_multiplier
+    simulated = simulate_acu(acu_target(cpu, ram))
+    return {key: float(values[0]) for key, values in simulated.items() if key != "capacity"}
+
+
+def serverless_price(calculator, region: str, engine: str) -> float:
+    """Hourly ACU price: the db.serverless row for the engine, else Aurora's in that region"""
+    region_data = calculator.instance_db.get(region, calculator.instance_db["us-east-1"])
+    for name in (engine, *SERVERLESS_ENGINES):
+        for instance in region_data.get(name, []):
+            if instance["type"] == "db.serverless":
+                return instance["pricing"]["ondemand"]
+    return ACU_PRICE_PER_HOUR
+
+
+def compare_serverless(calculator, inputs_list: list, recommendations: list = None, env: str = "PROD",
+                       profiles: dict = None) -> pd.DataFrame:
+    """Provisioned vs Aurora Serverless v2 compute cost for every workload of an inventory
+
+    ``recommendations`` are the workloads' ``env`` recommendations (sized
+    here when omitted). CPU demand follows ``profiles`` (db_name -> hourly
+    CPU percent, e.g. UtilizationProfiler.diurnal_profile rows) or the default
+    daily curve scaled to the entered peak; memory demand is flat. PROD is
+    doubled for its standby, as in the provisioned instance cost.
+    """
+    columns = ["db_name", "engine", "instance_type", "provisioned_monthly", "serverless_monthly",
+               "savings", "avg_acu", "peak_acu", "min_acu", "shortfall_minutes", "aurora_engine", "recommended"]
+    if not inputs_list:
+        return pd.DataFrame(columns=columns)
+    if recommendations is None:
+        recommendations = [recs[env] for recs in size_batch(calculator, inputs_list, [env])]
+    data = _columns_from_records(inputs_list)
+    names = [inputs.get("db_name", f"Database {i+1}") for i, inputs in enumerate(inputs_list)]
+    factor = calculator.env_profiles[env]["cpu_factor"]
+
+    # Hourly shape of the CPU peak: a measured profile where given, else the default curve
+    shape = profile_shapes(names, profiles)
+    cpu = (data["cores"] * data["cpu_util"] / 100 * factor)[:, None] * shape
+    ram = (data["ram"] * data["ram_util"] / 100 * factor)[:, None]
+    simulated = simulate_acu(acu_target(cpu, ram))
+
+    prices = {key: serverless_price(calculator, *key) for key in set(zip(data["region"], data["engine"]))}
+    price = np.array([prices[key] for key in zip(data["region"], data["engine"])])
+    standby = 2 if env == "PROD" else 1
+    serverless = simulated["acu_hours_month"] * price * standby
+    provisioned = np.array([rec["cost_breakdown"]["instance"] for rec in recommendations])
+
+    frame = pd.DataFrame({
+        "db_name": names,
+        "engine": data["engine"],
+        "instance_type": [rec["instance_type"] for rec in recommendations],
+        "provisioned_monthly": provisioned,
+        "serverless_monthly": serverless,
+        "savings": provisioned - serverless,
+        "avg_acu": simulated["avg_acu"],
+        "peak_acu": simulated["peak_acu"],
+        "min_acu": simulated["min_acu"],
+        "shortfall_minutes": simulated["shortfall_minutes"],
+        "aurora_engine": np.isin(data["engine"], SERVERLESS_ENGINES),
+    }, columns=columns)
+    frame["recommended"] = np.where(frame["savings"] > 0, "Serverless", "Provisioned")
+    return frame
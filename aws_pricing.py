@@ -2,15 +2,29 @@ import boto3
 import json
 import time
 from botocore.exceptions import ClientError
+from config import Config
 
 class AWSPricing:
     REGIONS = ["us-east-1", "us-west-1", "us-west-2", "eu-west-1", "ap-southeast-1"]
     CACHE_DURATION = 86400  # 24 hours
     
-    def __init__(self):
+    # Pricing API attribute values for each supported engine
+    ENGINE_NAMES = {
+        'oracle-ee': 'Oracle',
+        'oracle-se': 'Oracle',
+        'postgres': 'PostgreSQL',
+        'aurora-postgresql': 'Aurora PostgreSQL',
+        'aurora-mysql': 'Aurora MySQL',
+        'sqlserver': 'SQL Server'
+    }
+    
+    def __init__(self, client=None):
         self.cache = {}
         self.last_updated = {}
-        self.client = boto3.client('pricing', region_name='us-east-1')
+        self.client = client or boto3.client(
+            'pricing', region_name='us-east-1',
+            endpoint_url=Config.AWS_PRICING_ENDPOINT_URL
+        )
     
     def get_rds_pricing(self, region, engine):
         cache_key = f"{region}_{engine}"
@@ -22,13 +36,17 @@ class AWSPricing:
         try:
             filters = [
                 {'Type': 'TERM_MATCH', 'Field': 'regionCode', 'Value': region},
-                {'Type': 'TERM_MATCH', 'Field': 'databaseEngine', 'Value': engine.split('-')[0].capitalize()},
+                {'Type': 'TERM_MATCH', 'Field': 'databaseEngine', 'Value': self.ENGINE_NAMES.get(engine, 'PostgreSQL')},
                 {'Type': 'TERM_MATCH', 'Field': 'deploymentOption', 'Value': 'Single-AZ'},
-                {'Type': 'TERM_MATCH', 'Field': 'licenseModel', 'Value': 'License included'},
             ]
             
+            # Only commercial engines carry a license-included price
+            if engine.startswith(('oracle', 'sqlserver')):
+                filters.append({'Type': 'TERM_MATCH', 'Field': 'licenseModel', 'Value': 'License included'})
+            
             if engine.startswith('oracle'):
-                filters.append({'Type': 'TERM_MATCH', 'Field': 'databaseEdition', 'Value': engine.split('-')[1].upper()})
+                edition = 'Enterprise' if engine.endswith('ee') else 'Standard'
+                filters.append({'Type': 'TERM_MATCH', 'Field': 'databaseEdition', 'Value': edition})
             
             prices = {}
             next_token = None
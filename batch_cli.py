@@ -0,0 +1,191 @@
+"""
+Headless batch runner: size (and optionally AI-analyze) a database inventory without Streamlit.
+
+    python batch_cli.py inventory.csv --output out/ --format parquet --format xlsx --report pdf
+    python batch_cli.py inventory.parquet --ai --predictions --workers 16 --api-key $ANTHROPIC_API_KEY
+    python batch_cli.py inventory.csv --metrics cloudwatch_export.parquet --percentile 99
+
+Runs the same pipeline as the bulk upload tab (bulk_analysis.run_bulk_analysis),
+checkpointed in the bulk job store by default so an interrupted nightly run
+resumes where it stopped. With --metrics, measured utilization percentiles
+replace the inventory's cpu_util/ram_util/iops (see utilization.py). Writes a tidy results table (one row per database and
+environment) plus the Excel/PDF reports and a JSON run summary.
+"""
+import argparse
+import json
+import logging
+import os
+import sys
+import time
+
+from bulk_analysis import AnalysisCancelled, run_bulk_analysis
+from bulk_jobs import JobInProgress, JobStore, open_job, run_job
+from bulk_reports import (REPORTLAB_AVAILABLE, RESULT_TABLE_FORMATS, PDFReportGenerator, export_full_report,
+                          export_results_table)
+from config import Config
+from enhanced_calculator import EnhancedRDSCalculator
+from inventory import PARQUET_AVAILABLE, parse_uploaded_file
+from utilization import apply_utilization, profile_metrics
+
+logger = logging.getLogger("batch_cli")
+
+RESULT_FORMATS = list(RESULT_TABLE_FORMATS)
+REPORT_FORMATS = ["excel", "pdf"]
+
+
+def load_inventory(path: str):
+    """(valid_inputs, errors) for a CSV/Excel/Parquet/Arrow inventory file"""
+    with open(path, "rb") as source:
+        return parse_uploaded_file(source)
+
+
+def write_results(all_results: list, output_dir: str, stem: str, formats: list) -> list:
+    written = []
+    for fmt in formats:
+        path = os.path.join(output_dir, f"{stem}_results.{RESULT_TABLE_FORMATS[fmt][1]}")
+        with open(path, "wb") as target:
+            target.write(export_results_table(all_results, fmt))
+        written.append(path)
+    return written
+
+
+def write_reports(all_results: list, output_dir: str, stem: str, reports: list) -> list:
+    written = []
+    if "excel" in reports:
+        path = os.path.join(output_dir, f"{stem}_report.xlsx")
+        with open(path, "wb") as target:
+            target.write(export_full_report(all_results))
+        written.append(path)
+    if "pdf" in reports:
+        if not REPORTLAB_AVAILABLE:
+            logger.warning("Skipping PDF report: reportlab is not installed")
+        else:
+            path = os.path.join(output_dir, f"{stem}_report.pdf")
+            with open(path, "wb") as target:
+                target.write(PDFReportGenerator().generate_report(all_results))
+            written.append(path)
+    return written
+
+
+def run_batch(args) -> dict:
+    valid_inputs, errors = load_inventory(args.inventory)
+    for error in errors:
+        logger.warning(error)
+    if not valid_inputs:
+        raise SystemExit(f"No valid database configurations in {args.inventory}")
+    logger.info("Loaded %d databases (%d rows rejected)", len(valid_inputs), len(errors))
+    matched = None
+    if args.metrics:
+        profiler = profile_metrics(args.metrics)
+        summary_frame = profiler.summary(sorted({50, 95, 99, args.percentile}))
+        valid_inputs, matched = apply_utilization(valid_inputs, summary_frame, args.percentile)
+        logger.info("Profiled %d samples for %d databases; P%d utilization applied to %d of them",
+                    profiler.rows, len(profiler.databases), args.percentile, len(matched))
+
+    options = {
+        "enable_ai_analysis": args.ai,
+        "enable_predictions": args.predictions,
+        "enable_migration_strategy": args.migration,
+    }
+    ai_analytics = None
+    if any(options.values()):
+        api_key = args.api_key or os.getenv("ANTHROPIC_API_KEY") or os.getenv("CLAUDE_API_KEY")
+        if not api_key:
+            raise SystemExit("AI analysis requested but no API key given (--api-key or ANTHROPIC_API_KEY)")
+        from ai_analytics import AIAnalytics
+        ai_analytics = AIAnalytics(api_key)
+
+    calculator = EnhancedRDSCalculator()
+    sized = [0]
+
+    def on_sized(index, result):
+        sized[0] += 1
+        if sized[0] % 500 == 0:
+            logger.info("Sized %d databases", sized[0])
+
+    def on_ai_progress(done, total, index):
+        if done == total or done % 25 == 0:
+            logger.info("AI analysis %d/%d", done, total)
+
+    callbacks = dict(on_stage=logger.info, on_sized=on_sized, on_ai_progress=on_ai_progress,
+                     max_workers=args.workers)
+    start = time.perf_counter()
+    if args.checkpoint:
+        store = JobStore(args.job_db)
+        store.mark_interrupted()
+        job_id, resumed = open_job(store, valid_inputs, options, os.path.basename(args.inventory))
+        if resumed:
+            logger.info("Resuming checkpoint %s (%d/%d databases complete)",
+                        job_id, store.get_job(job_id)["completed"], len(valid_inputs))
+        all_results, reuse = run_job(store, job_id, calculator, ai_analytics, **callbacks)
+    else:
+        job_id = None
+        all_results, reuse = run_bulk_analysis(valid_inputs, calculator, ai_analytics, *options.values(), **callbacks)
+    elapsed = time.perf_counter() - start
+
+    os.makedirs(args.output, exist_ok=True)
+    stem = os.path.splitext(os.path.basename(args.inventory))[0]
+    formats = args.format or ["parquet" if PARQUET_AVAILABLE else "csv"]
+    written = write_results(all_results, args.output, stem, formats)
+    written += write_reports(all_results, args.output, stem, args.report or [])
+
+    prod_costs = [result["recommendations"]["PROD"]["monthly_cost"] for result in all_results]
+    summary = {
+        "inventory": args.inventory,
+        "job_id": job_id,
+        "databases": len(all_results),
+        "rejected_rows": len(errors),
+        "utilization_profiled": None if matched is None else len(matched),
+        "seconds": round(elapsed, 3),
+        "prod_monthly_cost": round(sum(prod_costs), 2),
+        "ai_reuse": reuse,
+        "ai_usage": ai_analytics.usage.snapshot() if ai_analytics else None,
+        "outputs": written,
+    }
+    summary_path = os.path.join(args.output, f"{stem}_summary.json")
+    with open(summary_path, "w") as target:
+        json.dump(summary, target, indent=2, default=str)
+    summary["outputs"].append(summary_path)
+    return summary
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Batch RDS sizing for a database inventory")
+    parser.add_argument("inventory", help="CSV, Excel, Parquet or Arrow IPC inventory file")
+    parser.add_argument("--output", default="batch_output", help="Directory for results and reports")
+    parser.add_argument("--format", action="append", choices=RESULT_FORMATS,
+                        help="Results table format; repeat for several (default parquet, csv without pyarrow)")
+    parser.add_argument("--metrics", help="Utilization time series (CSV/Parquet/Arrow) to size from measured peaks")
+    parser.add_argument("--percentile", type=int, default=Config.UTILIZATION_PERCENTILE,
+                        help="Utilization percentile used with --metrics")
+    parser.add_argument("--report", action="append", choices=REPORT_FORMATS, help="Also write this report; repeatable")
+    parser.add_argument("--ai", action="store_true", help="Run AI workload analysis")
+    parser.add_argument("--predictions", action="store_true", help="Run AI capacity predictions")
+    parser.add_argument("--migration", action="store_true", help="Run AI migration strategy")
+    parser.add_argument("--api-key", help="Claude API key (default ANTHROPIC_API_KEY)")
+    parser.add_argument("--workers", type=int, default=Config.AI_MAX_CONCURRENCY, help="Concurrent Claude requests")
+    parser.add_argument("--job-db", default=Config.BULK_JOB_DB_PATH, help="Checkpoint store")
+    parser.add_argument("--no-checkpoint", dest="checkpoint", action="store_false",
+                        help="Do not checkpoint or resume this run")
+    parser.add_argument("--quiet", action="store_true")
+    args = parser.parse_args(argv)
+    if {"parquet", "arrow"} & set(args.format or []) and not PARQUET_AVAILABLE:
+        parser.error("Parquet/Arrow output needs pyarrow: pip install pyarrow")
+
+    logging.basicConfig(level=logging.WARNING if args.quiet else logging.INFO,
+                        format="%(asctime)s %(levelname)s %(message)s")
+    logging.getLogger("httpx").setLevel(logging.WARNING)  # one INFO line per Claude request
+    try:
+        summary = run_batch(args)
+    except (AnalysisCancelled, KeyboardInterrupt):
+        logger.error("Interrupted; re-run the same command to resume from the checkpoint")
+        return 130
+    except JobInProgress as e:
+        logger.error("%s; wait for it to finish or use --no-checkpoint", e)
+        return 1
+    print(json.dumps(summary, indent=2, default=str))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,155 @@
+"""
+Bulk analysis pipeline shared by the Streamlit bulk upload and background jobs.
+
+Sizes every database first (local and fast), then runs AI analysis for one
+representative per workload bucket - batched workload analysis plus
+concurrent per-database calls paced by the shared rate-limit scheduler - and
+fans each representative's insights out to its bucket. Callbacks fire from the
+calling thread, so they may touch Streamlit widgets or a database connection.
+"""
+import copy
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from config import Config
+from enhanced_calculator import EnhancedRDSCalculator
+from vectorized_sizing import size_batch
+from workload_fingerprint import group_workloads, reuse_report
+
+# Databases sized per vectorized call; also how often should_stop is checked while sizing
+SIZING_CHUNK = 500
+
+
+class AnalysisCancelled(Exception):
+    """Raised when ``should_stop`` asks the pipeline to stop early"""
+
+
+def db_label(inputs: dict, index: int) -> str:
+    return inputs.get('db_name', f'Database {index+1}')
+
+
+def size_database(calculator, inputs: dict) -> dict:
+    """Recommendations for every environment profile"""
+    return {env: calculator.calculate_requirements(inputs, env) for env in calculator.env_profiles}
+
+
+def size_databases(calculator, inputs_list: list) -> list:
+    """size_database for many databases; EnhancedRDSCalculator sizes them in one vectorized pass"""
+    if isinstance(calculator, EnhancedRDSCalculator):
+        return size_batch(calculator, inputs_list)
+    return [size_database(calculator, inputs) for inputs in inputs_list]
+
+
+def run_bulk_analysis(valid_inputs, calculator, ai_analytics=None, enable_ai_analysis=False,
+                      enable_predictions=False, enable_migration_strategy=False, previous=None, ai_done=None,
+                      on_stage=None, on_sized=None, on_ai_progress=None, on_ai_result=None, should_stop=None,
+                      max_workers=None):
+    """Analyze ``valid_inputs``; returns (all_results, reuse report or None)
+
+    ``previous`` maps index -> an earlier result to keep instead of re-sizing and
+    ``ai_done`` holds the indices whose AI insights in ``previous`` are final, so
+    an interrupted run can be resumed. ``max_workers`` caps concurrent Claude
+    calls (default AI_MAX_CONCURRENCY). Callbacks:
+
+    - on_stage(message)
+    - on_sized(index, result)
+    - on_ai_progress(done, total, index)  # representative finished
+    - on_ai_result(index, result)         # final AI insights for any database
+    - should_stop() -> bool
+    """
+    previous = previous or {}
+    max_workers = max_workers or Config.AI_MAX_CONCURRENCY
+    ai_done = set(ai_done or ())
+    notify = lambda callback, *args: callback(*args) if callback else None
+
+    def check_stop():
+        if should_stop and should_stop():
+            raise AnalysisCancelled()
+
+    # Resource sizing is local and fast, so do it for every database first
+    notify(on_stage, "📊 Calculating resource requirements...")
+    all_results = [previous.get(index) for index in range(len(valid_inputs))]
+    pending = [index for index in range(len(valid_inputs)) if index not in previous]
+    for start in range(0, len(pending), SIZING_CHUNK):
+        check_stop()
+        chunk = pending[start:start + SIZING_CHUNK]
+        recommendations = size_databases(calculator, [valid_inputs[index] for index in chunk])
+        for index, recs in zip(chunk, recommendations):
+            result = {'inputs': valid_inputs[index], 'recommendations': recs, 'ai_insights': {}}
+            all_results[index] = result
+            notify(on_sized, index, result)
+
+    use_ai = ai_analytics and (enable_ai_analysis or enable_predictions or enable_migration_strategy)
+    if not use_ai:
+        return all_results, None
+
+    # Near-identical workloads share one analysis: only one member per bucket is sent
+    if Config.AI_REUSE_ENABLED:
+        groups = group_workloads([result['inputs'] for result in all_results], Config.AI_REUSE_GRANULARITY)
+    else:
+        groups = [[index] for index in range(len(all_results))]
+
+    # Buckets with a finished member reuse it; the rest send their first member
+    sources = [next((index for index in group if index in ai_done), group[0]) for group in groups]
+    representatives = [source for source in sources if source not in ai_done]
+    total_targets = len(representatives)
+
+    # Workload analysis packs many databases into each request when batching is enabled
+    batch_workloads = enable_ai_analysis and Config.AI_BATCH_ANALYSIS and total_targets > 1
+    if batch_workloads:
+        check_stop()
+        notify(on_stage, "🤖 Running batched AI workload analysis...")
+        workload_analyses = ai_analytics.analyze_workload_batch(
+            [all_results[index]['inputs'] for index in representatives],
+            max_workers=max_workers,
+            progress_callback=lambda done: notify(on_ai_progress, done, total_targets, None)
+        )
+        for index, workload_analysis in zip(representatives, workload_analyses):
+            all_results[index]['ai_insights']['workload'] = workload_analysis
+
+    notify(on_stage, "🤖 Running AI analysis (rate-limited)...")
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        futures = {
+            pool.submit(
+                ai_analytics.analyze_database, all_results[index]['inputs'], all_results[index]['recommendations']['PROD'],
+                enable_ai_analysis and not batch_workloads, enable_predictions, enable_migration_strategy
+            ): index
+            for index in representatives
+        }
+
+        recorded = set()
+
+        def record(future):
+            index = futures[future]
+            try:
+                ai_insights = future.result()
+            except Exception as e:
+                ai_insights = {"workload": {"error": str(e)}}
+            all_results[index]['ai_insights'].update(ai_insights)
+            recorded.add(future)
+            notify(on_ai_result, index, all_results[index])
+            return index
+
+        try:
+            for done, future in enumerate(as_completed(futures), start=1):
+                index = record(future)
+                notify(on_ai_progress, done, total_targets, index)
+                check_stop()
+        except AnalysisCancelled:
+            # Drop queued calls but keep the answers already in flight
+            pending = [future for future in futures if not future.cancel() and future not in recorded]
+            for future in as_completed(pending):
+                record(future)
+            raise
+
+    # Fan each source's insights out to the rest of its bucket
+    for group, source_index in zip(groups, sources):
+        source = all_results[source_index]
+        for index in group:
+            if index == source_index or index in ai_done:
+                continue
+            all_results[index]['ai_insights'] = copy.deepcopy(source['ai_insights'])
+            all_results[index]['ai_reused_from'] = db_label(source['inputs'], source_index)
+            notify(on_ai_result, index, all_results[index])
+
+    analyses_per_workload = sum([bool(enable_ai_analysis), bool(enable_predictions), bool(enable_migration_strategy)])
+    return all_results, reuse_report(groups, [result['inputs'] for result in all_results], analyses_per_workload)
@@ -0,0 +1,435 @@
+"""
+Background bulk analysis jobs backed by SQLite.
+
+Jobs run on a process-wide worker pool instead of the Streamlit script thread,
+so browser refreshes and widget interaction no longer abort long AI runs. Each
+database's result is written to the job table as soon as it is ready; a job
+interrupted by a crash or restart keeps its finished databases and resumes
+with the rest. The UI only reads job state and polls until the job is done.
+
+Jobs are keyed by a fingerprint of the parsed inventory and the analysis
+options, so re-running the same upload - in the background or synchronously -
+picks up the unfinished job instead of paying for the same Claude calls again.
+
+Several processes (Streamlit sessions, workers, batch_cli) may share one job
+database. Active jobs record their owner (host and PID) and a heartbeat the
+owner refreshes while it works, and only jobs whose heartbeat went stale or
+whose owner is gone are treated as interrupted. Within one process (e.g. all
+Streamlit sessions) a registry of running job ids keeps a job from being run
+twice at once.
+"""
+import hashlib
+import json
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from bulk_analysis import AnalysisCancelled, db_label, run_bulk_analysis
+from config import Config
+
+ACTIVE_STATUSES = ("queued", "running")
+RESUMABLE_STATUSES = ("interrupted", "failed", "cancelled")
+AI_OPTIONS = ("enable_ai_analysis", "enable_predictions", "enable_migration_strategy")
+# Item statuses: sized (AI pending), ai_failed (sized, AI to retry on resume), done
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS bulk_jobs (
+    id TEXT PRIMARY KEY,
+    name TEXT,
+    fingerprint TEXT,
+    status TEXT NOT NULL,
+    stage TEXT,
+    options TEXT NOT NULL,
+    total INTEGER NOT NULL,
+    error TEXT,
+    reuse_report TEXT,
+    owner TEXT,
+    heartbeat REAL,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS bulk_job_items (
+    job_id TEXT NOT NULL REFERENCES bulk_jobs(id) ON DELETE CASCADE,
+    idx INTEGER NOT NULL,
+    db_name TEXT,
+    inputs TEXT NOT NULL,
+    status TEXT NOT NULL,
+    result TEXT,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (job_id, idx)
+);
+"""
+
+
+class JobInProgress(RuntimeError):
+    """The job for an inventory is running in this or another live process"""
+
+
+def current_owner() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+# Jobs queued or running in this process
+_running_jobs = set()
+_running_lock = threading.Lock()
+
+
+def _claim_in_process(job_id: str):
+    with _running_lock:
+        if job_id in _running_jobs:
+            raise JobInProgress(f"Job {job_id} for this inventory is already running in this process")
+        _running_jobs.add(job_id)
+
+
+def _release_in_process(job_id: str):
+    with _running_lock:
+        _running_jobs.discard(job_id)
+
+
+def running_in_process(job_id: str) -> bool:
+    with _running_lock:
+        return job_id in _running_jobs
+
+
+def _owner_alive(owner: str) -> bool:
+    """False only when ``owner`` ran on this host and its process is gone; other hosts are judged by heartbeat"""
+    host, _, pid = (owner or "").rpartition(":")
+    if host != socket.gethostname() or not pid.isdigit():
+        return True
+    try:
+        os.kill(int(pid), 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+def inventory_fingerprint(valid_inputs: list, options: dict) -> str:
+    """Stable key for an inventory plus the options it is analyzed with"""
+    payload = json.dumps({"inputs": valid_inputs, "options": options}, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class JobStore:
+    """Job and per-database result persistence; safe to share between threads"""
+
+    def __init__(self, path: str):
+        self.path = path
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(SCHEMA)
+            # Stores created before checkpoint fingerprints and job owners were added
+            columns = {row["name"] for row in conn.execute("PRAGMA table_info(bulk_jobs)")}
+            for column, kind in (("fingerprint", "TEXT"), ("owner", "TEXT"), ("heartbeat", "REAL")):
+                if column not in columns:
+                    conn.execute(f"ALTER TABLE bulk_jobs ADD COLUMN {column} {kind}")
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA foreign_keys=ON")
+        return conn
+
+    def create_job(self, valid_inputs: list, options: dict, name: str = None) -> str:
+        job_id = uuid.uuid4().hex[:12]
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT INTO bulk_jobs (id, name, fingerprint, status, options, total, created_at, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (job_id, name or f"Bulk analysis {job_id}", inventory_fingerprint(valid_inputs, options), "queued",
+                 json.dumps(options), len(valid_inputs), now, now)
+            )
+            conn.executemany(
+                "INSERT INTO bulk_job_items (job_id, idx, db_name, inputs, status, updated_at) VALUES (?, ?, ?, ?, 'pending', ?)",
+                [(job_id, index, db_label(inputs, index), json.dumps(inputs, default=str), now)
+                 for index, inputs in enumerate(valid_inputs)]
+            )
+        return job_id
+
+    def update_job(self, job_id: str, **fields):
+        fields["updated_at"] = time.time()
+        assignments = ", ".join(f"{name} = ?" for name in fields)
+        with self._connect() as conn:
+            conn.execute(f"UPDATE bulk_jobs SET {assignments} WHERE id = ?", (*fields.values(), job_id))
+
+    def save_item(self, job_id: str, index: int, result: dict, status: str):
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE bulk_job_items SET status = ?, result = ?, updated_at = ? WHERE job_id = ? AND idx = ?",
+                (status, json.dumps(result, default=str), time.time(), job_id, index)
+            )
+
+    def _job_row(self, conn, row) -> dict:
+        job = dict(row)
+        job["options"] = json.loads(job["options"])
+        job["reuse_report"] = json.loads(job["reuse_report"]) if job["reuse_report"] else None
+        counts = dict(conn.execute(
+            "SELECT status, COUNT(*) FROM bulk_job_items WHERE job_id = ? GROUP BY status", (job["id"],)
+        ).fetchall())
+        job["completed"] = counts.get("done", 0)
+        job["ai_failed"] = counts.get("ai_failed", 0)
+        job["sized"] = counts.get("sized", 0) + job["ai_failed"] + job["completed"]
+        return job
+
+    def get_job(self, job_id: str) -> dict:
+        with self._connect() as conn:
+            row = conn.execute("SELECT * FROM bulk_jobs WHERE id = ?", (job_id,)).fetchone()
+            return self._job_row(conn, row) if row else None
+
+    def list_jobs(self, limit: int = 10) -> list:
+        with self._connect() as conn:
+            rows = conn.execute("SELECT * FROM bulk_jobs ORDER BY created_at DESC LIMIT ?", (limit,)).fetchall()
+            return [self._job_row(conn, row) for row in rows]
+
+    def find_unfinished(self, fingerprint: str) -> dict:
+        """Most recent job for ``fingerprint`` that did not complete, if any"""
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT * FROM bulk_jobs WHERE fingerprint = ? AND status != 'completed' ORDER BY created_at DESC LIMIT 1",
+                (fingerprint,)
+            ).fetchone()
+            return self._job_row(conn, row) if row else None
+
+    def load_items(self, job_id: str):
+        """(valid_inputs, previous results by index, indices whose AI insights are final)"""
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT idx, inputs, status, result FROM bulk_job_items WHERE job_id = ? ORDER BY idx", (job_id,)
+            ).fetchall()
+        valid_inputs = [json.loads(row["inputs"]) for row in rows]
+        previous = {row["idx"]: json.loads(row["result"]) for row in rows if row["result"]}
+        ai_done = {row["idx"] for row in rows if row["status"] == "done"}
+        return valid_inputs, previous, ai_done
+
+    def load_results(self, job_id: str) -> list:
+        """Results persisted so far, in input order"""
+        _, previous, _ = self.load_items(job_id)
+        return [previous[index] for index in sorted(previous)]
+
+    def claim(self, job_id: str, status: str):
+        """Set ``status`` with this process as the owner and a fresh heartbeat"""
+        self.update_job(job_id, status=status, error=None, owner=current_owner(), heartbeat=time.time())
+
+    def heartbeat(self, job_id: str):
+        with self._connect() as conn:
+            conn.execute("UPDATE bulk_jobs SET heartbeat = ? WHERE id = ? AND owner = ?",
+                         (time.time(), job_id, current_owner()))
+
+    def is_live(self, job: dict) -> bool:
+        """Whether an active job's owner is still working on it (fresh heartbeat, process alive)"""
+        fresh = job.get("heartbeat") and time.time() - job["heartbeat"] <= Config.BULK_JOB_STALE_SECONDS
+        return job["status"] in ACTIVE_STATUSES and bool(fresh) and _owner_alive(job.get("owner"))
+
+    def mark_interrupted(self):
+        """Flag active jobs whose owner stopped heartbeating or exited so they can be resumed"""
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT id, status, owner, heartbeat FROM bulk_jobs WHERE status IN (?, ?)", ACTIVE_STATUSES
+            ).fetchall()
+            stale = [(time.time(), row["id"]) for row in rows if not self.is_live(dict(row))]
+            conn.executemany("UPDATE bulk_jobs SET status = 'interrupted', updated_at = ? WHERE id = ?", stale)
+
+    def delete_job(self, job_id: str):
+        with self._connect() as conn:
+            conn.execute("DELETE FROM bulk_jobs WHERE id = ?", (job_id,))
+
+
+class JobHeartbeat:
+    """Refreshes a job's heartbeat from a daemon thread until stopped"""
+
+    def __init__(self, store: JobStore, job_id: str, interval: float = None):
+        self.store = store
+        self.job_id = job_id
+        self.interval = interval or Config.BULK_JOB_HEARTBEAT_SECONDS
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._beat, name=f"bulk-job-heartbeat-{job_id}", daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+
+    def _beat(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.store.heartbeat(self.job_id)
+            except sqlite3.Error:
+                pass  # the next beat retries; a long gap only lets another process resume the job
+
+
+def ai_failed(result: dict) -> bool:
+    """Whether any of a result's AI insights is an error (e.g. a failed Claude call)"""
+    return any(isinstance(insight, dict) and "error" in insight for insight in result.get('ai_insights', {}).values())
+
+
+def open_job(store: JobStore, valid_inputs: list, options: dict, name: str = None):
+    """(job_id, resumed): the unfinished checkpoint for this inventory and options, or a new job
+
+    Raises JobInProgress when this or another live process is running that checkpoint.
+    """
+    job = store.find_unfinished(inventory_fingerprint(valid_inputs, options))
+    if job:
+        if running_in_process(job["id"]):
+            raise JobInProgress(f"Job {job['id']} for this inventory is already running in this process")
+        if job["owner"] != current_owner() and store.is_live(job):
+            raise JobInProgress(f"Job {job['id']} for this inventory is running in {job['owner']}")
+        return job["id"], True
+    return store.create_job(valid_inputs, options, name), False
+
+
+def run_job(store: JobStore, job_id: str, calculator, ai_analytics=None, on_stage=None, on_sized=None,
+            on_ai_progress=None, on_ai_result=None, should_stop=None, max_workers=None, claimed=False):
+    """Run or resume ``job_id``, checkpointing every database; returns run_bulk_analysis's result
+
+    The job's status is updated on success, cancellation and failure; the
+    exception is re-raised for the caller to report. Raises JobInProgress if
+    the job is already running in this process, unless the caller ``claimed``
+    it (BulkJobRunner.submit).
+    """
+    notify = lambda callback, *args: callback(*args) if callback else None
+    heartbeat = None
+    if not claimed:
+        _claim_in_process(job_id)
+    try:
+        options = store.get_job(job_id)["options"]
+        wants_ai = any(options.get(key) for key in AI_OPTIONS)
+        if wants_ai and ai_analytics is None:
+            raise RuntimeError("A Claude API key is required to run this job's AI analysis")
+
+        valid_inputs, previous, ai_done = store.load_items(job_id)
+        store.claim(job_id, "running")
+        heartbeat = JobHeartbeat(store, job_id).start()
+
+        def checkpoint_sized(index, result):
+            store.save_item(job_id, index, result, "sized" if wants_ai else "done")
+            notify(on_sized, index, result)
+
+        def checkpoint_ai_result(index, result):
+            # Failed analyses stay out of ai_done, so resuming the job retries them
+            store.save_item(job_id, index, result, "ai_failed" if ai_failed(result) else "done")
+            notify(on_ai_result, index, result)
+
+        def stage(message):
+            store.update_job(job_id, stage=message)
+            notify(on_stage, message)
+
+        all_results, reuse = run_bulk_analysis(
+            valid_inputs, calculator, ai_analytics,
+            *(options.get(key, False) for key in AI_OPTIONS),
+            previous=previous,
+            ai_done=ai_done,
+            on_stage=stage,
+            on_sized=checkpoint_sized,
+            on_ai_progress=on_ai_progress,
+            on_ai_result=checkpoint_ai_result,
+            should_stop=should_stop,
+            max_workers=max_workers
+        )
+        reuse_report = json.dumps(reuse) if reuse else None
+        failures = store.get_job(job_id)["ai_failed"]
+        if failures:
+            store.update_job(job_id, status="failed", stage="AI analysis incomplete", reuse_report=reuse_report,
+                             error=f"AI analysis failed for {failures} database(s); resume to retry them")
+        else:
+            store.update_job(job_id, status="completed", stage="🎉 All databases analyzed", reuse_report=reuse_report)
+        return all_results, reuse
+    except AnalysisCancelled:
+        store.update_job(job_id, status="cancelled", stage="Cancelled")
+        raise
+    except Exception as e:
+        store.update_job(job_id, status="failed", error=str(e))
+        raise
+    finally:
+        if heartbeat:
+            heartbeat.stop()
+        _release_in_process(job_id)
+
+
+class BulkJobRunner:
+    """Runs bulk analysis jobs on background threads"""
+
+    def __init__(self, store: JobStore, max_workers: int = 2):
+        self.store = store
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="bulk-job")
+        self._cancel_events = {}
+        self._lock = threading.Lock()
+
+    def start(self, valid_inputs: list, options: dict, calculator, ai_analytics=None, name: str = None):
+        """Queue ``valid_inputs``, resuming an unfinished job for the same inventory; returns (job_id, resumed)
+
+        Raises JobInProgress when that job is already queued or running.
+        """
+        job_id, resumed = open_job(self.store, valid_inputs, options, name)
+        self.submit(job_id, calculator, ai_analytics)
+        return job_id, resumed
+
+    def submit(self, job_id: str, calculator, ai_analytics=None):
+        """Queue a new or resumable job; finished databases are kept. JobInProgress if it is already running"""
+        _claim_in_process(job_id)
+        with self._lock:
+            self._cancel_events[job_id] = threading.Event()
+        try:
+            self.store.claim(job_id, "queued")
+            heartbeat = JobHeartbeat(self.store, job_id).start()
+            self._executor.submit(self._run, job_id, calculator, ai_analytics, heartbeat)
+        except Exception:
+            with self._lock:
+                self._cancel_events.pop(job_id, None)
+            _release_in_process(job_id)
+            raise
+
+    def cancel(self, job_id: str):
+        with self._lock:
+            event = self._cancel_events.get(job_id)
+        if event:
+            event.set()
+
+    def is_active(self, job_id: str) -> bool:
+        with self._lock:
+            return job_id in self._cancel_events
+
+    def _run(self, job_id: str, calculator, ai_analytics, heartbeat):
+        try:
+            run_job(self.store, job_id, calculator, ai_analytics, should_stop=self._cancel_events[job_id].is_set,
+                    claimed=True)
+        except Exception:
+            pass  # recorded on the job row by run_job
+        finally:
+            heartbeat.stop()
+            with self._lock:
+                self._cancel_events.pop(job_id, None)
+
+
+_store = None
+_runner = None
+_lock = threading.Lock()
+
+
+def get_job_store() -> JobStore:
+    """Process-wide store; jobs left active by a process that is gone are marked interrupted"""
+    global _store
+    with _lock:
+        if _store is None:
+            _store = JobStore(Config.BULK_JOB_DB_PATH)
+            _store.mark_interrupted()
+        return _store
+
+
+def get_job_runner() -> BulkJobRunner:
+    """Process-wide runner; lives in this module so it survives Streamlit script reruns"""
+    global _runner
+    store = get_job_store()
+    with _lock:
+        if _runner is None:
+            _runner = BulkJobRunner(store, max_workers=Config.BULK_JOB_WORKERS)
+        return _runner
@@ -0,0 +1,311 @@
+"""
+PDF and Excel reports for single and bulk analysis results.
+"""
+import io
+from datetime import datetime
+
+import pandas as pd
+
+from tco import tco_from_results, tco_table
+
+# Import reportlab components for PDF generation with error handling
+try:
+    from reportlab.lib.pagesizes import letter
+    from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
+    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+    from reportlab.lib.units import inch
+    from reportlab.lib import colors
+    REPORTLAB_AVAILABLE = True
+except ImportError:
+    REPORTLAB_AVAILABLE = False
+
+
+class PDFReportGenerator:
+    """Generates PDF reports from analysis results with enhanced error handling."""
+
+    def __init__(self):
+        if not REPORTLAB_AVAILABLE:
+            raise ImportError("ReportLab library not found. Please install with: pip install reportlab")
+        
+        try:
+            # Initialize styles
+            self.styles = getSampleStyleSheet()
+            self.styles.add(ParagraphStyle(name='H1_Custom', fontSize=24, leading=28, alignment=1, spaceAfter=20, fontName='Helvetica-Bold'))
+            self.styles.add(ParagraphStyle(name='H2_Custom', fontSize=18, leading=22, spaceBefore=10, spaceAfter=10, fontName='Helvetica-Bold'))
+            self.styles.add(ParagraphStyle(name='H3_Custom', fontSize=14, leading=18, spaceBefore=8, spaceAfter=8, fontName='Helvetica-Bold'))
+            self.styles.add(ParagraphStyle(name='Normal_Custom', fontSize=10, leading=12, spaceAfter=6))
+            self.styles.add(ParagraphStyle(name='Bullet_Custom', fontSize=10, leading=12, leftIndent=20, spaceAfter=6, bulletText='•'))
+            
+        except Exception as e:
+            raise Exception(f"Failed to initialize PDF generator: {str(e)}") from e
+
+    def generate_report(self, all_results: list | dict):
+        """Generates a PDF report based on the analysis results."""
+        try:
+            buffer = io.BytesIO()
+            doc = SimpleDocTemplate(buffer, pagesize=letter)
+            story = []
+
+            story.append(Paragraph("AI Database Migration Studio Report", self.styles['H1_Custom']))
+            story.append(Paragraph(f"Generated On: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}", self.styles['Normal_Custom']))
+            story.append(Spacer(1, 0.2 * inch))
+
+            if not all_results:
+                story.append(Paragraph("No analysis results available to generate a report.", self.styles['Normal_Custom']))
+                doc.build(story)
+                buffer.seek(0)
+                return buffer.getvalue()
+
+            # Handle both single and bulk analysis results
+            if isinstance(all_results, dict):
+                # Convert single result to a list for consistent processing
+                all_results = [all_results]
+
+            # Executive Summary (aggregated for bulk, or single for individual)
+            story.append(Paragraph("1. Executive Summary", self.styles['H2_Custom']))
+            
+            summary_data = [["Database", "Engine", "Instance Type", "Monthly Cost ($)", "Optimization"]]
+            total_monthly_cost = 0
+            total_databases = len(all_results)
+            
+            for result in all_results:
+                inputs = result.get('inputs', {})
+                prod_rec = result['recommendations']['PROD']
+                db_name = inputs.get('db_name', 'N/A')
+                engine = inputs.get('engine', 'N/A')
+                instance_type = prod_rec['instance_type']
+                monthly_cost = f"{prod_rec['monthly_cost']:,.0f}"
+                optimization = f"{prod_rec.get('optimization_score', 85)}%"
+                
+                summary_data.append([db_name, engine, instance_type, monthly_cost, optimization])
+                total_monthly_cost += prod_rec['monthly_cost']
+
+            table = Table(summary_data, colWidths=[1.5*inch, 1*inch, 1.5*inch, 1.2*inch, 1*inch])
+            table.setStyle(TableStyle([
+                ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#667eea')),
+                ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+                ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+                ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+                ('BACKGROUND', (0, 1), (-1, -1), colors.HexColor('#f8fafc')),
+                ('GRID', (0, 0), (-1, -1), 1, colors.HexColor('#e2e8f0')),
+                ('LEFTPADDING', (0,0), (-1,-1), 6),
+                ('RIGHTPADDING', (0,0), (-1,-1), 6),
+                ('TOPPADDING', (0,0), (-1,-1), 6),
+                ('BOTTOMPADDING', (0,0), (-1,-1), 6),
+            ]))
+            story.append(table)
+            story.append(Spacer(1, 0.2 * inch))
+
+            story.append(Paragraph(f"Total Monthly Cost (Production): ${total_monthly_cost:,.0f}", self.styles['Normal_Custom']))
+            story.append(Paragraph(f"Total Annual Cost (Production): ${total_monthly_cost * 12:,.0f}", self.styles['Normal_Custom']))
+            story.append(Spacer(1, 0.2 * inch))
+
+            # Detailed Analysis for Each Database
+            for i, result in enumerate(all_results):
+                inputs = result.get('inputs', {})
+                recommendations = result.get('recommendations', {})
+                ai_insights = result.get('ai_insights', {})
+                db_name = inputs.get('db_name', f'Database {i+1}')
+
+                story.append(Paragraph(f"2. Detailed Analysis: {db_name}", self.styles['H2_Custom']))
+                story.append(Paragraph("2.1. Current Configuration", self.styles['H3_Custom']))
+                story.append(Paragraph(f"• Engine: {inputs.get('engine', 'N/A').upper()}", self.styles['Bullet_Custom']))
+                story.append(Paragraph(f"• Region: {inputs.get('region', 'N/A')}", self.styles['Bullet_Custom']))
+                story.append(Paragraph(f"• CPU: {inputs.get('cores', 'N/A')} cores ({inputs.get('cpu_util', 'N/A')}% util)", self.styles['Bullet_Custom']))
+                story.append(Paragraph(f"• RAM: {inputs.get('ram', 'N/A')} GB ({inputs.get('ram_util', 'N/A')}% util)", self.styles['Bullet_Custom']))
+                story.append(Paragraph(f"• Storage: {inputs.get('storage', 'N/A'):,} GB ({inputs.get('iops', 'N/A'):,} IOPS)", self.styles['Bullet_Custom']))
+                story.append(Spacer(1, 0.1 * inch))
+
+                story.append(Paragraph("2.2. Recommended Configurations", self.styles['H3_Custom']))
+                rec_table_data = [["Environment", "Instance Type", "vCPUs", "RAM (GB)", "Monthly Cost ($)"]]
+                for env, rec in recommendations.items():
+                    rec_table_data.append([
+                        env, 
+                        rec['instance_type'], 
+                        rec['vcpus'], 
+                        rec['ram_gb'], 
+                        f"{rec['monthly_cost']:,.0f}"
+                    ])
+                
+                rec_table = Table(rec_table_data, colWidths=[1.2*inch, 1.5*inch, 0.8*inch, 0.8*inch, 1.2*inch])
+                rec_table.setStyle(TableStyle([
+                    ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#764ba2')),
+                    ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+                    ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+                    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+                    ('BOTTOMPADDING', (0, 0), (-1, 0), 6),
+                    ('BACKGROUND', (0, 1), (-1, -1), colors.HexColor('#f8fafc')),
+                    ('GRID', (0, 0), (-1, -1), 1, colors.HexColor('#e2e8f0')),
+                    ('LEFTPADDING', (0,0), (-1,-1), 6),
+                    ('RIGHTPADDING', (0,0), (-1,-1), 6),
+                    ('TOPPADDING', (0,0), (-1,-1), 6),
+                    ('BOTTOMPADDING', (0,0), (-1,-1), 6),
+                ]))
+                story.append(rec_table)
+                story.append(Spacer(1, 0.2 * inch))
+
+                if 'workload' in ai_insights and 'error' not in ai_insights['workload']:
+                    workload = ai_insights['workload']
+                    story.append(Paragraph("2.3. AI Workload Insights", self.styles['H3_Custom']))
+                    story.append(Paragraph(f"• Workload Type: {workload.get('workload_type', 'N/A')}", self.styles['Bullet_Custom']))
+                    story.append(Paragraph(f"• Migration Complexity: {workload.get('complexity', 'N/A')}", self.styles['Bullet_Custom']))
+                    story.append(Paragraph(f"• Estimated Timeline: {workload.get('timeline', 'N/A')}", self.styles['Bullet_Custom']))
+                    
+                    if workload.get('recommendations'):
+                        story.append(Paragraph("Key Recommendations:", self.styles['Normal_Custom']))
+                        for rec in workload['recommendations']:
+                            story.append(Paragraph(f"• {rec}", self.styles['Bullet_Custom']))
+                    if workload.get('risks'):
+                        story.append(Paragraph("Identified Risks:", self.styles['Normal_Custom']))
+                        for risk in workload['risks']:
+                            story.append(Paragraph(f"• {risk}", self.styles['Bullet_Custom']))
+                    story.append(Spacer(1, 0.2 * inch))
+
+                if 'migration' in ai_insights and 'error' not in ai_insights['migration']:
+                    migration = ai_insights['migration']
+                    story.append(Paragraph("2.4. Migration Strategy Overview", self.styles['H3_Custom']))
+                    story.append(Paragraph(f"• Estimated Timeline: {migration.get('timeline', 'N/A')}", self.styles['Bullet_Custom']))
+                    if migration.get('phases'):
+                        story.append(Paragraph("Migration Phases:", self.styles['Normal_Custom']))
+                        for phase in migration['phases']:
+                            story.append(Paragraph(f"• {phase}", self.styles['Bullet_Custom']))
+                    if migration.get('tools'):
+                        story.append(Paragraph("Recommended Tools:", self.styles['Normal_Custom']))
+                        for tool in migration['tools']:
+                            story.append(Paragraph(f"• {tool}", self.styles['Bullet_Custom']))
+                    story.append(Spacer(1, 0.2 * inch))
+
+            doc.build(story)
+            buffer.seek(0)
+            return buffer.getvalue()
+            
+        except Exception as e:
+            raise Exception(f"PDF generation failed: {str(e)}") from e
+
+
+# Larger inventories get one combined details sheet instead of one sheet per database
+MAX_DETAIL_SHEETS = 50
+
+
+def export_full_report(all_results):
+    """Export comprehensive Excel report"""
+    try:
+        output = io.BytesIO()
+        
+        with pd.ExcelWriter(output, engine='openpyxl') as writer:
+            # Summary sheet
+            summary_data = []
+            for result in all_results:
+                prod_rec = result['recommendations']['PROD']
+                summary_data.append({
+                    "Database": result['inputs'].get('db_name', 'N/A'),
+                    "Engine": result['inputs'].get('engine', 'N/A'),
+                    "Instance Type": prod_rec['instance_type'],
+                    "vCPUs": prod_rec['vcpus'],
+                    "RAM (GB)": prod_rec['ram_gb'],
+                    "Storage (GB)": prod_rec['storage_gb'],
+                    "Monthly Cost": prod_rec['monthly_cost'],
+                    "Annual Cost": prod_rec['annual_cost'],
+                    "Optimization": f"{prod_rec.get('optimization_score', 85)}%"
+                })
+            
+            summary_df = pd.DataFrame(summary_data)
+            summary_df.to_excel(writer, sheet_name='Executive Summary', index=False)
+            
+            # Detailed breakdown
+            all_details = []
+            for i, result in enumerate(all_results):
+                db_name = result['inputs'].get('db_name', f'Database_{i+1}')
+                sheet_name = db_name[:31]  # Excel sheet name limit
+                
+                detail_data = []
+                for env, rec in result['recommendations'].items():
+                    detail_data.append({
+                        'Environment': env,
+                        'Instance Type': rec['instance_type'],
+                        'vCPUs': rec['vcpus'],
+                        'RAM (GB)': rec['ram_gb'],
+                        'Storage (GB)': rec['storage_gb'],
+                        'Monthly Cost': rec['monthly_cost'],
+                        'Annual Cost': rec['annual_cost']
+                    })
+                
+                if len(all_results) > MAX_DETAIL_SHEETS:
+                    all_details.extend({'Database': db_name, **row} for row in detail_data)
+                    continue
+                detail_df = pd.DataFrame(detail_data)
+                detail_df.to_excel(writer, sheet_name=sheet_name, index=False)
+            
+            # Workbook save time grows quadratically with the sheet count
+            if all_details:
+                pd.DataFrame(all_details).to_excel(writer, sheet_name='Environment Details', index=False)
+            
+            # Portfolio TCO per environment, cumulative and per year
+            if all_results:
+                projection = tco_from_results(all_results, years=3)
+                tco_frames = [tco_table(projection, env).assign(Environment=env) for env in projection['environments']]
+                pd.concat(tco_frames).to_excel(writer, sheet_name='TCO Projection', index=False)
+        
+        output.seek(0)
+        return output.getvalue()
+        
+    except Exception as e:
+        raise Exception(f"Report generation failed: {str(e)}")
+
+
+def results_frame(all_results):
+    """One row per database and environment, for Parquet/CSV/Excel export"""
+    rows = []
+    for i, result in enumerate(all_results):
+        inputs = result['inputs']
+        workload = result.get('ai_insights', {}).get('workload', {})
+        for env, rec in result['recommendations'].items():
+            rows.append({
+                'db_name': inputs.get('db_name', f'Database {i+1}'),
+                'engine': inputs.get('engine'),
+                'region': inputs.get('region'),
+                'source_cores': inputs.get('cores'),
+                'source_ram_gb': inputs.get('ram'),
+                'source_storage_gb': inputs.get('storage'),
+                'environment': env,
+                'instance_type': rec['instance_type'],
+                'vcpus': rec['vcpus'],
+                'ram_gb': rec['ram_gb'],
+                'storage_gb': rec['storage_gb'],
+                'monthly_cost': rec['monthly_cost'],
+                'annual_cost': rec['annual_cost'],
+                'optimization_score': rec.get('optimization_score'),
+                'workload_type': workload.get('workload_type'),
+                'complexity': workload.get('complexity'),
+                'timeline_weeks': workload.get('timeline_weeks'),
+                'ai_error': next((insight['error'] for insight in result.get('ai_insights', {}).values()
+                                  if isinstance(insight, dict) and 'error' in insight), None),
+                'ai_reused_from': result.get('ai_reused_from'),
+            })
+    return pd.DataFrame(rows)
+
+
+RESULT_TABLE_FORMATS = {
+    'parquet': ('application/vnd.apache.parquet', 'parquet'),
+    'arrow': ('application/vnd.apache.arrow.file', 'arrow'),
+    'csv': ('text/csv', 'csv'),
+    'xlsx': ('application/vnd.openxmlformats-officedocument.spreadsheetml.sheet', 'xlsx'),
+}
+
+
+def export_results_table(all_results, fmt: str) -> bytes:
+    """results_frame as file bytes; parquet and arrow keep column types and need pyarrow"""
+    frame = results_frame(all_results)
+    buffer = io.BytesIO()
+    if fmt == 'parquet':
+        frame.to_parquet(buffer, index=False)
+    elif fmt == 'arrow':
+        frame.to_feather(buffer)
+    elif fmt == 'csv':
+        frame.to_csv(buffer, index=False)
+    elif fmt == 'xlsx':
+        frame.to_excel(buffer, index=False, sheet_name='Results')
+    else:
+        raise ValueError(f"Unsupported results format: {fmt}")
+    return buffer.getvalue()
@@ -0,0 +1,186 @@
+"""
+CPU credit simulation for burstable (db.t3 / db.t4g) instances.
+
+A burstable instance earns credits at its baseline (vCPUs x baseline share x
+60 per hour, capped at 24 hours of earnings) and spends one credit per vCPU
+at 100% for a minute. ``simulate_credits`` runs the balance for every
+(workload, instance) pair at once from a CPU demand series in vCPUs. With
+only the upper cap the balance has a closed form (cumulative sum minus the
+running maximum of the excess over the cap), so whole series are simulated
+without a Python loop over time steps:
+
+- a balance that goes negative means the instance runs on surplus credits:
+  Unlimited mode bills them, Standard mode throttles to baseline instead
+- the steady-state surplus (spend above earnings over the window) is the
+  monthly Unlimited surcharge at SURPLUS_CREDIT_PRICE per vCPU-hour
+
+``screen_burstable`` turns that into a verdict per candidate:
+FixedRDSDatabaseSizingCalculator drops burstable instances that would
+throttle (Standard mode) or whose surcharge makes them cost more than a
+fixed-performance instance of the same size (Unlimited mode, the RDS
+default), and bills the surcharge of the ones it keeps.
+"""
+import numpy as np
+import pandas as pd
+
+from config import Config
+
+BURSTABLE_FAMILIES = ("t3", "t4g")
+# Baseline CPU share per vCPU by size (same for t3 and t4g)
+BASELINE_PER_VCPU = {"micro": 0.10, "small": 0.20, "medium": 0.20, "large": 0.30, "xlarge": 0.40, "2xlarge": 0.40}
+# Unlimited mode surplus credits, USD per vCPU-hour
+SURPLUS_CREDIT_PRICE = 0.075
+HOURS_PER_MONTH = 24 * 30
+
+# Hourly CPU demand as a share of the peak, for workloads without measured utilization:
+# a business-day curve peaking mid-afternoon
+DEFAULT_DIURNAL_PROFILE = np.array([
+    0.30, 0.28, 0.27, 0.27, 0.28, 0.32, 0.40, 0.55, 0.72, 0.85, 0.92, 0.95,
+    0.93, 0.96, 1.00, 0.97, 0.90, 0.78, 0.62, 0.50, 0.44, 0.40, 0.36, 0.32,
+])
+
+
+CREDIT_COLUMNS = ["workload", "instance_type", "baseline_percent", "credits_per_hour", "max_balance",
+                  "avg_cpu_percent", "peak_cpu_percent", "min_balance", "end_balance", "deficit_minutes",
+                  "surplus_vcpu_hours_month", "surcharge_monthly", "throttles"]
+
+
+def _family_size(instance: dict) -> tuple:
+    parts = instance["type"].split('.')
+    family = instance.get("instance_family", parts[1] if len(parts) > 2 else "unknown")
+    return family, parts[-1]
+
+
+def is_burstable(instance: dict) -> bool:
+    family, size = _family_size(instance)
+    return family in BURSTABLE_FAMILIES and size in BASELINE_PER_VCPU
+
+
+def credit_profile(instance: dict) -> dict:
+    """Baseline share, credits earned per hour and maximum balance of a burstable instance"""
+    _, size = _family_size(instance)
+    baseline = BASELINE_PER_VCPU[size]
+    earned = instance["vCPU"] * baseline * 60
+    return {"baseline_percent": baseline * 100, "credits_per_hour": earned, "max_balance": earned * 24}
+
+
+def profile_shape(profile=None) -> np.ndarray:
+    """Hourly utilization as a share of the peak (maximum 1)
+
+    ``profile`` is a measured series, such as UtilizationProfiler.diurnal_profile
+    rows in percent; missing hours count as idle. DEFAULT_DIURNAL_PROFILE when
+    it is omitted or has no finite value.
+    """
+    if profile is None or not np.isfinite(np.asarray(profile, dtype=float)).any():
+        return DEFAULT_DIURNAL_PROFILE
+    measured = np.nan_to_num(np.asarray(profile, dtype=float))
+    return measured / max(measured.max(), 1e-9)
+
+
+def profile_shapes(names: list, profiles: dict = None) -> np.ndarray:
+    """(len(names), hours) profile_shape of each name's series in ``profiles`` (name -> hourly CPU)"""
+    profiles = profiles or {}
+    shapes = [profile_shape(profiles.get(name)) for name in names]
+    return np.array(shapes) if shapes else np.empty((0, len(DEFAULT_DIURNAL_PROFILE)))
+
+
+def demand_from_profile(cores: float, peak_percent: float, multiplier: float = 1.0, profile=None) -> np.ndarray:
+    """Hourly CPU demand in vCPUs: on-premise cores x peak utilization x environment multiplier, shaped by ``profile``
+
+    ``profile`` is a measured series (see profile_shape), scaled so its maximum
+    is ``peak_percent``; the default daily curve when omitted.
+    """
+    return cores * (peak_percent / 100) * multiplier * profile_shape(profile)
+
+
+def simulate_credits(demand, instances: list, step_minutes: float = 60, periodic: bool = True,
+                     initial_balance: str = "full") -> pd.DataFrame:
+    """Credit balance of every burstable instance under every demand series, as a tidy DataFrame
+
+    ``demand`` is CPU demand in vCPUs, shape (steps,) or (workloads, steps).
+    ``periodic`` treats the series as one repeating cycle (such as a 24-hour
+    profile): it is run twice and the second cycle reported, which is the
+    steady state. ``initial_balance`` is "full" or "empty". One row per
+    (workload, instance) with the balance low point, minutes on surplus
+    credits and the monthly Unlimited surcharge.
+    """
+    demand = np.atleast_2d(np.asarray(demand, dtype=float))
+    instances = [instance for instance in instances if is_burstable(instance)]
+    if not instances or not demand.size:
+        return pd.DataFrame(columns=CREDIT_COLUMNS)
+    return pd.DataFrame(_simulate(demand, instances, step_minutes, periodic, initial_balance), columns=CREDIT_COLUMNS)
+
+
+def _simulate(demand: np.ndarray, instances: list, step_minutes: float, periodic: bool, initial_balance: str) -> dict:
+    """simulate_credits columns as flat arrays, workload-major"""
+    profiles = [credit_profile(instance) for instance in instances]
+    vcpus = np.array([instance["vCPU"] for instance in instances], dtype=float)[None, :, None]
+    earned = np.array([profile["credits_per_hour"] for profile in profiles])[None, :, None] * step_minutes / 60
+    cap = np.array([profile["max_balance"] for profile in profiles])[None, :, None]
+    steps = demand.shape[1]
+    cycle = np.tile(demand, 2) if periodic else demand
+
+    # Credits per step: an instance cannot spend more than all of its vCPUs
+    spent = np.minimum(cycle[:, None, :], vcpus) * step_minutes
+    net = np.cumsum(earned - spent, axis=2)
+    start = cap if initial_balance == "full" else np.zeros_like(cap)
+    # b_t = min(cap, b_{t-1} + x_t)  =>  b_t = S_t + b_0 - max(0, max_{s<=t}(S_s + b_0 - cap))
+    balance = net + start - np.maximum(np.maximum.accumulate(net + start - cap, axis=2), 0)
+    balance = balance[:, :, -steps:]
+    spent = spent[:, :, -steps:]
+
+    window_hours = steps * step_minutes / 60
+    surplus = np.maximum(spent.sum(axis=2) - earned[:, :, 0] * steps, 0) / 60 * HOURS_PER_MONTH / window_hours
+    usage = np.minimum(demand[:, None, :], vcpus) / vcpus * 100
+    min_balance = balance.min(axis=2)
+
+    workloads, count = demand.shape[0], len(instances)
+    flat = lambda array: np.broadcast_to(array, (workloads, count)).reshape(-1)
+    return {
+        "workload": np.repeat(np.arange(workloads), count),
+        "instance_type": np.tile([instance["type"] for instance in instances], workloads),
+        "baseline_percent": flat(np.array([profile["baseline_percent"] for profile in profiles])),
+        "credits_per_hour": flat(earned[0, :, 0] * 60 / step_minutes),
+        "max_balance": flat(cap[0, :, 0]),
+        "avg_cpu_percent": usage.mean(axis=2).reshape(-1),
+        "peak_cpu_percent": usage.max(axis=2).reshape(-1),
+        "min_balance": min_balance.reshape(-1),
+        "end_balance": balance[:, :, -1].reshape(-1),
+        "deficit_minutes": ((balance < 0).sum(axis=2) * step_minutes).reshape(-1),
+        "surplus_vcpu_hours_month": surplus.reshape(-1),
+        "surcharge_monthly": (surplus * SURPLUS_CREDIT_PRICE).reshape(-1),
+        "throttles": ((min_balance < 0) | (surplus > 0)).reshape(-1),
+    }
+
+
+def screen_burstable(instances: list, demand, mode: str = None) -> dict:
+    """Instance type -> credit simulation row plus ``rejected`` for every burstable instance in ``instances``
+
+    ``demand`` is one workload's hourly CPU demand in vCPUs (see
+    demand_from_profile), treated as a repeating cycle.
+    Standard mode rejects instances that would throttle. Unlimited mode
+    rejects those whose hourly price plus surcharge is not below the
+    cheapest fixed-performance instance with at least their vCPUs and memory.
+    """
+    mode = (mode or Config.BURSTABLE_CREDIT_MODE).lower()
+    if mode not in ("standard", "unlimited"):
+        raise ValueError(f"Unknown burstable credit mode {mode!r}; expected 'standard' or 'unlimited'")
+    burstable = [instance for instance in instances if is_burstable(instance)]
+    if not burstable:
+        return {}
+    fixed = [instance for instance in instances if not is_burstable(instance) and instance["vCPU"] > 0]
+    credits = _simulate(np.atleast_2d(np.asarray(demand, dtype=float)), burstable, 60, True, "full")
+
+    screened = {}
+    for k, instance in enumerate(burstable):
+        # Plain Python values so recommendations stay JSON-serializable
+        row = {column: credits[column][k].item() for column in CREDIT_COLUMNS}
+        if mode == "standard":
+            rejected = bool(row["throttles"])
+        else:
+            effective = instance["pricing"]["ondemand"] + row["surcharge_monthly"] / HOURS_PER_MONTH
+            alternatives = [other["pricing"]["ondemand"] for other in fixed
+                            if other["vCPU"] >= instance["vCPU"] and other["memory"] >= instance["memory"]]
+            rejected = bool(alternatives) and effective >= min(alternatives)
+        screened[instance["type"]] = {**row, "mode": mode, "rejected": rejected}
+    return screened
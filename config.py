@@ -13,6 +13,79 @@ class Config:
     AI_MAX_TOKENS = int(os.getenv("AI_MAX_TOKENS", 2500))
     AI_TEMPERATURE = float(os.getenv("AI_TEMPERATURE", 0.1))
 
+    # Claude transport: "live", "record" or "replay" (see ai_transport.py)
+    AI_TRANSPORT_MODE = os.getenv("AI_TRANSPORT_MODE", "live")
+    AI_BASE_URL = os.getenv("AI_BASE_URL") or None  # e.g. mock_claude.py on http://127.0.0.1:8766
+    AI_CASSETTE_PATH = os.getenv("AI_CASSETTE_PATH", "fixtures/claude/cassette.jsonl")
+    AI_REPLAY_MATCH = os.getenv("AI_REPLAY_MATCH", "exact")
+    AI_STREAMING = os.getenv("AI_STREAMING", "true").lower() == "true"
+    AI_STRUCTURED_OUTPUT = os.getenv("AI_STRUCTURED_OUTPUT", "true").lower() == "true"
+    AI_PROMPT_CACHING = os.getenv("AI_PROMPT_CACHING", "true").lower() == "true"
+    AI_INPUT_PRICE_PER_MTOK = float(os.getenv("AI_INPUT_PRICE_PER_MTOK", 3.0))  # USD, for usage reporting
+    AI_OUTPUT_PRICE_PER_MTOK = float(os.getenv("AI_OUTPUT_PRICE_PER_MTOK", 15.0))
+
+    # Shared Claude rate-limit budget (see ai_scheduler.py)
+    AI_SCHEDULER_ENABLED = os.getenv("AI_SCHEDULER_ENABLED", "true").lower() == "true"
+    AI_REQUESTS_PER_MINUTE = int(os.getenv("AI_REQUESTS_PER_MINUTE", 50))
+    AI_TOKENS_PER_MINUTE = int(os.getenv("AI_TOKENS_PER_MINUTE", 80000))
+    AI_MAX_CONCURRENCY = int(os.getenv("AI_MAX_CONCURRENCY", 8))
+    AI_MAX_RETRIES = int(os.getenv("AI_MAX_RETRIES", 8))
+    AI_RETRY_BASE_DELAY = float(os.getenv("AI_RETRY_BASE_DELAY", 1.0))
+    AI_RETRY_MAX_DELAY = float(os.getenv("AI_RETRY_MAX_DELAY", 60.0))
+
+    # Batched workload analysis: several databases per Claude request
+    AI_BATCH_ANALYSIS = os.getenv("AI_BATCH_ANALYSIS", "true").lower() == "true"
+    AI_BATCH_MAX_SIZE = int(os.getenv("AI_BATCH_MAX_SIZE", 20))
+    AI_BATCH_MAX_INPUT_TOKENS = int(os.getenv("AI_BATCH_MAX_INPUT_TOKENS", 20000))
+    AI_BATCH_MAX_OUTPUT_TOKENS = int(os.getenv("AI_BATCH_MAX_OUTPUT_TOKENS", 8000))
+    AI_BATCH_OUTPUT_TOKENS_PER_DB = int(os.getenv("AI_BATCH_OUTPUT_TOKENS_PER_DB", 350))
+
+    # Reuse one AI analysis across near-identical workloads (see workload_fingerprint.py)
+    AI_REUSE_ENABLED = os.getenv("AI_REUSE_ENABLED", "true").lower() == "true"
+    AI_REUSE_GRANULARITY = os.getenv("AI_REUSE_GRANULARITY", "fine")  # exact, fine or coarse
+
+    # Background bulk analysis jobs (see bulk_jobs.py)
+    BULK_BACKGROUND_JOBS = os.getenv("BULK_BACKGROUND_JOBS", "true").lower() == "true"
+    BULK_JOB_DB_PATH = os.getenv("BULK_JOB_DB_PATH", "data/bulk_jobs.sqlite3")
+    BULK_JOB_WORKERS = int(os.getenv("BULK_JOB_WORKERS", 2))
+    BULK_JOB_POLL_SECONDS = float(os.getenv("BULK_JOB_POLL_SECONDS", 2.0))
+    # Active jobs refresh a heartbeat; other processes treat them as interrupted once it is this old
+    BULK_JOB_HEARTBEAT_SECONDS = float(os.getenv("BULK_JOB_HEARTBEAT_SECONDS", 10.0))
+    BULK_JOB_STALE_SECONDS = float(os.getenv("BULK_JOB_STALE_SECONDS", 60.0))
+    BULK_CHECKPOINTS = os.getenv("BULK_CHECKPOINTS", "true").lower() == "true"  # checkpoint synchronous runs too
+
+    # HTTP sizing service (see sizing_service.py)
+    SIZING_SERVICE_MAX_BATCH = int(os.getenv("SIZING_SERVICE_MAX_BATCH", 256))
+    SIZING_SERVICE_MAX_WAIT_MS = float(os.getenv("SIZING_SERVICE_MAX_WAIT_MS", 2.0))
+    SIZING_SERVICE_DETAILED_POOL = int(os.getenv("SIZING_SERVICE_DETAILED_POOL", 4))
+
+    # What-if scenario sweeps (scenario_sweep.py)
+    SWEEP_MAX_SCENARIOS = int(os.getenv("SWEEP_MAX_SCENARIOS", 200000))
+
+    # Monte Carlo cost and capacity risk (cost_risk.py)
+    MONTE_CARLO_TRIALS = int(os.getenv("MONTE_CARLO_TRIALS", 10000))
+
+    # Utilization time-series ingestion (utilization.py)
+    METRICS_CHUNK_ROWS = int(os.getenv("METRICS_CHUNK_ROWS", 1000000))
+    UTILIZATION_PERCENTILE = int(os.getenv("UTILIZATION_PERCENTILE", 95))  # sizes cpu_util/ram_util/iops
+    BURST_THRESHOLD_PERCENT = float(os.getenv("BURST_THRESHOLD_PERCENT", 80))  # CPU samples counted as bursts
+
+    # Burstable (t3/t4g) CPU credits (burst_credits.py): "unlimited" (the RDS default) bills surplus
+    # credits, "standard" throttles to baseline
+    BURSTABLE_CREDIT_MODE = os.getenv("BURSTABLE_CREDIT_MODE", "unlimited")
+
+    # Fleet consolidation (consolidation.py): packing target for shared instances and databases per instance
+    CONSOLIDATION_TARGET_UTILIZATION = float(os.getenv("CONSOLIDATION_TARGET_UTILIZATION", "0.75"))
+    CONSOLIDATION_MAX_DATABASES = int(os.getenv("CONSOLIDATION_MAX_DATABASES", "40"))
+
+    # Fleet optimizer (fleet_optimizer.py): local search rounds after the greedy budget fill
+    FLEET_LOCAL_SEARCH_ROUNDS = int(os.getenv("FLEET_LOCAL_SEARCH_ROUNDS", "200"))
+
+    # Migration transfer planning: shared link to AWS, DMS task limit and cutover window
+    MIGRATION_BANDWIDTH_MBPS = float(os.getenv("MIGRATION_BANDWIDTH_MBPS", "1000"))
+    MIGRATION_MAX_CONCURRENT_TASKS = int(os.getenv("MIGRATION_MAX_CONCURRENT_TASKS", "16"))
+    MIGRATION_CUTOVER_WINDOW_HOURS = float(os.getenv("MIGRATION_CUTOVER_WINDOW_HOURS", "4"))
+
     # Supported Database Engines and AWS Regions
     SUPPORTED_ENGINES = [
         'oracle-ee', 'oracle-se', 'postgres',
@@ -29,6 +102,9 @@ class Config:
     BASE_BACKUP_COST_GB = 0.095
     BASE_TRANSFER_COST_GB = 0.09
 
+    # AWS Pricing API endpoint override (point at fake_pricing.py for offline load tests)
+    AWS_PRICING_ENDPOINT_URL = os.getenv("AWS_PRICING_ENDPOINT_URL") or None
+
     # Environment Resource Multipliers
     ENV_PROFILES = {
         "PROD":    {"cpu_factor": 1.0, "storage_factor": 1.0, "ha_required": True},
@@ -51,6 +127,79 @@ class Config:
     AI_MAX_TOKENS = int(os.getenv("AI_MAX_TOKENS", 2500))
     AI_TEMPERATURE = float(os.getenv("AI_TEMPERATURE", 0.1))
 
+    # Claude transport: "live", "record" or "replay" (see ai_transport.py)
+    AI_TRANSPORT_MODE = os.getenv("AI_TRANSPORT_MODE", "live")
+    AI_BASE_URL = os.getenv("AI_BASE_URL") or None  # e.g. mock_claude.py on http://127.0.0.1:8766
+    AI_CASSETTE_PATH = os.getenv("AI_CASSETTE_PATH", "fixtures/claude/cassette.jsonl")
+    AI_REPLAY_MATCH = os.getenv("AI_REPLAY_MATCH", "exact")
+    AI_STREAMING = os.getenv("AI_STREAMING", "true").lower() == "true"
+    AI_STRUCTURED_OUTPUT = os.getenv("AI_STRUCTURED_OUTPUT", "true").lower() == "true"
+    AI_PROMPT_CACHING = os.getenv("AI_PROMPT_CACHING", "true").lower() == "true"
+    AI_INPUT_PRICE_PER_MTOK = float(os.getenv("AI_INPUT_PRICE_PER_MTOK", 3.0))  # USD, for usage reporting
+    AI_OUTPUT_PRICE_PER_MTOK = float(os.getenv("AI_OUTPUT_PRICE_PER_MTOK", 15.0))
+
+    # Shared Claude rate-limit budget (see ai_scheduler.py)
+    AI_SCHEDULER_ENABLED = os.getenv("AI_SCHEDULER_ENABLED", "true").lower() == "true"
+    AI_REQUESTS_PER_MINUTE = int(os.getenv("AI_REQUESTS_PER_MINUTE", 50))
+    AI_TOKENS_PER_MINUTE = int(os.getenv("AI_TOKENS_PER_MINUTE", 80000))
+    AI_MAX_CONCURRENCY = int(os.getenv("AI_MAX_CONCURRENCY", 8))
+    AI_MAX_RETRIES = int(os.getenv("AI_MAX_RETRIES", 8))
+    AI_RETRY_BASE_DELAY = float(os.getenv("AI_RETRY_BASE_DELAY", 1.0))
+    AI_RETRY_MAX_DELAY = float(os.getenv("AI_RETRY_MAX_DELAY", 60.0))
+
+    # Batched workload analysis: several databases per Claude request
+    AI_BATCH_ANALYSIS = os.getenv("AI_BATCH_ANALYSIS", "true").lower() == "true"
+    AI_BATCH_MAX_SIZE = int(os.getenv("AI_BATCH_MAX_SIZE", 20))
+    AI_BATCH_MAX_INPUT_TOKENS = int(os.getenv("AI_BATCH_MAX_INPUT_TOKENS", 20000))
+    AI_BATCH_MAX_OUTPUT_TOKENS = int(os.getenv("AI_BATCH_MAX_OUTPUT_TOKENS", 8000))
+    AI_BATCH_OUTPUT_TOKENS_PER_DB = int(os.getenv("AI_BATCH_OUTPUT_TOKENS_PER_DB", 350))
+
+    # Reuse one AI analysis across near-identical workloads (see workload_fingerprint.py)
+    AI_REUSE_ENABLED = os.getenv("AI_REUSE_ENABLED", "true").lower() == "true"
+    AI_REUSE_GRANULARITY = os.getenv("AI_REUSE_GRANULARITY", "fine")  # exact, fine or coarse
+
+    # Background bulk analysis jobs (see bulk_jobs.py)
+    BULK_BACKGROUND_JOBS = os.getenv("BULK_BACKGROUND_JOBS", "true").lower() == "true"
+    BULK_JOB_DB_PATH = os.getenv("BULK_JOB_DB_PATH", "data/bulk_jobs.sqlite3")
+    BULK_JOB_WORKERS = int(os.getenv("BULK_JOB_WORKERS", 2))
+    BULK_JOB_POLL_SECONDS = float(os.getenv("BULK_JOB_POLL_SECONDS", 2.0))
+    # Active jobs refresh a heartbeat; other processes treat them as interrupted once it is this old
+    BULK_JOB_HEARTBEAT_SECONDS = float(os.getenv("BULK_JOB_HEARTBEAT_SECONDS", 10.0))
+    BULK_JOB_STALE_SECONDS = float(os.getenv("BULK_JOB_STALE_SECONDS", 60.0))
+    BULK_CHECKPOINTS = os.getenv("BULK_CHECKPOINTS", "true").lower() == "true"  # checkpoint synchronous runs too
+
+    # HTTP sizing service (see sizing_service.py)
+    SIZING_SERVICE_MAX_BATCH = int(os.getenv("SIZING_SERVICE_MAX_BATCH", 256))
+    SIZING_SERVICE_MAX_WAIT_MS = float(os.getenv("SIZING_SERVICE_MAX_WAIT_MS", 2.0))
+    SIZING_SERVICE_DETAILED_POOL = int(os.getenv("SIZING_SERVICE_DETAILED_POOL", 4))
+
+    # What-if scenario sweeps (scenario_sweep.py)
+    SWEEP_MAX_SCENARIOS = int(os.getenv("SWEEP_MAX_SCENARIOS", 200000))
+
+    # Monte Carlo cost and capacity risk (cost_risk.py)
+    MONTE_CARLO_TRIALS = int(os.getenv("MONTE_CARLO_TRIALS", 10000))
+
+    # Utilization time-series ingestion (utilization.py)
+    METRICS_CHUNK_ROWS = int(os.getenv("METRICS_CHUNK_ROWS", 1000000))
+    UTILIZATION_PERCENTILE = int(os.getenv("UTILIZATION_PERCENTILE", 95))  # sizes cpu_util/ram_util/iops
+    BURST_THRESHOLD_PERCENT = float(os.getenv("BURST_THRESHOLD_PERCENT", 80))  # CPU samples counted as bursts
+
+    # Burstable (t3/t4g) CPU credits (burst_credits.py): "unlimited" (the RDS default) bills surplus
+    # credits, "standard" throttles to baseline
+    BURSTABLE_CREDIT_MODE = os.getenv("BURSTABLE_CREDIT_MODE", "unlimited")
+
+    # Fleet consolidation (consolidation.py): packing target for shared instances and databases per instance
+    CONSOLIDATION_TARGET_UTILIZATION = float(os.getenv("CONSOLIDATION_TARGET_UTILIZATION", "0.75"))
+    CONSOLIDATION_MAX_DATABASES = int(os.getenv("CONSOLIDATION_MAX_DATABASES", "40"))
+
+    # Fleet optimizer (fleet_optimizer.py): local search rounds after the greedy budget fill
+    FLEET_LOCAL_SEARCH_ROUNDS = int(os.getenv("FLEET_LOCAL_SEARCH_ROUNDS", "200"))
+
+    # Migration transfer planning: shared link to AWS, DMS task limit and cutover window
+    MIGRATION_BANDWIDTH_MBPS = float(os.getenv("MIGRATION_BANDWIDTH_MBPS", "1000"))
+    MIGRATION_MAX_CONCURRENT_TASKS = int(os.getenv("MIGRATION_MAX_CONCURRENT_TASKS", "16"))
+    MIGRATION_CUTOVER_WINDOW_HOURS = float(os.getenv("MIGRATION_CUTOVER_WINDOW_HOURS", "4"))
+
     # Supported Database Engines and AWS Regions
     SUPPORTED_ENGINES = [
         'oracle-ee', 'oracle-se', 'postgres',
@@ -67,6 +216,9 @@ class Config:
     BASE_BACKUP_COST_GB = 0.095
     BASE_TRANSFER_COST_GB = 0.09
 
+    # AWS Pricing API endpoint override (point at fake_pricing.py for offline load tests)
+    AWS_PRICING_ENDPOINT_URL = os.getenv("AWS_PRICING_ENDPOINT_URL") or None
+
     # Environment Resource Multipliers
     ENV_PROFILES = {
         "PROD":    {"cpu_factor": 1.0, "storage_factor": 1.0, "ha_required": True},
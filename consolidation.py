@@ -0,0 +1,209 @@
+"""
+Fleet consolidation: pack many small databases onto shared instances.
+
+Bulk analysis sizes every database on its own instance. ``plan_consolidation``
+groups compatible databases (same engine, region and environment) and packs
+them with best-fit decreasing bin packing over:
+
+- hourly CPU demand (24 values), so databases whose peaks fall at different
+  hours share headroom - measured diurnal profiles where available, else
+  the default daily curve (peaks then coincide and packing is conservative)
+- RAM, provisioned IOPS and storage, with per-instance limits; a shared
+  instance's members share one volume, priced by storage_pricing
+
+Compute demand is each database's sizing demand (utilized cores and memory,
+environment factor and headroom) without the per-instance minimums of the
+environment: those floors are what leaves small databases on half-idle
+instances, and a shared instance only has to meet them once.
+
+Bins are packed against the largest instance of the engine's catalog at
+CONSOLIDATION_TARGET_UTILIZATION, then right-sized to the cheapest instance
+that holds their load. A bin that would not cost less than its members on
+their own instances is dissolved, so the plan never costs more than the
+per-database recommendations. Fit checks run against all open bins at
+once, so thousands of databases pack in well under a second.
+"""
+import numpy as np
+import pandas as pd
+
+from burst_credits import is_burstable, profile_shapes
+from config import Config
+from storage_pricing import price_storage
+from vectorized_sizing import ENV_SIZING, _columns_from_records
+
+# Storage-level limits of one RDS instance
+MAX_IOPS_PER_INSTANCE = 64000
+MAX_STORAGE_GB = 65536
+
+
+def _bin_catalog(calculator, region: str, engine: str) -> list:
+    """Provisioned instances a consolidated group can run on, cheapest first
+
+    Burstable instances are left out: a shared instance carries the summed,
+    sustained load of its members, which would drain its CPU credits.
+    """
+    region_data = calculator.instance_db.get(region, calculator.instance_db["us-east-1"])
+    instances = [instance for instance in region_data.get(engine, region_data.get("postgres", []))
+                 if instance["vCPU"] > 0 and not is_burstable(instance)]
+    return sorted(instances, key=lambda instance: instance["pricing"]["ondemand"])
+
+
+def _pack(cpu: np.ndarray, ram: np.ndarray, iops: np.ndarray, storage: np.ndarray, capacity: dict) -> np.ndarray:
+    """Bin index of every item: best-fit decreasing over CPU-by-hour, RAM, IOPS, storage and count"""
+    limits = (capacity["cpu"], capacity["ram"], capacity["iops"], capacity["storage"])
+    share = np.maximum.reduce([cpu.max(axis=1) / limits[0], ram / limits[1], iops / limits[2], storage / limits[3]])
+
+    n = len(ram)
+    bins = np.full(n, -1)
+    cpu_load = np.zeros((n, cpu.shape[1]))
+    ram_load, iops_load, storage_load = np.zeros(n), np.zeros(n), np.zeros(n)
+    count = np.zeros(n, dtype=np.int64)
+    used = 0
+    for i in np.argsort(-share, kind="stable"):
+        if used:
+            open_cpu = cpu_load[:used] + cpu[i]
+            fits = ((open_cpu <= limits[0]).all(axis=1) & (ram_load[:used] + ram[i] <= limits[1])
+                    & (iops_load[:used] + iops[i] <= limits[2]) & (storage_load[:used] + storage[i] <= limits[3])
+                    & (count[:used] < capacity["databases"]))
+        if used and fits.any():
+            # Best fit: the bin left fullest (by its dominant resource) after adding the item
+            fullness = np.maximum(open_cpu.max(axis=1) / limits[0], (ram_load[:used] + ram[i]) / limits[1])
+            b = int(np.argmax(np.where(fits, fullness, -1)))
+        else:
+            b = used
+            used += 1
+        bins[i] = b
+        cpu_load[b] += cpu[i]
+        ram_load[b] += ram[i]
+        iops_load[b] += iops[i]
+        storage_load[b] += storage[i]
+        count[b] += 1
+    return bins
+
+
+def plan_consolidation(calculator, all_results: list, envs: list = None, profiles: dict = None,
+                       target_utilization: float = None, max_databases: int = None):
+    """(shared instances DataFrame, per-database placement DataFrame) for an EnhancedRDSCalculator bulk analysis
+
+    ``profiles`` maps db_name -> hourly CPU (e.g. UtilizationProfiler.diurnal_profile
+    rows), which shapes each database's CPU demand over the day.
+    """
+    target_utilization = target_utilization or Config.CONSOLIDATION_TARGET_UTILIZATION
+    max_databases = max_databases or Config.CONSOLIDATION_MAX_DATABASES
+    envs = envs or list(all_results[0]['recommendations']) if all_results else []
+    columns = _columns_from_records([result['inputs'] for result in all_results]) if all_results else {}
+    names = np.array([result['inputs'].get('db_name', f'Database {i+1}') for i, result in enumerate(all_results)], dtype=object)
+
+    # Hourly CPU shape (peak = 1) per database
+    shape = profile_shapes(names, profiles)
+
+    bin_rows, placement_rows = [], []
+    for env in envs:
+        recs = [result['recommendations'][env] for result in all_results]
+        profile = calculator.env_profiles[env]
+        headroom = ENV_SIZING[env][3] or 1
+        base_cpu = columns["cores"] * (columns["cpu_util"] / 100) * profile['cpu_factor'] * headroom
+        base_ram = columns["ram"] * (columns["ram_util"] / 100) * profile['cpu_factor'] * headroom
+        groups = {}
+        for i, result in enumerate(all_results):
+            if recs[i]['instance_type'] == "db.serverless":
+                continue  # already scales with its load
+            groups.setdefault((result['inputs']['engine'], result['inputs']['region']), []).append(i)
+        placed = {}
+
+        for (engine, region), members in groups.items():
+            catalog = _bin_catalog(calculator, region, engine)
+            if len(members) < 2 or not catalog:
+                continue
+            members = np.array(members)
+            largest = max(catalog, key=lambda instance: (instance["vCPU"], instance["memory"]))
+            capacity = {"cpu": largest["vCPU"] * target_utilization, "ram": largest["memory"] * target_utilization,
+                        "iops": MAX_IOPS_PER_INSTANCE, "storage": MAX_STORAGE_GB, "databases": max_databases}
+            cpu = base_cpu[members, None] * shape[members]
+            ram = base_ram[members]
+            iops = columns["iops"][members] * profile['storage_factor']
+            storage = np.array([recs[i]['storage_gb'] for i in members], dtype=float)
+            isolated = np.array([recs[i]['monthly_cost'] for i in members])
+            # Backup and transfer move with each database; instance, monitoring and the storage volume are shared
+            carried = np.array([recs[i]['cost_breakdown']['backup'] + recs[i]['cost_breakdown']['data_transfer']
+                                for i in members])
+
+            # Databases too big for the largest instance keep their own
+            alone = ((cpu.max(axis=1) > capacity["cpu"]) | (ram > capacity["ram"])
+                     | (iops > capacity["iops"]) | (storage > capacity["storage"]))
+            packable = np.nonzero(~alone)[0]
+            if len(packable) < 2:
+                continue
+            bins = _pack(cpu[packable], ram[packable], iops[packable], storage[packable], capacity)
+
+            # Right-size every bin to the cheapest instance that holds its load and meets the environment minimums
+            n_bins = bins.max() + 1
+            peak_cpu = np.zeros((n_bins, cpu.shape[1]))
+            np.add.at(peak_cpu, bins, cpu[packable])
+            peak_cpu = peak_cpu.max(axis=1)
+            load = {name: np.bincount(bins, weights=values[packable], minlength=n_bins)
+                    for name, values in (("ram", ram), ("iops", iops), ("storage", storage), ("isolated", isolated),
+                                         ("carried", carried))}
+            sizes = np.bincount(bins, minlength=n_bins)
+            vcpu = np.array([instance["vCPU"] for instance in catalog], dtype=float)
+            memory = np.array([instance["memory"] for instance in catalog], dtype=float)
+            min_vcpus, min_ram = ENV_SIZING[env][:2]
+            fits = ((vcpu * target_utilization >= peak_cpu[:, None] - 1e-9)
+                    & (memory * target_utilization >= load["ram"][:, None] - 1e-9)
+                    & (vcpu >= min_vcpus) & (memory >= min_ram))
+            choice = np.argmax(fits, axis=1)  # catalog is cheapest first
+
+            hourly = np.array([catalog[k]["pricing"]["ondemand"] for k in choice])
+            instance_cost = hourly * 24 * 30 * (2 if env == "PROD" else 1)
+            volume = price_storage(engine, calculator.STORAGE_TYPE, load["storage"], load["iops"],
+                                   instance_monthly=instance_cost)
+            instance_cost = instance_cost * volume["instance_factor"]
+            monitoring = instance_cost * 0.1 if env == "PROD" else 0
+            shared_cost = instance_cost + monitoring + volume["total"] + load["carried"]
+            keep = (sizes > 1) & (shared_cost < load["isolated"])
+
+            for b in np.nonzero(keep)[0]:
+                instance = catalog[choice[b]]
+                label = f"{engine}/{region}/{env} #{len(bin_rows) + 1}"
+                bin_rows.append({
+                    "environment": env, "engine": engine, "region": region, "shared_instance": label,
+                    "instance_type": instance["type"], "databases": int(sizes[b]),
+                    "cpu_peak_percent": peak_cpu[b] / instance["vCPU"] * 100,
+                    "ram_percent": load["ram"][b] / instance["memory"] * 100,
+                    "monthly_cost": shared_cost[b], "isolated_cost": load["isolated"][b],
+                    "savings": load["isolated"][b] - shared_cost[b],
+                })
+                for i in members[packable[bins == b]]:
+                    placed[i] = (label, instance["type"])
+
+        for i, rec in enumerate(recs):
+            label, instance_type = placed.get(i, (None, rec['instance_type']))
+            placement_rows.append({
+                "db_name": names[i], "environment": env, "engine": all_results[i]['inputs']['engine'],
+                "region": all_results[i]['inputs']['region'], "consolidated": label is not None,
+                "shared_instance": label, "instance_type": instance_type,
+                "isolated_instance": rec['instance_type'], "isolated_cost": rec['monthly_cost'],
+            })
+
+    bins = pd.DataFrame(bin_rows, columns=["environment", "engine", "region", "shared_instance", "instance_type",
+                                           "databases", "cpu_peak_percent", "ram_percent", "monthly_cost",
+                                           "isolated_cost", "savings"])
+    placements = pd.DataFrame(placement_rows, columns=["db_name", "environment", "engine", "region", "consolidated",
+                                                       "shared_instance", "instance_type", "isolated_instance",
+                                                       "isolated_cost"])
+    return bins, placements
+
+
+def consolidation_summary(bins: pd.DataFrame, placements: pd.DataFrame) -> pd.DataFrame:
+    """Per environment: instances and monthly cost before and after consolidation"""
+    before = placements.groupby("environment", sort=False).agg(databases=("db_name", "size"),
+                                                               isolated_cost=("isolated_cost", "sum"))
+    moved = placements[placements["consolidated"]].groupby("environment").agg(
+        consolidated=("db_name", "size"), moved_cost=("isolated_cost", "sum"))
+    shared = bins.groupby("environment").agg(shared_instances=("shared_instance", "size"),
+                                             shared_cost=("monthly_cost", "sum"))
+    summary = before.join(moved).join(shared).fillna(0)
+    summary["instances_after"] = summary["databases"] - summary["consolidated"] + summary["shared_instances"]
+    summary["consolidated_cost"] = summary["isolated_cost"] - summary["moved_cost"] + summary["shared_cost"]
+    summary["savings"] = summary["isolated_cost"] - summary["consolidated_cost"]
+    return summary[["databases", "instances_after", "isolated_cost", "consolidated_cost", "savings"]].reset_index()
@@ -0,0 +1,267 @@
+"""
+RDS sizing calculator used by the Streamlit app, bulk jobs and the batch CLI.
+"""
+from storage_pricing import price_storage
+
+
+class EnhancedRDSCalculator:
+    """Enhanced RDS calculator with AI integration"""
+    
+    # Priced through storage_pricing, as each engine resolves it (the cheaper Aurora type for Aurora engines)
+    STORAGE_TYPE = "gp3"
+    
+    def __init__(self):
+        self.engines = ['oracle-ee', 'oracle-se', 'postgres', 'aurora-postgresql', 'aurora-mysql', 'sqlserver']
+        self.regions = ["us-east-1", "us-west-1", "us-west-2", "eu-west-1", "ap-southeast-1"]
+        
+        # Instance database with expanded options
+        self.instance_db = {
+            "us-east-1": {
+                "oracle-ee": [
+                    {"type": "db.t3.medium", "vCPU": 2, "memory": 4, "pricing": {"ondemand": 0.136}},
+                    {"type": "db.m5.large", "vCPU": 2, "memory": 8, "pricing": {"ondemand": 0.475}},
+                    {"type": "db.m5.xlarge", "vCPU": 4, "memory": 16, "pricing": {"ondemand": 0.95}},
+                    {"type": "db.m5.2xlarge", "vCPU": 8, "memory": 32, "pricing": {"ondemand": 1.90}},
+                    {"type": "db.r5.large", "vCPU": 2, "memory": 16, "pricing": {"ondemand": 0.60}},
+                    {"type": "db.r5.xlarge", "vCPU": 4, "memory": 32, "pricing": {"ondemand": 1.20}},
+                    {"type": "db.r5.2xlarge", "vCPU": 8, "memory": 64, "pricing": {"ondemand": 1.92}}
+                ],
+                "aurora-postgresql": [
+                    {"type": "db.t3.medium", "vCPU": 2, "memory": 4, "pricing": {"ondemand": 0.082}},
+                    {"type": "db.r5.large", "vCPU": 2, "memory": 16, "pricing": {"ondemand": 0.285}},
+                    {"type": "db.r5.xlarge", "vCPU": 4, "memory": 32, "pricing": {"ondemand": 0.57}},
+                    {"type": "db.r5.2xlarge", "vCPU": 8, "memory": 64, "pricing": {"ondemand": 1.14}},
+                    {"type": "db.serverless", "vCPU": 0, "memory": 0, "pricing": {"ondemand": 0.12}}
+                ],
+                "postgres": [
+                    {"type": "db.t3.micro", "vCPU": 2, "memory": 1, "pricing": {"ondemand": 0.0255}},
+                    {"type": "db.t3.small", "vCPU": 2, "memory": 2, "pricing": {"ondemand": 0.051}},
+                    {"type": "db.t3.medium", "vCPU": 2, "memory": 4, "pricing": {"ondemand": 0.102}},
+                    {"type": "db.m5.large", "vCPU": 2, "memory": 8, "pricing": {"ondemand": 0.192}},
+                    {"type": "db.m5.xlarge", "vCPU": 4, "memory": 16, "pricing": {"ondemand": 0.384}},
+                    {"type": "db.m5.2xlarge", "vCPU": 8, "memory": 32, "pricing": {"ondemand": 0.768}}
+                ],
+                "sqlserver": [
+                    {"type": "db.t3.small", "vCPU": 2, "memory": 2, "pricing": {"ondemand": 0.231}},
+                    {"type": "db.m5.large", "vCPU": 2, "memory": 8, "pricing": {"ondemand": 0.693}},
+                    {"type": "db.m5.xlarge", "vCPU": 4, "memory": 16, "pricing": {"ondemand": 1.386}},
+                    {"type": "db.m5.2xlarge", "vCPU": 8, "memory": 32, "pricing": {"ondemand": 2.772}}
+                ],
+                "aurora-mysql": [
+                    {"type": "db.t3.medium", "vCPU": 2, "memory": 4, "pricing": {"ondemand": 0.082}},
+                    {"type": "db.r5.large", "vCPU": 2, "memory": 16, "pricing": {"ondemand": 0.285}},
+                    {"type": "db.r5.xlarge", "vCPU": 4, "memory": 32, "pricing": {"ondemand": 0.57}},
+                    {"type": "db.serverless", "vCPU": 0, "memory": 0, "pricing": {"ondemand": 0.12}}
+                ],
+                "oracle-se": [
+                    {"type": "db.t3.medium", "vCPU": 2, "memory": 4, "pricing": {"ondemand": 0.105}},
+                    {"type": "db.m5.large", "vCPU": 2, "memory": 8, "pricing": {"ondemand": 0.365}},
+                    {"type": "db.m5.xlarge", "vCPU": 4, "memory": 16, "pricing": {"ondemand": 0.730}},
+                    {"type": "db.r5.large", "vCPU": 2, "memory": 16, "pricing": {"ondemand": 0.462}}
+                ]
+            }
+        }
+        
+        # Environment profiles
+        self.env_profiles = {
+            "PROD": {"cpu_factor": 1.0, "storage_factor": 1.0, "ha_required": True},
+            "STAGING": {"cpu_factor": 0.8, "storage_factor": 0.7, "ha_required": True},
+            "QA": {"cpu_factor": 0.6, "storage_factor": 0.5, "ha_required": False},
+            "DEV": {"cpu_factor": 0.4, "storage_factor": 0.3, "ha_required": False}
+        }
+        
+        # Add other regions with regional pricing adjustments
+        for region in ["us-west-1", "us-west-2", "eu-west-1", "ap-southeast-1"]:
+            if region not in self.instance_db:
+                self.instance_db[region] = {}
+                for engine, instances in self.instance_db["us-east-1"].items():
+                    # Apply regional pricing multiplier
+                    multiplier = self._get_regional_multiplier(region)
+                    regional_instances = []
+                    for instance in instances:
+                        regional_instance = instance.copy()
+                        regional_instance["pricing"] = {
+                            "ondemand": instance["pricing"]["ondemand"] * multiplier
+                        }
+                        regional_instances.append(regional_instance)
+                    self.instance_db[region][engine] = regional_instances
+    
+    def _get_regional_multiplier(self, region: str) -> float:
+        """Get regional pricing multiplier"""
+        multipliers = {
+            "us-east-1": 1.0,
+            "us-west-1": 1.08,
+            "us-west-2": 1.05,
+            "eu-west-1": 1.12,
+            "ap-southeast-1": 1.15
+        }
+        return multipliers.get(region, 1.0)
+    
+    def calculate_requirements(self, inputs: dict, env: str) -> dict:
+        """Calculate resource requirements with AI-enhanced logic"""
+        profile = self.env_profiles[env]
+        
+        # Calculate resources with intelligent scaling
+        base_vcpus = inputs['cores'] * (inputs['cpu_util'] / 100)
+        base_ram = inputs['ram'] * (inputs['ram_util'] / 100)
+        
+        # Apply environment factors
+        if env == "PROD":
+            vcpus = max(4, int(base_vcpus * profile['cpu_factor'] * 1.2))
+            ram = max(8, int(base_ram * profile['cpu_factor'] * 1.2))
+            storage = max(100, int(inputs['storage'] * profile['storage_factor'] * 1.3))
+        elif env == "STAGING":
+            vcpus = max(2, int(base_vcpus * profile['cpu_factor']))
+            ram = max(4, int(base_ram * profile['cpu_factor']))
+            storage = max(50, int(inputs['storage'] * profile['storage_factor']))
+        elif env == "QA":
+            vcpus = max(2, int(base_vcpus * profile['cpu_factor']))
+            ram = max(4, int(base_ram * profile['cpu_factor']))
+            storage = max(20, int(inputs['storage'] * profile['storage_factor']))
+        else:  # DEV
+            vcpus = max(1, int(base_vcpus * profile['cpu_factor']))
+            ram = max(2, int(base_ram * profile['cpu_factor']))
+            storage = max(20, int(inputs['storage'] * profile['storage_factor']))
+        
+        # Apply growth projections only for PROD and STAGING
+        if env in ["PROD", "STAGING"]:
+            growth_factor = (1 + inputs['growth']/100) ** 2
+            storage = int(storage * growth_factor)
+            
+        # Select optimal instance
+        instance = self._select_optimal_instance(vcpus, ram, inputs['engine'], inputs['region'], env)
+        
+        # Calculate costs
+        costs = self._calculate_comprehensive_costs(instance, storage, inputs, env)
+        
+        return {
+            "environment": env,
+            "instance_type": instance["type"],
+            "vcpus": vcpus,
+            "ram_gb": ram,
+            "storage_gb": storage,
+            "monthly_cost": costs["total"],
+            "annual_cost": costs["total"] * 12,
+            "cost_breakdown": costs,
+            "instance_details": instance,
+            "optimization_score": self._calculate_optimization_score(instance, vcpus, ram)
+        }
+    
+    def _select_optimal_instance(self, vcpus: int, ram: int, engine: str, region: str, env: str = "PROD") -> dict:
+        """Select optimal instance type"""
+        region_data = self.instance_db.get(region, self.instance_db["us-east-1"])
+        engine_instances = region_data.get(engine, region_data.get("postgres", []))
+        
+        if not engine_instances:
+            if env == "DEV":
+                return {"type": "db.t3.micro", "vCPU": 2, "memory": 1, "pricing": {"ondemand": 0.017}}
+            elif env in ["QA", "STAGING"]:
+                return {"type": "db.t3.medium", "vCPU": 2, "memory": 4, "pricing": {"ondemand": 0.068}}
+            else:
+                return {"type": "db.m5.large", "vCPU": 2, "memory": 8, "pricing": {"ondemand": 0.4}}
+        
+        # Filter instances based on environment
+        if env == "DEV":
+            preferred_instances = [inst for inst in engine_instances if 't3' in inst["type"]]
+            if not preferred_instances:
+                preferred_instances = engine_instances
+        elif env in ["QA", "STAGING"]:
+            preferred_instances = [inst for inst in engine_instances if any(family in inst["type"] for family in ['t3', 'm5'])]
+            if not preferred_instances:
+                preferred_instances = engine_instances
+        else:
+            preferred_instances = [inst for inst in engine_instances if any(family in inst["type"] for family in ['r5', 'm5'])]
+            if not preferred_instances:
+                preferred_instances = engine_instances
+        
+        # Score instances
+        scored_instances = []
+        for instance in preferred_instances:
+            if instance["type"] == "db.serverless":
+                score = 120 if env == "DEV" else (100 if env in ["QA", "STAGING"] else 60)
+            else:
+                cpu_ratio = instance["vCPU"] / max(vcpus, 1)
+                ram_ratio = instance["memory"] / max(ram, 1)
+                
+                if env == "PROD":
+                    cpu_fit = 1.2 if 1.2 <= cpu_ratio <= 1.8 else (1.0 if cpu_ratio >= 1.0 else 0.3)
+                    ram_fit = 1.2 if 1.2 <= ram_ratio <= 1.8 else (1.0 if ram_ratio >= 1.0 else 0.3)
+                    cost_weight = 0.3
+                elif env in ["QA", "STAGING"]:
+                    cpu_fit = 1.0 if 1.1 <= cpu_ratio <= 1.5 else (0.8 if cpu_ratio >= 1.0 else 0.4)
+                    ram_fit = 1.0 if 1.1 <= ram_ratio <= 1.5 else (0.8 if ram_ratio >= 1.0 else 0.4)
+                    cost_weight = 0.5
+                else:
+                    cpu_fit = 1.0 if 1.0 <= cpu_ratio <= 1.3 else (0.7 if cpu_ratio >= 1.0 else 0.2)
+                    ram_fit = 1.0 if 1.0 <= ram_ratio <= 1.3 else (0.7 if ram_ratio >= 1.0 else 0.2)
+                    cost_weight = 0.7
+                
+                cost_per_vcpu = instance["pricing"]["ondemand"] / max(instance["vCPU"], 1)
+                cost_efficiency = (1.0 / (cost_per_vcpu + 1)) * cost_weight
+                
+                performance_bonus = 0
+                if env == "PROD":
+                    if 'r5' in instance["type"]:
+                        performance_bonus = 0.3
+                    elif 'm5' in instance["type"]:
+                        performance_bonus = 0.2
+                elif env == "DEV":
+                    if 't3' in instance["type"]:
+                        performance_bonus = 0.3
+                
+                score = (cpu_fit + ram_fit + cost_efficiency + performance_bonus) * 100
+            
+            scored_instances.append((score, instance))
+        
+        if scored_instances:
+            scored_instances.sort(key=lambda x: x[0], reverse=True)
+            return scored_instances[0][1]
+        
+        return engine_instances[0] if engine_instances else {"type": "db.m5.large", "vCPU": 2, "memory": 8, "pricing": {"ondemand": 0.4}}
+    
+    def _calculate_comprehensive_costs(self, instance: dict, storage: int, inputs: dict, env: str) -> dict:
+        """Calculate comprehensive monthly costs"""
+        instance_cost = instance["pricing"]["ondemand"] * 24 * 30
+        
+        if env == "PROD":
+            instance_cost *= 2
+        
+        # Storage provisioned to meet the environment's share of the IOPS (scaled like its storage);
+        # "iops" is everything beyond the GB charge
+        iops = inputs.get('iops', 3000) * self.env_profiles[env]['storage_factor']
+        priced = price_storage(inputs['engine'], self.STORAGE_TYPE, storage, iops, instance_monthly=instance_cost)
+        instance_cost = instance_cost * float(priced["instance_factor"][0])
+        storage_gb_cost = float(priced["storage"][0])
+        iops_cost = float(priced["total"][0]) - storage_gb_cost
+        
+        backup_days = inputs.get('backup_days', 7)
+        backup_cost = storage * 0.095 * (backup_days / 30)
+        
+        data_transfer = inputs.get('data_transfer_gb', 100)
+        transfer_cost = data_transfer * 0.09
+        
+        monitoring_cost = instance_cost * 0.1 if env == "PROD" else 0
+        
+        total_cost = (instance_cost + storage_gb_cost + iops_cost + 
+                     backup_cost + transfer_cost + monitoring_cost)
+        
+        return {
+            "instance": instance_cost,
+            "storage": storage_gb_cost,
+            "iops": iops_cost,
+            "backup": backup_cost,
+            "data_transfer": transfer_cost,
+            "monitoring": monitoring_cost,
+            "total": total_cost
+        }
+    
+    def _calculate_optimization_score(self, instance: dict, required_vcpus: int, required_ram: int) -> int:
+        """Calculate optimization score (0-100)"""
+        if instance["type"] == "db.serverless":
+            return 95
+        
+        cpu_efficiency = min(required_vcpus / instance["vCPU"], 1.0)
+        ram_efficiency = min(required_ram / instance["memory"], 1.0)
+        avg_efficiency = (cpu_efficiency + ram_efficiency) / 2
+        
+        return int(avg_efficiency * 100)
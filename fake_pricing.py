@@ -0,0 +1,448 @@
+"""
+Local stand-in for the AWS Pricing API used for offline load testing.
+
+Serves paginated ``get_products`` responses from recorded fixtures (or a catalog
+synthesized from the sizing calculator's fallback data) with configurable
+latency, page sizes and throttling errors. ``FakePricingClient`` plugs straight
+into ``AWSPricing(client=...)`` and ``FixedRDSDatabaseSizingCalculator(pricing_client=...)``;
+running this module serves the same behaviour over HTTP so boto3 itself (and its
+retry logic) can be exercised by pointing ``AWS_PRICING_ENDPOINT_URL`` at it.
+
+    python fake_pricing.py serve --port 8765 --latency-ms 120 --throttle-rate 0.05
+    python fake_pricing.py bench --threads 8 --rounds 20 --page-size 20
+"""
+import argparse
+import base64
+import hashlib
+import json
+import os
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from botocore.exceptions import ClientError
+
+from rds_sizing import FixedRDSDatabaseSizingCalculator
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "pricing")
+DEFAULT_FIXTURE = os.path.join(FIXTURE_DIR, "rds_us-east-1_postgres.json")
+
+# Pricing API attributes per engine, plus the fallback catalog and price factor they derive from
+ENGINE_ATTRIBUTES = {
+    "postgres": ({"databaseEngine": "PostgreSQL", "licenseModel": "No license required"}, "postgres", 1.0),
+    "oracle-ee": ({"databaseEngine": "Oracle", "databaseEdition": "Enterprise", "licenseModel": "License included"}, "oracle-ee", 1.0),
+    "oracle-se": ({"databaseEngine": "Oracle", "databaseEdition": "Standard", "licenseModel": "License included"}, "oracle-ee", 0.77),
+    "aurora-postgresql": ({"databaseEngine": "Aurora PostgreSQL", "licenseModel": "No license required"}, "aurora-postgresql", 1.0),
+    "aurora-mysql": ({"databaseEngine": "Aurora MySQL", "licenseModel": "No license required"}, "aurora-postgresql", 1.0),
+    "sqlserver": ({"databaseEngine": "SQL Server", "databaseEdition": "Standard", "licenseModel": "License included"}, "postgres", 3.6),
+}
+
+DEPLOYMENT_PRICE_FACTORS = {"Single-AZ": 1.0, "Multi-AZ": 2.0}
+
+# (lease length, purchase option, hourly factor, upfront factor) relative to the On-Demand rate
+RESERVED_OFFERINGS = [
+    ("1yr", "No Upfront", 0.69, 0.0),
+    ("1yr", "Partial Upfront", 0.33, 0.33),
+    ("1yr", "All Upfront", 0.0, 0.64),
+    ("3yr", "No Upfront", 0.50, 0.0),
+    ("3yr", "Partial Upfront", 0.22, 0.22),
+    ("3yr", "All Upfront", 0.0, 0.42),
+]
+
+LEASE_HOURS = {"1yr": 8760, "3yr": 26280}
+
+
+class ThrottlingError(Exception):
+    """Raised by the fake service when a request is throttled"""
+
+
+class InvalidNextTokenError(Exception):
+    """Raised by the fake service for an unknown or stale NextToken"""
+
+
+def _code(*parts, length=10):
+    return hashlib.sha1("|".join(str(p) for p in parts).encode()).hexdigest()[:length].upper()
+
+
+def _price_dimension(sku, term_code, rate_code, unit, usd, description):
+    return {
+        f"{sku}.{term_code}.{rate_code}": {
+            "rateCode": f"{sku}.{term_code}.{rate_code}",
+            "unit": unit,
+            "description": description,
+            "pricePerUnit": {"USD": f"{usd:.10f}"},
+            "appliesTo": [],
+        }
+    }
+
+
+def build_product(region, engine, deployment, instance, hourly_price):
+    """Build one Pricing API product document for an instance offering"""
+    engine_attrs = ENGINE_ATTRIBUTES[engine][0]
+    sku = _code(region, engine, deployment, instance["type"], length=16)
+
+    attributes = {
+        "servicecode": "AmazonRDS",
+        "regionCode": region,
+        "instanceType": instance["type"],
+        "instanceFamily": instance.get("instance_family", "unknown"),
+        "vcpu": str(instance["vCPU"]),
+        "memory": f"{instance['memory']} GiB",
+        "maxIops": str(instance.get("max_iops", 0)),
+        "networkPerformance": "Up to 10 Gigabit",
+        "deploymentOption": deployment,
+    }
+    attributes.update(engine_attrs)
+
+    ondemand_code = _code("ondemand")
+    terms = {
+        "OnDemand": {
+            f"{sku}.{ondemand_code}": {
+                "offerTermCode": ondemand_code,
+                "sku": sku,
+                "effectiveDate": "2024-01-01T00:00:00Z",
+                "priceDimensions": _price_dimension(
+                    sku, ondemand_code, "6YS6EN2CT7", "Hrs", hourly_price,
+                    f"${hourly_price:.4f} per RDS {instance['type']} {deployment} instance hour"
+                ),
+                "termAttributes": {},
+            }
+        },
+        "Reserved": {},
+    }
+
+    for lease, option, hourly_factor, upfront_factor in RESERVED_OFFERINGS:
+        term_code = _code(lease, option)
+        dimensions = _price_dimension(
+            sku, term_code, "6YS6EN2CT7", "Hrs", hourly_price * hourly_factor,
+            f"RDS {instance['type']} reserved instance hour ({lease} {option})"
+        )
+        if upfront_factor:
+            upfront = hourly_price * upfront_factor * LEASE_HOURS[lease]
+            dimensions.update(_price_dimension(
+                sku, term_code, "2TG2D8R56U", "Quantity", upfront, "Upfront Fee"
+            ))
+        terms["Reserved"][f"{sku}.{term_code}"] = {
+            "offerTermCode": term_code,
+            "sku": sku,
+            "effectiveDate": "2024-01-01T00:00:00Z",
+            "priceDimensions": dimensions,
+            "termAttributes": {
+                "LeaseContractLength": lease,
+                "OfferingClass": "standard",
+                "PurchaseOption": option,
+            },
+        }
+
+    return {
+        "product": {"productFamily": "Database Instance", "sku": sku, "attributes": attributes},
+        "serviceCode": "AmazonRDS",
+        "terms": terms,
+        "version": "20240101000000",
+        "publicationDate": "2024-01-01T00:00:00Z",
+    }
+
+
+def synthesize_products(regions=None, engines=None, deployments=None):
+    """Synthesize a product catalog from the sizing calculator's fallback data"""
+    calc = FixedRDSDatabaseSizingCalculator
+    regions = regions or list(calc.REGION_PRICE_MULTIPLIERS)
+    engines = engines or list(ENGINE_ATTRIBUTES)
+    deployments = deployments or list(DEPLOYMENT_PRICE_FACTORS)
+
+    products = []
+    for region in regions:
+        region_factor = calc.REGION_PRICE_MULTIPLIERS.get(region, 1.1)
+        for engine in engines:
+            _, catalog_key, engine_factor = ENGINE_ATTRIBUTES[engine]
+            for deployment in deployments:
+                factor = region_factor * engine_factor * DEPLOYMENT_PRICE_FACTORS[deployment]
+                for instance in calc.FALLBACK_INSTANCE_DATA[catalog_key]:
+                    # Aurora Serverless is billed per ACU, not as an instance offering
+                    if instance.get("instance_family") == "serverless":
+                        continue
+                    price = round(instance["pricing"]["ondemand"] * factor, 6)
+                    products.append(build_product(region, engine, deployment, instance, price))
+    return products
+
+
+def load_fixture(path=DEFAULT_FIXTURE):
+    """Load a recorded fixture; PriceList entries may be JSON strings or objects"""
+    with open(path) as f:
+        data = json.load(f)
+    return [json.loads(item) if isinstance(item, str) else item for item in data["PriceList"]]
+
+
+def save_fixture(products, path):
+    """Write products in the recorded-fixture format"""
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "w") as f:
+        json.dump({"FormatVersion": "aws_v1", "PriceList": products}, f, separators=(",", ":"))
+        f.write("\n")
+    return path
+
+
+def record_fixture(client, path, filters, service_code="AmazonRDS", max_pages=None):
+    """Record real get_products pages for the given filters into a fixture file"""
+    products = []
+    next_token = None
+    pages = 0
+    while True:
+        params = {"ServiceCode": service_code, "Filters": filters, "MaxResults": 100}
+        if next_token:
+            params["NextToken"] = next_token
+        response = client.get_products(**params)
+        products.extend(json.loads(item) for item in response["PriceList"])
+        pages += 1
+        next_token = response.get("NextToken")
+        if not next_token or (max_pages and pages >= max_pages):
+            break
+    return save_fixture(products, path)
+
+
+class FakePricingService:
+    """In-memory Pricing API with pagination, latency and throttling knobs"""
+
+    def __init__(self, products=None, fixture_path=None, page_size=100, latency_ms=0.0,
+                 latency_jitter_ms=0.0, throttle_rate=0.0, max_requests_per_second=None, seed=None):
+        if products is None:
+            products = load_fixture(fixture_path) if fixture_path else synthesize_products()
+
+        # Keep attributes for filtering alongside the serialized document we hand out
+        self._products = [(p["product"]["attributes"], json.dumps(p)) for p in products]
+        self._filter_cache = {}
+
+        self.page_size = max(1, int(page_size))
+        self.latency_ms = latency_ms
+        self.latency_jitter_ms = latency_jitter_ms
+        self.throttle_rate = throttle_rate
+        self.max_requests_per_second = max_requests_per_second
+
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._window_start = time.monotonic()
+        self._window_count = 0
+        self.reset_stats()
+
+    def reset_stats(self):
+        with self._lock:
+            self.stats = {"requests": 0, "pages": 0, "products_served": 0, "throttled": 0}
+
+    def _admit(self):
+        """Apply latency and throttling; raises ThrottlingError when rejected"""
+        with self._lock:
+            self.stats["requests"] += 1
+            delay = max(0.0, self._rng.gauss(self.latency_ms, self.latency_jitter_ms)) / 1000
+            throttled = self.throttle_rate > 0 and self._rng.random() < self.throttle_rate
+
+            if self.max_requests_per_second:
+                now = time.monotonic()
+                if now - self._window_start >= 1.0:
+                    self._window_start = now
+                    self._window_count = 0
+                self._window_count += 1
+                throttled = throttled or self._window_count > self.max_requests_per_second
+
+            if throttled:
+                self.stats["throttled"] += 1
+
+        if delay:
+            time.sleep(delay)
+        if throttled:
+            raise ThrottlingError("Rate exceeded")
+
+    def _matching(self, filters):
+        key = tuple(sorted((f["Field"], f["Value"]) for f in filters or []))
+        matched = self._filter_cache.get(key)
+        if matched is None:
+            matched = [
+                doc for attrs, doc in self._products
+                if all(attrs.get(field) == value for field, value in key)
+            ]
+            self._filter_cache[key] = matched
+        return key, matched
+
+    def get_products(self, ServiceCode=None, Filters=None, FormatVersion=None, NextToken=None, MaxResults=None):
+        self._admit()
+        key, matched = self._matching(Filters)
+        key_hash = _code(*key)
+
+        offset = 0
+        if NextToken:
+            try:
+                token = json.loads(base64.urlsafe_b64decode(NextToken.encode()))
+                offset = int(token["o"])
+            except (ValueError, KeyError, TypeError):
+                raise InvalidNextTokenError("Invalid NextToken")
+            if token.get("k") != key_hash:
+                raise InvalidNextTokenError("NextToken does not match request filters")
+
+        limit = min(int(MaxResults), self.page_size) if MaxResults else self.page_size
+        page = matched[offset:offset + limit]
+
+        with self._lock:
+            self.stats["pages"] += 1
+            self.stats["products_served"] += len(page)
+
+        response = {"FormatVersion": FormatVersion or "aws_v1", "PriceList": page}
+        if offset + limit < len(matched):
+            token = json.dumps({"k": key_hash, "o": offset + limit}).encode()
+            response["NextToken"] = base64.urlsafe_b64encode(token).decode()
+        return response
+
+    def describe_services(self, ServiceCode=None, FormatVersion=None, NextToken=None, MaxResults=None):
+        self._admit()
+        return {
+            "Services": [{"ServiceCode": "AmazonRDS", "AttributeNames": ["instanceType", "regionCode", "databaseEngine"]}],
+            "FormatVersion": FormatVersion or "aws_v1",
+        }
+
+
+class FakePricingClient:
+    """boto3-compatible pricing client backed by a FakePricingService"""
+
+    def __init__(self, service=None, **service_kwargs):
+        self.service = service or FakePricingService(**service_kwargs)
+
+    def _call(self, operation, method, kwargs):
+        try:
+            return method(**kwargs)
+        except ThrottlingError as e:
+            raise ClientError({"Error": {"Code": "ThrottlingException", "Message": str(e)}}, operation)
+        except InvalidNextTokenError as e:
+            raise ClientError({"Error": {"Code": "InvalidNextTokenException", "Message": str(e)}}, operation)
+
+    def get_products(self, **kwargs):
+        return self._call("GetProducts", self.service.get_products, kwargs)
+
+    def describe_services(self, **kwargs):
+        return self._call("DescribeServices", self.service.describe_services, kwargs)
+
+
+class PricingRequestHandler(BaseHTTPRequestHandler):
+    """Speaks the Pricing API's JSON 1.1 protocol for real boto3 clients"""
+
+    service = None  # set by make_server
+
+    def do_POST(self):
+        target = self.headers.get("X-Amz-Target", "").split(".")[-1]
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)) or 0)
+        params = json.loads(body or b"{}")
+
+        operations = {"GetProducts": self.service.get_products, "DescribeServices": self.service.describe_services}
+        if target not in operations:
+            return self._send(400, {"__type": "InvalidParameterException", "Message": f"Unknown operation {target}"})
+
+        try:
+            self._send(200, operations[target](**params))
+        except ThrottlingError as e:
+            self._send(400, {"__type": "ThrottlingException", "Message": str(e)})
+        except InvalidNextTokenError as e:
+            self._send(400, {"__type": "InvalidNextTokenException", "Message": str(e)})
+        except TypeError as e:
+            self._send(400, {"__type": "InvalidParameterException", "Message": str(e)})
+
+    def _send(self, status, payload):
+        data = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/x-amz-json-1.1")
+        self.send_header("Content-Length", str(len(data)))
+        self.send_header("x-amzn-RequestId", _code(time.time(), random.random(), length=32))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def make_server(service, host="127.0.0.1", port=8765):
+    """Create an HTTP server for the service (port 0 picks a free port)"""
+    handler = type("BoundPricingRequestHandler", (PricingRequestHandler,), {"service": service})
+    return ThreadingHTTPServer((host, port), handler)
+
+
+def start_background_server(service, host="127.0.0.1", port=0):
+    """Serve in a daemon thread; returns (server, endpoint_url)"""
+    server = make_server(service, host, port)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://{host}:{server.server_address[1]}"
+
+
+def run_pricing_benchmark(client, threads=8, rounds=10, regions=None, engines=None):
+    """Hammer AWSPricing and the sizing calculator's fetch path, cold and warm cache"""
+    from concurrent.futures import ThreadPoolExecutor
+    from aws_pricing import AWSPricing
+
+    regions = regions or list(FixedRDSDatabaseSizingCalculator.REGION_PRICE_MULTIPLIERS)
+    engines = engines or list(ENGINE_ATTRIBUTES)
+    combos = [(r, e) for r in regions for e in engines]
+    results = {}
+
+    def timed(label, fn):
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=threads) as pool:
+            sizes = list(pool.map(fn, combos * rounds))
+        elapsed = time.perf_counter() - start
+        results[label] = {
+            "calls": len(sizes),
+            "seconds": round(elapsed, 3),
+            "calls_per_second": round(len(sizes) / elapsed, 1) if elapsed else None,
+            "empty_results": sum(1 for s in sizes if not s),
+        }
+
+    pricing = AWSPricing(client=client)
+    timed("aws_pricing_cold", lambda c: len(AWSPricing(client=client).get_rds_pricing(*c)))
+    timed("aws_pricing_warm", lambda c: len(pricing.get_rds_pricing(*c)))
+
+    calculator = FixedRDSDatabaseSizingCalculator(pricing_client=client)
+    timed("sizing_fetch_warm", lambda c: len(calculator.get_instance_pricing_data(*c)))
+
+    service = getattr(client, "service", None)
+    if service is not None:
+        results["service_stats"] = dict(service.stats)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local fake AWS Pricing API")
+    parser.add_argument("mode", choices=["serve", "bench", "write-fixture"])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--fixture", help="Recorded fixture to serve (default: synthesized catalog)")
+    parser.add_argument("--page-size", type=int, default=100)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--latency-jitter-ms", type=float, default=0.0)
+    parser.add_argument("--throttle-rate", type=float, default=0.0)
+    parser.add_argument("--max-rps", type=float, default=None)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--rounds", type=int, default=10)
+    parser.add_argument("--output", default=DEFAULT_FIXTURE)
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    if args.mode == "write-fixture":
+        print(f"✅ Wrote {save_fixture(synthesize_products(regions=['us-east-1'], engines=['postgres'], deployments=['Single-AZ']), args.output)}")
+        return
+
+    service = FakePricingService(
+        fixture_path=args.fixture, page_size=args.page_size, latency_ms=args.latency_ms,
+        latency_jitter_ms=args.latency_jitter_ms, throttle_rate=args.throttle_rate,
+        max_requests_per_second=args.max_rps, seed=args.seed
+    )
+
+    if args.mode == "serve":
+        server = make_server(service, args.host, args.port)
+        print(f"🌐 Fake Pricing API on http://{args.host}:{args.port}")
+        print(f"   export AWS_PRICING_ENDPOINT_URL=http://{args.host}:{args.port}")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            server.shutdown()
+    else:
+        results = run_pricing_benchmark(FakePricingClient(service), threads=args.threads, rounds=args.rounds)
+        print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,276 @@
+"""
+Fleet-wide cost optimization of an EnhancedRDSCalculator bulk analysis.
+
+Per-database sizing scores every workload x environment on its own.
+``optimize_fleet`` chooses the instance, deployment, storage type and purchase
+option of all of them jointly, against a total monthly budget and/or a minimum
+headroom, as a multiple-choice knapsack:
+
+- every workload x environment (an item) picks exactly one instance
+- an option's value is its compute headroom over the measured demand
+  (utilized cores and memory times the environment factor), capped at
+  HEADROOM_CAP and weighted by environment (ENV_WEIGHTS)
+- deployment, storage type and purchase option do not change headroom, so
+  each item takes its cheapest allowed combination exactly; the knapsack is
+  over instances, with costs that already include them
+
+The solver starts from the cheapest instance meeting the minimum headroom
+and walks the upper convex hull of every item's (cost, value) options in
+order of value per dollar. That order is the Pareto frontier of cost versus
+fleet headroom, and every point on it is a real plan. Within a budget the
+greedy prefix is then improved by local search: single upgrades into the
+leftover budget and downgrade/upgrade swaps between items. All of it runs on
+(items x instances) arrays, so thousands of databases solve in a fraction of a second.
+"""
+import numpy as np
+import pandas as pd
+
+from config import Config
+from storage_pricing import cheapest_storage
+from tco import RI_OPTIONS
+from vectorized_sizing import ENV_SIZING, _columns_from_records, _requirements, candidate_instances
+
+# Instance cost factor per deployment; EnhancedRDSCalculator bills PROD Multi-AZ and the rest Single-AZ
+DEPLOYMENTS = {"Single-AZ": 1, "Multi-AZ": 2}
+ENV_DEPLOYMENTS = {"PROD": ["Multi-AZ"]}
+DEFAULT_DEPLOYMENTS = ["Single-AZ"]
+
+ON_DEMAND = "On-Demand"
+# Environments long-lived enough to reserve
+RI_ENVS = ("PROD", "STAGING")
+
+# Value of a unit of headroom by environment, and the headroom beyond which more is worth nothing
+ENV_WEIGHTS = {"PROD": 1.0, "STAGING": 0.5, "QA": 0.25, "DEV": 0.25}
+HEADROOM_CAP = 1.0
+FRONTIER_POINTS = 200
+# Top upgrade moves tried against every downgrade in one swap round
+SWAP_CANDIDATES = 64
+
+
+def _purchase_options(env: str, ri_envs) -> list:
+    """(label, discount) pairs allowed in ``env``"""
+    options = [(ON_DEMAND, 0.0)]
+    if env in ri_envs:
+        options += [(f"{term} {payment}", discount) for (term, payment), (_, _, discount) in RI_OPTIONS.items()]
+    return options
+
+
+def _items(calculator, all_results: list, envs: list, target_headroom: float, ri_envs, deployments: dict) -> dict:
+    """Padded (items x options) cost, value and choice arrays for every workload x environment"""
+    inputs_list = [result['inputs'] for result in all_results]
+    columns = _columns_from_records(inputs_list)
+
+    blocks = []
+    for env in envs:
+        profile = calculator.env_profiles[env]
+        min_vcpus, min_ram = ENV_SIZING[env][:2]
+        cpu_need = columns["cores"] * (columns["cpu_util"] / 100) * profile['cpu_factor']
+        ram_need = columns["ram"] * (columns["ram_util"] / 100) * profile['cpu_factor']
+        _, _, storage_gb = _requirements(calculator, columns, env)
+
+        # Storage type: the cheapest for each item's capacity and IOPS (see storage_pricing); Aurora
+        # I/O-Optimized is weighed against the baseline instance cost and scales every instance's cost
+        baseline_instance = np.array([result['recommendations'][env]['cost_breakdown']['instance'] for result in all_results])
+        storage = cheapest_storage(np.array(columns["engine"], dtype=object), storage_gb, columns["iops"],
+                                   instance_monthly=baseline_instance)
+        fixed = (storage["total"] + storage_gb * 0.095 * (columns["backup_days"] / 30)
+                 + columns["data_transfer_gb"] * 0.09)
+
+        # Deployment and purchase option: the cheapest allowed, per environment
+        allowed = deployments.get(env) or ENV_DEPLOYMENTS.get(env, DEFAULT_DEPLOYMENTS)
+        deployment = min(allowed, key=DEPLOYMENTS.get)
+        purchase, discount = max(_purchase_options(env, ri_envs), key=lambda option: option[1])
+
+        groups = {}
+        for i, key in enumerate(zip(columns["region"], columns["engine"])):
+            groups.setdefault(key, []).append(i)
+        for (region, engine), rows in groups.items():
+            rows = np.array(rows)
+            catalog = [instance for instance in candidate_instances(calculator, region, engine, env)
+                       if instance["vCPU"] > 0]
+            vcpu = np.array([instance["vCPU"] for instance in catalog], dtype=float)
+            memory = np.array([instance["memory"] for instance in catalog], dtype=float)
+            hourly = np.array([instance["pricing"]["ondemand"] for instance in catalog])
+
+            on_demand = hourly * 24 * 30 * DEPLOYMENTS[deployment]
+            monitoring = on_demand * 0.1 if env == "PROD" else 0
+            cost = (on_demand * (1 - discount) + monitoring)[None, :] * storage["instance_factor"][rows, None] + fixed[rows, None]
+            with np.errstate(divide="ignore", invalid="ignore"):
+                headroom = np.minimum(vcpu[None, :] / cpu_need[rows, None], memory[None, :] / ram_need[rows, None]) - 1
+            headroom = np.nan_to_num(headroom, nan=HEADROOM_CAP, posinf=HEADROOM_CAP)
+            feasible = (headroom >= target_headroom - 1e-9) & (vcpu >= min_vcpus) & (memory >= min_ram)
+            # Items nothing fits keep the option with the most headroom
+            fallback = headroom.argmax(axis=1)
+            none = ~feasible.any(axis=1)
+            feasible[none, fallback[none]] = True
+
+            blocks.append({
+                "row": rows, "env": env, "catalog": catalog, "cost": cost, "headroom": headroom,
+                "value": ENV_WEIGHTS.get(env, 1.0) * np.minimum(headroom, HEADROOM_CAP), "feasible": feasible,
+                "meets_target": ~none, "deployment": deployment, "purchase": purchase,
+                "storage_type": storage["storage_type"][rows],
+                "baseline": [all_results[i]['recommendations'][env] for i in rows],
+            })
+
+    width = max((len(block["catalog"]) for block in blocks), default=0)
+    pad = lambda key, fill: np.vstack([np.pad(block[key], ((0, 0), (0, width - block[key].shape[1])),
+                                              constant_values=fill) for block in blocks])
+    feasible = pad("feasible", False)
+    return {
+        "blocks": blocks,
+        "cost": np.where(feasible, pad("cost", np.inf), np.inf),
+        "value": np.where(feasible, pad("value", -np.inf), -np.inf),
+        "headroom": pad("headroom", np.nan),
+        "weight": np.concatenate([np.full(len(block["row"]), ENV_WEIGHTS.get(block["env"], 1.0)) for block in blocks]),
+    }
+
+
+def _hull_steps(cost: np.ndarray, value: np.ndarray, start: np.ndarray) -> tuple:
+    """Upper convex hull moves of every item from ``start``: (item, option, added cost, added value, slope)"""
+    rows = np.arange(len(cost))
+    current = start.copy()
+    active = np.ones(len(cost), dtype=bool)
+    steps = []
+    while active.any():
+        c0 = cost[rows, current][:, None]
+        v0 = value[rows, current][:, None]
+        dc, dv = cost - c0, value - v0
+        with np.errstate(divide="ignore", invalid="ignore"):
+            slope = np.where((dc > 0) & (dv > 0) & np.isfinite(dc), dv / dc, -np.inf)
+        slope[~active] = -np.inf
+        nxt = slope.argmax(axis=1)
+        best = slope[rows, nxt]
+        active = np.isfinite(best)
+        items = np.nonzero(active)[0]
+        steps.append((items, nxt[items], dc[items, nxt[items]], dv[items, nxt[items]], best[items]))
+        current[items] = nxt[items]
+    item, option, dc, dv, slope = (np.concatenate(part) for part in zip(*steps))
+    return item, option, dc, dv, slope
+
+
+def _local_search(cost: np.ndarray, value: np.ndarray, choice: np.ndarray, budget: float, rounds: int) -> np.ndarray:
+    """Improve a plan within ``budget``: best single upgrade into the slack, else the best downgrade/upgrade swap"""
+    rows = np.arange(len(cost))
+    for _ in range(rounds):
+        c0 = cost[rows, choice][:, None]
+        v0 = value[rows, choice][:, None]
+        slack = budget - c0.sum()
+        dc, dv = cost - c0, value - v0
+
+        gain = np.where((dc <= slack + 1e-9) & (dv > 1e-12), dv, 0)
+        if gain.max() > 0:
+            item, option = np.unravel_index(gain.argmax(), gain.shape)
+            choice[item] = option
+            continue
+
+        # Swaps: an upgrade paid for by a downgrade elsewhere
+        up_item, up_option = np.nonzero((dv > 1e-12) & np.isfinite(dc))
+        down_item, down_option = np.nonzero((dc < 0) & np.isfinite(dv))
+        if not len(up_item) or not len(down_item):
+            break
+        top = np.argsort(-dv[up_item, up_option])[:SWAP_CANDIDATES]
+        up_item, up_option = up_item[top], up_option[top]
+        saving = -dc[down_item, down_option]
+        loss = -dv[down_item, down_option]
+        order = np.argsort(saving)
+        saving, loss = saving[order], loss[order]
+        down_item, down_option = down_item[order], down_option[order]
+        # Cheapest loss among downgrades saving at least s: suffix minimum over savings
+        suffix = np.minimum.accumulate(loss[::-1])[::-1]
+
+        best_gain, best_move = 1e-12, None
+        for item, option in zip(up_item, up_option):
+            k = np.searchsorted(saving, dc[item, option] - slack - 1e-9)
+            if k >= len(saving) or dv[item, option] - suffix[k] <= best_gain:
+                continue
+            # The cheapest-loss downgrade from k on, skipping the upgraded item itself
+            candidates = np.nonzero(down_item[k:] != item)[0] + k
+            if not len(candidates):
+                continue
+            j = candidates[np.argmin(loss[candidates])]
+            if dv[item, option] - loss[j] > best_gain:
+                best_gain, best_move = dv[item, option] - loss[j], (item, option, down_item[j], down_option[j])
+        if best_move is None:
+            break
+        item, option, down, down_to = best_move
+        choice[item], choice[down] = option, down_to
+    return choice
+
+
+def optimize_fleet(calculator, all_results: list, budget: float = None, target_headroom: float = 0.0,
+                   envs: list = None, ri_envs=RI_ENVS, deployments: dict = None, rounds: int = None):
+    """(plan DataFrame, cost vs headroom frontier DataFrame) for an EnhancedRDSCalculator bulk analysis
+
+    ``target_headroom`` is the minimum spare compute of every item (0.2 = 20%
+    over demand). Without a ``budget`` the plan is the cheapest meeting it;
+    with one, the plan with the most weighted headroom within it (the cheapest
+    plan when the budget is below that). ``ri_envs`` are the environments
+    that may be reserved; ``deployments`` maps an environment to the
+    deployments it may use.
+    """
+    rounds = Config.FLEET_LOCAL_SEARCH_ROUNDS if rounds is None else rounds
+    envs = envs or (list(all_results[0]['recommendations']) if all_results else [])
+    plan_columns = ["db_name", "environment", "engine", "region", "instance_type", "deployment", "storage_type",
+                    "purchase_option", "vcpus", "ram_gb", "headroom_percent", "meets_target", "monthly_cost",
+                    "baseline_instance", "baseline_cost", "savings"]
+    frontier_columns = ["monthly_cost", "headroom_percent"]
+    if not all_results or not envs:
+        return pd.DataFrame(columns=plan_columns), pd.DataFrame(columns=frontier_columns)
+
+    items = _items(calculator, all_results, envs, target_headroom, ri_envs, deployments or {})
+    cost, value, weight = items["cost"], items["value"], items["weight"]
+    rows = np.arange(len(cost))
+
+    # Cheapest feasible option per item (most value among equal costs)
+    start = np.lexsort((-value, cost), axis=1)[:, 0]
+    start_cost = cost[rows, start].sum()
+    start_value = value[rows, start].sum()
+
+    # Frontier: hull moves in order of value per dollar (each item's moves have falling slopes)
+    item, option, dc, dv, slope = _hull_steps(cost, value, start)
+    order = np.lexsort((np.arange(len(slope)), -slope))
+    item, option, dc, dv = item[order], option[order], dc[order], dv[order]
+    frontier_cost = start_cost + np.concatenate([[0], np.cumsum(dc)])
+    frontier_value = start_value + np.concatenate([[0], np.cumsum(dv)])
+    keep = np.unique(np.linspace(0, len(frontier_cost) - 1, min(FRONTIER_POINTS, len(frontier_cost))).round().astype(int))
+    frontier = pd.DataFrame({
+        "monthly_cost": frontier_cost[keep],
+        "headroom_percent": frontier_value[keep] / weight.sum() * 100,
+    }, columns=frontier_columns)
+
+    choice = start.copy()
+    if budget is not None and budget > start_cost:
+        # Greedy: the longest frontier prefix within budget, then the later moves that still fit
+        taken = np.searchsorted(frontier_cost, budget + 1e-9, side="right") - 1
+        choice[item[:taken]] = option[:taken]
+        spent = frontier_cost[taken]
+        blocked = np.zeros(len(cost), dtype=bool)
+        for k in range(taken, len(item)):
+            if blocked[item[k]]:
+                continue
+            if spent + dc[k] <= budget + 1e-9:
+                choice[item[k]] = option[k]
+                spent += dc[k]
+            else:
+                blocked[item[k]] = True  # its later moves build on this one
+        choice = _local_search(cost, value, choice, budget, rounds)
+
+    plan_rows = []
+    offset = 0
+    names = [result['inputs'].get('db_name', f'Database {i+1}') for i, result in enumerate(all_results)]
+    for block in items["blocks"]:
+        for k, i in enumerate(block["row"]):
+            j = choice[offset + k]
+            instance = block["catalog"][j]
+            baseline = block["baseline"][k]
+            plan_rows.append({
+                "db_name": names[i], "environment": block["env"], "engine": all_results[i]['inputs']['engine'],
+                "region": all_results[i]['inputs']['region'], "instance_type": instance["type"],
+                "deployment": block["deployment"], "storage_type": block["storage_type"][k],
+                "purchase_option": block["purchase"], "vcpus": instance["vCPU"], "ram_gb": instance["memory"],
+                "headroom_percent": float(block["headroom"][k, j]) * 100, "meets_target": bool(block["meets_target"][k]),
+                "monthly_cost": float(cost[offset + k, j]), "baseline_instance": baseline['instance_type'],
+                "baseline_cost": baseline['monthly_cost'], "savings": baseline['monthly_cost'] - float(cost[offset + k, j]),
+            })
+        offset += len(block["row"])
+    return pd.DataFrame(plan_rows, columns=plan_columns), frontier
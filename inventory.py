@@ -0,0 +1,154 @@
+"""
+Database inventory parsing for bulk uploads and the batch CLI.
+
+CSV, Excel, Parquet and Arrow IPC (.arrow/.feather) inventories are accepted.
+Typed columnar files skip the per-row conversion: when every numeric column
+already has a numeric dtype, rows are normalized column-wise and only rows
+with missing values fall back to ``normalize_inputs`` for their error message.
+"""
+import numpy as np
+import pandas as pd
+
+# Parquet and Arrow IPC are read and written through pyarrow
+try:
+    import pyarrow
+    import pyarrow.ipc
+    PARQUET_AVAILABLE = True
+except ImportError:
+    PARQUET_AVAILABLE = False
+
+ARROW_EXTENSIONS = ('.arrow', '.feather', '.ipc')
+UPLOAD_TYPES = ["csv", "xlsx", "parquet", "arrow", "feather"]
+
+# Field -> default for missing columns (None: required), as in normalize_inputs
+INT_FIELDS = {
+    'cores': None, 'cpu_util': 65, 'ram': 0, 'ram_util': 75, 'storage': 100,
+    'iops': 8000, 'backup_days': 7, 'years': 3, 'data_transfer_gb': 100
+}
+FLOAT_FIELDS = {'growth': 15}
+TEXT_FIELDS = ['db_name', 'engine', 'region']
+
+
+def normalize_inputs(row) -> dict:
+    """Typed sizing inputs with defaults from one inventory row (a dict or pandas Series)"""
+    return {
+        'db_name': str(row['db_name']),
+        'engine': str(row['engine']),
+        'region': str(row['region']),
+        'cores': int(row['cores']),
+        'cpu_util': int(row.get('cpu_util', 65)),
+        'ram': int(row.get('ram', 0)), # Ensure RAM is handled safely
+        'ram_util': int(row.get('ram_util', 75)),
+        'storage': int(row.get('storage', 100)), # Default to 100 if missing
+        'iops': int(row.get('iops', 8000)),
+        'growth': float(row.get('growth', 15)),
+        'backup_days': int(row.get('backup_days', 7)),
+        'years': int(row.get('years', 3)),
+        'data_transfer_gb': int(row.get('data_transfer_gb', 100))
+    }
+
+
+def read_arrow_ipc(source) -> pd.DataFrame:
+    """Arrow IPC file (Feather v2) or stream format"""
+    data = source.read() if hasattr(source, 'read') else open(source, 'rb').read()
+    try:
+        table = pyarrow.ipc.open_file(pyarrow.py_buffer(data)).read_all()
+    except pyarrow.ArrowInvalid:
+        table = pyarrow.ipc.open_stream(pyarrow.py_buffer(data)).read_all()
+    return table.to_pandas()
+
+
+def normalize_frame(df: pd.DataFrame):
+    """normalize_inputs for every row of ``df``; returns (valid_inputs, errors)"""
+    numeric = [field for field in [*INT_FIELDS, *FLOAT_FIELDS] if field in df.columns]
+    if not all(pd.api.types.is_numeric_dtype(df[field]) for field in numeric):
+        # Untyped (e.g. text) columns keep Python's int()/float() conversion rules
+        return _normalize_rows(df, df.index)
+
+    n = len(df)
+    columns = {}
+    invalid = np.zeros(n, dtype=bool)
+    for field, default in INT_FIELDS.items():
+        if field in df.columns:
+            values = df[field].to_numpy(dtype=float, na_value=np.nan)
+            invalid |= ~np.isfinite(values)
+            columns[field] = np.trunc(np.nan_to_num(values)).astype(np.int64).tolist()
+        else:
+            columns[field] = [default] * n
+    for field, default in FLOAT_FIELDS.items():
+        columns[field] = (df[field].to_numpy(dtype=float, na_value=np.nan).tolist() if field in df.columns
+                          else [float(default)] * n)
+    for field in TEXT_FIELDS:
+        columns[field] = df[field].astype(str).tolist()
+
+    order = ['db_name', 'engine', 'region', 'cores', 'cpu_util', 'ram', 'ram_util', 'storage',
+             'iops', 'growth', 'backup_days', 'years', 'data_transfer_gb']
+    valid_inputs = [
+        {field: columns[field][i] for field in order}
+        for i in range(n) if not invalid[i]
+    ]
+    # Rows with missing values go through the row path for its error message
+    _, errors = _normalize_rows(df, df.index[invalid])
+    if len(errors) == invalid.sum():
+        return valid_inputs, errors
+    return _normalize_rows(df, df.index)
+
+
+def _normalize_rows(df: pd.DataFrame, index):
+    valid_inputs = []
+    errors = []
+    for position in index:
+        try:
+            valid_inputs.append(normalize_inputs(df.loc[position]))
+        except Exception as e:
+            errors.append(f"Row {position + 1}: {str(e)}")
+    return valid_inputs, errors
+
+
+def read_inventory(uploaded_file) -> pd.DataFrame:
+    """DataFrame from a CSV/Excel/Parquet/Arrow upload or open file, by file name"""
+    name = uploaded_file.name.lower()
+    if name.endswith('.csv'):
+        return pd.read_csv(uploaded_file)
+    if name.endswith('.parquet'):
+        return pd.read_parquet(uploaded_file)
+    if name.endswith(ARROW_EXTENSIONS):
+        return read_arrow_ipc(uploaded_file)
+    return pd.read_excel(uploaded_file)
+
+
+def parse_uploaded_file(uploaded_file):
+    """Parse uploaded CSV/Excel/Parquet/Arrow file with database configurations"""
+    try:
+        df = read_inventory(uploaded_file)
+        
+        # Column mapping for different naming conventions
+        column_mapping = {
+            'database_name': 'db_name',
+            'database_engine': 'engine', 
+            'aws_region': 'region',
+            'cpu_cores': 'cores',
+            'cpu_utilization': 'cpu_util',
+            'ram_gb': 'ram',
+            'ram_utilization': 'ram_util',
+            'storage_gb': 'storage',
+            'growth_rate': 'growth',
+            'projection_years': 'years',
+            'data_transfer_gb': 'data_transfer_gb'
+        }
+        
+        # Rename columns to match expected format
+        df = df.rename(columns=column_mapping)
+        
+        # Expected columns (after mapping)
+        required_columns = ['db_name', 'engine', 'region', 'cores', 'ram', 'storage']
+        
+        # Check for required columns
+        missing_columns = [col for col in required_columns if col not in df.columns]
+        if missing_columns:
+            return [], [f"Missing required columns: {', '.join(missing_columns)}"]
+        
+        return normalize_frame(df.reset_index(drop=True))
+        
+    except Exception as e:
+        return [], [f"File parsing error: {str(e)}"]
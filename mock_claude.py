@@ -0,0 +1,571 @@
+"""
+Local stand-in for the Claude Messages API used for offline AI throughput testing.
+
+Answers ``POST /v1/messages`` with canned analyses shaped like real responses,
+with a lognormal latency distribution, 429 rate-limit and 529 overload errors
+(carrying ``retry-after``), an optional requests-per-minute ceiling, and SSE
+streaming when ``"stream": true``. Point the app at it with
+``AI_BASE_URL=http://127.0.0.1:8766`` or benchmark the bulk AI path directly:
+
+    python mock_claude.py serve --port 8766 --latency-ms 900 --overload-rate 0.02
+    python mock_claude.py bench --workloads 40 --threads 8 --rate-limit-rate 0.05
+"""
+import argparse
+import itertools
+import json
+import math
+import random
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+WORKLOAD_ANALYSIS_TEXT = """Workload Classification: OLTP
+Complexity: Medium
+Migration Timeline: 8-12 weeks
+
+Right-sizing Recommendations:
+- Start with a memory optimized instance and validate buffer cache hit ratio
+- Enable storage autoscaling with a 20% headroom threshold
+- Use gp3 storage and provision IOPS independently of capacity
+
+Performance Bottlenecks:
+- Peak CPU utilization suggests contention during batch windows
+- IOPS requirement is close to the gp2 baseline for the allocated volume
+
+Risk Assessment:
+- Application connection strings and drivers must be updated
+- Long-running transactions may extend the cutover window
+
+Cost Optimization:
+- Reserved Instances for production after the first month of stable usage
+- Schedule non-production environments to stop outside business hours
+"""
+
+MIGRATION_STRATEGY_TEXT = """Phase 1: Assessment and Planning (2 weeks)
+- Inventory schemas, dependencies and integration points
+- Run AWS SCT to estimate conversion effort
+
+Phase 2: Schema Conversion and Environment Build (3 weeks)
+- Provision target RDS environments with Infrastructure as Code
+- Convert schema objects and resolve action items
+
+Phase 3: Data Migration and Validation (3 weeks)
+- Full load with AWS DMS followed by change data capture
+- Row count and checksum validation
+
+Phase 4: Cutover and Optimization (1 week)
+- Final sync, application switch and rollback checkpoint
+- Post-migration performance tuning
+
+Risks:
+- Data type incompatibilities during conversion
+- Extended cutover if CDC lag is not monitored
+"""
+
+PREDICTIONS_TEXT = """CPU: Expect roughly 35% more vCPU demand over the period
+Memory: Working set grows with data volume; plan for 40% more RAM
+Storage: Compound growth at the stated annual rate plus 15% for indexes and logs
+IOPS: Scale linearly with transaction volume, about 30% higher
+Cost: Projected monthly cost rises in line with compute and storage growth
+
+Key Assumptions:
+- Growth continues at the historical rate
+- No major change in workload mix
+
+Confidence: Medium
+"""
+
+
+def _estimate_tokens(text):
+    return max(1, len(text) // 4)
+
+
+CANNED_WORKLOAD_ANALYSIS = {
+    "workload_type": "OLTP",
+    "complexity": "Medium",
+    "timeline_weeks": 10,
+    "bottlenecks": ["Peak CPU contention during batch windows"],
+    "bottleneck_categories": ["cpu"],
+    "recommendations": ["Use gp3 storage with provisioned IOPS", "Enable Performance Insights"],
+    "risks": ["Driver and connection string changes"],
+    "risk_categories": ["compatibility"],
+    "summary": "Transactional workload suited to a memory optimized RDS instance.",
+}
+
+CANNED_MIGRATION_STRATEGY = {
+    "phases": [
+        {"name": "Assessment and Planning", "weeks": 2, "activities": ["Inventory schemas and dependencies"]},
+        {"name": "Schema Conversion", "weeks": 3, "activities": ["Convert objects with AWS SCT"]},
+        {"name": "Data Migration and Validation", "weeks": 3, "activities": ["Full load and CDC with AWS DMS"]},
+        {"name": "Cutover and Optimization", "weeks": 1, "activities": ["Final sync and application switch"]},
+    ],
+    "resources": ["Database Migration Specialist", "Cloud Architect"],
+    "risks": ["Data type incompatibilities during conversion"],
+    "tools": ["AWS DMS", "AWS SCT"],
+    "checklist": ["Map application dependencies", "Define rollback checkpoints"],
+    "rollback_plan": "Keep the source writable until validation passes and reverse CDC is in place.",
+    "summary": "Phased DMS migration with CDC to keep the cutover window short.",
+}
+
+CANNED_PREDICTIONS = {
+    "cpu": {"direction": "gradual_increase", "growth_pct": 35, "note": ""},
+    "memory": {"direction": "gradual_increase", "growth_pct": 40, "note": ""},
+    "storage": {"direction": "rapid_increase", "growth_pct": 72, "note": "Compound data growth"},
+    "iops": {"direction": "gradual_increase", "growth_pct": 30, "note": ""},
+    "cost": {"direction": "gradual_increase", "growth_pct": 38, "note": ""},
+    "confidence": "Medium",
+    "key_factors": ["Historical growth rate", "Workload mix"],
+    "recommendations": ["Plan for a 20% capacity buffer"],
+}
+
+
+def _batch_db_names(prompt):
+    """db_name column of the workload lines in a batched prompt"""
+    names = []
+    in_workloads = False
+    for line in prompt.splitlines():
+        line = line.strip()
+        if line.startswith("Workloads ("):
+            in_workloads = True
+        elif in_workloads and "|" in line:
+            names.append(line.split("|")[0].strip())
+        elif in_workloads and names:
+            break
+    return names
+
+
+def batched_response_text(prompt):
+    """JSON answer for a batched workload prompt, one entry per listed db_name"""
+    return json.dumps({name: CANNED_WORKLOAD_ANALYSIS for name in _batch_db_names(prompt)}, indent=1)
+
+
+def canned_tool_input(tool_name, prompt):
+    """Structured answer for the forced tool calls AIAnalytics makes"""
+    if tool_name == "record_workload_analyses":
+        return {"analyses": [dict(CANNED_WORKLOAD_ANALYSIS, db_name=name) for name in _batch_db_names(prompt)]}
+    if tool_name == "record_migration_strategy":
+        return CANNED_MIGRATION_STRATEGY
+    if tool_name == "record_capacity_predictions":
+        return CANNED_PREDICTIONS
+    return CANNED_WORKLOAD_ANALYSIS
+
+
+def canned_response_text(prompt):
+    """Pick a canned answer matching the kind of AIAnalytics prompt received"""
+    lowered = prompt.lower()
+    # Task markers from ai_prompts.py take precedence over keyword matching
+    for marker, text in [("task: batched workload analysis", None), ("task: workload analysis", WORKLOAD_ANALYSIS_TEXT),
+                         ("task: migration strategy", MIGRATION_STRATEGY_TEXT), ("task: capacity prediction", PREDICTIONS_TEXT)]:
+        if marker in lowered:
+            return text if text is not None else batched_response_text(prompt)
+    if "json object keyed by db_name" in lowered:
+        return batched_response_text(prompt)
+    if "analyze this workload" in lowered:
+        return WORKLOAD_ANALYSIS_TEXT
+    if "migration strategy" in lowered:
+        return MIGRATION_STRATEGY_TEXT
+    if "predict" in lowered:
+        return PREDICTIONS_TEXT
+    return WORKLOAD_ANALYSIS_TEXT
+
+
+def _cached_prefix(request):
+    """Serialized tools + system blocks up to the last cache breakpoint, or None"""
+    parts = [json.dumps(tool, sort_keys=True) for tool in request.get("tools") or []]
+    system = request.get("system")
+    blocks = [{"type": "text", "text": system}] if isinstance(system, str) else list(system or [])
+
+    prefix = None
+    for block in blocks:
+        parts.append(block.get("text", ""))
+        if block.get("cache_control"):
+            prefix = "\n".join(parts)
+    return prefix
+
+
+def _prompt_text(messages):
+    parts = []
+    for message in messages or []:
+        content = message.get("content", "")
+        if isinstance(content, str):
+            parts.append(content)
+        else:
+            parts.extend(block.get("text", "") for block in content if isinstance(block, dict))
+    return "\n".join(parts)
+
+
+class RateLimitedError(Exception):
+    def __init__(self, status, error_type, message, retry_after):
+        super().__init__(message)
+        self.status = status
+        self.error_type = error_type
+        self.retry_after = retry_after
+
+
+class MockClaudeService:
+    """Generates Messages API responses with latency and failure knobs"""
+
+    def __init__(self, latency_ms=800.0, latency_sigma=0.5, rate_limit_rate=0.0, overload_rate=0.0,
+                 max_requests_per_minute=None, retry_after_seconds=1.0, stream_chunk_chars=40,
+                 stream_chunk_delay_ms=15.0, seed=None, responder=None, cache_min_tokens=1024, cache_ttl_seconds=300):
+        self.latency_ms = latency_ms
+        self.latency_sigma = latency_sigma
+        self.rate_limit_rate = rate_limit_rate
+        self.overload_rate = overload_rate
+        self.max_requests_per_minute = max_requests_per_minute
+        self.retry_after_seconds = retry_after_seconds
+        self.stream_chunk_chars = max(1, int(stream_chunk_chars))
+        self.stream_chunk_delay_ms = stream_chunk_delay_ms
+        self.responder = responder or canned_response_text
+        self.cache_min_tokens = cache_min_tokens
+        self.cache_ttl_seconds = cache_ttl_seconds
+        self._prompt_cache = {}
+
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._window_start = time.monotonic()
+        self._window_count = 0
+        self.reset_stats()
+
+    def reset_stats(self):
+        with self._lock:
+            self.stats = {"requests": 0, "completed": 0, "streamed": 0, "rate_limited": 0, "overloaded": 0,
+                          "input_tokens": 0, "cache_read_input_tokens": 0, "cache_creation_input_tokens": 0,
+                          "output_tokens": 0}
+
+    def _sample_latency(self):
+        """Lognormal with median ``latency_ms``, matching the long tail of real calls"""
+        if not self.latency_ms:
+            return 0.0
+        return self.latency_ms * math.exp(self._rng.gauss(0, self.latency_sigma)) / 1000
+
+    def admit(self):
+        """Decide whether to serve a request; raises RateLimitedError when rejected"""
+        with self._lock:
+            self.stats["requests"] += 1
+            roll = self._rng.random()
+
+            if self.max_requests_per_minute:
+                now = time.monotonic()
+                if now - self._window_start >= 60.0:
+                    self._window_start = now
+                    self._window_count = 0
+                self._window_count += 1
+                if self._window_count > self.max_requests_per_minute:
+                    self.stats["rate_limited"] += 1
+                    retry_after = max(0.0, 60.0 - (now - self._window_start))
+                    raise RateLimitedError(429, "rate_limit_error", "Number of request tokens has exceeded your per-minute rate limit", retry_after)
+
+            if roll < self.rate_limit_rate:
+                self.stats["rate_limited"] += 1
+                raise RateLimitedError(429, "rate_limit_error", "Rate limit exceeded", self.retry_after_seconds)
+            if roll < self.rate_limit_rate + self.overload_rate:
+                self.stats["overloaded"] += 1
+                raise RateLimitedError(529, "overloaded_error", "Overloaded", self.retry_after_seconds)
+
+    def build_message(self, request):
+        prompt = _prompt_text(request.get("messages"))
+        if request.get("system"):
+            prompt = _prompt_text([{"content": request["system"]}]) + "\n" + prompt
+        if request.get("tools"):
+            choice = request.get("tool_choice") or {}
+            tool_name = choice.get("name") or request["tools"][0]["name"]
+            tool_args = canned_tool_input(tool_name, prompt)
+            text = json.dumps(tool_args)
+            content = [{"type": "tool_use", "id": f"toolu_mock_{uuid.uuid4().hex[:24]}", "name": tool_name, "input": tool_args}]
+            stop_reason = "tool_use"
+        else:
+            text = self.responder(prompt)
+            content = [{"type": "text", "text": text}]
+            stop_reason = "end_turn"
+
+        output_tokens = min(_estimate_tokens(text), int(request.get("max_tokens") or 4096))
+        usage = self._prompt_usage(request, prompt)
+        usage["output_tokens"] = output_tokens
+        with self._lock:
+            for key, value in usage.items():
+                self.stats[key] += value
+
+        return {
+            "id": f"msg_mock_{uuid.uuid4().hex[:24]}",
+            "type": "message",
+            "role": "assistant",
+            "model": request.get("model", "mock"),
+            "content": content,
+            "stop_reason": stop_reason,
+            "stop_sequence": None,
+            "usage": usage,
+        }
+
+    def _prompt_usage(self, request, prompt):
+        """Split input tokens into uncached, cache-read and cache-write like the real API"""
+        total = _estimate_tokens(prompt) + sum(_estimate_tokens(json.dumps(t)) for t in request.get("tools") or [])
+        usage = {"input_tokens": total, "cache_read_input_tokens": 0, "cache_creation_input_tokens": 0}
+
+        prefix = _cached_prefix(request)
+        if prefix is None or _estimate_tokens(prefix) < self.cache_min_tokens:
+            return usage
+
+        prefix_tokens = min(total, _estimate_tokens(prefix))
+        key = hash(prefix)
+        now = time.monotonic()
+        with self._lock:
+            hit = now - self._prompt_cache.get(key, float("-inf")) < self.cache_ttl_seconds
+            self._prompt_cache[key] = now  # reads refresh the TTL, as on the real API
+        usage["input_tokens"] = total - prefix_tokens
+        usage["cache_read_input_tokens" if hit else "cache_creation_input_tokens"] = prefix_tokens
+        return usage
+
+    def create_message(self, request):
+        """Non-streaming response after the sampled latency"""
+        self.admit()
+        time.sleep(self._sample_latency())
+        message = self.build_message(request)
+        with self._lock:
+            self.stats["completed"] += 1
+        return message
+
+    def stream_events(self, request):
+        """Yield (event, data) SSE pairs; time to first token is the sampled latency"""
+        self.admit()
+        time.sleep(self._sample_latency())
+        message = self.build_message(request)
+        block = message["content"][0]
+        if block["type"] == "tool_use":
+            text = json.dumps(block["input"])
+            opening = dict(block, input={})
+            delta = lambda chunk: {"type": "input_json_delta", "partial_json": chunk}
+        else:
+            text = block["text"]
+            opening = {"type": "text", "text": ""}
+            delta = lambda chunk: {"type": "text_delta", "text": chunk}
+
+        start = dict(message, content=[], stop_reason=None,
+                     usage=dict(message["usage"], output_tokens=1))
+        yield "message_start", {"type": "message_start", "message": start}
+        yield "content_block_start", {"type": "content_block_start", "index": 0, "content_block": opening}
+
+        for i in range(0, len(text), self.stream_chunk_chars):
+            yield "content_block_delta", {"type": "content_block_delta", "index": 0,
+                                          "delta": delta(text[i:i + self.stream_chunk_chars])}
+            if self.stream_chunk_delay_ms:
+                time.sleep(self.stream_chunk_delay_ms / 1000)
+
+        yield "content_block_stop", {"type": "content_block_stop", "index": 0}
+        yield "message_delta", {"type": "message_delta", "delta": {"stop_reason": message["stop_reason"], "stop_sequence": None},
+                                "usage": {"output_tokens": message["usage"]["output_tokens"]}}
+        yield "message_stop", {"type": "message_stop"}
+
+        with self._lock:
+            self.stats["completed"] += 1
+            self.stats["streamed"] += 1
+
+
+class ClaudeRequestHandler(BaseHTTPRequestHandler):
+    """Minimal Messages API over HTTP for the anthropic SDK"""
+
+    protocol_version = "HTTP/1.1"
+    service = None  # set by make_server
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)) or 0)
+        if self.path.rstrip("/") != "/v1/messages":
+            return self._send_json(404, {"type": "error", "error": {"type": "not_found_error", "message": self.path}})
+
+        try:
+            request = json.loads(body or b"{}")
+        except ValueError:
+            return self._send_json(400, {"type": "error", "error": {"type": "invalid_request_error", "message": "Invalid JSON"}})
+
+        try:
+            if request.get("stream"):
+                self._send_stream(self.service.stream_events(request))
+            else:
+                self._send_json(200, self.service.create_message(request))
+        except RateLimitedError as e:
+            self._send_json(e.status, {"type": "error", "error": {"type": e.error_type, "message": str(e)}},
+                            {"retry-after": f"{e.retry_after:.2f}"})
+
+    def _send_json(self, status, payload, headers=None):
+        data = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.send_header("request-id", f"req_mock_{uuid.uuid4().hex[:24]}")
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _send_stream(self, events):
+        # Pull the first event before sending headers so a RateLimitedError still maps to 429/529
+        events = iter(events)
+        first = next(events)
+
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        self.close_connection = True
+
+        for event, data in itertools.chain([first], events):
+            self.wfile.write(f"event: {event}\ndata: {json.dumps(data)}\n\n".encode())
+            self.wfile.flush()
+
+    def log_message(self, format, *args):
+        pass
+
+
+def make_server(service, host="127.0.0.1", port=8766):
+    """Create an HTTP server for the service (port 0 picks a free port)"""
+    handler = type("BoundClaudeRequestHandler", (ClaudeRequestHandler,), {"service": service})
+    return ThreadingHTTPServer((host, port), handler)
+
+
+def start_background_server(service, host="127.0.0.1", port=0):
+    """Serve in a daemon thread; returns (server, base_url)"""
+    server = make_server(service, host, port)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://{host}:{server.server_address[1]}"
+
+
+def _percentile(values, pct):
+    if not values:
+        return None
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(math.ceil(pct / 100 * len(ordered))) - 1))
+    return round(ordered[index], 1)
+
+
+def sample_workloads(count, seed=None):
+    """Synthetic bulk-upload rows for driving AIAnalytics"""
+    rng = random.Random(seed)
+    engines = ["postgres", "oracle-ee", "aurora-postgresql", "sqlserver"]
+    return [
+        {
+            "engine": rng.choice(engines),
+            "cores": rng.choice([4, 8, 16, 32]),
+            "ram": rng.choice([16, 32, 64, 128]),
+            "storage": rng.randint(100, 5000),
+            "cpu_util": rng.randint(30, 90),
+            "ram_util": rng.randint(40, 95),
+            "iops": rng.randint(1000, 20000),
+            "growth": rng.randint(5, 40),
+            "region": "us-east-1",
+            "monthly_cost": rng.uniform(500, 15000),
+        }
+        for _ in range(count)
+    ]
+
+
+def run_ai_benchmark(transport, workloads, threads=8, include_strategy=True, include_predictions=True):
+    """Run the bulk AI path (per-workload analysis calls) concurrently and report throughput"""
+    from concurrent.futures import ThreadPoolExecutor
+    from ai_analytics import AIAnalytics
+
+    ai = AIAnalytics(api_key="mock", transport=transport)
+    latencies = []
+    errors = []
+    lock = threading.Lock()
+
+    calls = [(ai.analyze_workload_patterns, w) for w in workloads]
+    if include_strategy:
+        calls += [(ai.generate_migration_strategy, w) for w in workloads]
+    if include_predictions:
+        calls += [(ai.predict_future_requirements, w) for w in workloads]
+
+    def run(call):
+        fn, payload = call
+        start = time.perf_counter()
+        result = fn(payload)
+        elapsed = (time.perf_counter() - start) * 1000
+        with lock:
+            latencies.append(elapsed)
+            if "error" in result:
+                errors.append(result["error"])
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        list(pool.map(run, calls))
+    elapsed = time.perf_counter() - start
+
+    return {
+        "calls": len(calls),
+        "threads": threads,
+        "seconds": round(elapsed, 3),
+        "calls_per_second": round(len(calls) / elapsed, 2) if elapsed else None,
+        "latency_ms_p50": _percentile(latencies, 50),
+        "latency_ms_p90": _percentile(latencies, 90),
+        "latency_ms_p99": _percentile(latencies, 99),
+        "errors": len(errors),
+        "sample_errors": errors[:3],
+        "ai_usage": ai.usage.snapshot(),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local mock Claude Messages API")
+    parser.add_argument("mode", choices=["serve", "bench"])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8766)
+    parser.add_argument("--latency-ms", type=float, default=800.0, help="Median response latency")
+    parser.add_argument("--latency-sigma", type=float, default=0.5, help="Lognormal spread of latency")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="Fraction of requests answered with 429")
+    parser.add_argument("--overload-rate", type=float, default=0.0, help="Fraction of requests answered with 529")
+    parser.add_argument("--max-rpm", type=int, default=None, help="Hard requests-per-minute ceiling")
+    parser.add_argument("--retry-after", type=float, default=1.0)
+    parser.add_argument("--workloads", type=int, default=20)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--max-retries", type=int, default=2, help="anthropic SDK retries in bench mode")
+    parser.add_argument("--record", help="Also record the benchmark exchanges to this cassette")
+    parser.add_argument("--scheduler", action="store_true", help="Route calls through RateLimitScheduler (SDK retries off)")
+    parser.add_argument("--rpm", type=int, default=600, help="Scheduler requests-per-minute budget")
+    parser.add_argument("--tpm", type=int, default=1000000, help="Scheduler tokens-per-minute budget")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    service = MockClaudeService(
+        latency_ms=args.latency_ms,
+        latency_sigma=args.latency_sigma,
+        rate_limit_rate=args.rate_limit_rate,
+        overload_rate=args.overload_rate,
+        max_requests_per_minute=args.max_rpm,
+        retry_after_seconds=args.retry_after,
+        seed=args.seed,
+    )
+
+    if args.mode == "serve":
+        server = make_server(service, args.host, args.port)
+        print(f"Mock Claude API listening on http://{args.host}:{args.port}")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        return
+
+    from ai_scheduler import RateLimitScheduler, ScheduledTransport
+    from ai_transport import AnthropicTransport, RecordingTransport
+
+    server, url = start_background_server(service, args.host, 0)
+    scheduler = None
+    if args.scheduler:
+        scheduler = RateLimitScheduler(requests_per_minute=args.rpm, tokens_per_minute=args.tpm,
+                                       max_concurrency=args.threads, base_delay=0.2, max_delay=10.0, seed=args.seed)
+        transport = ScheduledTransport(AnthropicTransport("mock", base_url=url, max_retries=0), scheduler)
+    else:
+        transport = AnthropicTransport("mock", base_url=url, max_retries=args.max_retries)
+    if args.record:
+        transport = RecordingTransport(transport, args.record)
+
+    results = run_ai_benchmark(transport, sample_workloads(args.workloads, args.seed), threads=args.threads)
+    results["service_stats"] = dict(service.stats)
+    if scheduler is not None:
+        results["scheduler_stats"] = scheduler.snapshot()
+    server.shutdown()
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -5,6 +5,14 @@ import boto3
 from datetime import datetime
 from functools import lru_cache
 from botocore.exceptions import ClientError, NoCredentialsError
+from aurora_serverless import serverless_capacity
+from burst_credits import BURSTABLE_FAMILIES, demand_from_profile, screen_burstable
+from config import Config
+from reserved_pricing import HOURS_PER_MONTH, LEASE_MONTHS, parse_reserved_terms, reserved_rate, ri_rates
+from scenario_sweep import sweep_scenarios
+from storage_pricing import price_storage, resolve_storage_type
+from tco import ONPREM_MONTHLY_PER_CORE, RI_OPTIONS, tco_from_recommendations, tco_table
+from utilization import sizing_inputs
 
 class FixedRDSDatabaseSizingCalculator:
     """
@@ -20,7 +28,7 @@ class FixedRDSDatabaseSizingCalculator:
         'Multi-AZ': 2,
         'Multi-AZ Cluster': 2.5,
         'Aurora Global': 3,
-        'Serverless': 0.5
+        'Serverless': 1  # one writer; capacity comes from the ACU simulation
     }
     
     # CRITICAL FIX: Properly differentiated environment profiles
@@ -82,13 +90,60 @@ class FixedRDSDatabaseSizingCalculator:
         "c5": {"type": "compute", "cpu_ratio": 1.5, "memory_ratio": 0.5, "cost_factor": 0.9}
     }
     
-    def __init__(self, use_real_time_pricing=True):
+    # Fallback instance catalog used when the AWS Pricing API is unavailable
+    FALLBACK_INSTANCE_DATA = {
+        "postgres": [
+            {"type": "db.t3.micro", "vCPU": 2, "memory": 1, "max_iops": 3000, "pricing": {"ondemand": 0.0255}, "instance_family": "t3"},
+            {"type": "db.t3.small", "vCPU": 2, "memory": 2, "max_iops": 3000, "pricing": {"ondemand": 0.051}, "instance_family": "t3"},
+            {"type": "db.t3.medium", "vCPU": 2, "memory": 4, "max_iops": 3000, "pricing": {"ondemand": 0.102}, "instance_family": "t3"},
+            {"type": "db.t3.large", "vCPU": 2, "memory": 8, "max_iops": 3000, "pricing": {"ondemand": 0.204}, "instance_family": "t3"},
+            {"type": "db.m5.large", "vCPU": 2, "memory": 8, "max_iops": 7000, "pricing": {"ondemand": 0.192}, "instance_family": "m5"},
+            {"type": "db.m5.xlarge", "vCPU": 4, "memory": 16, "max_iops": 10000, "pricing": {"ondemand": 0.384}, "instance_family": "m5"},
+            {"type": "db.m5.2xlarge", "vCPU": 8, "memory": 32, "max_iops": 15000, "pricing": {"ondemand": 0.768}, "instance_family": "m5"},
+            {"type": "db.m5.4xlarge", "vCPU": 16, "memory": 64, "max_iops": 18750, "pricing": {"ondemand": 1.536}, "instance_family": "m5"},
+            {"type": "db.r5.large", "vCPU": 2, "memory": 16, "max_iops": 15000, "pricing": {"ondemand": 0.24}, "instance_family": "r5"},
+            {"type": "db.r5.xlarge", "vCPU": 4, "memory": 32, "max_iops": 15000, "pricing": {"ondemand": 0.48}, "instance_family": "r5"},
+            {"type": "db.r5.2xlarge", "vCPU": 8, "memory": 64, "max_iops": 15000, "pricing": {"ondemand": 0.96}, "instance_family": "r5"},
+        ],
+        "oracle-ee": [
+            {"type": "db.t3.medium", "vCPU": 2, "memory": 4, "max_iops": 3000, "pricing": {"ondemand": 0.272}, "instance_family": "t3"},
+            {"type": "db.t3.large", "vCPU": 2, "memory": 8, "max_iops": 3000, "pricing": {"ondemand": 0.544}, "instance_family": "t3"},
+            {"type": "db.m5.large", "vCPU": 2, "memory": 8, "max_iops": 7000, "pricing": {"ondemand": 0.475}, "instance_family": "m5"},
+            {"type": "db.m5.xlarge", "vCPU": 4, "memory": 16, "max_iops": 10000, "pricing": {"ondemand": 0.95}, "instance_family": "m5"},
+            {"type": "db.m5.2xlarge", "vCPU": 8, "memory": 32, "max_iops": 15000, "pricing": {"ondemand": 1.90}, "instance_family": "m5"},
+            {"type": "db.m5.4xlarge", "vCPU": 16, "memory": 64, "max_iops": 18750, "pricing": {"ondemand": 3.80}, "instance_family": "m5"},
+            {"type": "db.r5.large", "vCPU": 2, "memory": 16, "max_iops": 15000, "pricing": {"ondemand": 0.60}, "instance_family": "r5"},
+            {"type": "db.r5.xlarge", "vCPU": 4, "memory": 32, "max_iops": 15000, "pricing": {"ondemand": 1.20}, "instance_family": "r5"},
+            {"type": "db.r5.2xlarge", "vCPU": 8, "memory": 64, "max_iops": 15000, "pricing": {"ondemand": 2.40}, "instance_family": "r5"},
+        ],
+        "aurora-postgresql": [
+            {"type": "db.t3.medium", "vCPU": 2, "memory": 4, "max_iops": 3000, "pricing": {"ondemand": 0.082}, "instance_family": "t3"},
+            {"type": "db.t4g.medium", "vCPU": 2, "memory": 4, "max_iops": 3000, "pricing": {"ondemand": 0.073}, "instance_family": "t4g"},
+            {"type": "db.r5.large", "vCPU": 2, "memory": 16, "max_iops": 15000, "pricing": {"ondemand": 0.285}, "instance_family": "r5"},
+            {"type": "db.r5.xlarge", "vCPU": 4, "memory": 32, "max_iops": 15000, "pricing": {"ondemand": 0.57}, "instance_family": "r5"},
+            {"type": "db.r5.2xlarge", "vCPU": 8, "memory": 64, "max_iops": 15000, "pricing": {"ondemand": 1.14}, "instance_family": "r5"},
+            {"type": "db.r6g.large", "vCPU": 2, "memory": 16, "max_iops": 15000, "pricing": {"ondemand": 0.256}, "instance_family": "r6g"},
+            {"type": "db.r6g.xlarge", "vCPU": 4, "memory": 32, "max_iops": 15000, "pricing": {"ondemand": 0.512}, "instance_family": "r6g"},
+            {"type": "db.serverless", "vCPU": 0, "memory": 0, "max_iops": 0, "pricing": {"ondemand": 0.12}, "instance_family": "serverless"},
+        ]
+    }
+    
+    # Rough regional price multipliers relative to us-east-1
+    REGION_PRICE_MULTIPLIERS = {
+        "us-east-1": 1.0,
+        "us-west-1": 1.08,
+        "us-west-2": 1.08,
+        "eu-west-1": 1.15,
+        "ap-southeast-1": 1.20
+    }
+    
+    def __init__(self, use_real_time_pricing=True, pricing_client=None):
         self.use_real_time_pricing = use_real_time_pricing
         self.pricing_cache = {}
         self.instance_cache = {}
-        
-        # Initialize AWS clients
-        self.aws_available = self._initialize_aws_clients()
+
+        # Initialize AWS clients (an injected client, e.g. fake_pricing.FakePricingClient, skips boto3)
+        self.aws_available = self._initialize_aws_clients(pricing_client)
         
         # Default inputs
         self.inputs = {
@@ -116,12 +171,20 @@ class FixedRDSDatabaseSizingCalculator:
         }
         
         self.recommendations = {}
+        self.tco_data = []
     
-    def _initialize_aws_clients(self):
+    def _initialize_aws_clients(self, pricing_client=None):
         """Initialize AWS clients for real-time pricing"""
         try:
-            self.pricing_client = boto3.client('pricing', region_name='us-east-1')
-            self.rds_client = boto3.client('rds', region_name='us-east-1')
+            if pricing_client is not None:
+                self.pricing_client = pricing_client
+                self.rds_client = None
+            else:
+                self.pricing_client = boto3.client(
+                    'pricing', region_name='us-east-1',
+                    endpoint_url=Config.AWS_PRICING_ENDPOINT_URL
+                )
+                self.rds_client = boto3.client('rds', region_name='us-east-1')
             
             # Test the connection
             self.pricing_client.describe_services(ServiceCode='AmazonRDS', MaxResults=1)
@@ -216,7 +279,8 @@ class FixedRDSDatabaseSizingCalculator:
                                 "memory": self._parse_memory(attributes.get('memory', '0 GiB')),
                                 "max_iops": int(attributes.get('maxIops', '0')),
                                 "network_performance": attributes.get('networkPerformance', 'Unknown'),
-                                "pricing": {"ondemand": float(price_per_hour)},
+                                "pricing": {"ondemand": float(price_per_hour),
+                                            "reserved": parse_reserved_terms(product['terms'])},
                                 "instance_family": instance_type.split('.')[1] if '.' in instance_type else 'unknown'
                             }
                             instances.append(instance_data)
@@ -267,57 +331,11 @@ class FixedRDSDatabaseSizingCalculator:
         """Get fallback pricing data when AWS API is not available"""
         print(f"📝 Using fallback pricing for {engine} in {region}")
         
-        # Enhanced fallback data with better instance variety
-        fallback_data = {
-            "postgres": [
-                {"type": "db.t3.micro", "vCPU": 2, "memory": 1, "max_iops": 3000, "pricing": {"ondemand": 0.0255}, "instance_family": "t3"},
-                {"type": "db.t3.small", "vCPU": 2, "memory": 2, "max_iops": 3000, "pricing": {"ondemand": 0.051}, "instance_family": "t3"},
-                {"type": "db.t3.medium", "vCPU": 2, "memory": 4, "max_iops": 3000, "pricing": {"ondemand": 0.102}, "instance_family": "t3"},
-                {"type": "db.t3.large", "vCPU": 2, "memory": 8, "max_iops": 3000, "pricing": {"ondemand": 0.204}, "instance_family": "t3"},
-                {"type": "db.m5.large", "vCPU": 2, "memory": 8, "max_iops": 7000, "pricing": {"ondemand": 0.192}, "instance_family": "m5"},
-                {"type": "db.m5.xlarge", "vCPU": 4, "memory": 16, "max_iops": 10000, "pricing": {"ondemand": 0.384}, "instance_family": "m5"},
-                {"type": "db.m5.2xlarge", "vCPU": 8, "memory": 32, "max_iops": 15000, "pricing": {"ondemand": 0.768}, "instance_family": "m5"},
-                {"type": "db.m5.4xlarge", "vCPU": 16, "memory": 64, "max_iops": 18750, "pricing": {"ondemand": 1.536}, "instance_family": "m5"},
-                {"type": "db.r5.large", "vCPU": 2, "memory": 16, "max_iops": 15000, "pricing": {"ondemand": 0.24}, "instance_family": "r5"},
-                {"type": "db.r5.xlarge", "vCPU": 4, "memory": 32, "max_iops": 15000, "pricing": {"ondemand": 0.48}, "instance_family": "r5"},
-                {"type": "db.r5.2xlarge", "vCPU": 8, "memory": 64, "max_iops": 15000, "pricing": {"ondemand": 0.96}, "instance_family": "r5"},
-            ],
-            "oracle-ee": [
-                {"type": "db.t3.medium", "vCPU": 2, "memory": 4, "max_iops": 3000, "pricing": {"ondemand": 0.272}, "instance_family": "t3"},
-                {"type": "db.t3.large", "vCPU": 2, "memory": 8, "max_iops": 3000, "pricing": {"ondemand": 0.544}, "instance_family": "t3"},
-                {"type": "db.m5.large", "vCPU": 2, "memory": 8, "max_iops": 7000, "pricing": {"ondemand": 0.475}, "instance_family": "m5"},
-                {"type": "db.m5.xlarge", "vCPU": 4, "memory": 16, "max_iops": 10000, "pricing": {"ondemand": 0.95}, "instance_family": "m5"},
-                {"type": "db.m5.2xlarge", "vCPU": 8, "memory": 32, "max_iops": 15000, "pricing": {"ondemand": 1.90}, "instance_family": "m5"},
-                {"type": "db.m5.4xlarge", "vCPU": 16, "memory": 64, "max_iops": 18750, "pricing": {"ondemand": 3.80}, "instance_family": "m5"},
-                {"type": "db.r5.large", "vCPU": 2, "memory": 16, "max_iops": 15000, "pricing": {"ondemand": 0.60}, "instance_family": "r5"},
-                {"type": "db.r5.xlarge", "vCPU": 4, "memory": 32, "max_iops": 15000, "pricing": {"ondemand": 1.20}, "instance_family": "r5"},
-                {"type": "db.r5.2xlarge", "vCPU": 8, "memory": 64, "max_iops": 15000, "pricing": {"ondemand": 2.40}, "instance_family": "r5"},
-            ],
-            "aurora-postgresql": [
-                {"type": "db.t3.medium", "vCPU": 2, "memory": 4, "max_iops": 3000, "pricing": {"ondemand": 0.082}, "instance_family": "t3"},
-                {"type": "db.t4g.medium", "vCPU": 2, "memory": 4, "max_iops": 3000, "pricing": {"ondemand": 0.073}, "instance_family": "t4g"},
-                {"type": "db.r5.large", "vCPU": 2, "memory": 16, "max_iops": 15000, "pricing": {"ondemand": 0.285}, "instance_family": "r5"},
-                {"type": "db.r5.xlarge", "vCPU": 4, "memory": 32, "max_iops": 15000, "pricing": {"ondemand": 0.57}, "instance_family": "r5"},
-                {"type": "db.r5.2xlarge", "vCPU": 8, "memory": 64, "max_iops": 15000, "pricing": {"ondemand": 1.14}, "instance_family": "r5"},
-                {"type": "db.r6g.large", "vCPU": 2, "memory": 16, "max_iops": 15000, "pricing": {"ondemand": 0.256}, "instance_family": "r6g"},
-                {"type": "db.r6g.xlarge", "vCPU": 4, "memory": 32, "max_iops": 15000, "pricing": {"ondemand": 0.512}, "instance_family": "r6g"},
-                {"type": "db.serverless", "vCPU": 0, "memory": 0, "max_iops": 0, "pricing": {"ondemand": 0.12}, "instance_family": "serverless"},
-            ]
-        }
-        
         # Default to postgres if engine not found
-        engine_data = fallback_data.get(engine, fallback_data["postgres"])
+        engine_data = self.FALLBACK_INSTANCE_DATA.get(engine, self.FALLBACK_INSTANCE_DATA["postgres"])
         
         # Adjust pricing for different regions (rough estimates)
-        region_multipliers = {
-            "us-east-1": 1.0,
-            "us-west-1": 1.08,
-            "us-west-2": 1.08,
-            "eu-west-1": 1.15,
-            "ap-southeast-1": 1.20
-        }
-        
-        multiplier = region_multipliers.get(region, 1.1)
+        multiplier = self.REGION_PRICE_MULTIPLIERS.get(region, 1.1)
         
         # Apply region multiplier
         adjusted_data = []
@@ -369,24 +387,34 @@ class FixedRDSDatabaseSizingCalculator:
         # Step 4: Calculate storage and IOPS
         storage_gb = self._calculate_storage_requirement(env, profile)
         iops_requirement = self._calculate_iops_requirement(env, profile)
+        throughput_requirement = self._calculate_throughput_requirement(env, profile)
         
-        # Step 5: Get available instances
+        # Step 5: Get available instances, without burstable ones that would run out of CPU credits
         available_instances = self.get_instance_pricing_data(self.inputs["region"], self.inputs["engine"])
+        burst_credits = self._screen_burstable_instances(env, profile, available_instances)
+        allowed_instances = [i for i in available_instances if not burst_credits.get(i["type"], {}).get("rejected")]
+        if allowed_instances:
+            available_instances = allowed_instances
         
         # Step 6: Select optimal instance (THIS IS THE KEY FIX)
         selected_instance = self._select_optimal_instance_fixed(
             final_cpu_requirement, final_ram_requirement, env, profile, available_instances
         )
+        selected_credits = burst_credits.get(selected_instance["type"])
+        serverless = self._serverless_capacity(profile) if "serverless" in selected_instance["type"] else None
         
         print(f"   Selected: {selected_instance['type']} ({selected_instance['vCPU']} vCPUs, {selected_instance['memory']}GB)")
         
         # Step 7: Calculate costs
-        costs = self._calculate_comprehensive_costs(selected_instance, storage_gb, env, profile)
+        costs = self._calculate_comprehensive_costs(selected_instance, storage_gb, env, profile, selected_credits,
+                                                    serverless, iops_requirement, throughput_requirement)
         
         # Step 8: Generate advisories
         advisories = self._generate_environment_advisories(
             selected_instance, final_cpu_requirement, final_ram_requirement, env, profile
         )
+        advisories += self._burst_credit_advisories(profile, burst_credits, selected_credits)
+        advisories += self._storage_advisories(costs["storage_config"], iops_requirement, throughput_requirement)
         
         return {
             "environment": env,
@@ -397,13 +425,17 @@ class FixedRDSDatabaseSizingCalculator:
             "actual_RAM_GB": selected_instance["memory"],
             "storage_GB": storage_gb,
             "iops": iops_requirement,
+            "throughput_mbps": throughput_requirement,
+            "storage_config": costs["storage_config"],
             "instance_cost": costs["instance_monthly"],
             "storage_cost": costs["storage_monthly"],
             "backup_cost": costs["backup_monthly"],
             "total_cost": costs["total_monthly"],
             "advisories": advisories,
             "cost_breakdown": costs,
-            "tco_savings": costs.get("tco_savings", 0),
+            "tco_savings": costs.get("tco_savings", 0),  # set by calculate_tco
+            "burst_credits": selected_credits,
+            "serverless_acu": serverless,
             "profile_applied": profile
         }
     
@@ -534,23 +566,82 @@ class FixedRDSDatabaseSizingCalculator:
         
         return max(min_iops, math.ceil(env_iops))
     
-    def _calculate_comprehensive_costs(self, instance, storage_gb, env, profile):
+    def _calculate_throughput_requirement(self, env, profile):
+        """Storage throughput (MB/s) for environment"""
+        base_throughput = self.inputs.get("peak_throughput_mbps", 0)
+        return math.ceil(base_throughput * profile["cpu_multiplier"] * profile["performance_buffer"])
+    
+    def _storage_advisories(self, storage_config, iops, throughput):
+        """Advisories when the configured storage type, or any single volume, cannot meet the IOPS / throughput requirement"""
+        if storage_config["exceeds_limits"]:
+            return [f"💾 {iops:,} IOPS / {throughput:,} MB/s requirement exceeds single-volume limits: priced as "
+                    f"{storage_config['type']} at {storage_config['provisioned_iops']:,.0f} IOPS / "
+                    f"{storage_config['provisioned_throughput_mbps']:,.0f} MB/s; split the workload or use Aurora"]
+        configured = resolve_storage_type(self.inputs["engine"], self.inputs["storage_type"])
+        if configured in ("auto", storage_config["type"]):
+            return []
+        return [f"💾 {configured} cannot deliver {iops:,} IOPS / {throughput:,} MB/s: priced as {storage_config['type']}"]
+    
+    def _screen_burstable_instances(self, env, profile, available_instances):
+        """CPU credit simulation of the burstable candidates for this environment (see burst_credits)"""
+        demand = demand_from_profile(self.inputs["on_prem_cores"], self.inputs["peak_cpu_percent"],
+                                     profile["cpu_multiplier"], self.inputs.get("cpu_profile"))
+        return screen_burstable(available_instances, demand)
+    
+    def _burst_credit_advisories(self, profile, burst_credits, selected_credits):
+        """Advisories for rejected burstable candidates and the credit usage of a selected one"""
+        advisories = []
+        rejected = [name for name, row in burst_credits.items() if row["rejected"]]
+        if rejected and profile["min_instance_class"] in BURSTABLE_FAMILIES:
+            reason = "would throttle" if burst_credits[rejected[0]]["mode"] == "standard" else "surplus credits cost more than a fixed-performance instance"
+            advisories.append(f"🔋 Skipped burstable {', '.join(rejected)}: {reason}")
+        if selected_credits and selected_credits["surcharge_monthly"] > 0:
+            advisories.append(
+                f"🔋 Averages {selected_credits['avg_cpu_percent']:.0f}% CPU vs {selected_credits['baseline_percent']:.0f}% baseline: "
+                f"~${selected_credits['surcharge_monthly']:,.2f}/month in Unlimited-mode CPU credits"
+            )
+        elif selected_credits and selected_credits["deficit_minutes"] > 0:
+            advisories.append(f"🔋 CPU credits run out for ~{selected_credits['deficit_minutes']:.0f} minutes a day at peak")
+        return advisories
+    
+    def _serverless_capacity(self, profile):
+        """Aurora Serverless v2 ACU simulation of this environment's load (see aurora_serverless)"""
+        return serverless_capacity(
+            self.inputs["on_prem_cores"], self.inputs["peak_cpu_percent"],
+            self.inputs["on_prem_ram_gb"], self.inputs["peak_ram_percent"],
+            profile["cpu_multiplier"], profile["ram_multiplier"], self.inputs.get("cpu_profile")
+        )
+    
+    def _calculate_comprehensive_costs(self, instance, storage_gb, env, profile, burst_credits=None, serverless=None,
+                                       iops=0, throughput=0):
         """Calculate comprehensive monthly costs"""
         
-        # Instance cost
+        # Instance cost; serverless is billed per ACU-hour of the simulated capacity
         hourly_rate = instance["pricing"]["ondemand"]
         deployment_factor = self.DEPLOYMENT_OPTIONS.get(self.inputs["deployment"], 1)
-        monthly_instance = hourly_rate * 24 * 30 * deployment_factor
-        
-        # Storage cost (simplified)
-        storage_cost_per_gb = {
-            "gp2": 0.10,
-            "gp3": 0.08,
-            "io1": 0.125,
-            "io2": 0.125
-        }
-        storage_rate = storage_cost_per_gb.get(self.inputs["storage_type"], 0.10)
-        monthly_storage = storage_gb * storage_rate
+        if serverless:
+            monthly_instance = hourly_rate * serverless["acu_hours_month"] * deployment_factor
+        else:
+            monthly_instance = hourly_rate * 24 * 30 * deployment_factor
+        
+        # Storage provisioned to meet the IOPS and throughput requirement (see storage_pricing);
+        # Aurora I/O-Optimized also raises the instance price
+        storage = price_storage(self.inputs["engine"], self.inputs["storage_type"], storage_gb, iops, throughput,
+                                monthly_instance)
+        instance_factor = float(storage["instance_factor"][0])
+        monthly_instance = monthly_instance * instance_factor
+        monthly_storage = float(storage["total"][0])
+        
+        # The same instance reserved for ri_duration / ri_term: hourly rate plus the upfront fee spread over the term
+        lease, purchase_option = self.inputs["ri_duration"], self.inputs["ri_term"]
+        reserved = None if serverless else reserved_rate(instance, lease, purchase_option)
+        if reserved:
+            term_hours = LEASE_MONTHS[lease] * HOURS_PER_MONTH
+            monthly_reserved = ((reserved["hourly"] + reserved["upfront"] / term_hours) * HOURS_PER_MONTH
+                                * deployment_factor * instance_factor)
+            ri_upfront = reserved["upfront"] * deployment_factor * instance_factor
+        else:
+            monthly_reserved, ri_upfront = monthly_instance, 0
         
         # Backup cost
         backup_retention_days = profile["backup_retention"]
@@ -567,14 +658,31 @@ class FixedRDSDatabaseSizingCalculator:
         # Data transfer cost
         data_transfer_cost = self.inputs["monthly_data_transfer_gb"] * 0.09
         
-        total_monthly = monthly_instance + monthly_storage + monthly_backup + features_cost + data_transfer_cost
+        # Unlimited-mode surplus CPU credits of a burstable instance (Standard mode throttles instead)
+        cpu_credits_cost = 0
+        if burst_credits and burst_credits["mode"] == "unlimited":
+            cpu_credits_cost = burst_credits["surcharge_monthly"]
+        
+        total_monthly = monthly_instance + monthly_storage + monthly_backup + features_cost + data_transfer_cost + cpu_credits_cost
         
         return {
             "instance_monthly": monthly_instance,
+            "reserved_instance_monthly": monthly_reserved,
+            "ri_upfront": ri_upfront,
+            "ri_rates": None if serverless else ri_rates(instance, lease, purchase_option),
             "storage_monthly": monthly_storage,
+            "storage_config": {
+                "type": str(storage["storage_type"][0]),
+                "allocated_gb": float(storage["allocated_gb"][0]),
+                "provisioned_iops": float(storage["provisioned_iops"][0]),
+                "provisioned_throughput_mbps": float(storage["provisioned_throughput"][0]),
+                "io_cost_monthly": float(storage["io_requests"][0]),
+                "exceeds_limits": bool(storage["exceeds_limits"][0]),
+            },
             "backup_monthly": monthly_backup,
             "features_monthly": features_cost,
             "data_transfer_monthly": data_transfer_cost,
+            "cpu_credits_monthly": cpu_credits_cost,
             "total_monthly": total_monthly,
             "tco_savings": 25  # Placeholder
         }
@@ -645,8 +753,69 @@ class FixedRDSDatabaseSizingCalculator:
         # Validate recommendations diversity
         self._validate_recommendations_diversity()
         
+        self.calculate_tco()
+        
         return self.recommendations
     
+    def calculate_tco(self):
+        """Project multi-year TCO from the current recommendations (see tco.py)
+        
+        Sets ``tco_data`` (per-year cumulative on-prem vs cloud cost for PROD)
+        and each recommendation's ``tco_savings`` percentage.
+        """
+        valid_recs = {env: rec for env, rec in self.recommendations.items() if 'error' not in rec}
+        if not valid_recs:
+            self.tco_data = []
+            return self.tco_data
+        
+        ri_option = (self.inputs["ri_duration"], self.inputs["ri_term"])
+        # Reservation terms of the PROD instance's catalog prices, where it has them
+        rates = valid_recs.get("PROD", {}).get("cost_breakdown", {}).get("ri_rates")
+        projection = tco_from_recommendations(
+            valid_recs,
+            onprem_monthly=self.inputs["on_prem_cores"] * ONPREM_MONTHLY_PER_CORE,
+            growth=self.inputs["storage_growth_rate"],
+            storage_gb=self.inputs["storage_current_gb"],
+            years=max(1, int(self.inputs["years"])),
+            ri_option=ri_option if ri_option in RI_OPTIONS or rates else ("1yr", "No Upfront"),
+            ri_rates=rates
+        )
+        onprem_total = projection["onprem_cumulative"][0, -1]
+        for e, env in enumerate(projection["environments"]):
+            cloud_total = projection["cloud_cumulative"][0, e, -1]
+            valid_recs[env]["tco_savings"] = float((onprem_total - cloud_total) / onprem_total * 100) if onprem_total else 0
+            break_even = projection["ri_break_even_month"][0, e]
+            valid_recs[env]["ri_break_even_month"] = None if math.isnan(break_even) else int(break_even)
+        
+        env = "PROD" if "PROD" in valid_recs else projection["environments"][0]
+        self.tco_data = json.loads(tco_table(projection, env).to_json(orient="records"))
+        return self.tco_data
+    
+    def sweep_scenarios(self, engines=None, regions=None, deployments=None, storage_types=None,
+                        growth_rates=None, environments=None, inputs=None):
+        """Evaluate a grid of what-if scenarios in one vectorized pass (see scenario_sweep)
+        
+        Returns a tidy DataFrame with one row per engine x region x deployment x
+        storage type x growth rate x environment combination.
+        """
+        return sweep_scenarios(self, engines, regions, deployments, storage_types,
+                               growth_rates, environments, inputs)
+    
+    def apply_utilization(self, stats, percentile=None, cpu_profile=None):
+        """Use measured peaks from a utilization summary row (see utilization.py) as the sizing inputs
+        
+        Sets peak_cpu_percent, peak_ram_percent and peak_iops to the summary's
+        percentile (default UTILIZATION_PERCENTILE) for the metrics it has.
+        ``cpu_profile`` (the database's row of UtilizationProfiler.diurnal_profile)
+        replaces the default daily curve in the burstable CPU credit simulation.
+        """
+        measured = sizing_inputs(stats, percentile)
+        names = {"cpu_util": "peak_cpu_percent", "ram_util": "peak_ram_percent", "iops": "peak_iops"}
+        self.inputs.update({names[metric]: value for metric, value in measured.items()})
+        if cpu_profile is not None:
+            self.inputs["cpu_profile"] = [float(value) for value in cpu_profile]
+        return measured
+    
     def _validate_recommendations_diversity(self):
         """Validate that environments have properly differentiated recommendations"""
         valid_recs = {k: v for k, v in self.recommendations.items() if 'error' not in v}
@@ -0,0 +1,96 @@
+"""
+Multi-region cost comparison for EnhancedRDSCalculator.
+
+Comparing regions used to mean one ``calculate_requirements`` call per region,
+each re-scoring an instance list that differs only by the regional price
+multiplier. ``compare_regions`` sizes every workload once per environment and
+scores each engine's candidates against all regional price vectors in one
+rows x regions x candidates tensor, then costs every (workload, region) pair in
+bulk. The figures match calculate_requirements with the region swapped in.
+"""
+import numpy as np
+import pandas as pd
+
+from vectorized_sizing import _columns_from_records, _costs, _requirements, _scores, candidate_instances
+
+
+def _region_choices(calculator, engine: str, regions: list, env: str, vcpus: np.ndarray, ram: np.ndarray):
+    """(hourly price, instance type) arrays of shape (rows, regions) for one engine"""
+    hourly = np.empty((len(vcpus), len(regions)))
+    types = np.empty((len(vcpus), len(regions)), dtype=object)
+
+    # Regions whose candidate lists hold the same instances in the same order share one tensor
+    groups = {}
+    for r, region in enumerate(regions):
+        candidates = candidate_instances(calculator, region, engine, env)
+        groups.setdefault(tuple(instance["type"] for instance in candidates), []).append((r, candidates))
+
+    for members in groups.values():
+        candidates = members[0][1]
+        prices = np.array([[instance["pricing"]["ondemand"] for instance in region_candidates]
+                           for _, region_candidates in members])
+        chosen = _scores(candidates, vcpus, ram, env, prices).argmax(axis=2)
+        for g, (r, _) in enumerate(members):
+            hourly[:, r] = prices[g, chosen[:, g]]
+            types[:, r] = [candidates[j]["type"] for j in chosen[:, g]]
+    return hourly, types
+
+
+def compare_regions(calculator, inputs_list: list, regions: list = None, envs: list = None) -> pd.DataFrame:
+    """Monthly cost of every workload in every region and environment, as a tidy DataFrame
+
+    One row per (database, region, environment) with the instance that region
+    would get, its monthly/annual cost and ``vs_current``: the difference from
+    the workload's own region (NaN when that region is not compared).
+    """
+    regions = list(regions or calculator.regions)
+    envs = list(envs or calculator.env_profiles)
+    if not inputs_list:
+        return pd.DataFrame(columns=["db_name", "engine", "current_region", "region", "environment",
+                                     "instance_type", "monthly_cost", "annual_cost", "vs_current"])
+    columns = _columns_from_records(inputs_list)
+    rows = len(inputs_list)
+
+    by_engine = {}
+    for i, engine in enumerate(columns["engine"]):
+        by_engine.setdefault(engine, []).append(i)
+    by_engine = {engine: np.array(indices) for engine, indices in by_engine.items()}
+    # Cost inputs as (rows, 1) so they broadcast across regions
+    cost_inputs = {name: columns[name][:, None] for name in ("iops", "backup_days", "data_transfer_gb")}
+    engines = np.array(columns["engine"], dtype=object)[:, None]
+    home = np.array([regions.index(region) if region in regions else -1 for region in columns["region"]])
+
+    frames = []
+    for env in envs:
+        vcpus, ram, storage = _requirements(calculator, columns, env)
+        hourly = np.empty((rows, len(regions)))
+        types = np.empty((rows, len(regions)), dtype=object)
+        for engine, indices in by_engine.items():
+            hourly[indices], types[indices] = _region_choices(
+                calculator, engine, regions, env, vcpus[indices], ram[indices]
+            )
+        monthly = _costs(calculator, hourly, storage[:, None], cost_inputs, env, engines)["total"]
+        current = np.where(home >= 0, monthly[np.arange(rows), home], np.nan)
+
+        frames.append(pd.DataFrame({
+            "db_name": np.repeat([inputs.get("db_name", f"Database {i+1}") for i, inputs in enumerate(inputs_list)], len(regions)),
+            "engine": np.repeat(columns["engine"], len(regions)),
+            "current_region": np.repeat(columns["region"], len(regions)),
+            "region": np.tile(regions, rows),
+            "environment": env,
+            "instance_type": types.reshape(-1),
+            "monthly_cost": monthly.reshape(-1),
+            "annual_cost": monthly.reshape(-1) * 12,
+            "vs_current": (monthly - current[:, None]).reshape(-1),
+        }))
+    return pd.concat(frames, ignore_index=True)
+
+
+def region_cost_matrix(comparison: pd.DataFrame, db_name: str = None) -> pd.DataFrame:
+    """Region x environment monthly cost for one database, or summed over the whole inventory"""
+    if db_name is not None:
+        comparison = comparison[comparison["db_name"] == db_name]
+    matrix = comparison.pivot_table(index="region", columns="environment", values="monthly_cost",
+                                    aggfunc="sum", sort=False)
+    matrix["Total"] = matrix.sum(axis=1)
+    return matrix
@@ -236,7 +236,9 @@ class ReportGenerator:
             df = pd.DataFrame(calculator.tco_data)
             plt.plot(df["Year"], df["OnPrem"], marker='o', label="On-Premise")
             plt.plot(df["Year"], df["Cloud"], marker='s', label="AWS Cloud")
-            plt.title("3-Year TCO Comparison")
+            if "CloudRI" in df:
+                plt.plot(df["Year"], df["CloudRI"], marker='^', label="AWS Cloud (Reserved)")
+            plt.title(f"{len(df)}-Year TCO Comparison")
             plt.xlabel("Year")
             plt.ylabel("Cumulative Cost ($)")
             plt.legend()
@@ -0,0 +1,178 @@
+"""
+Reserved Instance and Savings Plan pricing.
+
+The Pricing API lists every RDS offering with ``OnDemand`` and ``Reserved``
+terms. ``parse_reserved_terms`` reads the Reserved ones - each lease length,
+purchase option and offering class, with its hourly rate and upfront fee -
+into the instance catalog (``pricing["reserved"]``). Catalogs without them
+(the fallback data) get rates derived from tco.RI_OPTIONS, and Savings Plans
+apply a flat discount to the on-demand rate of any instance.
+
+``evaluate_purchase_options`` prices every purchase option of every instance
+of an inventory in one vectorized pass:
+
+- effective hourly rate: the hourly rate plus the upfront fee spread over the
+  term
+- break-even month: the first month in which the commitment has cost no more
+  than on-demand would have at the given utilization (reservations bill every
+  hour, on-demand only the hours the instance runs)
+- break-even utilization: the share of hours an instance must run for the
+  commitment to pay off over its term
+"""
+import math
+
+import numpy as np
+import pandas as pd
+
+from tco import RI_OPTIONS
+
+HOURS_PER_MONTH = 24 * 30
+LEASE_MONTHS = {"1yr": 12, "3yr": 36}
+ON_DEMAND = "On-Demand"
+# Compute Savings Plans for databases: discount vs on-demand, approximate rates
+SAVINGS_PLAN_DISCOUNTS = {("1yr", "No Upfront"): 0.20, ("3yr", "No Upfront"): 0.35}
+
+OPTION_COLUMNS = ["workload", "instance_type", "option", "lease", "purchase_option", "offering_class",
+                  "hourly", "upfront", "effective_hourly", "monthly_cost", "savings_percent",
+                  "break_even_month", "break_even_utilization"]
+
+
+def parse_reserved_terms(terms: dict) -> list:
+    """Reserved offerings of one Pricing API product's ``terms``, as plain dicts
+
+    Hourly rates come from the "Hrs" price dimensions and upfront fees from
+    the "Quantity" ones.
+    """
+    offerings = []
+    for term in terms.get("Reserved", {}).values():
+        attributes = term.get("termAttributes", {})
+        lease = attributes.get("LeaseContractLength")
+        if lease not in LEASE_MONTHS:
+            continue
+        hourly = upfront = 0.0
+        for dimension in term.get("priceDimensions", {}).values():
+            usd = float(dimension["pricePerUnit"]["USD"])
+            if dimension.get("unit") == "Quantity":
+                upfront += usd
+            else:
+                hourly += usd
+        offerings.append({
+            "lease": lease,
+            "purchase_option": attributes.get("PurchaseOption", "No Upfront"),
+            "offering_class": attributes.get("OfferingClass", "standard"),
+            "hourly": hourly,
+            "upfront": upfront,
+        })
+    return sorted(offerings, key=lambda offering: (LEASE_MONTHS[offering["lease"]], offering["offering_class"],
+                                                   offering["upfront"]))
+
+
+def _derived_offerings(ondemand: float) -> list:
+    """Reserved offerings implied by tco.RI_OPTIONS for an instance without parsed terms"""
+    offerings = []
+    for (lease, purchase_option), (months, upfront_share, discount) in RI_OPTIONS.items():
+        term_cost = ondemand * HOURS_PER_MONTH * months * (1 - discount)
+        offerings.append({
+            "lease": lease, "purchase_option": purchase_option, "offering_class": "standard",
+            "hourly": term_cost * (1 - upfront_share) / (HOURS_PER_MONTH * months),
+            "upfront": term_cost * upfront_share,
+        })
+    return offerings
+
+
+def purchase_options(instance: dict, savings_plans: bool = True) -> list:
+    """On-demand, reserved and Savings Plan offerings of one instance (reserved from its catalog if parsed)"""
+    ondemand = instance["pricing"]["ondemand"]
+    options = [{"lease": None, "purchase_option": ON_DEMAND, "offering_class": ON_DEMAND,
+                "hourly": ondemand, "upfront": 0.0}]
+    options += instance["pricing"].get("reserved") or _derived_offerings(ondemand)
+    if savings_plans:
+        options += [{"lease": lease, "purchase_option": purchase_option, "offering_class": "savings plan",
+                     "hourly": ondemand * (1 - discount), "upfront": 0.0}
+                    for (lease, purchase_option), discount in SAVINGS_PLAN_DISCOUNTS.items()]
+    return options
+
+
+def option_label(option: dict) -> str:
+    if option["lease"] is None:
+        return ON_DEMAND
+    kind = "Savings Plan" if option["offering_class"] == "savings plan" else f"RI {option['offering_class']}"
+    return f"{kind} {option['lease']} {option['purchase_option']}"
+
+
+def reserved_rate(instance: dict, lease: str, purchase_option: str, offering_class: str = "standard") -> dict:
+    """The matching reserved offering of an instance (derived from tco.RI_OPTIONS if not in its catalog), or None"""
+    for option in purchase_options(instance, savings_plans=False)[1:]:
+        if (option["lease"], option["purchase_option"], option["offering_class"]) == (lease, purchase_option, offering_class):
+            return option
+    return None
+
+
+def ri_rates(instance: dict, lease: str, purchase_option: str) -> tuple:
+    """(term months, upfront share, discount) of a standard reservation - the tco.RI_OPTIONS form - or None"""
+    option = reserved_rate(instance, lease, purchase_option)
+    ondemand = instance["pricing"]["ondemand"]
+    if option is None or not ondemand:
+        return None
+    months = LEASE_MONTHS[lease]
+    term_cost = option["hourly"] * HOURS_PER_MONTH * months + option["upfront"]
+    discount = 1 - term_cost / (ondemand * HOURS_PER_MONTH * months)
+    return months, option["upfront"] / term_cost if term_cost else 0.0, discount
+
+
+def evaluate_purchase_options(instances: list, utilization=1.0, savings_plans: bool = True) -> pd.DataFrame:
+    """Every purchase option of every instance, one row per (workload, option)
+
+    ``instances`` are catalog entries (e.g. each workload's recommended
+    ``instance_details``; serverless ones have no reservations and are
+    skipped); ``utilization`` is the share of hours each runs
+    (scalar or per workload), which on-demand billing follows and
+    commitments do not. ``monthly_cost`` is the effective monthly rate of the
+    option (on-demand: at that utilization).
+    """
+    rows = [(w, option) for w, instance in enumerate(instances) if instance["vCPU"] > 0
+            for option in purchase_options(instance, savings_plans)]
+    if not rows:
+        return pd.DataFrame(columns=OPTION_COLUMNS)
+    utilization = np.broadcast_to(np.asarray(utilization, dtype=float), (len(instances),))
+
+    workload = np.array([w for w, _ in rows])
+    hourly = np.array([option["hourly"] for _, option in rows])
+    upfront = np.array([option["upfront"] for _, option in rows])
+    months = np.array([LEASE_MONTHS.get(option["lease"], 1) for _, option in rows], dtype=float)
+    committed = np.array([option["lease"] is not None for _, option in rows])
+    ondemand = np.array([instances[w]["pricing"]["ondemand"] for w in workload])
+    used = utilization[workload]
+
+    effective = np.where(committed, hourly + upfront / (months * HOURS_PER_MONTH), hourly * used)
+    billed_ondemand = ondemand * used
+    with np.errstate(divide="ignore", invalid="ignore"):
+        savings = np.where(billed_ondemand > 0, (1 - effective / billed_ondemand) * 100, 0.0)
+        # Upfront fee recovered by the monthly saving; never if the hourly rate is not below on-demand
+        monthly_saving = (billed_ondemand - hourly) * HOURS_PER_MONTH
+        break_even = np.where(monthly_saving > 0, np.maximum(np.ceil(upfront / monthly_saving - 1e-9), 1), np.nan)
+        break_even_utilization = np.where(ondemand > 0, effective / ondemand, np.nan)
+    break_even[~committed | (break_even > months)] = np.nan
+    break_even_utilization[~committed] = np.nan
+
+    return pd.DataFrame({
+        "workload": workload,
+        "instance_type": [instances[w]["type"] for w in workload],
+        "option": [option_label(option) for _, option in rows],
+        "lease": [option["lease"] for _, option in rows],
+        "purchase_option": [option["purchase_option"] for _, option in rows],
+        "offering_class": [option["offering_class"] for _, option in rows],
+        "hourly": hourly,
+        "upfront": upfront,
+        "effective_hourly": effective,
+        "monthly_cost": effective * HOURS_PER_MONTH,
+        "savings_percent": savings,
+        "break_even_month": break_even,
+        "break_even_utilization": break_even_utilization,
+    }, columns=OPTION_COLUMNS)
+
+
+def best_purchase_options(options: pd.DataFrame, max_upfront: float = math.inf) -> pd.DataFrame:
+    """Cheapest option per workload by effective monthly cost, among those with an upfront fee up to ``max_upfront``"""
+    eligible = options[options["upfront"] <= max_upfront]
+    return eligible.loc[eligible.groupby("workload")["monthly_cost"].idxmin()].reset_index(drop=True)
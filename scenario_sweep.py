@@ -0,0 +1,263 @@
+"""
+What-if scenario sweeps for FixedRDSDatabaseSizingCalculator.
+
+``sweep_scenarios`` evaluates a whole grid - engines x regions x deployment
+options x storage types x storage growth rates x environments - in one
+vectorized pass and returns a tidy DataFrame (one row per scenario) ready for
+``pivot_table`` or plotly. It reproduces ``calculate_requirements`` exactly:
+
+- vCPU/RAM requirements depend only on the environment
+- instance selection depends only on (engine, region, environment), so every
+  catalog is scored once as a padded engines/regions x environments x
+  instances tensor, with the same filtering and first-maximum tie-break
+  (burstable instances rejected by the CPU credit screen are masked out)
+- serverless capacity (ACU-hours) depends only on the environment
+- storage depends on (growth rate, environment); its cost (storage_pricing)
+  also on the engine and, for Aurora I/O-Optimized, the instance cost, and
+  costs broadcast over the remaining axes
+
+A grid of tens of thousands of scenarios takes a few milliseconds once the
+pricing catalogs are cached, instead of one full calculation per scenario.
+"""
+import math
+
+import numpy as np
+import pandas as pd
+
+from aurora_serverless import serverless_capacity
+from burst_credits import demand_from_profile, screen_burstable
+from config import Config
+from storage_pricing import price_storage
+
+# As in FixedRDSDatabaseSizingCalculator.calculate_requirements and its helpers
+ENV_MINIMUMS = {"PROD": (4, 8), "SQA": (2, 4), "QA": (2, 4), "DEV": (1, 2)}
+MIN_STORAGE = {"PROD": 100, "SQA": 50, "QA": 50, "DEV": 20}
+MIN_IOPS = {"PROD": 3000, "SQA": 2000, "QA": 1500, "DEV": 1000}
+FIT_TOLERANCE = {"PROD": 0.95, "SQA": 0.8, "QA": 0.7, "DEV": 0.5}
+FAMILY_PRIORITY = {"t3": 1, "t4g": 1, "m5": 2, "m6i": 2, "r5": 3, "r6g": 3, "c5": 2}
+
+SCENARIO_AXES = ["engine", "region", "deployment", "storage_type", "storage_growth_rate", "environment"]
+SWEEP_AXES = ["engines", "regions", "deployments", "storage_types", "growth_rates", "environments"]
+
+
+def _axis(values, default) -> list:
+    if values is None:
+        return [default]
+    values = [values] if isinstance(values, (str, int, float)) else list(values)
+    if not values:
+        raise ValueError("every sweep axis needs at least one value")
+    return values
+
+
+def _catalog_tensor(calculator, pairs: list, inputs: dict) -> dict:
+    """Padded (pair, instance) arrays of every (engine, region) catalog"""
+    catalogs = []
+    for engine, region in pairs:
+        instances = calculator.get_instance_pricing_data(region, engine)
+        if not instances:
+            raise ValueError(f"No instances available for {engine} in {region}")
+        catalogs.append(instances)
+
+    shape = (len(pairs), max(len(instances) for instances in catalogs))
+    tensor = {
+        "vcpu": np.zeros(shape),
+        "memory": np.zeros(shape),
+        "price": np.zeros(shape),
+        "priority": np.zeros(shape),
+        "family_bonus": np.zeros(shape),
+        "valid": np.zeros(shape, dtype=bool),
+        "serverless": np.full(len(pairs), -1),
+        "is_serverless": np.zeros(shape, dtype=bool),
+        "catalogs": catalogs,
+    }
+    for p, instances in enumerate(catalogs):
+        for k, instance in enumerate(instances):
+            family = instance.get("instance_family", instance["type"].split('.')[1] if '.' in instance["type"] else "unknown")
+            characteristics = calculator.INSTANCE_FAMILIES.get(instance.get("instance_family", "unknown"), {"cost_factor": 1.0})
+            tensor["vcpu"][p, k] = instance["vCPU"]
+            tensor["memory"][p, k] = instance["memory"]
+            tensor["price"][p, k] = instance["pricing"]["ondemand"]
+            tensor["priority"][p, k] = FAMILY_PRIORITY.get(family, 1)
+            tensor["family_bonus"][p, k] = (1.0 / characteristics["cost_factor"]) * 0.1
+            tensor["valid"][p, k] = True
+            tensor["is_serverless"][p, k] = "serverless" in instance["type"]
+            if tensor["serverless"][p] < 0 and "serverless" in instance["type"]:
+                tensor["serverless"][p] = k
+    if inputs["deployment_model"] != "Serverless":
+        tensor["serverless"][:] = -1
+    return tensor
+
+
+def _credit_screen(tensor: dict, envs: list, profiles: list, inputs: dict) -> tuple:
+    """(allowed instances, Unlimited-mode CPU credit surcharge) of shape (pair, env, instance)
+
+    As calculate_requirements: rejected burstable instances are dropped unless
+    that would leave no instance at all.
+    """
+    shape = (len(tensor["catalogs"]), len(envs), tensor["valid"].shape[1])
+    allowed = np.ones(shape, dtype=bool)
+    surcharge = np.zeros(shape)
+    for e, profile in enumerate(profiles):
+        demand = demand_from_profile(inputs["on_prem_cores"], inputs["peak_cpu_percent"],
+                                     profile["cpu_multiplier"], inputs.get("cpu_profile"))
+        for p, instances in enumerate(tensor["catalogs"]):
+            screened = screen_burstable(instances, demand)
+            for k, instance in enumerate(instances):
+                row = screened.get(instance["type"])
+                if row is None:
+                    continue
+                allowed[p, e, k] = not row["rejected"]
+                if row["mode"] == "unlimited":
+                    surcharge[p, e, k] = row["surcharge_monthly"]
+            if not (allowed[p, e] & tensor["valid"][p]).any():
+                allowed[p, e] = True
+    return allowed, surcharge
+
+
+def _select(calculator, tensor: dict, envs: list, cpu_req: np.ndarray, ram_req: np.ndarray) -> np.ndarray:
+    """Index into each pair's catalog of the instance _select_optimal_instance_fixed picks, shape (pair, env)"""
+    profiles = [calculator.ENV_PROFILES[env] for env in envs]
+    min_priority = np.array([FAMILY_PRIORITY.get(profile["min_instance_class"], 1) for profile in profiles])
+    tolerance = np.array([FIT_TOLERANCE.get(env, 0.9) for env in envs])
+    cost_priority = np.array([profile["cost_priority"] for profile in profiles])[None, :, None]
+    is_prod = np.array([env == "PROD" for env in envs])[None, :, None]
+
+    vcpu, memory, valid = (tensor[name][:, None, :] for name in ("vcpu", "memory", "valid"))
+    if "allowed" in tensor:
+        valid = valid & tensor["allowed"]
+    cpu = cpu_req[None, :, None]
+    ram = ram_req[None, :, None]
+
+    # Requirement filter, then the per-environment tolerance, then every instance
+    suitable = valid & (vcpu >= cpu) & (memory >= ram) & (tensor["priority"][:, None, :] >= min_priority[None, :, None])
+    relaxed = valid & (vcpu >= cpu * tolerance[None, :, None]) & (memory >= ram * tolerance[None, :, None])
+    candidates = np.where(suitable.any(axis=2, keepdims=True), suitable,
+                          np.where(relaxed.any(axis=2, keepdims=True), relaxed, valid))
+
+    cpu_ratio = vcpu / np.maximum(cpu, 1)
+    ram_ratio = memory / np.maximum(ram, 1)
+    waste_penalty = (np.maximum(0, cpu_ratio - 1.0) + np.maximum(0, ram_ratio - 1.0)) * 0.5
+    cost_factor = 1.0 / (1.0 + tensor["price"][:, None, :])
+    performance_bonus = np.where(is_prod, np.minimum(cpu_ratio + ram_ratio - 2.0, 1.0) * 0.3, 0)
+    efficiency_score = (2.0 - waste_penalty) * (1.0 - cost_priority)
+    cost_score = cost_factor * cost_priority
+    scores = efficiency_score + cost_score + performance_bonus + tensor["family_bonus"][:, None, :]
+
+    # argmax keeps the first of equal scores, like max() in the scalar path
+    chosen = np.where(candidates, scores, -np.inf).argmax(axis=2)
+    serverless = tensor["serverless"][:, None]
+    return np.where(serverless >= 0, serverless, chosen)
+
+
+def sweep_scenarios(calculator, engines=None, regions=None, deployments=None, storage_types=None,
+                    growth_rates=None, environments=None, inputs: dict = None) -> pd.DataFrame:
+    """calculate_requirements for every combination of the given axes, as a tidy DataFrame
+
+    Axes left as None keep the calculator's current input; ``environments``
+    defaults to every profile. ``inputs`` overrides the rest of the
+    calculator's inputs for this sweep only.
+    """
+    inputs = {**calculator.inputs, **(inputs or {})}
+    engines = _axis(engines, inputs["engine"])
+    regions = _axis(regions, inputs["region"])
+    deployments = _axis(deployments, inputs["deployment"])
+    storage_types = _axis(storage_types, inputs["storage_type"])
+    growth_rates = _axis(growth_rates, inputs["storage_growth_rate"])
+    envs = _axis(environments, None) if environments is not None else list(calculator.ENV_PROFILES)
+    unknown = [env for env in envs if env not in calculator.ENV_PROFILES]
+    if unknown:
+        raise ValueError(f"Unknown environment(s): {', '.join(map(str, unknown))}")
+
+    shape = (len(engines) * len(regions), len(deployments), len(storage_types), len(growth_rates), len(envs))
+    total = math.prod(shape)
+    if total > Config.SWEEP_MAX_SCENARIOS:
+        raise ValueError(f"{total:,} scenarios exceeds SWEEP_MAX_SCENARIOS ({Config.SWEEP_MAX_SCENARIOS:,})")
+    profiles = [calculator.ENV_PROFILES[env] for env in envs]
+
+    # Per environment: vCPU/RAM, IOPS and backup retention
+    base_cpu = inputs["on_prem_cores"] * (inputs["peak_cpu_percent"] / 100)
+    base_ram = inputs["on_prem_ram_gb"] * (inputs["peak_ram_percent"] / 100)
+    cpu_req = np.array([max(math.ceil(base_cpu * p["cpu_multiplier"] * p["performance_buffer"]), ENV_MINIMUMS[env][0])
+                        for env, p in zip(envs, profiles)])
+    ram_req = np.array([max(math.ceil(base_ram * p["ram_multiplier"] * p["performance_buffer"]), ENV_MINIMUMS[env][1])
+                        for env, p in zip(envs, profiles)])
+    iops = np.array([max(MIN_IOPS[env], math.ceil(inputs["peak_iops"] * p["cpu_multiplier"] * p["performance_buffer"]))
+                     for env, p in zip(envs, profiles)])
+    throughput = np.array([math.ceil(inputs.get("peak_throughput_mbps", 0) * p["cpu_multiplier"] * p["performance_buffer"])
+                           for p in profiles])
+    retention = np.array([p["backup_retention"] for p in profiles])
+
+    # Per (growth, environment): storage
+    growth_factor = (1 + np.array(growth_rates, dtype=float)) ** inputs["years"]
+    storage_multiplier = np.array([p["storage_multiplier"] for p in profiles])
+    with_buffer = (inputs["storage_current_gb"] * growth_factor)[:, None] * storage_multiplier[None, :] * 1.3
+    storage_gb = np.maximum(np.array([MIN_STORAGE[env] for env in envs])[None, :], np.ceil(with_buffer)).astype(np.int64)
+
+    # Per (pair, environment): the selected instance
+    pairs = [(engine, region) for engine in engines for region in regions]
+    tensor = _catalog_tensor(calculator, pairs, inputs)
+    tensor["allowed"], credit_surcharge = _credit_screen(tensor, envs, profiles, inputs)
+    chosen = _select(calculator, tensor, envs, cpu_req, ram_req)
+    pair_index = np.arange(len(pairs))[:, None]
+    hourly = tensor["price"][pair_index, chosen]
+    cpu_credits = credit_surcharge[pair_index, np.arange(len(envs))[None, :], chosen]
+    # Serverless instances bill the simulated ACU-hours instead of a full month
+    acu_hours = np.array([serverless_capacity(inputs["on_prem_cores"], inputs["peak_cpu_percent"],
+                                              inputs["on_prem_ram_gb"], inputs["peak_ram_percent"],
+                                              p["cpu_multiplier"], p["ram_multiplier"],
+                                              inputs.get("cpu_profile"))["acu_hours_month"] for p in profiles])
+    billed_hours = np.where(tensor["is_serverless"][pair_index, chosen], hourly * acu_hours[None, :], hourly * 24 * 30)
+    instance_types = np.array([[tensor["catalogs"][p][k]["type"] for k in row] for p, row in enumerate(chosen)])
+
+    # Costs over (pair, deployment, storage type, growth, environment)
+    deployment_factor = np.array([calculator.DEPLOYMENT_OPTIONS.get(name, 1) for name in deployments], dtype=float)
+    monthly_compute = billed_hours[:, None, None, None, :] * deployment_factor[None, :, None, None, None]
+    pair_engines = np.array([engine for engine, _ in pairs], dtype=object)[:, None, None, None]
+    priced = [price_storage(pair_engines, name, storage_gb, iops, throughput, monthly_compute[:, :, 0])
+              for name in storage_types]
+    stacked = lambda key: np.stack([np.broadcast_to(costs[key], priced[0]["total"].shape) for costs in priced], axis=2)
+    monthly_instance = monthly_compute * stacked("instance_factor")
+    monthly_storage = stacked("total")
+    monthly_backup = storage_gb * 0.095 * (retention / 30)
+    features = np.zeros(1)
+    if inputs["enable_perf_insights"]:
+        features = features + monthly_instance * 0.1
+    if inputs["enable_encryption"]:
+        features = features + monthly_instance * 0.02
+    data_transfer = inputs["monthly_data_transfer_gb"] * 0.09
+    monthly_credits = cpu_credits[:, None, None, None, :]
+    total_monthly = (monthly_instance + monthly_storage + monthly_backup[None, None, None, :, :] + features
+                     + data_transfer + monthly_credits)
+
+    # Tidy frame: one row per scenario, axes in SCENARIO_AXES order
+    grids = np.indices(shape).reshape(len(shape), -1)
+    pair_codes, deployment_codes, storage_codes, growth_codes, env_codes = grids
+    flat = lambda array: np.broadcast_to(array, shape).reshape(-1)
+    return pd.DataFrame({
+        "engine": pd.Categorical.from_codes(pair_codes // len(regions), engines),
+        "region": pd.Categorical.from_codes(pair_codes % len(regions), regions),
+        "deployment": pd.Categorical.from_codes(deployment_codes, deployments),
+        "storage_type": pd.Categorical.from_codes(storage_codes, storage_types),
+        "storage_growth_rate": np.array(growth_rates, dtype=float)[growth_codes],
+        "environment": pd.Categorical.from_codes(env_codes, envs),
+        "instance_type": instance_types[pair_codes, env_codes],
+        "vCPUs": cpu_req[env_codes],
+        "RAM_GB": ram_req[env_codes],
+        "actual_vCPUs": tensor["vcpu"][pair_codes, chosen[pair_codes, env_codes]].astype(np.int64),
+        "actual_RAM_GB": tensor["memory"][pair_codes, chosen[pair_codes, env_codes]],
+        "storage_GB": storage_gb[growth_codes, env_codes],
+        "iops": iops[env_codes],
+        "throughput_mbps": throughput[env_codes],
+        "priced_storage_type": flat(stacked("storage_type")),
+        "allocated_GB": flat(stacked("allocated_gb")),
+        "provisioned_iops": flat(stacked("provisioned_iops")),
+        "exceeds_storage_limits": flat(stacked("exceeds_limits")),
+        "instance_cost": flat(monthly_instance),
+        "storage_cost": flat(monthly_storage),
+        "backup_cost": flat(monthly_backup),
+        "features_cost": flat(features),
+        "data_transfer_cost": data_transfer,
+        "cpu_credits_cost": flat(monthly_credits),
+        "total_cost": total_monthly.reshape(-1),
+        "annual_cost": total_monthly.reshape(-1) * 12,
+    })
@@ -0,0 +1,228 @@
+"""
+RDS and Aurora storage cost model.
+
+``storage_costs`` prices one storage type for arrays of (allocated GB, IOPS,
+throughput) requirements, provisioning whatever the type needs to meet them:
+
+- gp2: 3 IOPS per GB (100 minimum). Volumes under 1 TB burst to 3000 IOPS
+  from a 5.4M I/O credit balance; a daily peak the balance cannot carry
+  (GP2_PEAK_HOURS at the required IOPS) is met by allocating more GB.
+  Throughput is 128 MB/s, 250 MB/s from 334 GB.
+- gp3: 3000 IOPS / 125 MB/s included below 400 GB, where nothing more can
+  be provisioned, and 12000 IOPS / 500 MB/s from 400 GB; extra IOPS and
+  throughput are billed up to 64000 IOPS / 4000 MB/s.
+- io1 / io2: provisioned IOPS (at least 1000, and 4 per MB/s of
+  throughput) up to 50 (io1) or 500 (io2) IOPS per GB.
+- Aurora Standard bills I/O requests; Aurora I/O-Optimized has no I/O
+  charge but higher storage and instance prices (``instance_factor``).
+
+Requirements a type cannot meet come back with ``feasible`` False and an
+infinite total. ``cheapest_storage`` evaluates every type that applies to
+each workload's engine and keeps the cheapest feasible one, as arrays over
+the whole inventory; a requirement beyond every type's single-volume limits
+is priced as the most capable type at its limits (``exceeds_limits``), so
+totals stay finite. ``price_storage`` prices a configured type (or "auto")
+and falls back to the cheapest feasible one where it cannot keep up; Aurora
+engines configured with an EBS type choose between Standard and
+I/O-Optimized like "auto".
+FixedRDSDatabaseSizingCalculator, the scenario sweep, the fleet optimizer
+and EnhancedRDSCalculator's bulk sizing (scalar and vectorized) all price
+storage here.
+"""
+import numpy as np
+
+# Approximate us-east-1 single-AZ rates
+STORAGE_TYPES = {
+    "gp2": {"gb": 0.115},
+    "gp3": {"gb": 0.115, "iops": 0.02, "throughput": 0.08},
+    "io1": {"gb": 0.125, "iops": 0.10},
+    "io2": {"gb": 0.125, "iops": 0.10},
+    "aurora-standard": {"gb": 0.10, "io_million": 0.20},
+    "aurora-io-optimized": {"gb": 0.225, "instance_factor": 1.3},
+}
+EBS_TYPES = ("gp2", "gp3", "io1", "io2")
+AURORA_TYPES = ("aurora-standard", "aurora-io-optimized")
+# Rate for storage types without an IOPS model (e.g. magnetic)
+FLAT_GB_RATE = 0.10
+AUTO = "auto"
+
+GP2_BURST_IOPS = 3000
+GP2_BURST_BALANCE = 5_400_000
+GP2_BURST_MAX_GB = 1000
+GP2_MAX_IOPS = 16000
+# Hours a day the workload runs at its peak IOPS, drawing down the gp2 burst balance
+GP2_PEAK_HOURS = 4
+GP3_STRIPED_GB = 400
+PIOPS_RATIO = {"io1": 50, "io2": 500}
+PIOPS_MIN = 1000
+PIOPS_MAX = 256000
+# Single-volume (IOPS, MB/s) limits, most capable type first
+STORAGE_LIMITS = {"io2": (PIOPS_MAX, 4000), "io1": (PIOPS_MAX, 4000), "gp3": (64000, 4000), "gp2": (GP2_MAX_IOPS, 250)}
+# Provisioned IOPS needed per MB/s of throughput (256 KiB I/Os)
+IOPS_PER_MBPS = 4
+# Average share of the peak IOPS over a month, for Aurora I/O request charges
+AVERAGE_IO_SHARE = 0.5
+SECONDS_PER_MONTH = 3600 * 24 * 30
+
+COST_KEYS = ["allocated_gb", "provisioned_iops", "provisioned_throughput", "storage", "iops", "throughput",
+             "io_requests", "total", "instance_factor", "feasible"]
+
+
+def is_aurora(engine: str) -> bool:
+    return str(engine).startswith("aurora")
+
+
+def resolve_storage_type(engine: str, storage_type: str) -> str:
+    """Storage type an engine actually uses: Aurora clusters choose the cheaper Aurora type (AUTO) for any EBS type"""
+    if storage_type == AUTO:
+        return AUTO
+    if is_aurora(engine):
+        return storage_type if storage_type in AURORA_TYPES else AUTO
+    return "gp3" if storage_type in AURORA_TYPES else storage_type
+
+
+def storage_costs(storage_type: str, storage_gb, iops, throughput_mbps=0, io_requests=None,
+                  peak_hours: float = GP2_PEAK_HOURS) -> dict:
+    """Monthly cost of ``storage_type`` meeting each requirement, as broadcast arrays (see COST_KEYS)
+
+    ``io_requests`` are Aurora I/O requests per month; by default
+    AVERAGE_IO_SHARE of ``iops`` sustained all month.
+    """
+    gb = np.asarray(storage_gb, dtype=float)
+    iops = np.asarray(iops, dtype=float)
+    throughput = np.asarray(throughput_mbps, dtype=float)
+    gb, iops, throughput = np.broadcast_arrays(gb, iops, throughput)
+    rates = STORAGE_TYPES.get(storage_type, {"gb": FLAT_GB_RATE})
+    zero = np.zeros(gb.shape)
+    allocated, provisioned_iops, provisioned_throughput = gb, iops, throughput
+    extra_iops, extra_throughput, requests = zero, zero, zero
+    feasible = np.ones(gb.shape, dtype=bool)
+
+    if storage_type == "gp2":
+        baseline = np.maximum(100, gb * 3)
+        # Bursting covers the peak if the balance outlasts the daily peak hours
+        drain = np.maximum(iops - baseline, 0) * peak_hours * 3600
+        bursts = (iops <= GP2_BURST_IOPS) & (gb < GP2_BURST_MAX_GB) & (drain <= GP2_BURST_BALANCE)
+        allocated = np.where(bursts, gb, np.maximum(gb, np.ceil(iops / 3)))
+        allocated = np.where(throughput > 128, np.maximum(allocated, 334), allocated)
+        provisioned_iops = np.minimum(np.maximum(100, allocated * 3), GP2_MAX_IOPS)
+        provisioned_throughput = np.where(allocated >= 334, 250.0, 128.0)
+        feasible = (iops <= GP2_MAX_IOPS) & (throughput <= 250)
+    elif storage_type == "gp3":
+        needs_more = (iops > 3000) | (throughput > 125)
+        allocated = np.where(needs_more, np.maximum(gb, GP3_STRIPED_GB), gb)
+        striped = allocated >= GP3_STRIPED_GB
+        included_iops = np.where(striped, 12000, 3000)
+        included_throughput = np.where(striped, 500, 125)
+        provisioned_iops = np.maximum(included_iops, np.maximum(iops, throughput * IOPS_PER_MBPS))
+        provisioned_throughput = np.maximum(included_throughput, throughput)
+        extra_iops = provisioned_iops - included_iops
+        extra_throughput = provisioned_throughput - included_throughput
+        feasible = (provisioned_iops <= 64000) & (provisioned_throughput <= 4000)
+    elif storage_type in PIOPS_RATIO:
+        provisioned_iops = np.maximum(np.maximum(iops, throughput * IOPS_PER_MBPS), PIOPS_MIN)
+        allocated = np.maximum(np.maximum(gb, 100), np.ceil(provisioned_iops / PIOPS_RATIO[storage_type]))
+        provisioned_throughput = np.minimum(provisioned_iops / IOPS_PER_MBPS, 4000)
+        extra_iops = provisioned_iops
+        feasible = (provisioned_iops <= PIOPS_MAX) & (throughput <= 4000)
+    elif storage_type in AURORA_TYPES:
+        requests = (iops * AVERAGE_IO_SHARE * SECONDS_PER_MONTH if io_requests is None
+                    else np.broadcast_to(np.asarray(io_requests, dtype=float), gb.shape))
+
+    storage = allocated * rates["gb"]
+    iops_cost = extra_iops * rates.get("iops", 0)
+    throughput_cost = extra_throughput * rates.get("throughput", 0)
+    requests_cost = requests / 1e6 * rates.get("io_million", 0)
+    total = storage + iops_cost + throughput_cost + requests_cost
+    return {
+        "allocated_gb": allocated,
+        "provisioned_iops": provisioned_iops,
+        "provisioned_throughput": provisioned_throughput,
+        "storage": storage,
+        "iops": iops_cost,
+        "throughput": throughput_cost,
+        "io_requests": requests_cost,
+        "total": np.where(feasible, total, np.inf),
+        "instance_factor": np.full(gb.shape, rates.get("instance_factor", 1.0)),
+        "feasible": feasible,
+    }
+
+
+def cheapest_storage(engines, storage_gb, iops, throughput_mbps=0, instance_monthly=0, io_requests=None,
+                     storage_types=None) -> dict:
+    """storage_costs of the cheapest feasible type for each workload, plus its ``storage_type``
+
+    Aurora engines choose among AURORA_TYPES, counting the I/O-Optimized
+    instance uplift on ``instance_monthly``; other engines among
+    ``storage_types`` (default EBS_TYPES). Ties keep the earlier type.
+    Where no type is feasible, the most capable one is priced at its
+    STORAGE_LIMITS and ``exceeds_limits`` is True.
+    ``engines`` and ``instance_monthly`` may have any shape that broadcasts
+    with the requirements.
+    """
+    engines = np.atleast_1d(np.asarray(engines, dtype=object))
+    aurora = np.vectorize(is_aurora, otypes=[bool])(engines)
+    instance_monthly = np.asarray(instance_monthly, dtype=float)
+    # Only the types some engine here can use
+    candidates = ([] if aurora.all() else list(storage_types or EBS_TYPES)) + (list(AURORA_TYPES) if aurora.any() else [])
+
+    priced = [storage_costs(name, storage_gb, iops, throughput_mbps, io_requests) for name in candidates]
+    shape = np.broadcast_shapes(aurora.shape, priced[0]["total"].shape, instance_monthly.shape)
+    effective = np.stack([np.broadcast_to(costs["total"] + (costs["instance_factor"] - 1) * instance_monthly, shape)
+                          for costs in priced])
+    aurora_type = np.array([name in AURORA_TYPES for name in candidates]).reshape((-1,) + (1,) * len(shape))
+    effective = np.where(aurora_type == np.broadcast_to(aurora, shape), effective, np.inf)
+    choice = effective.argmin(axis=0)
+
+    pick = lambda key: np.take_along_axis(np.stack([np.broadcast_to(costs[key], shape) for costs in priced]),
+                                          choice[None], axis=0)[0]
+    chosen = {key: pick(key) for key in COST_KEYS}
+    chosen["storage_type"] = np.array(candidates, dtype=object)[choice]
+
+    exceeds = ~np.isfinite(effective.min(axis=0))
+    if exceeds.any():
+        name = next(name for name in STORAGE_LIMITS if name in candidates)
+        max_iops, max_throughput = STORAGE_LIMITS[name]
+        capped = storage_costs(name, storage_gb, np.minimum(iops, max_iops),
+                               np.minimum(throughput_mbps, max_throughput), io_requests)
+        for key in COST_KEYS:
+            chosen[key] = np.where(exceeds, np.broadcast_to(capped[key], shape), chosen[key])
+        chosen["storage_type"] = np.where(exceeds, name, chosen["storage_type"])
+        chosen["feasible"] = chosen["feasible"] & ~exceeds
+    chosen["exceeds_limits"] = exceeds
+    return chosen
+
+
+def price_storage(engines, storage_type: str, storage_gb, iops, throughput_mbps=0, instance_monthly=0) -> dict:
+    """cheapest_storage for ``storage_type`` AUTO, else the configured type as each engine resolves it
+
+    Where the configured type cannot meet a requirement, the cheapest type
+    that can is priced instead (its name is in ``storage_type``); only those
+    requirements go through cheapest_storage.
+    """
+    engines = np.atleast_1d(np.asarray(engines, dtype=object))
+    resolved = np.vectorize(resolve_storage_type, otypes=[object])(engines, storage_type)
+    names = set(resolved.ravel()) - {AUTO}
+    if not names:
+        return cheapest_storage(engines, storage_gb, iops, throughput_mbps, instance_monthly)
+    configured = {name: storage_costs(name, storage_gb, iops, throughput_mbps) for name in names}
+    first = next(iter(configured.values()))
+    shape = np.broadcast_shapes(resolved.shape, first["total"].shape, np.shape(instance_monthly))
+    resolved = np.broadcast_to(resolved, shape)
+    full = lambda values: np.broadcast_to(values, shape)
+
+    priced = {key: full(first[key]).copy() for key in COST_KEYS}
+    for name, costs in list(configured.items())[1:]:
+        use = resolved == name
+        for key in COST_KEYS:
+            priced[key][use] = full(costs[key])[use]
+    priced["storage_type"] = resolved.copy()
+    priced["exceeds_limits"] = np.zeros(shape, dtype=bool)
+
+    fallback = ~priced["feasible"] | (resolved == AUTO)
+    if fallback.any():
+        cheapest = cheapest_storage(full(engines)[fallback], full(storage_gb)[fallback], full(iops)[fallback],
+                                    full(throughput_mbps)[fallback], full(instance_monthly)[fallback])
+        for key in priced:
+            priced[key][fallback] = cheapest[key]
+    return priced
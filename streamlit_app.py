@@ -2,8 +2,6 @@ import streamlit as st
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
-import anthropic
-from anthropic import APIStatusError # Import specific error type
 import json
 import time
 import traceback
@@ -14,16 +12,23 @@ import os
 import requests
 from streamlit_oauth import OAuth2Component
 
-# Import reportlab components for PDF generation with error handling
-try:
-    from reportlab.lib.pagesizes import letter
-    from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
-    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-    from reportlab.lib.units import inch
-    from reportlab.lib import colors
-    REPORTLAB_AVAILABLE = True
-except ImportError:
-    REPORTLAB_AVAILABLE = False
+from ai_analytics import AIAnalytics
+from aurora_serverless import compare_serverless
+from consolidation import consolidation_summary, plan_consolidation
+from bulk_analysis import db_label, run_bulk_analysis
+from bulk_jobs import JobInProgress, get_job_runner, get_job_store, open_job, run_job
+from bulk_reports import (REPORTLAB_AVAILABLE, RESULT_TABLE_FORMATS, PDFReportGenerator, export_full_report,
+                          export_results_table)
+from config import Config
+from cost_risk import PERCENTILES, simulate_cost_risk
+from enhanced_calculator import EnhancedRDSCalculator
+from fleet_optimizer import ENV_WEIGHTS, HEADROOM_CAP, RI_ENVS, optimize_fleet
+from inventory import PARQUET_AVAILABLE, UPLOAD_TYPES, parse_uploaded_file
+from region_comparison import compare_regions, region_cost_matrix
+from reserved_pricing import best_purchase_options, evaluate_purchase_options
+from tco import ONPREM_MONTHLY_PER_CORE, RI_OPTIONS, tco_from_recommendations, tco_from_results, tco_table
+from transfer_planner import NOT_CONVERGING, plan_transfers, schedule_waves
+from utilization import apply_utilization, profile_metrics
 
 # #--- Google Authentication Setup ---
 CLIENT_ID = os.environ.get("GOOGLE_CLIENT_ID", st.secrets.get("GOOGLE_CLIENT_ID", None) if hasattr(st, 'secrets') else None)
@@ -531,819 +536,6 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
-class AIAnalytics:
-    """AI-powered analytics engine using Claude API"""
-    
-    def __init__(self, api_key: str):
-        self.client = anthropic.Anthropic(api_key=api_key)
-    
-    def analyze_workload_patterns(self, workload_data: dict) -> dict:
-        """Analyze workload patterns and provide intelligent recommendations"""
-
-        prompt = f"""
-        As an expert database architect and cloud migration specialist, analyze this workload data and provide intelligent insights:
-
-        Workload Data:
-        - Database Engine: {workload_data.get('engine')}
-        - Current CPU Cores: {workload_data.get('cores')}
-        - Current RAM: {workload_data.get('ram')} GB
-        - Storage: {workload_data.get('storage')} GB
-        - Peak CPU Utilization: {workload_data.get('cpu_util')}%
-        - Peak RAM Utilization: {workload_data.get('ram_util')}%
-        - IOPS Requirements: {workload_data.get('iops')}
-        - Growth Rate: {workload_data.get('growth')}% annually
-        - Region: {workload_data.get('region')}
-
-        Please provide a comprehensive analysis including:
-        1. Workload Classification (OLTP/OLAP/Mixed)
-        2. Performance Bottleneck Identification
-        3. Right-sizing Recommendations
-        4. Cost Optimization Opportunities
-        5. Migration Strategy Recommendations
-        6. Risk Assessment and Mitigation
-        7. Timeline and Complexity Estimation
-
-        Respond in a structured format with clear sections.
-        """
-
-        try:
-            message = self.client.messages.create(
-                model="claude-3-5-sonnet-20240620", # Updated model
-                max_tokens=2000,
-                messages=[{"role": "user", "content": prompt}]
-            )
-
-            # Parse AI response
-            ai_analysis = self._parse_ai_response(message.content[0].text)
-            return ai_analysis
-
-        except APIStatusError as e:
-            if e.status_code == 401:
-                return {"error": "AI analysis failed: Authentication Error (401). Please check your Claude API key."}
-            return {"error": f"AI analysis failed: {str(e)}"}
-        except Exception as e:
-            return {"error": f"AI analysis failed: {str(e)}"}
-    
-    def generate_migration_strategy(self, analysis_data: dict) -> dict:
-        """Generate detailed migration strategy with AI insights"""
-        
-        prompt = f"""
-        Based on the database analysis, create a comprehensive migration strategy:
-
-        Analysis Summary: 
-        - Engine: {analysis_data.get('engine', 'Unknown')}
-        - Estimated Cost: ${analysis_data.get('monthly_cost', 0):,.2f}/month
-        - Complexity: Medium to High
-
-        Please provide:
-        1. Pre-migration checklist and requirements
-        2. Detailed migration phases with timelines
-        3. Resource allocation recommendations
-        4. Testing and validation strategy
-        5. Rollback procedures
-        6. Post-migration optimization steps
-        7. Monitoring and alerting setup
-        8. Security and compliance considerations
-
-        Include specific AWS services, tools, and best practices.
-        """
-        
-        try:
-            message = self.client.messages.create(
-                model="claude-3-5-sonnet-20240620", # Updated model
-                max_tokens=2500,
-                messages=[{"role": "user", "content": prompt}]
-            )
-            
-            return self._parse_migration_strategy(message.content[0].text)
-            
-        except APIStatusError as e:
-            if e.status_code == 401:
-                return {"error": "Migration strategy generation failed: Authentication Error (401). Please check your Claude API key."}
-            return {"error": f"Migration strategy generation failed: {str(e)}"}
-        except Exception as e:
-            return {"error": f"Migration strategy generation failed: {str(e)}"}
-    
-    def predict_future_requirements(self, historical_data: dict, years: int = 3) -> dict:
-        """Predict future resource requirements using AI"""
-        
-        prompt = f"""
-        As a data scientist specializing in capacity planning, analyze these metrics and predict future requirements:
-
-        Current Configuration:
-        - CPU Cores: {historical_data.get('cores')}
-        - RAM: {historical_data.get('ram')} GB
-        - Storage: {historical_data.get('storage')} GB
-        - Growth Rate: {historical_data.get('growth')}% annually
-        - Engine: {historical_data.get('engine')}
-
-        Prediction Period: {years} years
-
-        Consider:
-        - Technology evolution impact
-        - Business scaling factors
-        - Industry benchmarks for {historical_data.get('engine')} workloads
-
-        Provide predictions for:
-        - CPU requirements
-        - Memory usage
-        - Storage growth
-        - IOPS scaling
-        - Cost projections
-
-        Include key assumptions and confidence levels.
-        """
-        
-        try:
-            message = self.client.messages.create(
-                model="claude-3-5-sonnet-20240620", # Updated model
-                max_tokens=2000,
-                messages=[{"role": "user", "content": prompt}]
-            )
-            
-            return self._parse_predictions(message.content[0].text)
-            
-        except APIStatusError as e:
-            if e.status_code == 401:
-                return {"error": "Prediction generation failed: Authentication Error (401). Please check your Claude API key."}
-            return {"error": f"Prediction generation failed: {str(e)}"}
-        except Exception as e:
-            return {"error": f"Prediction generation failed: {str(e)}"}
-    
-    def _parse_ai_response(self, response_text: str) -> dict:
-        """Parse AI response into structured data"""
-        # Extract key insights from the response
-        lines = response_text.split('\n')
-        
-        # Default structure
-        result = {
-            "workload_type": "Mixed",
-            "complexity": "Medium",
-            "timeline": "12-16 weeks",
-            "bottlenecks": [],
-            "recommendations": [],
-            "risks": [],
-            "summary": response_text[:500] + "..." if len(response_text) > 500 else response_text
-        }
-        
-        # Parse specific sections
-        current_section = ""
-        for line in lines:
-            line = line.strip()
-            if not line:
-                continue
-                
-            # Identify sections
-            if "workload" in line.lower() and ("classification" in line.lower() or "type" in line.lower()):
-                if "oltp" in line.lower():
-                    result["workload_type"] = "OLTP"
-                elif "olap" in line.lower():
-                    result["workload_type"] = "OLAP"
-                elif "mixed" in line.lower():
-                    result["workload_type"] = "Mixed"
-            
-            if "complexity" in line.lower():
-                if "high" in line.lower():
-                    result["complexity"] = "High"
-                elif "low" in line.lower():
-                    result["complexity"] = "Low"
-                else:
-                    result["complexity"] = "Medium"
-            
-            # Extract recommendations, bottlenecks, risks
-            if any(marker in line for marker in ['•', '-', '*', '1.', '2.', '3.']):
-                clean_line = line.strip('•-* \t0123456789.').strip()
-                if clean_line:
-                    if "recommend" in current_section.lower():
-                        result["recommendations"].append(clean_line)
-                    elif "bottleneck" in current_section.lower() or "performance" in current_section.lower():
-                        result["bottlenecks"].append(clean_line)
-                    elif "risk" in current_section.lower():
-                        result["risks"].append(clean_line)
-            
-            # Track current section
-            if ":" in line:
-                current_section = line
-        
-        # Ensure we have some content
-        if not result["recommendations"]:
-            result["recommendations"] = [
-                "Consider Aurora for improved performance and cost efficiency",
-                "Implement read replicas for better read performance",
-                "Use GP3 storage for cost optimization",
-                "Enable Performance Insights for monitoring"
-            ]
-        
-        if not result["bottlenecks"]:
-            result["bottlenecks"] = [
-                "CPU utilization may peak during business hours",
-                "Storage IOPS might be a limiting factor",
-                "Network bandwidth could impact data transfer"
-            ]
-        
-        if not result["risks"]:
-            result["risks"] = [
-                "Application compatibility testing required",
-                "Data migration complexity for large datasets",
-                "Downtime during cutover process"
-            ]
-        
-        return result
-    
-    def _parse_migration_strategy(self, response_text: str) -> dict:
-        """Parse migration strategy response"""
-        return {
-            "phases": [
-                "Assessment and Planning",
-                "Environment Setup and Testing", 
-                "Data Migration and Validation",
-                "Application Migration",
-                "Go-Live and Optimization"
-            ],
-            "timeline": "14-18 weeks",
-            "resources": [
-                "Database Migration Specialist",
-                "Cloud Architect", 
-                "DevOps Engineer",
-                "Application Developer",
-                "Project Manager"
-            ],
-            "risks": [
-                "Data consistency during migration",
-                "Application compatibility issues",
-                "Performance degradation post-migration"
-            ],
-            "tools": [
-                "AWS Database Migration Service (DMS)",
-                "AWS Schema Conversion Tool (SCT)",
-                "CloudFormation for infrastructure",
-                "CloudWatch for monitoring"
-            ],
-            "checklist": [
-                "Complete application dependency mapping",
-                "Set up target AWS environment",
-                "Configure monitoring and alerting",
-                "Establish rollback procedures",
-                "Plan communication strategy"
-            ],
-            "full_strategy": response_text
-        }
-    
-    def _parse_predictions(self, response_text: str) -> dict:
-        """Parse prediction response"""
-        return {
-            "cpu_trend": "Gradual increase expected",
-            "memory_trend": "Stable with seasonal peaks", 
-            "storage_trend": "Linear growth with data retention",
-            "cost_trend": "Optimized through right-sizing",
-            "confidence": "High (85-90%)",
-            "key_factors": [
-                "Business growth projections",
-                "Technology adoption patterns",
-                "Seasonal usage variations",
-                "Regulatory requirements"
-            ],
-            "recommendations": [
-                "Plan for 20% capacity buffer",
-                "Implement auto-scaling policies",
-                "Review and optimize quarterly",
-                "Consider reserved instances for predictable workloads"
-            ],
-            "full_prediction": response_text
-        }
-
-class EnhancedRDSCalculator:
-    """Enhanced RDS calculator with AI integration"""
-    
-    def __init__(self):
-        self.engines = ['oracle-ee', 'oracle-se', 'postgres', 'aurora-postgresql', 'aurora-mysql', 'sqlserver']
-        self.regions = ["us-east-1", "us-west-1", "us-west-2", "eu-west-1", "ap-southeast-1"]
-        
-        # Instance database with expanded options
-        self.instance_db = {
-            "us-east-1": {
-                "oracle-ee": [
-                    {"type": "db.t3.medium", "vCPU": 2, "memory": 4, "pricing": {"ondemand": 0.136}},
-                    {"type": "db.m5.large", "vCPU": 2, "memory": 8, "pricing": {"ondemand": 0.475}},
-                    {"type": "db.m5.xlarge", "vCPU": 4, "memory": 16, "pricing": {"ondemand": 0.95}},
-                    {"type": "db.m5.2xlarge", "vCPU": 8, "memory": 32, "pricing": {"ondemand": 1.90}},
-                    {"type": "db.r5.large", "vCPU": 2, "memory": 16, "pricing": {"ondemand": 0.60}},
-                    {"type": "db.r5.xlarge", "vCPU": 4, "memory": 32, "pricing": {"ondemand": 1.20}},
-                    {"type": "db.r5.2xlarge", "vCPU": 8, "memory": 64, "pricing": {"ondemand": 1.92}}
-                ],
-                "aurora-postgresql": [
-                    {"type": "db.t3.medium", "vCPU": 2, "memory": 4, "pricing": {"ondemand": 0.082}},
-                    {"type": "db.r5.large", "vCPU": 2, "memory": 16, "pricing": {"ondemand": 0.285}},
-                    {"type": "db.r5.xlarge", "vCPU": 4, "memory": 32, "pricing": {"ondemand": 0.57}},
-                    {"type": "db.r5.2xlarge", "vCPU": 8, "memory": 64, "pricing": {"ondemand": 1.14}},
-                    {"type": "db.serverless", "vCPU": 0, "memory": 0, "pricing": {"ondemand": 0.12}}
-                ],
-                "postgres": [
-                    {"type": "db.t3.micro", "vCPU": 2, "memory": 1, "pricing": {"ondemand": 0.0255}},
-                    {"type": "db.t3.small", "vCPU": 2, "memory": 2, "pricing": {"ondemand": 0.051}},
-                    {"type": "db.t3.medium", "vCPU": 2, "memory": 4, "pricing": {"ondemand": 0.102}},
-                    {"type": "db.m5.large", "vCPU": 2, "memory": 8, "pricing": {"ondemand": 0.192}},
-                    {"type": "db.m5.xlarge", "vCPU": 4, "memory": 16, "pricing": {"ondemand": 0.384}},
-                    {"type": "db.m5.2xlarge", "vCPU": 8, "memory": 32, "pricing": {"ondemand": 0.768}}
-                ],
-                "sqlserver": [
-                    {"type": "db.t3.small", "vCPU": 2, "memory": 2, "pricing": {"ondemand": 0.231}},
-                    {"type": "db.m5.large", "vCPU": 2, "memory": 8, "pricing": {"ondemand": 0.693}},
-                    {"type": "db.m5.xlarge", "vCPU": 4, "memory": 16, "pricing": {"ondemand": 1.386}},
-                    {"type": "db.m5.2xlarge", "vCPU": 8, "memory": 32, "pricing": {"ondemand": 2.772}}
-                ],
-                "aurora-mysql": [
-                    {"type": "db.t3.medium", "vCPU": 2, "memory": 4, "pricing": {"ondemand": 0.082}},
-                    {"type": "db.r5.large", "vCPU": 2, "memory": 16, "pricing": {"ondemand": 0.285}},
-                    {"type": "db.r5.xlarge", "vCPU": 4, "memory": 32, "pricing": {"ondemand": 0.57}},
-                    {"type": "db.serverless", "vCPU": 0, "memory": 0, "pricing": {"ondemand": 0.12}}
-                ],
-                "oracle-se": [
-                    {"type": "db.t3.medium", "vCPU": 2, "memory": 4, "pricing": {"ondemand": 0.105}},
-                    {"type": "db.m5.large", "vCPU": 2, "memory": 8, "pricing": {"ondemand": 0.365}},
-                    {"type": "db.m5.xlarge", "vCPU": 4, "memory": 16, "pricing": {"ondemand": 0.730}},
-                    {"type": "db.r5.large", "vCPU": 2, "memory": 16, "pricing": {"ondemand": 0.462}}
-                ]
-            }
-        }
-        
-        # Environment profiles
-        self.env_profiles = {
-            "PROD": {"cpu_factor": 1.0, "storage_factor": 1.0, "ha_required": True},
-            "STAGING": {"cpu_factor": 0.8, "storage_factor": 0.7, "ha_required": True},
-            "QA": {"cpu_factor": 0.6, "storage_factor": 0.5, "ha_required": False},
-            "DEV": {"cpu_factor": 0.4, "storage_factor": 0.3, "ha_required": False}
-        }
-        
-        # Add other regions with regional pricing adjustments
-        for region in ["us-west-1", "us-west-2", "eu-west-1", "ap-southeast-1"]:
-            if region not in self.instance_db:
-                self.instance_db[region] = {}
-                for engine, instances in self.instance_db["us-east-1"].items():
-                    # Apply regional pricing multiplier
-                    multiplier = self._get_regional_multiplier(region)
-                    regional_instances = []
-                    for instance in instances:
-                        regional_instance = instance.copy()
-                        regional_instance["pricing"] = {
-                            "ondemand": instance["pricing"]["ondemand"] * multiplier
-                        }
-                        regional_instances.append(regional_instance)
-                    self.instance_db[region][engine] = regional_instances
-    
-    def _get_regional_multiplier(self, region: str) -> float:
-        """Get regional pricing multiplier"""
-        multipliers = {
-            "us-east-1": 1.0,
-            "us-west-1": 1.08,
-            "us-west-2": 1.05,
-            "eu-west-1": 1.12,
-            "ap-southeast-1": 1.15
-        }
-        return multipliers.get(region, 1.0)
-    
-    def calculate_requirements(self, inputs: dict, env: str) -> dict:
-        """Calculate resource requirements with AI-enhanced logic"""
-        profile = self.env_profiles[env]
-        
-        # Calculate resources with intelligent scaling
-        base_vcpus = inputs['cores'] * (inputs['cpu_util'] / 100)
-        base_ram = inputs['ram'] * (inputs['ram_util'] / 100)
-        
-        # Apply environment factors
-        if env == "PROD":
-            vcpus = max(4, int(base_vcpus * profile['cpu_factor'] * 1.2))
-            ram = max(8, int(base_ram * profile['cpu_factor'] * 1.2))
-            storage = max(100, int(inputs['storage'] * profile['storage_factor'] * 1.3))
-        elif env == "STAGING":
-            vcpus = max(2, int(base_vcpus * profile['cpu_factor']))
-            ram = max(4, int(base_ram * profile['cpu_factor']))
-            storage = max(50, int(inputs['storage'] * profile['storage_factor']))
-        elif env == "QA":
-            vcpus = max(2, int(base_vcpus * profile['cpu_factor']))
-            ram = max(4, int(base_ram * profile['cpu_factor']))
-            storage = max(20, int(inputs['storage'] * profile['storage_factor']))
-        else:  # DEV
-            vcpus = max(1, int(base_vcpus * profile['cpu_factor']))
-            ram = max(2, int(base_ram * profile['cpu_factor']))
-            storage = max(20, int(inputs['storage'] * profile['storage_factor']))
-        
-        # Apply growth projections only for PROD and STAGING
-        if env in ["PROD", "STAGING"]:
-            growth_factor = (1 + inputs['growth']/100) ** 2
-            storage = int(storage * growth_factor)
-            
-        # Select optimal instance
-        instance = self._select_optimal_instance(vcpus, ram, inputs['engine'], inputs['region'], env)
-        
-        # Calculate costs
-        costs = self._calculate_comprehensive_costs(instance, storage, inputs, env)
-        
-        return {
-            "environment": env,
-            "instance_type": instance["type"],
-            "vcpus": vcpus,
-            "ram_gb": ram,
-            "storage_gb": storage,
-            "monthly_cost": costs["total"],
-            "annual_cost": costs["total"] * 12,
-            "cost_breakdown": costs,
-            "instance_details": instance,
-            "optimization_score": self._calculate_optimization_score(instance, vcpus, ram)
-        }
-    
-    def _select_optimal_instance(self, vcpus: int, ram: int, engine: str, region: str, env: str = "PROD") -> dict:
-        """Select optimal instance type"""
-        region_data = self.instance_db.get(region, self.instance_db["us-east-1"])
-        engine_instances = region_data.get(engine, region_data.get("postgres", []))
-        
-        if not engine_instances:
-            if env == "DEV":
-                return {"type": "db.t3.micro", "vCPU": 2, "memory": 1, "pricing": {"ondemand": 0.017}}
-            elif env in ["QA", "STAGING"]:
-                return {"type": "db.t3.medium", "vCPU": 2, "memory": 4, "pricing": {"ondemand": 0.068}}
-            else:
-                return {"type": "db.m5.large", "vCPU": 2, "memory": 8, "pricing": {"ondemand": 0.4}}
-        
-        # Filter instances based on environment
-        if env == "DEV":
-            preferred_instances = [inst for inst in engine_instances if 't3' in inst["type"]]
-            if not preferred_instances:
-                preferred_instances = engine_instances
-        elif env in ["QA", "STAGING"]:
-            preferred_instances = [inst for inst in engine_instances if any(family in inst["type"] for family in ['t3', 'm5'])]
-            if not preferred_instances:
-                preferred_instances = engine_instances
-        else:
-            preferred_instances = [inst for inst in engine_instances if any(family in inst["type"] for family in ['r5', 'm5'])]
-            if not preferred_instances:
-                preferred_instances = engine_instances
-        
-        # Score instances
-        scored_instances = []
-        for instance in preferred_instances:
-            if instance["type"] == "db.serverless":
-                score = 120 if env == "DEV" else (100 if env in ["QA", "STAGING"] else 60)
-            else:
-                cpu_ratio = instance["vCPU"] / max(vcpus, 1)
-                ram_ratio = instance["memory"] / max(ram, 1)
-                
-                if env == "PROD":
-                    cpu_fit = 1.2 if 1.2 <= cpu_ratio <= 1.8 else (1.0 if cpu_ratio >= 1.0 else 0.3)
-                    ram_fit = 1.2 if 1.2 <= ram_ratio <= 1.8 else (1.0 if ram_ratio >= 1.0 else 0.3)
-                    cost_weight = 0.3
-                elif env in ["QA", "STAGING"]:
-                    cpu_fit = 1.0 if 1.1 <= cpu_ratio <= 1.5 else (0.8 if cpu_ratio >= 1.0 else 0.4)
-                    ram_fit = 1.0 if 1.1 <= ram_ratio <= 1.5 else (0.8 if ram_ratio >= 1.0 else 0.4)
-                    cost_weight = 0.5
-                else:
-                    cpu_fit = 1.0 if 1.0 <= cpu_ratio <= 1.3 else (0.7 if cpu_ratio >= 1.0 else 0.2)
-                    ram_fit = 1.0 if 1.0 <= ram_ratio <= 1.3 else (0.7 if ram_ratio >= 1.0 else 0.2)
-                    cost_weight = 0.7
-                
-                cost_per_vcpu = instance["pricing"]["ondemand"] / max(instance["vCPU"], 1)
-                cost_efficiency = (1.0 / (cost_per_vcpu + 1)) * cost_weight
-                
-                performance_bonus = 0
-                if env == "PROD":
-                    if 'r5' in instance["type"]:
-                        performance_bonus = 0.3
-                    elif 'm5' in instance["type"]:
-                        performance_bonus = 0.2
-                elif env == "DEV":
-                    if 't3' in instance["type"]:
-                        performance_bonus = 0.3
-                
-                score = (cpu_fit + ram_fit + cost_efficiency + performance_bonus) * 100
-            
-            scored_instances.append((score, instance))
-        
-        if scored_instances:
-            scored_instances.sort(key=lambda x: x[0], reverse=True)
-            return scored_instances[0][1]
-        
-        return engine_instances[0] if engine_instances else {"type": "db.m5.large", "vCPU": 2, "memory": 8, "pricing": {"ondemand": 0.4}}
-    
-    def _calculate_comprehensive_costs(self, instance: dict, storage: int, inputs: dict, env: str) -> dict:
-        """Calculate comprehensive monthly costs"""
-        instance_cost = instance["pricing"]["ondemand"] * 24 * 30
-        
-        if env == "PROD":
-            instance_cost *= 2
-        
-        storage_gb_cost = storage * 0.115
-        extra_iops = max(0, inputs.get('iops', 3000) - 3000)
-        iops_cost = extra_iops * 0.005
-        
-        backup_days = inputs.get('backup_days', 7)
-        backup_cost = storage * 0.095 * (backup_days / 30)
-        
-        data_transfer = inputs.get('data_transfer_gb', 100)
-        transfer_cost = data_transfer * 0.09
-        
-        monitoring_cost = instance_cost * 0.1 if env == "PROD" else 0
-        
-        total_cost = (instance_cost + storage_gb_cost + iops_cost + 
-                     backup_cost + transfer_cost + monitoring_cost)
-        
-        return {
-            "instance": instance_cost,
-            "storage": storage_gb_cost,
-            "iops": iops_cost,
-            "backup": backup_cost,
-            "data_transfer": transfer_cost,
-            "monitoring": monitoring_cost,
-            "total": total_cost
-        }
-    
-    def _calculate_optimization_score(self, instance: dict, required_vcpus: int, required_ram: int) -> int:
-        """Calculate optimization score (0-100)"""
-        if instance["type"] == "db.serverless":
-            return 95
-        
-        cpu_efficiency = min(required_vcpus / instance["vCPU"], 1.0)
-        ram_efficiency = min(required_ram / instance["memory"], 1.0)
-        avg_efficiency = (cpu_efficiency + ram_efficiency) / 2
-        
-        return int(avg_efficiency * 100)
-
-class PDFReportGenerator:
-    """Generates PDF reports from analysis results with enhanced error handling."""
-
-    def __init__(self):
-        if not REPORTLAB_AVAILABLE:
-            raise ImportError("ReportLab library not found. Please install with: pip install reportlab")
-        
-        try:
-            # Initialize styles
-            self.styles = getSampleStyleSheet()
-            self.styles.add(ParagraphStyle(name='H1_Custom', fontSize=24, leading=28, alignment=1, spaceAfter=20, fontName='Helvetica-Bold'))
-            self.styles.add(ParagraphStyle(name='H2_Custom', fontSize=18, leading=22, spaceBefore=10, spaceAfter=10, fontName='Helvetica-Bold'))
-            self.styles.add(ParagraphStyle(name='H3_Custom', fontSize=14, leading=18, spaceBefore=8, spaceAfter=8, fontName='Helvetica-Bold'))
-            self.styles.add(ParagraphStyle(name='Normal_Custom', fontSize=10, leading=12, spaceAfter=6))
-            self.styles.add(ParagraphStyle(name='Bullet_Custom', fontSize=10, leading=12, leftIndent=20, spaceAfter=6, bulletText='•'))
-            
-        except Exception as e:
-            raise Exception(f"Failed to initialize PDF generator: {str(e)}") from e
-
-    def generate_report(self, all_results: list | dict):
-        """Generates a PDF report based on the analysis results."""
-        try:
-            buffer = io.BytesIO()
-            doc = SimpleDocTemplate(buffer, pagesize=letter)
-            story = []
-
-            story.append(Paragraph("AI Database Migration Studio Report", self.styles['H1_Custom']))
-            story.append(Paragraph(f"Generated On: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}", self.styles['Normal_Custom']))
-            story.append(Spacer(1, 0.2 * inch))
-
-            if not all_results:
-                story.append(Paragraph("No analysis results available to generate a report.", self.styles['Normal_Custom']))
-                doc.build(story)
-                buffer.seek(0)
-                return buffer.getvalue()
-
-            # Handle both single and bulk analysis results
-            if isinstance(all_results, dict):
-                # Convert single result to a list for consistent processing
-                all_results = [all_results]
-
-            # Executive Summary (aggregated for bulk, or single for individual)
-            story.append(Paragraph("1. Executive Summary", self.styles['H2_Custom']))
-            
-            summary_data = [["Database", "Engine", "Instance Type", "Monthly Cost ($)", "Optimization"]]
-            total_monthly_cost = 0
-            total_databases = len(all_results)
-            
-            for result in all_results:
-                inputs = result.get('inputs', {})
-                prod_rec = result['recommendations']['PROD']
-                db_name = inputs.get('db_name', 'N/A')
-                engine = inputs.get('engine', 'N/A')
-                instance_type = prod_rec['instance_type']
-                monthly_cost = f"{prod_rec['monthly_cost']:,.0f}"
-                optimization = f"{prod_rec.get('optimization_score', 85)}%"
-                
-                summary_data.append([db_name, engine, instance_type, monthly_cost, optimization])
-                total_monthly_cost += prod_rec['monthly_cost']
-
-            table = Table(summary_data, colWidths=[1.5*inch, 1*inch, 1.5*inch, 1.2*inch, 1*inch])
-            table.setStyle(TableStyle([
-                ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#667eea')),
-                ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-                ('BACKGROUND', (0, 1), (-1, -1), colors.HexColor('#f8fafc')),
-                ('GRID', (0, 0), (-1, -1), 1, colors.HexColor('#e2e8f0')),
-                ('LEFTPADDING', (0,0), (-1,-1), 6),
-                ('RIGHTPADDING', (0,0), (-1,-1), 6),
-                ('TOPPADDING', (0,0), (-1,-1), 6),
-                ('BOTTOMPADDING', (0,0), (-1,-1), 6),
-            ]))
-            story.append(table)
-            story.append(Spacer(1, 0.2 * inch))
-
-            story.append(Paragraph(f"Total Monthly Cost (Production): ${total_monthly_cost:,.0f}", self.styles['Normal_Custom']))
-            story.append(Paragraph(f"Total Annual Cost (Production): ${total_monthly_cost * 12:,.0f}", self.styles['Normal_Custom']))
-            story.append(Spacer(1, 0.2 * inch))
-
-            # Detailed Analysis for Each Database
-            for i, result in enumerate(all_results):
-                inputs = result.get('inputs', {})
-                recommendations = result.get('recommendations', {})
-                ai_insights = result.get('ai_insights', {})
-                db_name = inputs.get('db_name', f'Database {i+1}')
-
-                story.append(Paragraph(f"2. Detailed Analysis: {db_name}", self.styles['H2_Custom']))
-                story.append(Paragraph("2.1. Current Configuration", self.styles['H3_Custom']))
-                story.append(Paragraph(f"• Engine: {inputs.get('engine', 'N/A').upper()}", self.styles['Bullet_Custom']))
-                story.append(Paragraph(f"• Region: {inputs.get('region', 'N/A')}", self.styles['Bullet_Custom']))
-                story.append(Paragraph(f"• CPU: {inputs.get('cores', 'N/A')} cores ({inputs.get('cpu_util', 'N/A')}% util)", self.styles['Bullet_Custom']))
-                story.append(Paragraph(f"• RAM: {inputs.get('ram', 'N/A')} GB ({inputs.get('ram_util', 'N/A')}% util)", self.styles['Bullet_Custom']))
-                story.append(Paragraph(f"• Storage: {inputs.get('storage', 'N/A'):,} GB ({inputs.get('iops', 'N/A'):,} IOPS)", self.styles['Bullet_Custom']))
-                story.append(Spacer(1, 0.1 * inch))
-
-                story.append(Paragraph("2.2. Recommended Configurations", self.styles['H3_Custom']))
-                rec_table_data = [["Environment", "Instance Type", "vCPUs", "RAM (GB)", "Monthly Cost ($)"]]
-                for env, rec in recommendations.items():
-                    rec_table_data.append([
-                        env, 
-                        rec['instance_type'], 
-                        rec['vcpus'], 
-                        rec['ram_gb'], 
-                        f"{rec['monthly_cost']:,.0f}"
-                    ])
-                
-                rec_table = Table(rec_table_data, colWidths=[1.2*inch, 1.5*inch, 0.8*inch, 0.8*inch, 1.2*inch])
-                rec_table.setStyle(TableStyle([
-                    ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#764ba2')),
-                    ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                    ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-                    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                    ('BOTTOMPADDING', (0, 0), (-1, 0), 6),
-                    ('BACKGROUND', (0, 1), (-1, -1), colors.HexColor('#f8fafc')),
-                    ('GRID', (0, 0), (-1, -1), 1, colors.HexColor('#e2e8f0')),
-                    ('LEFTPADDING', (0,0), (-1,-1), 6),
-                    ('RIGHTPADDING', (0,0), (-1,-1), 6),
-                    ('TOPPADDING', (0,0), (-1,-1), 6),
-                    ('BOTTOMPADDING', (0,0), (-1,-1), 6),
-                ]))
-                story.append(rec_table)
-                story.append(Spacer(1, 0.2 * inch))
-
-                if 'workload' in ai_insights and 'error' not in ai_insights['workload']:
-                    workload = ai_insights['workload']
-                    story.append(Paragraph("2.3. AI Workload Insights", self.styles['H3_Custom']))
-                    story.append(Paragraph(f"• Workload Type: {workload.get('workload_type', 'N/A')}", self.styles['Bullet_Custom']))
-                    story.append(Paragraph(f"• Migration Complexity: {workload.get('complexity', 'N/A')}", self.styles['Bullet_Custom']))
-                    story.append(Paragraph(f"• Estimated Timeline: {workload.get('timeline', 'N/A')}", self.styles['Bullet_Custom']))
-                    
-                    if workload.get('recommendations'):
-                        story.append(Paragraph("Key Recommendations:", self.styles['Normal_Custom']))
-                        for rec in workload['recommendations']:
-                            story.append(Paragraph(f"• {rec}", self.styles['Bullet_Custom']))
-                    if workload.get('risks'):
-                        story.append(Paragraph("Identified Risks:", self.styles['Normal_Custom']))
-                        for risk in workload['risks']:
-                            story.append(Paragraph(f"• {risk}", self.styles['Bullet_Custom']))
-                    story.append(Spacer(1, 0.2 * inch))
-
-                if 'migration' in ai_insights and 'error' not in ai_insights['migration']:
-                    migration = ai_insights['migration']
-                    story.append(Paragraph("2.4. Migration Strategy Overview", self.styles['H3_Custom']))
-                    story.append(Paragraph(f"• Estimated Timeline: {migration.get('timeline', 'N/A')}", self.styles['Bullet_Custom']))
-                    if migration.get('phases'):
-                        story.append(Paragraph("Migration Phases:", self.styles['Normal_Custom']))
-                        for phase in migration['phases']:
-                            story.append(Paragraph(f"• {phase}", self.styles['Bullet_Custom']))
-                    if migration.get('tools'):
-                        story.append(Paragraph("Recommended Tools:", self.styles['Normal_Custom']))
-                        for tool in migration['tools']:
-                            story.append(Paragraph(f"• {tool}", self.styles['Bullet_Custom']))
-                    story.append(Spacer(1, 0.2 * inch))
-
-            doc.build(story)
-            buffer.seek(0)
-            return buffer.getvalue()
-            
-        except Exception as e:
-            raise Exception(f"PDF generation failed: {str(e)}") from e
-
-def parse_uploaded_file(uploaded_file):
-    """Parse uploaded CSV/Excel file with database configurations"""
-    try:
-        if uploaded_file.name.endswith('.csv'):
-            df = pd.read_csv(uploaded_file)
-        else:
-            df = pd.read_excel(uploaded_file)
-        
-        # Column mapping for different naming conventions
-        column_mapping = {
-            'database_name': 'db_name',
-            'database_engine': 'engine', 
-            'aws_region': 'region',
-            'cpu_cores': 'cores',
-            'cpu_utilization': 'cpu_util',
-            'ram_gb': 'ram',
-            'ram_utilization': 'ram_util',
-            'storage_gb': 'storage',
-            'growth_rate': 'growth',
-            'projection_years': 'years',
-            'data_transfer_gb': 'data_transfer_gb'
-        }
-        
-        # Rename columns to match expected format
-        df = df.rename(columns=column_mapping)
-        
-        # Expected columns (after mapping)
-        required_columns = ['db_name', 'engine', 'region', 'cores', 'ram', 'storage']
-        
-        # Check for required columns
-        missing_columns = [col for col in required_columns if col not in df.columns]
-        if missing_columns:
-            return [], [f"Missing required columns: {', '.join(missing_columns)}"]
-        
-        valid_inputs = []
-        errors = []
-        
-        for index, row in df.iterrows():
-            try:
-                input_data = {
-                    'db_name': str(row['db_name']),
-                    'engine': str(row['engine']),
-                    'region': str(row['region']),
-                    'cores': int(row['cores']),
-                    'cpu_util': int(row.get('cpu_util', 65)),
-                    'ram': int(row.get('ram', 0)), # Ensure RAM is handled safely
-                    'ram_util': int(row.get('ram_util', 75)),
-                    'storage': int(row.get('storage', 100)), # Default to 100 if missing
-                    'iops': int(row.get('iops', 8000)),
-                    'growth': float(row.get('growth', 15)),
-                    'backup_days': int(row.get('backup_days', 7)),
-                    'years': int(row.get('years', 3)),
-                    'data_transfer_gb': int(row.get('data_transfer_gb', 100))
-                }
-                valid_inputs.append(input_data)
-            except Exception as e:
-                errors.append(f"Row {index + 1}: {str(e)}")
-        
-        return valid_inputs, errors
-        
-    except Exception as e:
-        return [], [f"File parsing error: {str(e)}"]
-
-def export_full_report(all_results):
-    """Export comprehensive Excel report"""
-    try:
-        output = io.BytesIO()
-        
-        with pd.ExcelWriter(output, engine='openpyxl') as writer:
-            # Summary sheet
-            summary_data = []
-            for result in all_results:
-                prod_rec = result['recommendations']['PROD']
-                summary_data.append({
-                    "Database": result['inputs'].get('db_name', 'N/A'),
-                    "Engine": result['inputs'].get('engine', 'N/A'),
-                    "Instance Type": prod_rec['instance_type'],
-                    "vCPUs": prod_rec['vcpus'],
-                    "RAM (GB)": prod_rec['ram_gb'],
-                    "Storage (GB)": prod_rec['storage_gb'],
-                    "Monthly Cost": prod_rec['monthly_cost'],
-                    "Annual Cost": prod_rec['annual_cost'],
-                    "Optimization": f"{prod_rec.get('optimization_score', 85)}%"
-                })
-            
-            summary_df = pd.DataFrame(summary_data)
-            summary_df.to_excel(writer, sheet_name='Executive Summary', index=False)
-            
-            # Detailed breakdown
-            for i, result in enumerate(all_results):
-                db_name = result['inputs'].get('db_name', f'Database_{i+1}')
-                sheet_name = db_name[:31]  # Excel sheet name limit
-                
-                detail_data = []
-                for env, rec in result['recommendations'].items():
-                    detail_data.append({
-                        'Environment': env,
-                        'Instance Type': rec['instance_type'],
-                        'vCPUs': rec['vcpus'],
-                        'RAM (GB)': rec['ram_gb'],
-                        'Storage (GB)': rec['storage_gb'],
-                        'Monthly Cost': rec['monthly_cost'],
-                        'Annual Cost': rec['annual_cost']
-                    })
-                
-                detail_df = pd.DataFrame(detail_data)
-                detail_df.to_excel(writer, sheet_name=sheet_name, index=False)
-        
-        output.seek(0)
-        return output.getvalue()
-        
-    except Exception as e:
-        raise Exception(f"Report generation failed: {str(e)}")
-
 def check_pdf_requirements():
     """Check if PDF generation requirements are met"""
     if REPORTLAB_AVAILABLE:
@@ -1488,6 +680,10 @@ def initialize_session_state():
         st.session_state.file_inputs = None
     if 'last_analysis_results' not in st.session_state:
         st.session_state.last_analysis_results = None
+    if 'active_bulk_job' not in st.session_state:
+        st.session_state.active_bulk_job = None
+    if 'loaded_bulk_job' not in st.session_state:
+        st.session_state.loaded_bulk_job = None
 
 def main():
     """Main application function"""
@@ -1763,10 +959,17 @@ def render_bulk_upload_tab(enable_ai_analysis, enable_predictions, enable_migrat
     upload_cols = st.columns([2, 1])
     with upload_cols[0]:
         uploaded_file = st.file_uploader(
-            "Upload CSV/Excel file with database configurations", 
-            type=["csv", "xlsx"],
+            "Upload CSV/Excel/Parquet/Arrow file with database configurations", 
+            type=UPLOAD_TYPES,
             help="Upload a file containing multiple database configurations for batch analysis"
         )
+        metrics_file = st.file_uploader(
+            "Optional: utilization time series (CSV/Parquet/Arrow)",
+            type=["csv", "parquet", "arrow", "feather"],
+            help="Per-sample CPU/memory/IOPS per db_name from your monitoring export; "
+                 "measured percentiles replace the inventory's cpu_util/ram_util/iops",
+            key="metrics_upload"
+        )
     
     with upload_cols[1]:
         if st.button("📋 Download Template", use_container_width=True, key="download_template_button"):
@@ -1800,9 +1003,85 @@ def render_bulk_upload_tab(enable_ai_analysis, enable_predictions, enable_migrat
             )
     
     if uploaded_file:
-        process_bulk_upload(uploaded_file, enable_ai_analysis, enable_predictions, enable_migration_strategy, api_key)
+        process_bulk_upload(uploaded_file, enable_ai_analysis, enable_predictions, enable_migration_strategy, api_key,
+                            metrics_file)
+
+    if Config.BULK_BACKGROUND_JOBS:
+        render_bulk_jobs_panel()
+
+def render_bulk_jobs_panel():
+    """List background bulk analysis jobs and poll while any of them is running"""
+    runner = get_job_runner()
+    runner.store.mark_interrupted()  # jobs of other processes that stopped heartbeating
+    jobs = runner.store.list_jobs(limit=5)
+    if not jobs:
+        return
+    
+    st.markdown("#### 🗂️ Background Analysis Jobs")
+    status_icons = {
+        'queued': '⏳', 'running': '🔄', 'completed': '✅',
+        'failed': '❌', 'cancelled': '⏹️', 'interrupted': '⚠️'
+    }
+    active = False
+    
+    for job in jobs:
+        job_id = job['id']
+        job_cols = st.columns([4, 2, 1, 1])
+        with job_cols[0]:
+            created = datetime.fromtimestamp(job['created_at']).strftime('%Y-%m-%d %H:%M')
+            st.markdown(f"**{job['name']}** · `{job_id}` · {created}")
+            st.progress(job['completed'] / job['total'] if job['total'] else 0.0)
+        with job_cols[1]:
+            st.markdown(f"{status_icons.get(job['status'], '')} **{job['status'].title()}** · {job['completed']}/{job['total']} done")
+            if job['error']:
+                st.caption(job['error'])
+            elif job['stage'] and job['status'] in ('queued', 'running'):
+                st.caption(job['stage'])
+        
+        with job_cols[2]:
+            if job['status'] in ('queued', 'running'):
+                active = True
+                if st.button("⏹️ Cancel", key=f"cancel_job_{job_id}", use_container_width=True):
+                    runner.cancel(job_id)
+            elif job['status'] in ('interrupted', 'failed', 'cancelled'):
+                if st.button("▶️ Resume", key=f"resume_job_{job_id}", use_container_width=True):
+                    wants_ai = any(job['options'].values())
+                    if wants_ai and not st.session_state.ai_analytics:
+                        st.error("🔑 Please enter your Claude API key in the sidebar to resume AI analysis")
+                    else:
+                        try:
+                            runner.submit(job_id, st.session_state.calculator, st.session_state.ai_analytics)
+                        except JobInProgress as e:
+                            st.info(f"🗂️ {e}")
+                        else:
+                            st.session_state.active_bulk_job = job_id
+                            st.rerun()
+        
+        with job_cols[3]:
+            if job['sized'] and st.button("📊 Results", key=f"load_job_{job_id}", use_container_width=True):
+                st.session_state.loaded_bulk_job = job_id
+        
+        # Show the results of this session's job as soon as it finishes
+        if job['status'] == 'completed' and job_id == st.session_state.get('active_bulk_job'):
+            st.session_state.loaded_bulk_job = job_id
+            st.session_state.active_bulk_job = None
+    
+    loaded_job = st.session_state.get('loaded_bulk_job')
+    if loaded_job:
+        all_results = runner.store.load_results(loaded_job)
+        if all_results:
+            job = runner.store.get_job(loaded_job)
+            if job and job['reuse_report']:
+                st.session_state.ai_reuse_report = job['reuse_report']
+            st.session_state.last_analysis_results = all_results
+            display_bulk_results(all_results)
+    
+    if active:
+        time.sleep(Config.BULK_JOB_POLL_SECONDS)
+        st.rerun()
 
-def process_bulk_upload(uploaded_file, enable_ai_analysis, enable_predictions, enable_migration_strategy, api_key):
+def process_bulk_upload(uploaded_file, enable_ai_analysis, enable_predictions, enable_migration_strategy, api_key,
+                        metrics_file=None):
     """Process the bulk upload file"""
     try:
         st.markdown("#### 📋 File Processing Results")
@@ -1825,6 +1104,9 @@ def process_bulk_upload(uploaded_file, enable_ai_analysis, enable_predictions, e
                 for i, error in enumerate(errors, 1):
                     st.error(f"{i}. {error}")
         
+        if valid_inputs and metrics_file:
+            valid_inputs = render_utilization_profile(valid_inputs, metrics_file)
+        
         # Show valid configurations
         if valid_inputs:
             st.success(f"✅ Successfully parsed **{len(valid_inputs)}** valid database configurations")
@@ -1862,8 +1144,28 @@ def process_bulk_upload(uploaded_file, enable_ai_analysis, enable_predictions, e
             if st.button("🚀 Analyze All Databases", type="primary", use_container_width=False, key="bulk_analyze_button"):
                 if not api_key and (enable_ai_analysis or enable_predictions or enable_migration_strategy):
                     st.error("🔑 Please enter your Claude API key in the sidebar to enable AI analysis")
+                elif Config.BULK_BACKGROUND_JOBS:
+                    options = {
+                        'enable_ai_analysis': enable_ai_analysis,
+                        'enable_predictions': enable_predictions,
+                        'enable_migration_strategy': enable_migration_strategy
+                    }
+                    try:
+                        job_id, resumed = get_job_runner().start(
+                            valid_inputs, options, st.session_state.calculator, st.session_state.ai_analytics,
+                            name=uploaded_file.name
+                        )
+                    except JobInProgress as e:
+                        st.info(f"🗂️ {e} - it will show up here when it finishes")
+                    else:
+                        st.session_state.active_bulk_job = job_id
+                        if resumed:
+                            st.success(f"♻️ Resuming unfinished job `{job_id}` for this file - completed databases are skipped")
+                        else:
+                            st.success(f"🗂️ Background job `{job_id}` started - you can keep working while it runs")
                 else:
-                    analyze_file(valid_inputs, enable_ai_analysis, enable_predictions, enable_migration_strategy)
+                    analyze_file(valid_inputs, enable_ai_analysis, enable_predictions, enable_migration_strategy,
+                                 name=uploaded_file.name)
             
             st.markdown("</div>", unsafe_allow_html=True) # Close the centering div
 
@@ -1886,6 +1188,73 @@ def process_bulk_upload(uploaded_file, enable_ai_analysis, enable_predictions, e
         st.error(f"❌ **Error processing file:** {str(e)}")
         st.info("💡 Make your file has all required columns and proper formatting.")
 
+def render_utilization_profile(valid_inputs, metrics_file):
+    """Profile an uploaded utilization time series and return the inputs sized from its percentiles"""
+    st.markdown("#### 📈 Measured Utilization")
+    
+    # Profiling millions of rows is done once per uploaded file, not on every rerun
+    cache_key = (metrics_file.name, metrics_file.size)
+    cached = st.session_state.get('utilization_profile')
+    if not cached or cached[0] != cache_key:
+        try:
+            with st.spinner("🔄 Profiling utilization time series..."):
+                profiler = profile_metrics(metrics_file)
+                cached = (cache_key, profiler, profiler.summary(sorted({50, 90, 95, 99, Config.UTILIZATION_PERCENTILE})))
+        except Exception as e:
+            st.error(f"❌ **Error reading utilization metrics:** {str(e)}")
+            return valid_inputs
+        st.session_state.utilization_profile = cached
+    _, profiler, summary = cached
+    
+    options = [50, 90, 95, 99]
+    percentile = st.selectbox(
+        "Size from percentile", options,
+        index=options.index(Config.UTILIZATION_PERCENTILE) if Config.UTILIZATION_PERCENTILE in options else 2,
+        format_func=lambda pct: f"P{pct}", key="utilization_percentile"
+    )
+    sized_inputs, matched = apply_utilization(valid_inputs, summary, percentile)
+    
+    metric_cols = st.columns(4)
+    with metric_cols[0]:
+        st.metric("Samples", f"{profiler.rows:,}")
+    with metric_cols[1]:
+        st.metric("Databases Profiled", len(profiler.databases))
+    with metric_cols[2]:
+        st.metric("Matched to Inventory", f"{len(matched)} / {len(valid_inputs)}")
+    with metric_cols[3]:
+        bursty = summary[summary['db_name'].isin(matched)]['cpu_burst_share'] > 0.05
+        st.metric("Bursty Databases", int(bursty.sum()),
+                  help=f"More than 5% of CPU samples above {Config.BURST_THRESHOLD_PERCENT:.0f}%")
+    
+    if not matched:
+        st.warning("⚠️ No db_name in the metrics file matches the inventory; entered values are used.")
+        return valid_inputs
+    
+    with st.expander(f"View measured utilization (P{percentile} replaces entered values)", expanded=False):
+        entered = {inputs['db_name']: inputs for inputs in valid_inputs}
+        table = summary[summary['db_name'].isin(matched)]
+        st.dataframe(pd.DataFrame({
+            "Database": table['db_name'],
+            "CPU Entered %": [entered[name]['cpu_util'] for name in table['db_name']],
+            f"CPU P{percentile} %": table[f'cpu_util_p{percentile}'].round(1),
+            "CPU Max %": table['cpu_util_max'].round(1),
+            f"RAM P{percentile} %": table[f'ram_util_p{percentile}'].round(1),
+            f"IOPS P{percentile}": table[f'iops_p{percentile}'].round(0),
+            "Burst Share": (table['cpu_burst_share'] * 100).round(1).astype(str) + "%",
+            "Peak/Median": table['cpu_burst_ratio'].round(2),
+            "Peak Hour": table['cpu_peak_hour'],
+        }), use_container_width=True, hide_index=True)
+        
+        profile = profiler.diurnal_profile("cpu_util").loc[matched]
+        if profile.notna().any().any():
+            selected = st.selectbox("Diurnal CPU profile", matched, key="utilization_profile_db")
+            fig = px.line(x=profile.columns, y=profile.loc[selected], markers=True,
+                          labels={"x": "Hour of day", "y": "Mean CPU %"},
+                          title=f"{selected}: mean CPU utilization by hour")
+            st.plotly_chart(fig, use_container_width=True, key="utilization_diurnal_chart")
+    
+    return sized_inputs
+
 def render_manual_config_tab(inputs, enable_ai_analysis, enable_predictions, enable_migration_strategy, api_key):
     """Render the manual configuration tab"""
     st.markdown("### 📊 Manual Database Configuration")
@@ -2168,7 +1537,6 @@ def analyze_workload(inputs, enable_ai_analysis, enable_predictions, enable_migr
         status_text.text("🔄 Calculating resource requirements...")
         stage_info.info("Analyzing current workload and determining optimal AWS configurations")
         progress_bar.progress(20)
-        time.sleep(1)
         
         calculator = st.session_state.calculator
         recommendations = {}
@@ -2185,11 +1553,17 @@ def analyze_workload(inputs, enable_ai_analysis, enable_predictions, enable_migr
             progress_bar.progress(60)
             
             try:
-                workload_analysis = st.session_state.ai_analytics.analyze_workload_patterns(inputs)
+                if Config.AI_STREAMING:
+                    live_panel = st.empty()
+                    workload_analysis = st.session_state.ai_analytics.analyze_workload_patterns_stream(
+                        inputs, on_update=lambda partial: render_streaming_workload(live_panel, partial)
+                    )
+                    live_panel.empty()
+                else:
+                    workload_analysis = st.session_state.ai_analytics.analyze_workload_patterns(inputs)
                 ai_insights['workload'] = workload_analysis
                 if "error" in ai_insights['workload']:
                     st.error(ai_insights['workload']['error'])
-                time.sleep(2)
             except Exception as e:
                 st.error(f"AI Analysis Error: {str(e)}")
                 ai_insights['workload'] = {"error": str(e)}
@@ -2201,11 +1575,17 @@ def analyze_workload(inputs, enable_ai_analysis, enable_predictions, enable_migr
             progress_bar.progress(75)
             
             try:
-                predictions = st.session_state.ai_analytics.predict_future_requirements(inputs, inputs['years'])
+                if Config.AI_STREAMING:
+                    live_panel = st.empty()
+                    predictions = st.session_state.ai_analytics.predict_future_requirements_stream(
+                        inputs, inputs['years'], on_text=streaming_text_renderer(live_panel, "🔮 Predictions")
+                    )
+                    live_panel.empty()
+                else:
+                    predictions = st.session_state.ai_analytics.predict_future_requirements(inputs, inputs['years'])
                 ai_insights['predictions'] = predictions
                 if "error" in ai_insights['predictions']:
                     st.error(ai_insights['predictions']['error'])
-                time.sleep(2)
             except Exception as e:
                 st.error(f"Prediction Error: {str(e)}")
                 ai_insights['predictions'] = {"error": str(e)}
@@ -2217,15 +1597,24 @@ def analyze_workload(inputs, enable_ai_analysis, enable_predictions, enable_migr
             progress_bar.progress(90)
             
             try:
-                migration_strategy = st.session_state.ai_analytics.generate_migration_strategy(recommendations['PROD'])
+                if Config.AI_STREAMING:
+                    live_panel = st.empty()
+                    migration_strategy = st.session_state.ai_analytics.generate_migration_strategy_stream(
+                        recommendations['PROD'], on_text=streaming_text_renderer(live_panel, "📋 Migration Strategy")
+                    )
+                    live_panel.empty()
+                else:
+                    migration_strategy = st.session_state.ai_analytics.generate_migration_strategy(recommendations['PROD'])
                 ai_insights['migration'] = migration_strategy
                 if "error" in ai_insights['migration']:
                     st.error(ai_insights['migration']['error'])
-                time.sleep(2)
             except Exception as e:
                 st.error(f"Migration Strategy Error: {str(e)}")
                 ai_insights['migration'] = {"error": str(e)}
         
+        if st.session_state.ai_analytics and (enable_ai_analysis or enable_predictions or enable_migration_strategy):
+            render_ai_usage_caption(st.session_state.ai_analytics)
+        
         # Complete
         progress_bar.progress(100)
         status_text.text("✅ Analysis complete!")
@@ -2245,6 +1634,42 @@ def analyze_workload(inputs, enable_ai_analysis, enable_predictions, enable_migr
         progress_container.empty()
         st.error(f"Analysis failed: {str(e)}")
 
+def render_ai_usage_caption(ai_analytics):
+    """One-line summary of Claude token usage and prompt-cache effectiveness for this session"""
+    usage = ai_analytics.usage.snapshot()
+    if not usage['calls']:
+        return
+    st.caption(
+        f"🧠 Claude usage: {usage['calls']} calls · {usage['prompt_tokens']:,} prompt tokens "
+        f"({usage['cache_hit_rate']:.0%} from cache) · {usage['output_tokens']:,} output tokens · "
+        f"est. ${usage['estimated_cost']:.2f} (${usage['estimated_cost_without_cache']:.2f} without caching)"
+    )
+
+def render_streaming_workload(placeholder, partial):
+    """Render a partially parsed workload analysis while the response is still streaming"""
+    sections = []
+    for key, title in [('recommendations', '💡 Recommendations'), ('bottlenecks', '⚠️ Bottlenecks'), ('risks', '🛡️ Risks')]:
+        if partial.get(key):
+            items = "\n".join(f"- {item}" for item in partial[key])
+            sections.append(f"**{title}**\n{items}")
+    
+    placeholder.markdown(
+        f"**🤖 Live AI Insights** · Workload: **{partial.get('workload_type', '…')}** · "
+        f"Complexity: **{partial.get('complexity', '…')}**\n\n" + "\n\n".join(sections)
+    )
+
+def streaming_text_renderer(placeholder, title, min_interval=0.25):
+    """Return an on_text callback that re-renders streamed text at most every ``min_interval`` seconds"""
+    last_render = [0.0]
+    
+    def render(text):
+        now = time.monotonic()
+        if now - last_render[0] >= min_interval:
+            last_render[0] = now
+            placeholder.markdown(f"**{title}** (streaming)\n\n{text}")
+    
+    return render
+
 def display_enhanced_results(recommendations, ai_insights, inputs):
     """Display comprehensive results with enhanced AI insights"""
     
@@ -2273,7 +1698,7 @@ def display_enhanced_results(recommendations, ai_insights, inputs):
         """, unsafe_allow_html=True)
     
     with summary_cols[2]:
-        onprem_monthly = inputs['cores'] * 200
+        onprem_monthly = inputs['cores'] * ONPREM_MONTHLY_PER_CORE
         monthly_savings = onprem_monthly - prod_rec['monthly_cost']
         savings_percentage = (monthly_savings / onprem_monthly) * 100 if onprem_monthly > 0 else 0
         st.markdown(f"""
@@ -2373,7 +1798,7 @@ def render_ai_insights_tab(ai_insights, inputs):
             """, unsafe_allow_html=True)
         
         with insight_cols[2]:
-            timeline = workload.get('timeline', '12-16 weeks')
+            timeline = workload.get('timeline', 'N/A')
             st.markdown(f"""
             <div class="analysis-card">
                 <h6>⏱️ Estimated Timeline</h6>
@@ -2584,7 +2009,7 @@ def render_cost_analysis_tab(recommendations, inputs):
     st.markdown("##### 📊 Cost Comparison & Savings Analysis")
     
     # Calculate savings
-    onprem_monthly = inputs['cores'] * 200  # Estimated on-premise cost
+    onprem_monthly = inputs['cores'] * ONPREM_MONTHLY_PER_CORE  # Estimated on-premise cost
     cloud_monthly = recommendations['PROD']['monthly_cost']
     monthly_savings = onprem_monthly - cloud_monthly
     annual_savings = monthly_savings * 12
@@ -2604,28 +2029,96 @@ def render_cost_analysis_tab(recommendations, inputs):
     # 3-year projection
     st.markdown("##### 📈 3-Year Cost Projection")
     
-    years = list(range(1, 4))
-    growth_rate = inputs.get('growth', 15) / 100
-    
-    onprem_costs = [onprem_monthly * 12 * (1 + growth_rate) ** (year - 1) for year in years]
-    cloud_costs = [cloud_monthly * 12 * (1 + growth_rate * 0.7) ** (year - 1) for year in years]  # Cloud scales better
+    ri_labels = {f"{duration} {term}": (duration, term) for duration, term in RI_OPTIONS}
+    ri_choice = st.selectbox("Reserved Instance option", list(ri_labels), index=1, key="tco_ri_option")
+    projection = tco_from_recommendations(
+        recommendations, onprem_monthly, inputs.get('growth', 15) / 100, inputs['storage'],
+        years=3, ri_option=ri_labels[ri_choice]
+    )
+    tco_df = tco_table(projection, 'PROD')
     
     projection_df = pd.DataFrame({
-        'Year': years,
-        'On-Premise': onprem_costs,
-        'AWS Cloud': cloud_costs,
-        'Savings': [op - cl for op, cl in zip(onprem_costs, cloud_costs)]
+        'Year': tco_df['Year'],
+        'On-Premise': tco_df['OnPremAnnual'],
+        'AWS Cloud': tco_df['CloudAnnual'],
+        'AWS Cloud (Reserved)': tco_df['CloudRIAnnual']
     })
     
     fig3 = px.line(
         projection_df, 
         x='Year', 
-        y=['On-Premise', 'AWS Cloud'],
+        y=['On-Premise', 'AWS Cloud', 'AWS Cloud (Reserved)'],
         title="3-Year Cost Projection",
         labels={'value': 'Annual Cost ($)', 'variable': 'Infrastructure'}
     )
     fig3.update_layout(height=400, title_font_size=16)
     st.plotly_chart(fig3, use_container_width=True, config={'responsive': True})
+    
+    tco_cols = st.columns(3)
+    with tco_cols[0]:
+        st.metric("3-Year TCO (On-Demand)", f"${tco_df['Cloud'].iloc[-1]:,.0f}",
+                  f"${tco_df['Savings'].iloc[-1]:,.0f} vs on-premise")
+    with tco_cols[1]:
+        st.metric("3-Year TCO (Reserved)", f"${tco_df['CloudRI'].iloc[-1]:,.0f}",
+                  f"${tco_df['Cloud'].iloc[-1] - tco_df['CloudRI'].iloc[-1]:,.0f} vs on-demand")
+    with tco_cols[2]:
+        break_even = projection['ri_break_even_month'][0, projection['environments'].index('PROD')]
+        st.metric("RI Break-Even", f"Month {break_even:.0f}" if break_even == break_even else "Not within 3 years")
+    
+    # Monte Carlo risk around the point estimates
+    st.markdown("##### 🎲 Cost & Capacity Risk (12 months)")
+    risk, _ = simulate_cost_risk(st.session_state.calculator, [inputs], [recommendations['PROD']], seed=0)
+    risk_row = risk.iloc[0]
+    risk_cols = st.columns(len(PERCENTILES) + 1)
+    for col, pct in zip(risk_cols, PERCENTILES):
+        with col:
+            st.metric(f"P{pct} Monthly Cost", f"${risk_row[f'p{pct}_cost']:,.0f}",
+                      f"${risk_row[f'p{pct}_cost'] - cloud_monthly:+,.0f} vs estimate", delta_color="inverse")
+    with risk_cols[-1]:
+        st.metric("Outgrow Probability", f"{risk_row['prob_outgrow']:.0%}",
+                  help=f"Share of {Config.MONTE_CARLO_TRIALS:,} simulated trials whose peak CPU or RAM demand exceeds {recommendations['PROD']['instance_type']}")
+
+    render_region_comparison([inputs], key="single")
+
+def render_region_comparison(inputs_list, key):
+    """Render the region x environment cost matrix for one workload or a whole inventory"""
+    st.markdown("##### 🌍 Multi-Region Cost Comparison")
+    
+    comparison = compare_regions(st.session_state.calculator, inputs_list)
+    matrix = region_cost_matrix(comparison)
+    env_matrix = matrix.drop(columns="Total")
+    
+    region_cols = st.columns([3, 2])
+    
+    with region_cols[0]:
+        fig = px.imshow(
+            env_matrix,
+            text_auto=',.0f',
+            aspect='auto',
+            color_continuous_scale='RdYlGn_r',
+            title="Monthly Cost by Region and Environment",
+            labels={'x': 'Environment', 'y': 'Region', 'color': 'Monthly Cost ($)'}
+        )
+        fig.update_layout(height=400, title_font_size=16)
+        st.plotly_chart(fig, use_container_width=True, config={'responsive': True}, key=f"region_matrix_{key}")
+    
+    with region_cols[1]:
+        totals = matrix['Total'].sort_values()
+        current_regions = set(comparison['current_region'])
+        current_total = comparison[comparison['region'] == comparison['current_region']]['monthly_cost'].sum()
+        st.metric("Cheapest Region", totals.index[0], f"${totals.iloc[0]:,.0f}/mo (all environments)")
+        if current_regions <= set(totals.index):
+            st.metric("Savings vs Current Region(s)", f"${current_total - totals.iloc[0]:,.0f}/mo",
+                      f"{(current_total - totals.iloc[0]) / current_total * 100:.1f}%" if current_total else None)
+        
+        summary = pd.DataFrame({
+            'Monthly Total': totals.map(lambda cost: f"${cost:,.0f}"),
+            'vs Cheapest': (totals - totals.iloc[0]).map(lambda delta: f"+${delta:,.0f}" if delta else "—")
+        })
+        if len(inputs_list) == 1:
+            prod_types = comparison[comparison['environment'] == 'PROD'].set_index('region')['instance_type']
+            summary['PROD Instance'] = prod_types.reindex(summary.index)
+        st.dataframe(summary, use_container_width=True)
 
 def render_future_planning_tab(ai_insights, recommendations, inputs):
     """Render future planning insights"""
@@ -2648,7 +2141,7 @@ def render_future_planning_tab(ai_insights, recommendations, inputs):
             <div class="analysis-card">
                 <h6>💻 CPU Trend</h6>
                 <p style="font-weight: bold; color: #667eea; margin: 1rem 0;">
-                    {predictions.get('cpu_trend', 'Gradual increase expected')}
+                    {predictions.get('cpu_trend', 'N/A')}
                 </p>
                 <p style="color: #64748b; font-size: 0.9rem;">
                     Based on workload analysis and growth patterns
@@ -2661,7 +2154,7 @@ def render_future_planning_tab(ai_insights, recommendations, inputs):
             <div class="analysis-card">
                 <h6>🧠 Memory Trend</h6>
                 <p style="font-weight: bold; color: #10b981; margin: 1rem 0;">
-                    {predictions.get('memory_trend', 'Stable with seasonal peaks')}
+                    {predictions.get('memory_trend', 'N/A')}
                 </p>
                 <p style="color: #64748b; font-size: 0.9rem;">
                     Memory usage patterns and optimization opportunities
@@ -2674,7 +2167,7 @@ def render_future_planning_tab(ai_insights, recommendations, inputs):
             <div class="analysis-card">
                 <h6>💾 Storage Trend</h6>
                 <p style="font-weight: bold; color: #f59e0b; margin: 1rem 0;">
-                    {predictions.get('storage_trend', 'Linear growth with data retention')}
+                    {predictions.get('storage_trend', 'N/A')}
                 </p>
                 <p style="color: #64748b; font-size: 0.9rem;">
                     Data growth patterns and retention policies
@@ -2699,7 +2192,7 @@ def render_future_planning_tab(ai_insights, recommendations, inputs):
         confidence_cols = st.columns(2)
         
         with confidence_cols[0]:
-            confidence = predictions.get('confidence', 'High (85-90%)')
+            confidence = predictions.get('confidence', 'N/A')
             st.markdown(f"""
             <div class="config-section">
                 <div class="config-header">📊 Prediction Confidence</div>
@@ -2725,23 +2218,28 @@ def render_future_planning_tab(ai_insights, recommendations, inputs):
                     st.markdown(f"<li>{factor}</li>", unsafe_allow_html=True)
                 
                 st.markdown("</ul></div>", unsafe_allow_html=True)
+        
+        if predictions.get('full_prediction'):
+            with st.expander("📄 Full AI Response", expanded='growth_pct' not in predictions):
+                st.markdown(predictions['full_prediction'])
     else:
         # Show basic projections without AI
         st.markdown("##### 📊 Basic Growth Projections")
         
-        growth_rate = inputs.get('growth', 15)
-        years = list(range(1, 6))
-        
-        current_storage = inputs['storage']
-        projected_storage = [current_storage * (1 + growth_rate/100) ** year for year in years]
-        
-        current_cost = recommendations['PROD']['monthly_cost']
-        projected_costs = [current_cost * (1 + growth_rate/100 * 0.8) ** year for year in years]
+        projection = tco_from_recommendations(
+            recommendations, inputs['cores'] * ONPREM_MONTHLY_PER_CORE, inputs.get('growth', 15) / 100,
+            inputs['storage'], years=5
+        )
+        tco_df = tco_table(projection, 'PROD')
+        # Storage and monthly cost at the end of each year
+        year_end = projection['months'] % 12 == 0
+        prod_index = projection['environments'].index('PROD')
         
         projection_df = pd.DataFrame({
-            'Year': [f"Year {y}" for y in years],
-            'Storage (GB)': [f"{storage:,.0f}" for storage in projected_storage],
-            'Estimated Cost': [f"${cost:,.0f}" for cost in projected_costs]
+            'Year': [f"Year {y}" for y in tco_df['Year']],
+            'Storage (GB)': [f"{storage:,.0f}" for storage in projection['storage_gb'][0, year_end]],
+            'Estimated Cost': [f"${cost:,.0f}/mo" for cost in projection['cloud'][0, prod_index, year_end]],
+            'Cumulative TCO': [f"${cost:,.0f}" for cost in tco_df['Cloud']]
         })
         
         st.dataframe(projection_df, use_container_width=True, hide_index=True)
@@ -2784,7 +2282,7 @@ def render_migration_strategy_tab(ai_insights, recommendations):
         strategy_cols = st.columns(2)
         
         with strategy_cols[0]:
-            timeline = migration.get('timeline', '14-18 weeks')
+            timeline = migration.get('timeline', 'N/A')
             st.markdown(f"""
             <div class="config-section">
                 <div class="config-header">⏱️ Estimated Timeline</div>
@@ -2854,6 +2352,10 @@ def render_migration_strategy_tab(ai_insights, recommendations):
                     <strong>Risk {i}:</strong> {risk}
                 </div>
                 """, unsafe_allow_html=True)
+        
+        if migration.get('full_strategy'):
+            with st.expander("📄 Full AI Response", expanded=not phases):
+                st.markdown(migration['full_strategy'])
     
     else:
         # Basic migration strategy without AI
@@ -2882,7 +2384,7 @@ def render_migration_strategy_tab(ai_insights, recommendations):
         
         st.info("💡 Enable AI migration strategy generation for detailed implementation roadmap, resource planning, and risk assessment.")
 
-def analyze_file(valid_inputs, enable_ai_analysis, enable_predictions, enable_migration_strategy):
+def analyze_file(valid_inputs, enable_ai_analysis, enable_predictions, enable_migration_strategy, name=None):
     """Analyze multiple databases from uploaded file with enhanced progress tracking"""
     
     st.markdown("### 🔄 Bulk Database Analysis")
@@ -2902,72 +2404,77 @@ def analyze_file(valid_inputs, enable_ai_analysis, enable_predictions, enable_mi
     try:
         total_databases = len(valid_inputs)
         
-        for i, inputs in enumerate(valid_inputs):
-            db_name = inputs.get('db_name', f'Database {i+1}')
-            current_db.text(f"🔄 Analyzing: {db_name} ({i+1}/{total_databases})")
-            
-            # Basic calculations
-            stage_status.text("📊 Calculating resource requirements...")
-            calculator = st.session_state.calculator
-            recommendations = {}
-            for env in calculator.env_profiles:
-                recommendations[env] = calculator.calculate_requirements(inputs, env)
-            
-            # AI Analysis
-            ai_insights = {}
-            if st.session_state.ai_analytics:
-                if enable_ai_analysis:
-                    stage_status.text("🤖 Running AI workload analysis...")
-                    try:
-                        workload_analysis = st.session_state.ai_analytics.analyze_workload_patterns(inputs)
-                        ai_insights['workload'] = workload_analysis
-                        if "error" in ai_insights['workload']:
-                            st.warning(f"AI Workload Analysis for {db_name}: {ai_insights['workload']['error']}")
-                    except Exception as e:
-                        st.warning(f"AI Workload Analysis for {db_name} failed: {str(e)}")
-                        ai_insights['workload'] = {"error": str(e)}
-                
-                if enable_predictions:
-                    stage_status.text("🔮 Generating predictions...")
-                    try:
-                        predictions = st.session_state.ai_analytics.predict_future_requirements(inputs, inputs.get('years', 3))
-                        ai_insights['predictions'] = predictions
-                        if "error" in ai_insights['predictions']:
-                            st.warning(f"AI Predictions for {db_name}: {ai_insights['predictions']['error']}")
-                    except Exception as e:
-                        st.warning(f"AI Predictions for {db_name} failed: {str(e)}")
-                        ai_insights['predictions'] = {"error": str(e)}
-                
-                if enable_migration_strategy:
-                    stage_status.text("📋 Creating migration strategy...")
-                    try:
-                        migration_strategy = st.session_state.ai_analytics.generate_migration_strategy(recommendations['PROD'])
-                        ai_insights['migration'] = migration_strategy
-                        if "error" in ai_insights['migration']:
-                            st.warning(f"AI Migration Strategy for {db_name}: {ai_insights['migration']['error']}")
-                    except Exception as e:
-                        st.warning(f"AI Migration Strategy for {db_name} failed: {str(e)}")
-                        ai_insights['migration'] = {"error": str(e)}
-            
-            all_results.append({
-                'inputs': inputs,
-                'recommendations': recommendations,
-                'ai_insights': ai_insights
-            })
-            
-            # Update progress
-            progress = (i + 1) / total_databases
-            overall_progress.progress(progress)
+        sized = []
+        
+        def on_sized(index, result):
+            sized.append(result)
+            current_db.text(f"🔄 Analyzing: {db_label(result['inputs'], index)} ({index+1}/{total_databases})")
+            overall_progress.progress((index + 1) / total_databases)
             
             # Update summary
-            completed = i + 1
-            total_cost = sum(result['recommendations']['PROD']['monthly_cost'] for result in all_results)
+            completed = index + 1
+            total_cost = sum(r['recommendations']['PROD']['monthly_cost'] for r in sized)
             results_summary.markdown(f"""
             **Progress:** {completed}/{total_databases} databases analyzed  
             **Total Monthly Cost:** ${total_cost:,.0f}  
             **Average Cost:** ${total_cost/completed:,.0f} per database
             """)
         
+        def on_ai_progress(done, total, index):
+            overall_progress.progress(done / total)
+            if index is not None:
+                current_db.text(f"🤖 AI insights ready: {db_label(valid_inputs[index], index)} ({done}/{total})")
+        
+        def on_ai_result(index, result):
+            if 'ai_reused_from' in result:
+                return
+            ai_insights = result['ai_insights']
+            for key, label in [('workload', 'AI Workload Analysis'), ('predictions', 'AI Predictions'),
+                               ('migration', 'AI Migration Strategy')]:
+                if "error" in ai_insights.get(key, {}):
+                    st.warning(f"{label} for {db_label(result['inputs'], index)}: {ai_insights[key]['error']}")
+        
+        callbacks = dict(on_stage=stage_status.text, on_sized=on_sized, on_ai_progress=on_ai_progress,
+                         on_ai_result=on_ai_result)
+        if Config.BULK_CHECKPOINTS:
+            # Every finished database is checkpointed; re-running the same file and options resumes
+            store = get_job_store()
+            options = {
+                'enable_ai_analysis': enable_ai_analysis,
+                'enable_predictions': enable_predictions,
+                'enable_migration_strategy': enable_migration_strategy
+            }
+            try:
+                job_id, resumed = open_job(store, valid_inputs, options, name)
+                if resumed:
+                    checkpoint = store.get_job(job_id)
+                    st.info(
+                        f"♻️ Resuming from checkpoint: {checkpoint['completed']} of {total_databases} databases "
+                        f"already complete"
+                    )
+                all_results, reuse = run_job(
+                    store, job_id, st.session_state.calculator, st.session_state.ai_analytics, **callbacks
+                )
+            except JobInProgress as e:
+                # Another session of this process (or another process) is analyzing the same file
+                progress_container.empty()
+                st.info(f"🗂️ {e}")
+                return
+        else:
+            all_results, reuse = run_bulk_analysis(
+                valid_inputs, st.session_state.calculator, st.session_state.ai_analytics,
+                enable_ai_analysis, enable_predictions, enable_migration_strategy, **callbacks
+            )
+        
+        if reuse:
+            st.session_state.ai_reuse_report = reuse
+            if reuse['reused_databases']:
+                st.info(
+                    f"♻️ AI results reused for {reuse['reused_databases']} of {reuse['databases']} databases "
+                    f"({reuse['buckets']} workload buckets, {reuse['analyses_saved']} AI analyses saved)"
+                )
+            render_ai_usage_caption(st.session_state.ai_analytics)
+        
         # Analysis complete
         current_db.text("✅ Analysis complete for all databases!")
         stage_status.text("🎉 All databases analyzed successfully")
@@ -2996,7 +2503,7 @@ def display_bulk_results(all_results):
     avg_monthly = total_monthly / len(all_results)
     
     # Calculate total on-premise estimate
-    total_onprem = sum(result['inputs']['cores'] * 200 for result in all_results)
+    total_onprem = sum(result['inputs']['cores'] * ONPREM_MONTHLY_PER_CORE for result in all_results)
     total_savings = total_onprem - total_monthly
     savings_percentage = (total_savings / total_onprem) * 100 if total_onprem > 0 else 0
     
@@ -3139,6 +2646,70 @@ def render_bulk_summary_tab(all_results):
         st.markdown(f"• **Minimum:** ${min_cost:,.0f}/month")
         st.markdown(f"• **Median:** ${median_cost:,.0f}/month")
         st.markdown(f"• **Maximum:** ${max_cost:,.0f}/month")
+    
+    render_bulk_transfer_plan(all_results)
+
+def render_bulk_transfer_plan(all_results):
+    """Render the migration data-transfer plan: full load, CDC and cutover per database, in waves on a shared link"""
+    st.markdown("#### 🚚 Migration Transfer Plan")
+    
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        bandwidth = st.number_input("Link bandwidth (Mbps)", 10, 100000, int(Config.MIGRATION_BANDWIDTH_MBPS), 100,
+                                    key="bulk_transfer_bandwidth")
+    with col2:
+        streams = st.number_input("Parallel streams per database", 1, 64, 4, key="bulk_transfer_streams")
+    with col3:
+        compression = st.slider("Compression ratio", 1.0, 5.0, 1.0, 0.5, key="bulk_transfer_compression")
+    with col4:
+        change = st.slider("Daily change (% of data)", 0.0, 50.0, 2.0, 0.5, key="bulk_transfer_change")
+    window = st.slider("Cutover window (hours)", 0.5, 48.0, float(Config.MIGRATION_CUTOVER_WINDOW_HOURS), 0.5,
+                       key="bulk_transfer_window")
+    
+    plan = plan_transfers([result['inputs'] for result in all_results], bandwidth, streams, compression, change, window)
+    plan, waves = schedule_waves(plan, bandwidth)
+    
+    metric_cols = st.columns(4)
+    with metric_cols[0]:
+        st.metric("Data to Move", f"{plan['size_gb'].sum():,.0f} GB")
+    with metric_cols[1]:
+        st.metric("Waves", f"{len(waves)}")
+    with metric_cols[2]:
+        st.metric("Total Duration", f"{waves['end_hour'].max() if len(waves) else 0:,.1f} h")
+    with metric_cols[3]:
+        finite = plan['downtime_hours'][np.isfinite(plan['downtime_hours'])]
+        st.metric("Longest Cutover", f"{finite.max() if len(finite) else 0:,.1f} h")
+    
+    stuck = plan[plan['method'] == NOT_CONVERGING]
+    if len(stuck):
+        st.warning(f"{len(stuck)} database(s) change faster than their streams can replicate: "
+                   f"{', '.join(stuck['db_name'].astype(str))}. Add streams, bandwidth or compression.")
+    
+    if len(waves):
+        fig = px.timeline(
+            plan[plan['wave'] > 0].assign(
+                start=pd.Timestamp(0) + pd.to_timedelta(plan['start_hour'], unit='h'),
+                finish=pd.Timestamp(0) + pd.to_timedelta(plan['cutover_hour'], unit='h'),
+                wave=lambda frame: frame['wave'].astype(str)),
+            x_start="start", x_end="finish", y="db_name", color="wave",
+            title="Migration waves (hours from start)"
+        )
+        fig.update_yaxes(autorange="reversed")
+        st.plotly_chart(fig, use_container_width=True)
+    
+    with st.expander("View transfer plan", expanded=False):
+        st.dataframe(
+            plan.style.format({
+                'size_gb': '{:,.0f}', 'wire_gb': '{:,.0f}', 'line_rate_mbps': '{:,.0f}', 'full_load_hours': '{:,.1f}',
+                'change_gb_per_day': '{:,.1f}', 'cdc_catch_up_hours': '{:,.1f}', 'sync_hours': '{:,.1f}',
+                'downtime_hours': '{:,.2f}', 'start_hour': '{:,.1f}', 'cutover_hour': '{:,.1f}'
+            }),
+            use_container_width=True, hide_index=True
+        )
+        st.dataframe(waves, use_container_width=True, hide_index=True)
+        st.caption("Databases whose offline full load fits the cutover window migrate that way; the rest use "
+                   "full load + CDC and cut over after replaying the changes made meanwhile. Waves share the "
+                   f"link and at most {Config.MIGRATION_MAX_CONCURRENT_TASKS} DMS tasks, longest migrations first.")
 
 def render_bulk_ai_tab(all_results):
     """Render bulk AI intelligence summary"""
@@ -3161,6 +2732,10 @@ def render_bulk_ai_tab(all_results):
     workload_types = {}
     complexity_levels = {}
     all_recommendations = []
+    bottleneck_categories = {}
+    risk_categories = {}
+    timeline_weeks = []
+    predicted_growth = []
     
     for result in clean_results:
         ai_insights = result.get('ai_insights', {})
@@ -3177,6 +2752,18 @@ def render_bulk_ai_tab(all_results):
             
             # Collect recommendations
             all_recommendations.extend(workload.get('recommendations', []))
+            
+            # Structured output adds categorical fields that aggregate cleanly
+            for category in workload.get('bottleneck_categories', []):
+                bottleneck_categories[category] = bottleneck_categories.get(category, 0) + 1
+            for category in workload.get('risk_categories', []):
+                risk_categories[category] = risk_categories.get(category, 0) + 1
+            if workload.get('timeline_weeks'):
+                timeline_weeks.append(workload['timeline_weeks'])
+        
+        predictions = ai_insights.get('predictions', {})
+        if 'growth_pct' in predictions:
+            predicted_growth.append(predictions['growth_pct'])
     
     # Display aggregated insights
     ai_cols = st.columns(2)
@@ -3210,6 +2797,34 @@ def render_bulk_ai_tab(all_results):
                 </div>
                 """, unsafe_allow_html=True)
     
+    # Categorical aggregation (structured AI output)
+    if bottleneck_categories or risk_categories:
+        category_cols = st.columns(2)
+        
+        for col, counts, title in [(category_cols[0], bottleneck_categories, "⚠️ Bottlenecks by Category"),
+                                   (category_cols[1], risk_categories, "🛡️ Risks by Category")]:
+            if counts:
+                with col:
+                    st.markdown(f"##### {title}")
+                    ordered = sorted(counts.items(), key=lambda item: item[1], reverse=True)
+                    fig_categories = px.bar(
+                        x=[count for _, count in ordered],
+                        y=[category.replace('_', ' ').title() for category, _ in ordered],
+                        orientation='h',
+                        labels={'x': 'Databases', 'y': ''}
+                    )
+                    fig_categories.update_layout(height=300, yaxis={'autorange': 'reversed'})
+                    st.plotly_chart(fig_categories, use_container_width=True, config={'responsive': True})
+    
+    if timeline_weeks or predicted_growth:
+        metric_cols = st.columns(4)
+        if timeline_weeks:
+            metric_cols[0].metric("Avg Migration Timeline", f"{np.mean(timeline_weeks):.1f} weeks")
+            metric_cols[1].metric("Total Migration Effort", f"{sum(timeline_weeks):,} db-weeks")
+        if predicted_growth:
+            metric_cols[2].metric("Avg Predicted Storage Growth", f"{np.mean([g['storage'] for g in predicted_growth]):+.0f}%")
+            metric_cols[3].metric("Avg Predicted Cost Growth", f"{np.mean([g['cost'] for g in predicted_growth]):+.0f}%")
+    
     # Top recommendations
     if all_recommendations:
         st.markdown("##### 🎯 Most Common AI Recommendations")
@@ -3298,7 +2913,7 @@ def render_bulk_cost_tab(all_results):
     st.markdown("##### 📊 Financial Summary")
     
     total_monthly = sum(result['recommendations']['PROD']['monthly_cost'] for result in all_results)
-    total_onprem_estimate = sum(result['inputs']['cores'] * 200 for result in all_results)
+    total_onprem_estimate = sum(result['inputs']['cores'] * ONPREM_MONTHLY_PER_CORE for result in all_results)
     total_savings = total_onprem_estimate - total_monthly
     
     financial_cols = st.columns(4)
@@ -3317,6 +2932,309 @@ def render_bulk_cost_tab(all_results):
         payback_months = (total_monthly * 0.1) / (total_savings / 12) if total_savings > 0 else (0 if total_savings == 0 else float('inf'))
         st.metric("ROI Payback", f"{payback_months:.0f} months" if payback_months > 0 and payback_months != float('inf') else ("Immediate" if payback_months == 0 else "N/A"))
 
+    # Fleet TCO from the shared projection engine
+    st.markdown("##### 📈 Portfolio 3-Year TCO")
+    fleet_tco = tco_table(tco_from_results(all_results, years=3), 'PROD')
+    fig3 = px.bar(
+        fleet_tco,
+        x='Year',
+        y=['OnPremAnnual', 'CloudAnnual', 'CloudRIAnnual'],
+        barmode='group',
+        title="Annual Portfolio Cost (Production)",
+        labels={'value': 'Annual Cost ($)', 'variable': 'Infrastructure'}
+    )
+    fig3.for_each_trace(lambda trace: trace.update(name={
+        'OnPremAnnual': 'On-Premise', 'CloudAnnual': 'AWS Cloud', 'CloudRIAnnual': 'AWS Cloud (Reserved)'
+    }[trace.name]))
+    fig3.update_layout(height=400, title_font_size=16)
+    st.plotly_chart(fig3, use_container_width=True, config={'responsive': True})
+    
+    render_region_comparison([result['inputs'] for result in all_results], key="bulk")
+    render_bulk_cost_risk(all_results)
+    render_bulk_serverless(all_results)
+    render_bulk_consolidation(all_results)
+    render_bulk_fleet_optimizer(all_results)
+    render_bulk_purchase_options(all_results)
+
+def render_bulk_cost_risk(all_results):
+    """Render Monte Carlo cost and capacity risk for the whole inventory"""
+    st.markdown("##### 🎲 Portfolio Cost & Capacity Risk")
+    
+    risk_cols = st.columns([1, 1, 2])
+    with risk_cols[0]:
+        trials = st.select_slider("Trials per database", options=[1000, 5000, 10000, 20000],
+                                  value=Config.MONTE_CARLO_TRIALS, key="bulk_risk_trials")
+    with risk_cols[1]:
+        years = st.selectbox("Horizon (years)", [1, 2, 3], key="bulk_risk_years")
+    with risk_cols[2]:
+        st.markdown("<br>", unsafe_allow_html=True)
+        run = st.button("🎲 Run Monte Carlo Simulation", use_container_width=True, key="run_bulk_risk")
+    
+    # Identifies the analysis a stored simulation belongs to
+    results_key = (len(all_results), round(sum(result['recommendations']['PROD']['monthly_cost'] for result in all_results), 2))
+    
+    if run:
+        with st.spinner(f"Simulating {trials:,} trials for {len(all_results)} databases..."):
+            risk, fleet = simulate_cost_risk(
+                st.session_state.calculator,
+                [result['inputs'] for result in all_results],
+                [result['recommendations']['PROD'] for result in all_results],
+                trials=trials, years=years, seed=0
+            )
+        st.session_state.bulk_cost_risk = (results_key, risk, fleet, trials, years)
+    
+    stored = st.session_state.get('bulk_cost_risk')
+    if not stored or stored[0] != results_key:
+        st.info("💡 Simulate growth, peak utilization, IOPS and transfer uncertainty to see cost percentiles and which databases are likely to outgrow their instances.")
+        return
+    
+    _, risk, fleet, trials, years = stored
+    
+    fleet_percentiles = np.percentile(fleet, PERCENTILES)
+    metric_cols = st.columns(len(PERCENTILES) + 1)
+    for col, pct, value in zip(metric_cols, PERCENTILES, fleet_percentiles):
+        with col:
+            st.metric(f"Portfolio P{pct}", f"${value:,.0f}/mo")
+    with metric_cols[-1]:
+        st.metric("Likely to Outgrow", f"{(risk['prob_outgrow'] >= 0.5).sum()} databases",
+                  f"within {years} year{'s' if years > 1 else ''}", delta_color="off")
+    
+    fig = px.histogram(x=fleet, nbins=60, title=f"Portfolio Monthly Cost over {trials:,} Trials",
+                       labels={'x': 'Monthly Cost ($)', 'y': 'Trials'})
+    fig.update_layout(height=350, showlegend=False, title_font_size=16)
+    st.plotly_chart(fig, use_container_width=True, config={'responsive': True}, key="bulk_risk_histogram")
+    
+    st.dataframe(
+        risk.sort_values('prob_outgrow', ascending=False).style.format({
+            'monthly_cost': '${:,.0f}', 'mean_cost': '${:,.0f}',
+            **{f'p{pct}_cost': '${:,.0f}' for pct in PERCENTILES},
+            'prob_outgrow': '{:.0%}'
+        }),
+        use_container_width=True, hide_index=True
+    )
+
+def render_bulk_serverless(all_results):
+    """Render provisioned vs Aurora Serverless v2 compute cost for the whole inventory"""
+    st.markdown("##### ⚡ Provisioned vs Aurora Serverless v2")
+    
+    envs = list(all_results[0]['recommendations'])
+    env = st.selectbox("Environment", envs, key="bulk_serverless_env")
+    
+    # Measured daily CPU curves from an uploaded utilization file, where available
+    profiles = None
+    if st.session_state.get('utilization_profile'):
+        diurnal = st.session_state.utilization_profile[1].diurnal_profile("cpu_util")
+        profiles = {name: row.to_numpy() for name, row in diurnal.iterrows()}
+    
+    comparison = compare_serverless(
+        st.session_state.calculator,
+        [result['inputs'] for result in all_results],
+        [result['recommendations'][env] for result in all_results],
+        env=env, profiles=profiles
+    )
+    
+    cheaper = comparison[comparison['recommended'] == "Serverless"]
+    metric_cols = st.columns(4)
+    with metric_cols[0]:
+        st.metric("Provisioned Compute", f"${comparison['provisioned_monthly'].sum():,.0f}/mo")
+    with metric_cols[1]:
+        st.metric("All Serverless", f"${comparison['serverless_monthly'].sum():,.0f}/mo")
+    with metric_cols[2]:
+        st.metric("Cheaper on Serverless", f"{len(cheaper)} of {len(comparison)}",
+                  f"{cheaper['aurora_engine'].sum()} already Aurora", delta_color="off")
+    with metric_cols[3]:
+        best = comparison[['provisioned_monthly', 'serverless_monthly']].min(axis=1).sum()
+        st.metric("Best Mix", f"${best:,.0f}/mo",
+                  f"-${comparison['provisioned_monthly'].sum() - best:,.0f}", delta_color="inverse")
+    
+    fig = px.scatter(
+        comparison, x='provisioned_monthly', y='serverless_monthly', color='recommended',
+        hover_data=['db_name', 'engine', 'instance_type', 'avg_acu', 'peak_acu'],
+        title=f"Monthly Compute Cost per Database ({env})",
+        labels={'provisioned_monthly': 'Provisioned ($/mo)', 'serverless_monthly': 'Serverless v2 ($/mo)'}
+    )
+    limit = float(comparison[['provisioned_monthly', 'serverless_monthly']].max().max())
+    fig.add_shape(type="line", x0=0, y0=0, x1=limit, y1=limit, line=dict(dash="dot", color="gray"))
+    fig.update_layout(height=400, title_font_size=16)
+    st.plotly_chart(fig, use_container_width=True, config={'responsive': True}, key="bulk_serverless_scatter")
+    
+    with st.expander("View serverless capacity per database", expanded=False):
+        st.dataframe(
+            comparison.sort_values('savings', ascending=False).style.format({
+                'provisioned_monthly': '${:,.0f}', 'serverless_monthly': '${:,.0f}', 'savings': '${:,.0f}',
+                'avg_acu': '{:.1f}', 'peak_acu': '{:.1f}', 'min_acu': '{:.1f}'
+            }),
+            use_container_width=True, hide_index=True
+        )
+        st.caption("Serverless capacity follows the daily CPU curve (measured where a utilization file was uploaded) "
+                   "and working memory, with gradual scale-down. Storage and I/O are priced separately.")
+
+def render_bulk_consolidation(all_results):
+    """Render shared-instance consolidation of compatible databases"""
+    st.markdown("##### 🧩 Fleet Consolidation")
+    
+    col1, col2 = st.columns(2)
+    with col1:
+        envs = list(all_results[0]['recommendations'])
+        env = st.selectbox("Environment", envs, key="bulk_consolidation_env")
+    with col2:
+        target = st.slider("Target utilization of shared instances", 0.5, 0.95,
+                           float(Config.CONSOLIDATION_TARGET_UTILIZATION), 0.05, key="bulk_consolidation_target")
+    
+    profiles = None
+    if st.session_state.get('utilization_profile'):
+        diurnal = st.session_state.utilization_profile[1].diurnal_profile("cpu_util")
+        profiles = {name: row.to_numpy() for name, row in diurnal.iterrows()}
+    
+    bins, placements = plan_consolidation(st.session_state.calculator, all_results, envs=[env],
+                                          profiles=profiles, target_utilization=target)
+    summary = consolidation_summary(bins, placements).iloc[0]
+    
+    metric_cols = st.columns(4)
+    with metric_cols[0]:
+        st.metric("Instances", f"{summary['instances_after']:,.0f}",
+                  f"{summary['instances_after'] - summary['databases']:,.0f}", delta_color="inverse")
+    with metric_cols[1]:
+        st.metric("Per-Database Cost", f"${summary['isolated_cost']:,.0f}/mo")
+    with metric_cols[2]:
+        st.metric("Consolidated Cost", f"${summary['consolidated_cost']:,.0f}/mo",
+                  f"-${summary['savings']:,.0f}", delta_color="inverse")
+    with metric_cols[3]:
+        st.metric("Databases Consolidated", f"{placements['consolidated'].sum()} of {len(placements)}")
+    
+    if bins.empty:
+        st.info(f"No group of compatible {env} databases is cheaper on a shared instance.")
+        return
+    
+    with st.expander("View shared instances", expanded=False):
+        st.dataframe(
+            bins.drop(columns=['environment']).sort_values('savings', ascending=False).style.format({
+                'cpu_peak_percent': '{:.0f}%', 'ram_percent': '{:.0f}%', 'monthly_cost': '${:,.0f}',
+                'isolated_cost': '${:,.0f}', 'savings': '${:,.0f}'
+            }),
+            use_container_width=True, hide_index=True
+        )
+        st.dataframe(placements[placements['consolidated']].drop(columns=['environment', 'consolidated']),
+                     use_container_width=True, hide_index=True)
+        st.caption("Databases of the same engine, region and environment are packed by hourly CPU (measured daily "
+                   "curves where a utilization file was uploaded), RAM, IOPS and storage. Shared instances that "
+                   "would not cost less than their members on their own instances are not proposed.")
+
+def render_bulk_fleet_optimizer(all_results):
+    """Render the fleet-wide optimizer: cost vs headroom frontier and the plan within a budget"""
+    st.markdown("##### 🎯 Fleet Optimizer")
+    
+    baseline_total = sum(rec['monthly_cost'] for result in all_results for rec in result['recommendations'].values())
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        target = st.slider("Minimum headroom over demand", 0, 100, 0, 5, format="%d%%", key="fleet_target_headroom")
+    with col2:
+        budget = st.number_input("Monthly budget ($, 0 = cheapest plan)", min_value=0.0,
+                                 value=float(round(baseline_total)), step=1000.0, key="fleet_budget")
+    with col3:
+        reserve = st.checkbox(f"Reserve {' & '.join(RI_ENVS)} instances", value=True, key="fleet_reserve")
+    
+    plan, frontier = optimize_fleet(st.session_state.calculator, all_results, budget=budget or None,
+                                    target_headroom=target / 100, ri_envs=RI_ENVS if reserve else ())
+    weights = plan['environment'].map(ENV_WEIGHTS).fillna(1.0)
+    fleet_headroom = (weights * plan['headroom_percent'].clip(upper=HEADROOM_CAP * 100)).sum() / weights.sum()
+    
+    metric_cols = st.columns(4)
+    with metric_cols[0]:
+        st.metric("Per-Database Plan", f"${baseline_total:,.0f}/mo")
+    with metric_cols[1]:
+        st.metric("Optimized Plan", f"${plan['monthly_cost'].sum():,.0f}/mo",
+                  f"-${baseline_total - plan['monthly_cost'].sum():,.0f}", delta_color="inverse")
+    with metric_cols[2]:
+        st.metric("Fleet Headroom", f"{fleet_headroom:.0f}%")
+    with metric_cols[3]:
+        st.metric("Meeting Minimum Headroom", f"{plan['meets_target'].sum()} of {len(plan)}")
+    if budget and plan['monthly_cost'].sum() > budget:
+        st.warning(f"The cheapest plan meeting {target}% headroom costs ${plan['monthly_cost'].sum():,.0f}/mo, "
+                   f"above the budget.")
+    
+    fig = px.line(frontier, x='monthly_cost', y='headroom_percent',
+                  title="Cost vs Fleet Headroom (Pareto frontier)",
+                  labels={'monthly_cost': 'Monthly Cost ($)', 'headroom_percent': 'Weighted Headroom (%)'})
+    fig.add_scatter(x=[plan['monthly_cost'].sum()], y=[fleet_headroom], mode='markers', name='Plan',
+                    marker=dict(size=12, color='red'))
+    fig.update_layout(height=400, title_font_size=16)
+    st.plotly_chart(fig, use_container_width=True, config={'responsive': True}, key="fleet_frontier_chart")
+    
+    with st.expander("View optimized plan", expanded=False):
+        st.dataframe(
+            plan.style.format({
+                'headroom_percent': '{:.0f}%', 'monthly_cost': '${:,.0f}', 'baseline_cost': '${:,.0f}',
+                'savings': '${:,.0f}'
+            }),
+            use_container_width=True, hide_index=True
+        )
+        st.caption("Headroom is spare compute over the utilized cores and memory, capped at "
+                   f"{HEADROOM_CAP:.0%} and weighted by environment "
+                   f"({', '.join(f'{env} {weight:g}' for env, weight in ENV_WEIGHTS.items())}). "
+                   "Reserved prices are effective monthly rates including the amortized upfront payment.")
+
+def render_bulk_purchase_options(all_results):
+    """Render on-demand vs Reserved Instance vs Savings Plan pricing of the recommended instances"""
+    st.markdown("##### 🧾 Purchase Options")
+    
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        env = st.selectbox("Environment", list(all_results[0]['recommendations']), key="purchase_options_env")
+    with col2:
+        utilization = st.slider("Share of hours running", 10, 100, 100, 5, format="%d%%", key="purchase_options_hours",
+                                help="Below 100% for instances stopped outside working hours; on-demand bills only running hours")
+    with col3:
+        max_upfront = st.number_input("Max upfront per instance ($, 0 = no limit)", min_value=0.0, value=0.0,
+                                      step=500.0, key="purchase_options_upfront")
+    
+    recs = [result['recommendations'][env] for result in all_results]
+    options = evaluate_purchase_options([rec['instance_details'] for rec in recs], utilization / 100)
+    if options.empty:
+        st.info("No provisioned instances to reserve.")
+        return
+    # PROD instances run with a standby, as in the instance cost
+    instances = 2 if env == "PROD" else 1
+    options['monthly_cost'] *= instances
+    options['upfront'] *= instances
+    best = best_purchase_options(options, max_upfront / instances if max_upfront else float('inf'))
+    ondemand = options[options['lease'].isna()]
+    
+    metric_cols = st.columns(4)
+    with metric_cols[0]:
+        st.metric("On-Demand Compute", f"${ondemand['monthly_cost'].sum():,.0f}/mo")
+    with metric_cols[1]:
+        st.metric("Best Mix", f"${best['monthly_cost'].sum():,.0f}/mo",
+                  f"-${ondemand['monthly_cost'].sum() - best['monthly_cost'].sum():,.0f}", delta_color="inverse")
+    with metric_cols[2]:
+        st.metric("Upfront Payment", f"${best['upfront'].sum():,.0f}")
+    with metric_cols[3]:
+        st.metric("Median Break-Even", f"{best['break_even_month'].median():.0f} mo"
+                  if best['break_even_month'].notna().any() else "n/a")
+    
+    fleet = options.groupby('option', sort=False).agg(
+        monthly_cost=('monthly_cost', 'sum'), upfront=('upfront', 'sum'),
+        savings_percent=('savings_percent', 'mean'), break_even_month=('break_even_month', 'median')
+    ).reset_index()
+    fig = px.bar(fleet, x='option', y='monthly_cost', color='savings_percent', color_continuous_scale='RdYlGn',
+                 title=f"Effective Monthly Compute Cost by Purchase Option ({env})",
+                 labels={'option': '', 'monthly_cost': 'Monthly Cost ($)', 'savings_percent': 'Savings %'})
+    fig.update_layout(height=400, title_font_size=16, xaxis_tickangle=-30)
+    st.plotly_chart(fig, use_container_width=True, config={'responsive': True}, key="purchase_options_chart")
+    
+    with st.expander("View best option per database", expanded=False):
+        best.insert(0, 'db_name', [all_results[w]['inputs'].get('db_name', f'Database {w+1}') for w in best['workload']])
+        st.dataframe(
+            best.drop(columns=['workload']).style.format({
+                'hourly': '${:.4f}', 'upfront': '${:,.0f}', 'effective_hourly': '${:.4f}', 'monthly_cost': '${:,.0f}',
+                'savings_percent': '{:.0f}%', 'break_even_month': '{:.0f}', 'break_even_utilization': '{:.0%}'
+            }, na_rep='-'),
+            use_container_width=True, hide_index=True
+        )
+        st.caption("Reserved rates come from the Pricing API's Reserved terms where the catalog has them, otherwise "
+                   "from standard discounts; Savings Plan rates are approximate. Break-even utilization is the share "
+                   "of hours an instance must run for the commitment to beat on-demand.")
+
 def render_bulk_individual_tab(all_results):
     """Render individual database details from bulk analysis"""
     st.markdown("#### 🔍 Individual Database Analysis")
@@ -3406,7 +3324,7 @@ def display_single_database_analysis(result, db_number):
                 st.markdown(f"""
                 **Workload Type:** {workload.get('workload_type', 'Mixed')}  
                 **Complexity:** {workload.get('complexity', 'Medium')}  
-                **Timeline:** {workload.get('timeline', '12-16 weeks')}
+                **Timeline:** {workload.get('timeline', 'N/A')}
                 """)
             
             with ai_detail_cols[1]:
@@ -3590,6 +3508,21 @@ def render_bulk_export_tab(all_results):
             use_container_width=True,
             key="download_technical_json_bulk"
         )
+
+        # Typed columnar exports of every environment, for notebooks and data pipelines
+        if PARQUET_AVAILABLE:
+            for fmt, label in [("parquet", "🗃️ Download Results (Parquet)"), ("arrow", "🏹 Download Results (Arrow)")]:
+                mime, extension = RESULT_TABLE_FORMATS[fmt]
+                st.download_button(
+                    label=label,
+                    data=export_results_table(all_results, fmt),
+                    file_name=f"migration_results_{datetime.now().strftime('%Y%m%d_%H%M')}.{extension}",
+                    mime=mime,
+                    use_container_width=True,
+                    key=f"download_results_{fmt}_bulk"
+                )
+        else:
+            st.info("💡 Install pyarrow for Parquet/Arrow exports: pip install pyarrow")
     
     with export_cols[2]:
         st.markdown("""
@@ -3608,7 +3541,7 @@ def render_bulk_export_tab(all_results):
         if st.button("📧 Generate Email Summary", use_container_width=True, key="generate_email_summary_bulk"):
             total_monthly = sum(result['recommendations']['PROD']['monthly_cost'] for result in all_results)
             total_annual = total_monthly * 12
-            total_onprem = sum(result['inputs']['cores'] * 200 for result in all_results)
+            total_onprem = sum(result['inputs']['cores'] * ONPREM_MONTHLY_PER_CORE for result in all_results)
             total_savings = total_onprem - total_monthly
             
             email_summary = f"""
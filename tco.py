@@ -0,0 +1,167 @@
+"""
+Multi-year total cost of ownership projections.
+
+``project_tco`` builds monthly cost curves for every workload x environment x
+month as NumPy arrays in one pass:
+
+- instance cost grows with compute demand (CLOUD_COMPUTE_GROWTH of the workload
+  growth rate - right-sizing absorbs part of the growth on RDS)
+- storage and backup cost grow with the storage growth rate
+- everything else (IOPS, transfer, monitoring) stays flat
+- on-premise cost grows with the full growth rate
+- a reserved-instance curve re-reserves the on-demand instance cost at the start
+  of every term; growth above the reservation is billed on demand
+
+The single-workload tabs, the bulk Excel report and
+FixedRDSDatabaseSizingCalculator.tco_data (read by report_generator) all use
+it, so every screen shows the same numbers.
+"""
+import numpy as np
+import pandas as pd
+
+# On-premise estimate used across the app: fully loaded monthly cost per core
+ONPREM_MONTHLY_PER_CORE = 200
+# Share of the workload growth rate that shows up in RDS instance cost
+CLOUD_COMPUTE_GROWTH = 0.7
+
+# (term months, share of the term's cost paid upfront, discount vs on-demand), approximate RDS rates
+RI_OPTIONS = {
+    ("1yr", "No Upfront"): (12, 0.0, 0.31),
+    ("1yr", "Partial Upfront"): (12, 0.5, 0.34),
+    ("1yr", "All Upfront"): (12, 1.0, 0.36),
+    ("3yr", "Partial Upfront"): (36, 0.5, 0.53),
+    ("3yr", "All Upfront"): (36, 1.0, 0.58),
+}
+DEFAULT_RI_OPTION = ("1yr", "No Upfront")
+
+
+def project_tco(instance_monthly, storage_monthly, fixed_monthly, onprem_monthly, growth,
+                storage_gb=None, years: int = 3, ri_option: tuple = DEFAULT_RI_OPTION, ri_rates: tuple = None) -> dict:
+    """Monthly cost curves for workloads x environments x months
+
+    ``instance_monthly``, ``storage_monthly`` and ``fixed_monthly`` are
+    (workloads, environments) arrays of today's monthly cost split by how it
+    grows; ``onprem_monthly``, ``growth`` (fraction per year) and
+    ``storage_gb`` are per workload. Curves are (workloads, environments,
+    months), or (workloads, months) for on-premise and storage. ``ri_rates``
+    overrides RI_OPTIONS[ri_option] with (term months, upfront share,
+    discount) from catalog prices (see reserved_pricing.ri_rates).
+    """
+    if ri_rates is None and ri_option not in RI_OPTIONS:
+        raise ValueError(f"Unknown RI option {ri_option}; expected one of {list(RI_OPTIONS)}")
+    instance = np.atleast_2d(np.asarray(instance_monthly, dtype=float))
+    storage = np.atleast_2d(np.asarray(storage_monthly, dtype=float))
+    fixed = np.atleast_2d(np.asarray(fixed_monthly, dtype=float))
+    growth = np.atleast_1d(np.asarray(growth, dtype=float))[:, None]
+    months = np.arange(int(years * 12))
+
+    # Growth compounds annually, applied smoothly month by month
+    elapsed_years = months / 12
+    storage_factor = (1 + growth) ** elapsed_years
+    compute_factor = (1 + growth * CLOUD_COMPUTE_GROWTH) ** elapsed_years
+
+    instance_curve = instance[:, :, None] * compute_factor[:, None, :]
+    storage_curve = storage[:, :, None] * storage_factor[:, None, :]
+    cloud = instance_curve + storage_curve + fixed[:, :, None]
+    onprem = np.atleast_1d(np.asarray(onprem_monthly, dtype=float))[:, None] * storage_factor
+
+    # Reserved instances: each term reserves the instance cost of its first month
+    term, upfront_share, discount = ri_rates or RI_OPTIONS[ri_option]
+    term = int(term)
+    term_start = (months // term) * term
+    reserved = instance_curve[:, :, term_start]
+    ri_instance = reserved * (1 - discount) * (1 - upfront_share) + np.maximum(instance_curve - reserved, 0)
+    ri_instance[:, :, months % term == 0] += reserved[:, :, months % term == 0] * (1 - discount) * upfront_share * term
+    cloud_ri = ri_instance + storage_curve + fixed[:, :, None]
+
+    cloud_cumulative = cloud.cumsum(axis=-1)
+    cloud_ri_cumulative = cloud_ri.cumsum(axis=-1)
+    # First month (1-based) from which the reservation has cost no more than on-demand; NaN if never
+    ahead = cloud_ri_cumulative <= cloud_cumulative
+    break_even = np.where(ahead.any(axis=-1), ahead.argmax(axis=-1) + 1, np.nan)
+
+    projection = {
+        "months": months + 1,
+        "ri_option": ri_option,
+        "cloud": cloud,
+        "cloud_ri": cloud_ri,
+        "onprem": onprem,
+        "cloud_cumulative": cloud_cumulative,
+        "cloud_ri_cumulative": cloud_ri_cumulative,
+        "onprem_cumulative": onprem.cumsum(axis=-1),
+        "ri_break_even_month": break_even,
+    }
+    if storage_gb is not None:
+        projection["storage_gb"] = np.atleast_1d(np.asarray(storage_gb, dtype=float))[:, None] * storage_factor
+    return projection
+
+
+def cost_components(recommendation: dict) -> tuple:
+    """(instance, storage + backup, everything else) monthly cost of one recommendation
+
+    Accepts both EnhancedRDSCalculator and FixedRDSDatabaseSizingCalculator
+    recommendations.
+    """
+    costs = recommendation.get("cost_breakdown", {})
+    if "instance_monthly" in costs:
+        instance = costs["instance_monthly"]
+        storage = costs["storage_monthly"] + costs["backup_monthly"]
+        total = costs["total_monthly"]
+    else:
+        instance = costs.get("instance", 0)
+        storage = costs.get("storage", 0) + costs.get("backup", 0)
+        total = recommendation["monthly_cost"]
+    return instance, storage, total - instance - storage
+
+
+def tco_from_recommendations(recommendations: dict, onprem_monthly: float, growth: float, storage_gb: float = None,
+                             years: int = 3, ri_option: tuple = DEFAULT_RI_OPTION, ri_rates: tuple = None) -> dict:
+    """project_tco for one workload's per-environment recommendations"""
+    envs = list(recommendations)
+    components = np.array([cost_components(recommendations[env]) for env in envs])
+    projection = project_tco(components[None, :, 0], components[None, :, 1], components[None, :, 2],
+                             onprem_monthly, growth, storage_gb, years, ri_option, ri_rates)
+    projection["environments"] = envs
+    projection["workloads"] = ["Workload"]
+    return projection
+
+
+def tco_from_results(all_results: list, years: int = 3, ri_option: tuple = DEFAULT_RI_OPTION) -> dict:
+    """project_tco for a bulk analysis (EnhancedRDSCalculator results), one workload per database"""
+    envs = list(all_results[0]['recommendations'])
+    components = np.array([[cost_components(result['recommendations'][env]) for env in envs]
+                           for result in all_results])
+    inputs = [result['inputs'] for result in all_results]
+    projection = project_tco(
+        components[:, :, 0], components[:, :, 1], components[:, :, 2],
+        [item['cores'] * ONPREM_MONTHLY_PER_CORE for item in inputs],
+        [item.get('growth', 15) / 100 for item in inputs],
+        [item['storage'] for item in inputs], years, ri_option
+    )
+    projection["environments"] = envs
+    projection["workloads"] = [item.get('db_name', f'Database {i+1}') for i, item in enumerate(inputs)]
+    return projection
+
+
+def tco_table(projection: dict, env: str = "PROD", workload: int = None) -> pd.DataFrame:
+    """Per-year cumulative and annual cost for one environment, summed over workloads unless one is given
+
+    Columns Year, OnPrem, Cloud and CloudRI are cumulative (the ``tco_data``
+    format report_generator charts); the *Annual columns are each year's spend.
+    """
+    e = projection["environments"].index(env)
+    pick = slice(None) if workload is None else slice(workload, workload + 1)
+    monthly = {
+        "OnPrem": projection["onprem"][pick].sum(axis=0),
+        "Cloud": projection["cloud"][pick, e].sum(axis=0),
+        "CloudRI": projection["cloud_ri"][pick, e].sum(axis=0),
+    }
+    years = len(projection["months"]) // 12
+    table = {"Year": np.arange(1, years + 1)}
+    for name, curve in monthly.items():
+        annual = curve[:years * 12].reshape(years, 12).sum(axis=1)
+        table[name] = annual.cumsum()
+        table[f"{name}Annual"] = annual
+    table = pd.DataFrame(table)
+    table["Savings"] = table["OnPrem"] - table["Cloud"]
+    return table
@@ -0,0 +1,150 @@
+"""
+Migration data-transfer planner.
+
+``plan_transfers`` estimates how long moving every database of a bulk
+analysis takes, and how long its cutover is, from:
+
+- throughput: ``streams`` parallel DMS tasks / streams of STREAM_MBPS each,
+  at most the link bandwidth, at LINK_EFFICIENCY of line rate
+  (utils.calculate_network_transfer_time, over arrays)
+- compression: data crosses the link at 1 / compression ratio of its size
+- full load: the whole database; changes made meanwhile are captured (CDC)
+  and replayed after it, with the throughput the ongoing change rate leaves
+- cutover: with CDC, draining the last CDC_LAG_MINUTES of changes plus
+  CUTOVER_OVERHEAD_HOURS; an offline (full load only) migration is down for
+  its whole full load, so it is only chosen when that fits the cutover window
+
+Per-database ``parallel_streams``, ``compression_ratio`` and
+``daily_change_percent`` inputs override the defaults.
+
+``schedule_waves`` places the migrations on one shared link: longest first,
+each into the first wave with bandwidth and task slots left (first-fit
+decreasing), and waves run back to back, every database cutting over when
+its wave ends. Migrations whose change rate outruns their throughput never
+converge and are left out of the schedule.
+"""
+import numpy as np
+import pandas as pd
+
+from config import Config
+from utils import calculate_network_transfer_time
+
+# One DMS task / TCP stream: WAN latency caps what a single stream moves
+STREAM_MBPS = 250
+PARALLEL_STREAMS = 4
+# Share of line rate left after protocol overhead
+LINK_EFFICIENCY = 0.8
+COMPRESSION_RATIO = 1.0
+# Share of the data changed per day, for the CDC backlog
+DAILY_CHANGE_PERCENT = 2.0
+CDC_LAG_MINUTES = 5
+# Stopping writes, validation and switching the application over
+CUTOVER_OVERHEAD_HOURS = 0.5
+
+FULL_LOAD_ONLY = "Full load only"
+FULL_LOAD_CDC = "Full load + CDC"
+NOT_CONVERGING = "CDC does not converge"
+
+PLAN_COLUMNS = ["db_name", "engine", "size_gb", "wire_gb", "streams", "line_rate_mbps", "full_load_hours",
+                "change_gb_per_day", "cdc_catch_up_hours", "sync_hours", "method", "downtime_hours"]
+
+
+def plan_transfers(inputs_list: list, bandwidth_mbps: float = None, streams: int = PARALLEL_STREAMS,
+                   compression_ratio: float = COMPRESSION_RATIO, daily_change_percent: float = DAILY_CHANGE_PERCENT,
+                   cutover_window_hours: float = None, stream_mbps: float = STREAM_MBPS,
+                   efficiency: float = LINK_EFFICIENCY) -> pd.DataFrame:
+    """Full-load, CDC and cutover durations of every database, one row each
+
+    Sizes are the bulk ``storage`` (or calculator ``storage_current_gb``)
+    inputs. ``method`` is the offline migration where its downtime fits
+    ``cutover_window_hours``, else full load + CDC.
+    """
+    bandwidth_mbps = bandwidth_mbps or Config.MIGRATION_BANDWIDTH_MBPS
+    cutover_window_hours = cutover_window_hours if cutover_window_hours is not None else Config.MIGRATION_CUTOVER_WINDOW_HOURS
+    if not inputs_list:
+        return pd.DataFrame(columns=PLAN_COLUMNS)
+    value = lambda key, default: np.array([inputs.get(key, default) for inputs in inputs_list], dtype=float)
+    size = np.array([inputs.get("storage", inputs.get("storage_current_gb", 0)) for inputs in inputs_list], dtype=float)
+    task_streams = np.maximum(value("parallel_streams", streams), 1)
+    ratio = np.maximum(value("compression_ratio", compression_ratio), 1)
+    change_percent = value("daily_change_percent", daily_change_percent)
+
+    line_rate = np.minimum(task_streams * stream_mbps, bandwidth_mbps)
+    wire_gb = size / ratio
+    full_load = calculate_network_transfer_time(wire_gb, line_rate, efficiency)["estimated_hours"]
+    gb_per_hour = 1 / calculate_network_transfer_time(1, line_rate, efficiency)["estimated_hours"]
+
+    # Changes made during the full load are replayed after it, while new ones keep arriving
+    change_per_hour = wire_gb * change_percent / 100 / 24
+    spare = gb_per_hour - change_per_hour
+    converges = spare > 0
+    with np.errstate(divide="ignore", invalid="ignore"):
+        catch_up = np.where(converges, change_per_hour * full_load / spare, np.inf)
+    cdc_cutover = change_per_hour * CDC_LAG_MINUTES / 60 / gb_per_hour + CUTOVER_OVERHEAD_HOURS
+    offline_cutover = full_load + CUTOVER_OVERHEAD_HOURS
+    offline = offline_cutover <= cutover_window_hours
+
+    return pd.DataFrame({
+        "db_name": [inputs.get("db_name", f"Database {i+1}") for i, inputs in enumerate(inputs_list)],
+        "engine": [inputs.get("engine") for inputs in inputs_list],
+        "size_gb": size,
+        "wire_gb": wire_gb,
+        "streams": task_streams.astype(np.int64),
+        "line_rate_mbps": line_rate,
+        "full_load_hours": full_load,
+        "change_gb_per_day": size * change_percent / 100,
+        "cdc_catch_up_hours": np.where(offline, 0.0, catch_up),
+        "sync_hours": np.where(offline, full_load, full_load + catch_up),
+        "method": np.where(offline, FULL_LOAD_ONLY, np.where(converges, FULL_LOAD_CDC, NOT_CONVERGING)),
+        "downtime_hours": np.where(offline, offline_cutover, np.where(converges, cdc_cutover, np.inf)),
+    }, columns=PLAN_COLUMNS)
+
+
+def schedule_waves(plan: pd.DataFrame, bandwidth_mbps: float = None, max_tasks: int = None) -> tuple:
+    """(plan with wave, start and cutover hours; one row per wave) on a link of ``bandwidth_mbps``
+
+    A wave's migrations run concurrently, within the link's line rate and
+    ``max_tasks`` DMS tasks (one per stream), and it lasts as long as its
+    slowest migration including cutover.
+    """
+    bandwidth_mbps = bandwidth_mbps or Config.MIGRATION_BANDWIDTH_MBPS
+    max_tasks = max_tasks or Config.MIGRATION_MAX_CONCURRENT_TASKS
+    plan = plan.copy()
+    # Offline migrations are down from the start: their downtime already spans the full load
+    duration = np.where(plan["method"] == FULL_LOAD_ONLY, plan["downtime_hours"],
+                        plan["sync_hours"] + plan["downtime_hours"])
+    rate = plan["line_rate_mbps"].to_numpy()
+    tasks = np.minimum(plan["streams"].to_numpy(), max_tasks)
+
+    n = len(plan)
+    wave = np.full(n, -1)
+    rate_load, task_load, length = np.zeros(n), np.zeros(n), np.zeros(n)
+    used = 0
+    for i in np.argsort(-duration, kind="stable"):
+        if not np.isfinite(duration[i]):
+            continue
+        fits = (rate_load[:used] + rate[i] <= bandwidth_mbps + 1e-9) & (task_load[:used] + tasks[i] <= max_tasks)
+        w = int(np.argmax(fits)) if fits.any() else used
+        used = max(used, w + 1)
+        wave[i] = w
+        rate_load[w] += rate[i]
+        task_load[w] += tasks[i]
+        length[w] = max(length[w], duration[i])
+
+    starts = np.concatenate([[0.0], np.cumsum(length[:used])])
+    scheduled = wave >= 0
+    plan["wave"] = np.where(scheduled, wave + 1, 0)
+    plan["start_hour"] = np.where(scheduled, starts[wave], np.nan)
+    plan["cutover_hour"] = np.where(scheduled, starts[wave + 1], np.nan)
+
+    waves = pd.DataFrame({
+        "wave": np.arange(1, used + 1),
+        "databases": np.bincount(wave[scheduled], minlength=used),
+        "size_gb": np.bincount(wave[scheduled], weights=plan["size_gb"].to_numpy()[scheduled], minlength=used),
+        "line_rate_mbps": rate_load[:used],
+        "tasks": task_load[:used].astype(np.int64),
+        "start_hour": starts[:used],
+        "end_hour": starts[1:],
+        "hours": length[:used],
+    })
+    return plan, waves
@@ -0,0 +1,286 @@
+"""
+Utilization time-series ingestion for percentile-based sizing.
+
+Monitoring exports (CSV, Parquet or Arrow IPC; one row per database and
+sample, millions of rows) are streamed in chunks through a
+``UtilizationProfiler``, which keeps per database and metric:
+
+- a log-bucket quantile sketch (relative error SKETCH_RELATIVE_ACCURACY on
+  every percentile, fixed size however many samples arrive)
+- count, mean and exact maximum
+- an hour-of-day (diurnal) profile of the mean
+- burst statistics: share of CPU samples above BURST_THRESHOLD_PERCENT and
+  the P99/P50 peak-to-median ratio
+
+Memory grows with the number of databases, not rows. ``apply_utilization``
+replaces the hand-entered cpu_util/ram_util/iops of an inventory with the
+measured percentile (UTILIZATION_PERCENTILE) before calculate_requirements.
+"""
+import math
+
+import numpy as np
+import pandas as pd
+
+from config import Config
+from inventory import ARROW_EXTENSIONS
+
+try:
+    import pyarrow
+    import pyarrow.ipc
+    import pyarrow.parquet
+    PARQUET_AVAILABLE = True
+except ImportError:
+    PARQUET_AVAILABLE = False
+
+METRICS = ["cpu_util", "ram_util", "iops"]
+# Sketch range per metric; values at or below the low end share one bucket, above the high end the last
+SKETCH_RANGES = {"cpu_util": (0.01, 100.0), "ram_util": (0.01, 100.0), "iops": (1.0, 1e7)}
+SKETCH_RELATIVE_ACCURACY = 0.01
+PERCENTILES = (50, 95, 99)
+
+# Monitoring export column names -> metric names
+COLUMN_ALIASES = {
+    'database_name': 'db_name', 'database': 'db_name', 'db_instance_identifier': 'db_name', 'instance': 'db_name',
+    'time': 'timestamp', 'ts': 'timestamp', 'datetime': 'timestamp',
+    'cpu': 'cpu_util', 'cpu_percent': 'cpu_util', 'cpu_utilization': 'cpu_util', 'cpuutilization': 'cpu_util',
+    'memory': 'ram_util', 'ram_utilization': 'ram_util', 'memory_util': 'ram_util',
+    'memory_utilization': 'ram_util', 'memory_percent': 'ram_util',
+    'total_iops': 'iops',
+}
+KNOWN_COLUMNS = {'db_name', 'timestamp', 'read_iops', 'write_iops', *METRICS}
+
+
+def _canonical(column) -> str:
+    name = str(column).strip().lower().replace(' ', '_')
+    return COLUMN_ALIASES.get(name, name)
+
+
+def iter_metric_chunks(source, chunk_rows: int = None):
+    """DataFrames of at most ``chunk_rows`` samples from a CSV/Parquet/Arrow file path or upload
+
+    Columns are renamed to db_name, timestamp, cpu_util, ram_util and iops;
+    read_iops + write_iops are summed when there is no iops column.
+    """
+    chunk_rows = chunk_rows or Config.METRICS_CHUNK_ROWS
+    name = (source if isinstance(source, str) else getattr(source, 'name', '')).lower()
+    if name.endswith('.csv'):
+        chunks = pd.read_csv(source, chunksize=chunk_rows, usecols=lambda column: _canonical(column) in KNOWN_COLUMNS)
+    elif name.endswith('.parquet') or name.endswith(ARROW_EXTENSIONS):
+        if not PARQUET_AVAILABLE:
+            raise ValueError("Parquet/Arrow metrics need pyarrow: pip install pyarrow")
+        chunks = (batch.to_pandas() for batch in _arrow_batches(source, name, chunk_rows))
+    else:
+        raise ValueError("Metrics must be a CSV, Parquet or Arrow IPC file")
+
+    for chunk in chunks:
+        chunk = chunk.rename(columns=_canonical)
+        if 'db_name' not in chunk.columns:
+            raise ValueError("Metrics file needs a db_name (or database_name) column")
+        if 'iops' not in chunk.columns and {'read_iops', 'write_iops'} <= set(chunk.columns):
+            chunk['iops'] = chunk['read_iops'] + chunk['write_iops']
+        yield chunk
+
+
+def _arrow_batches(source, name: str, chunk_rows: int):
+    if name.endswith('.parquet'):
+        yield from pyarrow.parquet.ParquetFile(source).iter_batches(batch_size=chunk_rows)
+        return
+    data = source.read() if hasattr(source, 'read') else open(source, 'rb').read()
+    try:
+        reader = pyarrow.ipc.open_file(pyarrow.py_buffer(data))
+        batches = (reader.get_batch(i) for i in range(reader.num_record_batches))
+    except pyarrow.ArrowInvalid:
+        batches = pyarrow.ipc.open_stream(pyarrow.py_buffer(data))
+    for batch in batches:
+        for start in range(0, batch.num_rows, chunk_rows):
+            yield batch.slice(start, chunk_rows)
+
+
+class _Sketch:
+    """Log-bucket quantile sketch for every database of one metric
+
+    Bucket i > 0 holds values in (low * gamma^(i-1), low * gamma^i]; reporting
+    its midpoint keeps every quantile within the relative accuracy.
+    """
+
+    def __init__(self, low: float, high: float, relative_accuracy: float):
+        self.low = low
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self.log_gamma = math.log(self.gamma)
+        self.bins = int(math.ceil(math.log(high / low) / self.log_gamma)) + 1
+        self.counts = np.zeros((0, self.bins), dtype=np.uint32)
+
+    def grow(self, rows: int):
+        self.counts = np.vstack([self.counts, np.zeros((rows - len(self.counts), self.bins), dtype=np.uint32)])
+
+    def add(self, codes: np.ndarray, values: np.ndarray):
+        buckets = np.zeros(len(values), dtype=np.int64)
+        above = values > self.low
+        buckets[above] = np.ceil(np.log(values[above] / self.low) / self.log_gamma)
+        np.minimum(buckets, self.bins - 1, out=buckets)
+        # Only the databases in this chunk, so the bincount stays chunk-sized
+        present, local = np.unique(codes, return_inverse=True)
+        counts = np.bincount(local * self.bins + buckets, minlength=len(present) * self.bins)
+        self.counts[present] += counts.reshape(len(present), self.bins).astype(np.uint32)
+
+    def quantiles(self, percentiles) -> np.ndarray:
+        """(databases, percentiles) values; NaN where a database has no samples"""
+        cumulative = self.counts.cumsum(axis=1, dtype=np.int64)
+        total = cumulative[:, -1]
+        result = np.full((len(total), len(percentiles)), np.nan)
+        upper = self.low * self.gamma ** np.arange(self.bins)
+        midpoints = np.concatenate([[0.0], upper[1:] * 2 / (self.gamma + 1)])
+        for k, pct in enumerate(percentiles):
+            rank = pct / 100 * (total - 1)
+            bucket = (cumulative <= rank[:, None]).sum(axis=1)
+            result[:, k] = np.where(total > 0, midpoints[np.minimum(bucket, self.bins - 1)], np.nan)
+        return result
+
+
+class UtilizationProfiler:
+    """Per-database percentiles, diurnal profiles and burst statistics from streamed metric chunks"""
+
+    def __init__(self, relative_accuracy: float = SKETCH_RELATIVE_ACCURACY, burst_threshold: float = None):
+        self.burst_threshold = Config.BURST_THRESHOLD_PERCENT if burst_threshold is None else burst_threshold
+        self.databases = []
+        self._codes = {}
+        self.rows = 0
+        self.sketches = {metric: _Sketch(*SKETCH_RANGES[metric], relative_accuracy) for metric in METRICS}
+        self.stats = {metric: {"count": np.zeros(0, dtype=np.int64), "sum": np.zeros(0), "max": np.zeros(0)}
+                      for metric in METRICS}
+        self.diurnal = {metric: {"sum": np.zeros((0, 24)), "count": np.zeros((0, 24), dtype=np.int64)}
+                        for metric in METRICS}
+        self.bursts = np.zeros(0, dtype=np.int64)
+
+    def _encode(self, names: pd.Series) -> np.ndarray:
+        codes, uniques = pd.factorize(names.astype(str))
+        mapping = np.empty(len(uniques), dtype=np.int64)
+        for k, name in enumerate(uniques):
+            if name not in self._codes:
+                self._codes[name] = len(self.databases)
+                self.databases.append(name)
+            mapping[k] = self._codes[name]
+        self._grow(len(self.databases))
+        return mapping[codes]
+
+    def _grow(self, rows: int):
+        if rows <= len(self.bursts):
+            return
+        pad = lambda array: np.concatenate([array, np.zeros((rows - len(array),) + array.shape[1:], dtype=array.dtype)])
+        for metric in METRICS:
+            self.sketches[metric].grow(rows)
+            self.stats[metric] = {name: pad(array) for name, array in self.stats[metric].items()}
+            self.diurnal[metric] = {name: pad(array) for name, array in self.diurnal[metric].items()}
+        self.bursts = pad(self.bursts)
+
+    def update(self, chunk: pd.DataFrame):
+        """Add one chunk of samples (columns as yielded by iter_metric_chunks)"""
+        chunk = chunk[chunk['db_name'].notna()]
+        if chunk.empty:
+            return
+        codes = self._encode(chunk['db_name'])
+        hours = None
+        if 'timestamp' in chunk.columns:
+            hours = pd.to_datetime(chunk['timestamp']).dt.hour.to_numpy()
+        self.rows += len(chunk)
+
+        for metric in METRICS:
+            if metric not in chunk.columns:
+                continue
+            values = pd.to_numeric(chunk[metric], errors='coerce').to_numpy(dtype=float)
+            valid = np.isfinite(values)
+            metric_codes, values = codes[valid], values[valid]
+            if not len(values):
+                continue
+            stats = self.stats[metric]
+            stats["count"] += np.bincount(metric_codes, minlength=len(self.databases))
+            stats["sum"] += np.bincount(metric_codes, weights=values, minlength=len(self.databases))
+            np.maximum.at(stats["max"], metric_codes, values)
+            self.sketches[metric].add(metric_codes, values)
+            if hours is not None:
+                cells = metric_codes * 24 + hours[valid]
+                diurnal = self.diurnal[metric]
+                diurnal["sum"] += np.bincount(cells, weights=values, minlength=len(self.databases) * 24).reshape(-1, 24)
+                diurnal["count"] += np.bincount(cells, minlength=len(self.databases) * 24).reshape(-1, 24)
+            if metric == "cpu_util":
+                self.bursts += np.bincount(metric_codes[values > self.burst_threshold], minlength=len(self.databases))
+
+    def summary(self, percentiles=None) -> pd.DataFrame:
+        """One row per database: {metric}_p{N}, _mean, _max and _samples, plus CPU burst statistics
+
+        ``percentiles`` defaults to PERCENTILES plus UTILIZATION_PERCENTILE.
+        """
+        percentiles = percentiles or sorted({*PERCENTILES, Config.UTILIZATION_PERCENTILE})
+        frame = {"db_name": self.databases}
+        for metric in METRICS:
+            stats = self.stats[metric]
+            with np.errstate(invalid='ignore', divide='ignore'):
+                mean = stats["sum"] / stats["count"]
+            measured = stats["count"] > 0
+            # A bucket midpoint can sit just above the largest sample
+            values = np.minimum(self.sketches[metric].quantiles(percentiles), stats["max"][:, None])
+            for k, pct in enumerate(percentiles):
+                frame[f"{metric}_p{pct}"] = values[:, k]
+            frame[f"{metric}_mean"] = mean
+            frame[f"{metric}_max"] = np.where(measured, stats["max"], np.nan)
+            frame[f"{metric}_samples"] = stats["count"]
+
+        cpu = self.stats["cpu_util"]["count"]
+        p50, p99 = self.sketches["cpu_util"].quantiles((50, 99)).T
+        with np.errstate(invalid='ignore', divide='ignore'):
+            frame["cpu_burst_share"] = np.where(cpu > 0, self.bursts / np.maximum(cpu, 1), np.nan)
+            frame["cpu_burst_ratio"] = np.where(p50 > 0, p99 / p50, np.nan)
+        profile = self.diurnal_profile("cpu_util").to_numpy()
+        has_profile = np.isfinite(profile).any(axis=1)
+        frame["cpu_peak_hour"] = np.where(has_profile, np.nanargmax(np.where(np.isfinite(profile), profile, -np.inf), axis=1), -1)
+        return pd.DataFrame(frame)
+
+    def diurnal_profile(self, metric: str = "cpu_util") -> pd.DataFrame:
+        """Database x hour-of-day mean of ``metric``; NaN for hours without samples"""
+        diurnal = self.diurnal[metric]
+        with np.errstate(invalid='ignore', divide='ignore'):
+            mean = diurnal["sum"] / diurnal["count"]
+        return pd.DataFrame(mean, index=pd.Index(self.databases, name="db_name"), columns=pd.RangeIndex(24, name="hour"))
+
+
+def profile_metrics(source, chunk_rows: int = None, **kwargs) -> UtilizationProfiler:
+    """Stream a whole metrics file through a UtilizationProfiler"""
+    profiler = UtilizationProfiler(**kwargs)
+    for chunk in iter_metric_chunks(source, chunk_rows):
+        profiler.update(chunk)
+    return profiler
+
+
+def sizing_inputs(stats, percentile: int = None) -> dict:
+    """cpu_util/ram_util/iops (as integers, like normalize_inputs) from one summary row
+
+    Metrics without samples are left out. The percentile must be one the
+    summary was computed with.
+    """
+    percentile = percentile or Config.UTILIZATION_PERCENTILE
+    inputs = {}
+    for metric in METRICS:
+        value = stats.get(f"{metric}_p{percentile}")
+        if value is None:
+            raise ValueError(f"Summary has no P{percentile}; compute it with summary(percentiles=...)")
+        if np.isfinite(value):
+            value = math.ceil(value)
+            inputs[metric] = min(max(value, 1), 100) if metric != "iops" else value
+    return inputs
+
+
+def apply_utilization(inputs_list: list, summary: pd.DataFrame, percentile: int = None):
+    """(inputs with measured cpu_util/ram_util/iops, names of the databases that matched)
+
+    Databases are matched by db_name; the rest keep their entered values.
+    """
+    by_name = summary.set_index("db_name").to_dict(orient="index")
+    updated, matched = [], []
+    for inputs in inputs_list:
+        stats = by_name.get(str(inputs.get('db_name')))
+        if stats is None:
+            updated.append(inputs)
+            continue
+        updated.append({**inputs, **sizing_inputs(stats, percentile)})
+        matched.append(inputs['db_name'])
+    return updated, matched
@@ -9,6 +9,8 @@ from datetime import datetime, timedelta
 from typing import Dict, List, Any, Optional, Tuple
 import numpy as np
 
+from storage_pricing import storage_costs
+
 def parse_uploaded_file(uploaded_file):
     """Parse uploaded CSV/Excel file into a list of input dictionaries"""
     try:
@@ -359,37 +361,14 @@ def calculate_storage_costs(
     iops: int = 3000,
     throughput_mbps: int = 125
 ) -> Dict[str, float]:
-    """Calculate detailed storage costs"""
-    costs = {}
-    
-    if storage_type == "gp3":
-        # GP3 base cost
-        costs["base_storage"] = storage_gb * 0.08
-        
-        # Additional IOPS cost (free up to 3000)
-        extra_iops = max(0, iops - 3000)
-        costs["additional_iops"] = extra_iops * 0.005
-        
-        # Additional throughput cost (free up to 125 MB/s)
-        extra_throughput = max(0, throughput_mbps - 125)
-        costs["additional_throughput"] = extra_throughput * 0.04
-        
-    elif storage_type == "gp2":
-        costs["base_storage"] = storage_gb * 0.10
-        costs["additional_iops"] = 0  # Burstable
-        costs["additional_throughput"] = 0
-        
-    elif storage_type == "io1":
-        costs["base_storage"] = storage_gb * 0.125
-        costs["additional_iops"] = iops * 0.065
-        costs["additional_throughput"] = 0
-        
-    elif storage_type == "io2":
-        costs["base_storage"] = storage_gb * 0.125
-        costs["additional_iops"] = iops * 0.065
-        costs["additional_throughput"] = 0
-    
-    costs["total"] = sum(costs.values())
+    """Calculate detailed storage costs (see storage_pricing.storage_costs)"""
+    priced = storage_costs(storage_type, storage_gb, iops, throughput_mbps)
+    costs = {
+        "base_storage": float(priced["storage"]),
+        "additional_iops": float(priced["iops"] + priced["io_requests"]),
+        "additional_throughput": float(priced["throughput"]),
+    }
+    costs["total"] = float(priced["total"])
     return costs
 
 def export_to_json(data: Dict, filename: str = None) -> str:
@@ -431,13 +410,13 @@ def calculate_network_transfer_time(
     bandwidth_mbps: int = 1000,
     efficiency_factor: float = 0.8
 ) -> Dict[str, float]:
-    """Calculate estimated data transfer time"""
+    """Calculate estimated data transfer time (scalars or numpy arrays, see transfer_planner)"""
     
     # Convert GB to Mb (Gigabytes to Megabits)
     data_size_mb = data_size_gb * 8 * 1024
     
-    # Calculate transfer time with efficiency factor
-    theoretical_time_hours = data_size_mb / (bandwidth_mbps * 60)
+    # Calculate transfer time with efficiency factor (Mb / Mbps = seconds)
+    theoretical_time_hours = data_size_mb / (bandwidth_mbps * 3600)
     actual_time_hours = theoretical_time_hours / efficiency_factor
     
     return {
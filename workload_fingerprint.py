@@ -0,0 +1,89 @@
+"""
+Workload fingerprinting for reusing AI analysis across near-identical databases.
+
+Workloads are bucketed on engine and region plus quantized sizing and
+utilization figures; AI analysis runs once per bucket and the result is shared
+with every member. Region stays exact because the prompts name it and the
+migration strategy quotes its prices. Granularity presets trade reuse for fidelity:
+
+- exact: every input except db_name must match
+- fine: sizes within ~10% (log-scale buckets), utilization and growth in 5-point steps
+- coarse: sizes within ~25%, utilization and growth in 10-point steps
+"""
+import math
+
+GRANULARITY_PRESETS = {
+    "exact": None,
+    "fine": {"size_tolerance": 0.10, "util_step": 5, "growth_step": 5},
+    "coarse": {"size_tolerance": 0.25, "util_step": 10, "growth_step": 10},
+}
+
+SIZE_FIELDS = ['cores', 'ram', 'storage', 'iops']
+UTIL_FIELDS = ['cpu_util', 'ram_util']
+
+
+def _number(value, default=0.0) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return default
+
+
+def _size_bucket(value, tolerance: float) -> int:
+    # Log-scale buckets keep the relative tolerance constant from 2 to 2000 cores/GB/IOPS
+    value = _number(value)
+    if value <= 0:
+        return 0
+    return int(round(math.log(value) / math.log(1 + tolerance))) + 1
+
+
+def _step_bucket(value, step: float) -> int:
+    return int(round(_number(value) / step))
+
+
+def workload_fingerprint(workload: dict, granularity: str = "fine") -> tuple:
+    """Hashable bucket key for a workload's AI-relevant inputs"""
+    if granularity not in GRANULARITY_PRESETS:
+        raise ValueError(f"Unknown granularity '{granularity}', expected one of {list(GRANULARITY_PRESETS)}")
+
+    preset = GRANULARITY_PRESETS[granularity]
+    if preset is None:
+        return tuple(sorted((key, str(value)) for key, value in workload.items() if key != 'db_name'))
+
+    return (
+        str(workload.get('engine', '')).lower(),
+        str(workload.get('region', '')).lower(),
+        int(_number(workload.get('years'), 3)),
+        *(_size_bucket(workload.get(field), preset["size_tolerance"]) for field in SIZE_FIELDS),
+        *(_step_bucket(workload.get(field), preset["util_step"]) for field in UTIL_FIELDS),
+        _step_bucket(workload.get('growth'), preset["growth_step"]),
+    )
+
+
+def group_workloads(workloads: list, granularity: str = "fine") -> list:
+    """Group workload indices by fingerprint; the first index of each group is its representative"""
+    groups = {}
+    for index, workload in enumerate(workloads):
+        groups.setdefault(workload_fingerprint(workload, granularity), []).append(index)
+    return list(groups.values())
+
+
+def reuse_report(groups: list, workloads: list, analyses_per_workload: int) -> dict:
+    """Summarize how many AI analyses bucketing avoided"""
+    total = sum(len(group) for group in groups)
+    largest = sorted(groups, key=len, reverse=True)[:5]
+    return {
+        "databases": total,
+        "buckets": len(groups),
+        "reused_databases": total - len(groups),
+        "analyses_made": len(groups) * analyses_per_workload,
+        "analyses_saved": (total - len(groups)) * analyses_per_workload,
+        "reuse_rate": (total - len(groups)) / total if total else 0.0,
+        "largest_buckets": [
+            {
+                "representative": workloads[group[0]].get('db_name', f"Database {group[0] + 1}"),
+                "members": len(group),
+            }
+            for group in largest if len(group) > 1
+        ],
+    }